@@ -0,0 +1,13 @@
+"""Benchmarks for the StockFrame, the Indicators and the bar loop.
+
+The suite runs with airspeed velocity (`pip install asv`), which builds each
+commit in its own environment and keeps the timings of every run in
+`benchmarks/results`, so a slower hot path shows up against earlier commits:
+
+    asv run                      # Benchmark the latest commit.
+    asv continuous master HEAD   # Compare a branch against master, flagging regressions.
+    asv publish && asv preview   # Browse the timings over time.
+
+Use `--bench` to run part of the suite, for example `asv run --bench IndicatorSuite`.
+The data is generated by `benchmarks.generators`, so nothing needs TD credentials.
+"""
@@ -0,0 +1,150 @@
+"""Benchmarks for one iteration of the robot's bar loop, from the new bar to the orders."""
+
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+from unittest.mock import patch
+
+from pyrobot.robot import PyRobot
+from pyrobot.trades import Trade
+from pyrobot.rules import ThresholdRule
+from pyrobot.rules import CrossoverRule
+from pyrobot.replay import ReplayDataSource
+from pyrobot.backtest import EventBacktester
+from pyrobot.td_server import SimulatedTDServer
+from pyrobot.td_server import random_walk_bars
+from pyrobot.indicators import Indicators
+
+from benchmarks import generators
+
+
+def connect_strategy(trading_robot: PyRobot, symbols: list, incremental: bool) -> None:
+    """Connects an SMA crossover, with an RSI filter, to the robot's pipeline.
+
+    Arguments:
+    ----
+    trading_robot {PyRobot} -- The robot, with its StockFrame.
+
+    symbols {list} -- The symbols to trade.
+
+    incremental {bool} -- Whether the indicators refresh only the new bars.
+    """
+
+    indicator_client = Indicators(price_data_frame=trading_robot.stock_frame, incremental=incremental)
+    indicator_client.sma(period=20)
+    indicator_client.rsi(period=14)
+    indicator_client.add_signal_rule(rule=CrossoverRule(side='buy', indicator_1='close', direction='above', indicator_2='sma'))
+    indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='rsi', condition='<', value=70.0))
+    indicator_client.add_signal_rule(rule=CrossoverRule(side='sell', indicator_1='close', direction='below', indicator_2='sma'))
+
+    trades_dict = {}
+
+    for symbol in symbols:
+
+        trades_dict[symbol] = {}
+
+        for side, enter_or_exit in [('buy', 'enter'), ('sell', 'exit')]:
+
+            trade_obj = Trade()
+            trade_obj.new_trade(trade_id=side, order_type='mkt', side='long', enter_or_exit=enter_or_exit)
+            trade_obj.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+            trades_dict[symbol][side] = {'trade_func': trade_obj}
+
+    trading_robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+
+
+class BarLoopSuite():
+
+    """Times one bar through the pipeline, against the simulated broker.
+
+    Each sample is a single bar, so it covers fetching the bar, adding the rows,
+    refreshing the indicators, checking the signals and placing the orders.
+    """
+
+    params = ([10, 100, 1000], [False, True])
+    param_names = ['symbols', 'incremental']
+    timeout = 600
+
+    number = 1
+    repeat = (10, 50, 30.0)
+    warmup_time = 0
+
+    warmup_bars = 200
+
+    def setup(self, symbols: int, incremental: bool) -> None:
+
+        bars = generators.price_frame(symbols=symbols, rows=symbols * (self.warmup_bars + 100))
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            self.trading_robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        self.event_backtester = EventBacktester(
+            trading_robot=self.trading_robot,
+            source=ReplayDataSource(bars=bars),
+            warmup_bars=self.warmup_bars
+        )
+
+        connect_strategy(
+            trading_robot=self.trading_robot,
+            symbols=generators.symbol_names(symbols=symbols),
+            incremental=incremental
+        )
+
+    def time_step(self, symbols: int, incremental: bool) -> None:
+        self.event_backtester.step()
+
+
+class HTTPBarLoopSuite():
+
+    """Times one bar through the pipeline, against the simulated TD server.
+
+    Unlike `BarLoopSuite`, the bars and the orders go over HTTP with the
+    robot's own session, so the time includes the requests made per symbol.
+    """
+
+    params = ([10, 100], [False, True])
+    param_names = ['symbols', 'incremental']
+    timeout = 600
+
+    number = 1
+    repeat = (10, 50, 30.0)
+    warmup_time = 0
+
+    def setup(self, symbols: int, incremental: bool) -> None:
+
+        symbol_names = generators.symbol_names(symbols=symbols)
+        source = ReplayDataSource(bars=random_walk_bars(symbols=symbol_names, bars=300, seed=1))
+
+        # Start with 200 bars, leaving the rest for the samples.
+        self.td_server = SimulatedTDServer(source=source, clock=int(source.timestamps[199]), seed=1)
+        self.td_server.start()
+
+        with self.td_server.patch_robot():
+            self.trading_robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                trading_account='123456789',
+                paper_trading=False,
+                max_workers=8,
+                requests_per_minute=None
+            )
+
+        # Keep the orders off the disk, so the samples only time the loop.
+        self.trading_robot.record_orders = False
+
+        self.trading_robot.create_portfolio()
+        for symbol in symbol_names:
+            self.trading_robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+        clock = datetime.fromtimestamp(self.td_server.broker.clock / 1000, tz=timezone.utc)
+        self.trading_robot.grab_historical_prices(start=clock - timedelta(minutes=199), end=clock)
+        self.trading_robot.create_stock_frame(data=self.trading_robot.historical_prices['aggregated'])
+
+        connect_strategy(trading_robot=self.trading_robot, symbols=symbol_names, incremental=incremental)
+
+    def time_process_latest_bar(self, symbols: int, incremental: bool) -> None:
+        self.td_server.advance(bars=1)
+        self.trading_robot.process_latest_bar()
+
+    def teardown(self, symbols: int, incremental: bool) -> None:
+        self.td_server.stop()
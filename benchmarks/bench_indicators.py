@@ -0,0 +1,72 @@
+"""Benchmarks for every indicator of the Indicators object."""
+
+from pyrobot.indicators import Indicators
+
+from benchmarks import generators
+
+
+# The arguments each indicator is benchmarked with.
+INDICATORS = {
+    'change_in_price': {},
+    'rsi': {'period': 14},
+    'sma': {'period': 20},
+    'ema': {'period': 20},
+    'rate_of_change': {'period': 1},
+    'bollinger_bands': {'period': 20},
+    'average_true_range': {'period': 14},
+    'stochastic_oscillator': {'period': 14},
+    'macd': {'fast_period': 12, 'slow_period': 26},
+    'mass_index': {'period': 9},
+    'force_index': {'period': 9},
+    'ease_of_movement': {'period': 9},
+    'commodity_channel_index': {'period': 20},
+    'standard_deviation': {'period': 20},
+    'chaikin_oscillator': {'period': 9},
+    'kst_oscillator': {'r1': 10, 'r2': 15, 'r3': 20, 'r4': 30, 'n1': 10, 'n2': 10, 'n3': 10, 'n4': 15}
+}
+
+# The indicators that can keep their state between bars.
+INCREMENTAL_INDICATORS = ['sma', 'ema', 'rsi', 'rate_of_change', 'average_true_range', 'macd']
+
+
+class IndicatorSuite():
+
+    """Times calculating each indicator over a whole StockFrame."""
+
+    params = (list(INDICATORS), generators.SYMBOLS, generators.ROWS)
+    param_names = ['indicator', 'symbols', 'rows']
+    timeout = 600
+
+    def setup(self, indicator: str, symbols: int, rows: int) -> None:
+
+        generators.skip_if_too_few_bars(symbols=symbols, rows=rows)
+
+        self.stock_frame = generators.stock_frame(symbols=symbols, rows=rows)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+    def time_indicator(self, indicator: str, symbols: int, rows: int) -> None:
+        getattr(self.indicator_client, indicator)(**INDICATORS[indicator])
+
+
+class IndicatorRefreshSuite():
+
+    """Times adding a bar and refreshing an indicator, with and without the incremental mode."""
+
+    params = (INCREMENTAL_INDICATORS, [False, True], generators.SYMBOLS, generators.ROWS)
+    param_names = ['indicator', 'incremental', 'symbols', 'rows']
+    timeout = 600
+
+    def setup(self, indicator: str, incremental: bool, symbols: int, rows: int) -> None:
+
+        generators.skip_if_too_few_bars(symbols=symbols, rows=rows)
+
+        self.stock_frame = generators.stock_frame(symbols=symbols, rows=rows)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame, incremental=incremental)
+
+        getattr(self.indicator_client, indicator)(**INDICATORS[indicator])
+
+    def time_add_bar_and_refresh(self, indicator: str, incremental: bool, symbols: int, rows: int) -> None:
+
+        # Every call adds a new minute, like a live bar would.
+        self.stock_frame.add_rows(data=generators.next_bars(stock_frame=self.stock_frame))
+        self.indicator_client.refresh()
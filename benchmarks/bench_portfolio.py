@@ -0,0 +1,37 @@
+"""Benchmarks for the risk metrics of a Portfolio."""
+
+from pyrobot.replay import ReplaySession
+from pyrobot.replay import ReplayDataSource
+from pyrobot.portfolio import Portfolio
+
+from benchmarks import generators
+
+
+class PortfolioMetricsSuite():
+
+    """Times the portfolio metrics over a year of daily bars for each position."""
+
+    params = [generators.SYMBOLS]
+    param_names = ['symbols']
+    timeout = 600
+
+    def setup(self, symbols: int) -> None:
+
+        daily_prices = generators.price_frame(symbols=symbols, rows=symbols * 252)
+        daily_prices['datetime'] = generators.FIRST_BAR_TIME + (daily_prices['datetime'] - generators.FIRST_BAR_TIME) * 24 * 60
+
+        # The quotes and the daily prices come from a replay, instead of TD.
+        td_session = ReplaySession(source=ReplayDataSource(bars=daily_prices))
+        td_session.clock = int(daily_prices['datetime'].max())
+
+        self.portfolio = Portfolio()
+        self.portfolio.td_client = td_session
+
+        for symbol in generators.symbol_names(symbols=symbols):
+            self.portfolio.add_position(symbol=symbol, asset_type='equity', quantity=10, purchase_price=100.0)
+
+        # The daily prices are grabbed once, and kept by the portfolio.
+        self.portfolio.portfolio_metrics()
+
+    def time_portfolio_metrics(self, symbols: int) -> None:
+        self.portfolio.portfolio_metrics()
@@ -0,0 +1,36 @@
+"""Benchmarks for checking the signals of the latest bars, and of every bar."""
+
+from pyrobot.rules import ThresholdRule
+from pyrobot.rules import CrossoverRule
+from pyrobot.indicators import Indicators
+
+from benchmarks import generators
+
+
+class CheckSignalsSuite():
+
+    """Times checking a crossover and a threshold signal on each side."""
+
+    params = (generators.SYMBOLS, generators.ROWS)
+    param_names = ['symbols', 'rows']
+    timeout = 600
+
+    def setup(self, symbols: int, rows: int) -> None:
+
+        generators.skip_if_too_few_bars(symbols=symbols, rows=rows)
+
+        self.stock_frame = generators.stock_frame(symbols=symbols, rows=rows)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+        self.indicator_client.sma(period=20)
+        self.indicator_client.rsi(period=14)
+        self.indicator_client.add_signal_rule(rule=CrossoverRule(side='buy', indicator_1='close', direction='above', indicator_2='sma'))
+        self.indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='rsi', condition='<', value=70.0))
+        self.indicator_client.add_signal_rule(rule=CrossoverRule(side='sell', indicator_1='close', direction='below', indicator_2='sma'))
+        self.indicator_client.add_signal_rule(rule=ThresholdRule(side='sell', indicator='rsi', condition='>', value=30.0))
+
+    def time_check_signals(self, symbols: int, rows: int) -> None:
+        self.stock_frame._check_signals(signal_plan=self.indicator_client.signal_plan)
+
+    def time_check_signals_history(self, symbols: int, rows: int) -> None:
+        self.stock_frame._check_signals_history(signal_plan=self.indicator_client.signal_plan)
@@ -0,0 +1,32 @@
+"""Benchmarks for building a StockFrame and adding bars to it."""
+
+from pyrobot.stock_frame import StockFrame
+
+from benchmarks import generators
+
+
+class StockFrameSuite():
+
+    """Times building a StockFrame from a price history, and adding the next bar."""
+
+    params = (generators.SYMBOLS, generators.ROWS)
+    param_names = ['symbols', 'rows']
+    timeout = 600
+
+    def setup(self, symbols: int, rows: int) -> None:
+
+        generators.skip_if_too_few_bars(symbols=symbols, rows=rows, bars=2)
+
+        self.prices = generators.price_frame(symbols=symbols, rows=rows)
+        self.stock_frame = StockFrame(data=self.prices)
+
+    def time_create(self, symbols: int, rows: int) -> None:
+        StockFrame(data=self.prices)
+
+    def peakmem_create(self, symbols: int, rows: int) -> None:
+        StockFrame(data=self.prices)
+
+    def time_add_rows(self, symbols: int, rows: int) -> None:
+
+        # Every call adds the minute after the last one, so no call just overwrites a bar.
+        self.stock_frame.add_rows(data=generators.next_bars(stock_frame=self.stock_frame))
@@ -0,0 +1,142 @@
+"""Synthetic prices for the benchmarks.
+
+Everything is built with whole arrays, so a million rows take well under a
+second, and seeded, so every run of a benchmark sees the same prices.
+"""
+
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+from pyrobot.stock_frame import StockFrame
+
+
+# The time of the first bar, in milliseconds since epoch.
+FIRST_BAR_TIME = 1586390400000
+
+# The symbol and total row counts the benchmarks are run at.
+SYMBOLS = [10, 100, 1000]
+ROWS = [1000, 100000, 1000000]
+
+
+def symbol_names(symbols: int) -> List[str]:
+    """Returns made up ticker symbols, like `SYM0001`.
+
+    Arguments:
+    ----
+    symbols {int} -- The number of symbols.
+
+    Returns:
+    ----
+    {List[str]} -- The symbols.
+    """
+
+    return ['SYM{index:04d}'.format(index=index) for index in range(symbols)]
+
+
+def skip_if_too_few_bars(symbols: int, rows: int, bars: int = 30) -> None:
+    """Skips a benchmark where each symbol would have too few bars to mean anything.
+
+    Arguments:
+    ----
+    symbols {int} -- The number of symbols.
+
+    rows {int} -- The total number of rows.
+
+    Keyword Arguments:
+    ----
+    bars {int} -- The fewest bars each symbol needs. (default: {30})
+    """
+
+    # Airspeed velocity skips the parameters a setup raises this for.
+    if rows // symbols < bars:
+        raise NotImplementedError("Too few bars per symbol.")
+
+
+def price_frame(symbols: int, rows: int, seed: int = 1) -> pd.DataFrame:
+    """Builds random walk minute bars, with the columns the TD API returns.
+
+    Arguments:
+    ----
+    symbols {int} -- The number of symbols.
+
+    rows {int} -- The total number of rows, split evenly between the symbols.
+
+    Keyword Arguments:
+    ----
+    seed {int} -- The seed of the random walk. (default: {1})
+
+    Returns:
+    ----
+    {pd.DataFrame} -- The bars, with the `symbol`, `datetime` (in milliseconds since
+        epoch), `open`, `close`, `high`, `low` and `volume` of each one.
+    """
+
+    bars = rows // symbols
+    random_state = np.random.RandomState(seed=seed)
+
+    returns = random_state.normal(scale=0.001, size=(symbols, bars))
+    closes = 100.0 * np.exp(np.cumsum(returns, axis=1))
+    opens = np.concatenate([np.full((symbols, 1), 100.0), closes[:, :-1]], axis=1)
+    wicks = np.abs(random_state.normal(scale=0.001, size=(2, symbols, bars))) * closes
+
+    return pd.DataFrame(data={
+        'symbol': np.repeat(symbol_names(symbols=symbols), bars),
+        'datetime': np.tile(FIRST_BAR_TIME + np.arange(bars, dtype=np.int64) * 60000, symbols),
+        'open': opens.ravel(),
+        'close': closes.ravel(),
+        'high': (np.maximum(opens, closes) + wicks[0]).ravel(),
+        'low': (np.minimum(opens, closes) - wicks[1]).ravel(),
+        'volume': random_state.randint(100, 10000, size=symbols * bars).astype(float)
+    })
+
+
+def stock_frame(symbols: int, rows: int, seed: int = 1) -> StockFrame:
+    """Builds a StockFrame of random walk minute bars.
+
+    Arguments:
+    ----
+    symbols {int} -- The number of symbols.
+
+    rows {int} -- The total number of rows.
+
+    Keyword Arguments:
+    ----
+    seed {int} -- The seed of the random walk. (default: {1})
+
+    Returns:
+    ----
+    {StockFrame} -- The StockFrame.
+    """
+
+    return StockFrame(data=price_frame(symbols=symbols, rows=rows, seed=seed))
+
+
+def next_bars(stock_frame: StockFrame) -> List[dict]:
+    """Builds the bars for the minute after the last bar of every symbol.
+
+    Arguments:
+    ----
+    stock_frame {StockFrame} -- The StockFrame the bars are added to.
+
+    Returns:
+    ----
+    {List[dict]} -- One bar per symbol, in the format `StockFrame.add_rows` takes.
+    """
+
+    last_rows = stock_frame.frame.iloc[stock_frame.last_row_positions]
+    last_times = last_rows.index.get_level_values(1).to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+    return [
+        {
+            'symbol': symbol,
+            'datetime': int(last_time) + 60000,
+            'open': close,
+            'close': close * 1.001,
+            'high': close * 1.002,
+            'low': close * 0.999,
+            'volume': 1000.0
+        }
+        for (symbol, _), last_time, close in zip(last_rows.index, last_times, last_rows['close'].tolist())
+    ]
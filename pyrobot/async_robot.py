@@ -0,0 +1,456 @@
+import time
+import asyncio
+import functools
+import pandas as pd
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Any
+from typing import List
+from typing import Callable
+
+from pyrobot.trades import Trade
+from pyrobot.retry import RetryPolicy
+from pyrobot.events import Event
+from pyrobot.events import BAR_EVENT
+from pyrobot.metrics import MetricsSink
+from pyrobot.robot import PyRobot
+from pyrobot.robot import milliseconds_since_epoch
+
+
+# The order statuses that won't change anymore.
+FINAL_ORDER_STATUSES = {'FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'REPLACED'}
+
+
+class AsyncPyRobot(PyRobot):
+
+    """
+    Represents a trading robot that runs on asyncio, so the requests for
+    every symbol, order placements and order status polling run concurrently.
+    """
+
+    def __init__(self, client_id: str, redirect_uri: str, paper_trading: bool = True, credentials_path: str = None,
+                 trading_account: str = None, max_concurrency: int = 10, requests_per_minute: int = 120,
+                 retry_policy: RetryPolicy = None, metrics: MetricsSink = None) -> None:
+        """Initalizes a new instance of the async robot and logs into the API platform specified.
+
+        Overview:
+        ----
+        The TD Ameritrade client is synchronous, so each request runs on a thread
+        pool and is awaited from the event loop. At most `max_concurrency` requests
+        are in flight at once. With 200 symbols, `get_latest_bar_async` is one
+        concurrent fan-out instead of 200 requests one after the other.
+
+        Once the bars are in, the connected stages (adding the rows, refreshing the
+        indicators, checking the signals and executing the trades) run on a thread
+        of their own, so the event loop keeps running, and the orders the signals
+        trigger are placed concurrently.
+
+        The coroutines have an `_async` suffix, the methods inherited from `PyRobot`
+        keep working synchronously, so the robot can be used anywhere a `PyRobot` is.
+
+        Arguments:
+        ----
+        client_id {str} -- The Consumer ID assigned to you during the App registration.
+            This can be found at the app registration portal.
+
+        redirect_uri {str} -- This is the redirect URL that you specified when you created your
+            TD Ameritrade Application.
+
+        Keyword Arguments:
+        ----
+        paper_trading {bool} -- If `True`, orders aren't sent to the broker. (default: {True})
+
+        credentials_path {str} -- The path to the session state file used to prevent a full
+            OAuth workflow. (default: {None})
+
+        trading_account {str} -- Your TD Ameritrade account number. (default: {None})
+
+        max_concurrency {int} -- The most requests that can be in flight at once. (default: {10})
+
+        requests_per_minute {int} -- The TD API requests that can be sent each minute, or
+            `None` to turn the rate limiter off. (default: {120})
+
+        retry_policy {RetryPolicy} -- How failed TD API requests are retried. (default: {RetryPolicy()})
+
+        metrics {MetricsSink} -- Where the stages of the bar loop and the TD API requests are
+            reported. See `PyRobot`. (default: {NULL_METRICS})
+
+        Usage:
+        ----
+            >>> trading_robot = AsyncPyRobot(
+                    client_id=CLIENT_ID,
+                    redirect_uri=REDIRECT_URI,
+                    credentials_path=CREDENTIALS_PATH,
+                    max_concurrency=20
+                )
+            >>> trading_robot.connect_pipeline(indicator_client=indicator_client)
+            >>> asyncio.run(trading_robot.run())
+        """
+
+        super().__init__(
+            client_id=client_id,
+            redirect_uri=redirect_uri,
+            paper_trading=paper_trading,
+            credentials_path=credentials_path,
+            trading_account=trading_account,
+            max_workers=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            retry_policy=retry_policy,
+            metrics=metrics
+        )
+
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        # One bar at a time goes through the stages, apart from the request pool so
+        # the orders it places can't wait on it.
+        self._pipeline_executor = ThreadPoolExecutor(max_workers=1)
+
+    async def _run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a blocking call on the thread pool and waits for it.
+
+        Arguments:
+        ----
+        func {Callable} -- The blocking function, for example `self.session.get_quotes`.
+
+        Returns:
+        ----
+        {Any} -- Whatever the function returns.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def grab_historical_prices_async(self, start: datetime, end: datetime, bar_size: int = 1,
+                                     bar_type: str = 'minute', symbols: List[str] = None) -> dict:
+        """Grabs the historical prices for all the postions in a portfolio, concurrently.
+
+        Arguments:
+        ----
+        start {datetime} -- Defines the start date for the historical prices.
+
+        end {datetime} -- Defines the end date for the historical prices.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- Defines the size of each bar. (default: {1})
+
+        bar_type {str} -- Defines the bar type, can be one of the following:
+            `['minute', 'week', 'month', 'year']` (default: {'minute'})
+
+        symbols {List[str]} -- A list of ticker symbols to pull. (default: None)
+
+        Returns:
+        ----
+        {dict} -- The candles of each symbol, and every price under `aggregated`. Symbols
+            whose request failed are left out, and their errors are stored in `fetch_errors`.
+
+        Usage:
+        ----
+            >>> historical_prices = await trading_robot.grab_historical_prices_async(
+                    start=end_date,
+                    end=start_date,
+                    bar_size=1,
+                    bar_type='minute'
+                )
+        """
+
+        self._bar_size = bar_size
+        self._bar_type = bar_type
+        self.scheduler.bar_size = bar_size
+        self.scheduler.bar_type = bar_type
+
+        start = str(milliseconds_since_epoch(dt_object=start))
+        end = str(milliseconds_since_epoch(dt_object=end))
+
+        if not symbols:
+            symbols = list(self.portfolio.positions)
+
+        responses = await asyncio.gather(*[
+            self._run_blocking(
+                self._fetch_price_history,
+                symbol=symbol,
+                start=start,
+                end=end,
+                bar_size=bar_size,
+                bar_type=bar_type
+            )
+            for symbol in symbols
+        ], return_exceptions=True)
+
+        new_prices = []
+
+        # The responses come back in the same order as the symbols.
+        for symbol, historical_prices_response in self._collect_price_histories(symbols=symbols, responses=responses):
+
+            self.historical_prices[symbol] = {}
+            self.historical_prices[symbol]['candles'] = historical_prices_response['candles']
+
+            new_prices += self._parse_candles(
+                symbol=symbol,
+                candles=historical_prices_response['candles']
+            )
+
+        self.historical_prices['aggregated'] = new_prices
+        self._track_last_bar_times(prices=new_prices)
+
+        return self.historical_prices
+
+    async def get_latest_bar_async(self) -> List[dict]:
+        """Returns the latest bar for each symbol in the portfolio, requested concurrently.
+
+        Returns:
+        ---
+        {List[dict]} -- A simplified quote list, in the same order as the portfolio positions,
+            with only the bars that weren't ingested yet. See `PyRobot.get_latest_bar`.
+
+        Usage:
+        ----
+            >>> latest_bars = await trading_robot.get_latest_bar_async()
+        """
+
+        symbols = list(self.portfolio.positions)
+        start = self._latest_bar_windows(symbols=symbols)
+        end = str(milliseconds_since_epoch(dt_object=datetime.today()))
+
+        # Don't keep retrying once the next bar is out.
+        deadline = self._next_bar_time()
+
+        with self.metrics.timer(name='stage_duration', tags={'stage': 'fetch'}):
+
+            responses = await asyncio.gather(*[
+                self._run_blocking(
+                    self._fetch_price_history,
+                    symbol=symbol,
+                    start=start[symbol],
+                    end=end,
+                    bar_size=self._bar_size,
+                    bar_type=self._bar_type,
+                    deadline=deadline
+                )
+                for symbol in symbols
+            ], return_exceptions=True)
+
+            price_histories = self._collect_price_histories(symbols=symbols, responses=responses)
+
+            # The quotes fallback sends a request, so it runs on the thread pool too.
+            return await self._run_blocking(self._latest_bars, symbols=symbols, price_histories=price_histories)
+
+    async def place_orders(self, trade_objs: List[Trade]) -> List[dict]:
+        """Executes several Trade Objects at once, without blocking the event loop.
+
+        Arguments:
+        ----
+        trade_objs {List[Trade]} -- The trade objects, with the `order` property filled out.
+
+        Returns:
+        ----
+        {List[dict]} -- The order responses, in the same order as the trades.
+
+        Usage:
+        ----
+            >>> order_responses = await trading_robot.place_orders(
+                    trade_objs=[new_enter_trade, new_exit_trade]
+                )
+        """
+
+        return list(await asyncio.gather(*[
+            self._run_blocking(self.execute_orders, trade_obj=trade_obj)
+            for trade_obj in trade_objs
+        ]))
+
+    async def get_order_statuses(self, order_ids: List[str]) -> List[dict]:
+        """Grabs several orders at once.
+
+        Arguments:
+        ----
+        order_ids {List[str]} -- The order IDs.
+
+        Returns:
+        ----
+        {List[dict]} -- The orders, in the same order as the IDs.
+        """
+
+        return list(await asyncio.gather(*[
+            self._run_blocking(self.session.get_orders, account=self.trading_account, order_id=order_id)
+            for order_id in order_ids
+        ]))
+
+    async def wait_for_orders(self, order_ids: List[str], interval: float = 1.0, timeout: float = 60.0) -> List[dict]:
+        """Polls several orders until they are filled, canceled or rejected.
+
+        Arguments:
+        ----
+        order_ids {List[str]} -- The order IDs.
+
+        Keyword Arguments:
+        ----
+        interval {float} -- The seconds between polls. (default: {1.0})
+
+        timeout {float} -- The most seconds to wait. Orders that are still open are
+            returned as they are. (default: {60.0})
+
+        Returns:
+        ----
+        {List[dict]} -- The latest state of each order, in the same order as the IDs.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        orders = await self.get_order_statuses(order_ids=order_ids)
+
+        while loop.time() + interval < deadline:
+
+            open_positions = [
+                position for position, order in enumerate(orders)
+                if order.get('status') not in FINAL_ORDER_STATUSES
+            ]
+
+            if not open_positions:
+                break
+
+            await asyncio.sleep(interval)
+
+            # Only poll the orders that are still open.
+            updated_orders = await self.get_order_statuses(
+                order_ids=[order_ids[position] for position in open_positions]
+            )
+
+            for position, order in zip(open_positions, updated_orders):
+                orders[position] = order
+
+        return orders
+
+    async def wait_till_next_bar_async(self, last_bar_timestamp: pd.DatetimeIndex) -> None:
+        """Waits, without blocking the event loop, till the next bar is released.
+
+        Arguments:
+        ----
+        last_bar_timestamp {pd.DatetimeIndex} -- The last bar's timestamp.
+        """
+
+        await asyncio.sleep(self._time_till_next_bar(last_bar_timestamp=last_bar_timestamp))
+
+    async def wait_for_new_bar_async(self, last_bar_time: float) -> List[dict]:
+        """Waits till the bar after the last one is published, and returns it.
+
+        Overview:
+        ----
+        The async version of `BarScheduler.wait_for_new_bar`, which polls with the
+        same backoff without blocking the event loop.
+
+        Arguments:
+        ----
+        last_bar_time {float} -- The open time of the last bar, as a UNIX timestamp in seconds.
+
+        Returns:
+        ----
+        {List[dict]} -- The first bars that include a new one or, if the following bar is
+            due before one shows up, the last bars fetched.
+        """
+
+        await asyncio.sleep(self.scheduler.time_till_next_bar(last_bar_time=last_bar_time))
+
+        # Give up once the bar after the new one is due.
+        deadline = last_bar_time + 2 * self.scheduler.bar_seconds
+
+        for delay in self.scheduler.poll_delays():
+
+            bars = await self.get_latest_bar_async()
+
+            if self.scheduler.is_new(bars=bars, last_bar_time=last_bar_time) or time.time() + delay > deadline:
+                return bars
+
+            await asyncio.sleep(delay)
+
+    async def process_latest_bar_async(self, wait: bool = False) -> Event:
+        """Grabs the latest bars concurrently and publishes them, running every connected stage.
+
+        Overview:
+        ----
+        The stages run on the pipeline thread, and the orders they place are sent
+        concurrently, see `_place_orders`, so the event loop isn't blocked.
+
+        Keyword Arguments:
+        ----
+        wait {bool} -- If `True`, waits for the bar after the last one ingested, polling
+            until it's published. (default: {False})
+
+        Returns:
+        ----
+        {Event} -- The published `bar` event.
+        """
+
+        last_bar_time = self._last_bar_time()
+
+        if wait and last_bar_time is not None:
+            latest_bars = await self.wait_for_new_bar_async(last_bar_time=last_bar_time)
+        else:
+            latest_bars = await self.get_latest_bar_async()
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._pipeline_executor, functools.partial(
+            self.events.publish,
+            topic=BAR_EVENT,
+            data=latest_bars,
+            bar_close=self._bar_close(bars=latest_bars)
+        ))
+
+    async def run(self, iterations: int = None) -> None:
+        """Runs the robot, processing each bar as soon as it's published.
+
+        Keyword Arguments:
+        ----
+        iterations {int} -- The number of bars to process, or `None` to run until
+            cancelled. (default: {None})
+
+        Usage:
+        ----
+            >>> trading_robot.connect_pipeline(
+                    indicator_client=indicator_client,
+                    trades_to_execute=trades_dict
+                )
+            >>> asyncio.run(trading_robot.run())
+        """
+
+        processed = 0
+
+        while iterations is None or processed < iterations:
+
+            # The first bar is processed straight away.
+            await self.process_latest_bar_async(wait=processed > 0)
+            processed += 1
+
+    def _place_orders(self, trade_objs: List[Trade]) -> List[dict]:
+        """Executes the trades a set of signals triggered, concurrently.
+
+        Overview:
+        ----
+        Called by `execute_signals` on the pipeline thread, so it waits on the request
+        pool with plain futures instead of the event loop.
+
+        Arguments:
+        ----
+        trade_objs {List[Trade]} -- The trade objects, with the `order` property filled out.
+
+        Returns:
+        ----
+        {List[dict]} -- The order responses, in the same order as the trades.
+        """
+
+        if len(trade_objs) < 2:
+            return super()._place_orders(trade_objs=trade_objs)
+
+        return list(self._executor.map(lambda trade_obj: self.execute_orders(trade_obj=trade_obj), trade_objs))
+
+    def close(self) -> None:
+        """Shuts down the thread pools used for the requests and the stages."""
+
+        self._pipeline_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+
+        super().close()
@@ -0,0 +1,854 @@
+import numpy as np
+import pandas as pd
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from pyrobot.robot import PyRobot
+from pyrobot.trades import Trade
+from pyrobot.events import Event
+from pyrobot.broker import SimulatedBroker
+from pyrobot.replay import ReplayEngine
+from pyrobot.replay import ReplayDataSource
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+
+# The order types the backtester can fill.
+FILLABLE_ORDER_TYPES = ['mkt', 'lmt', 'stop']
+
+# Which way each instruction moves the position.
+INSTRUCTION_DIRECTION = {
+    'BUY': 1,
+    'BUY_TO_COVER': 1,
+    'SELL': -1,
+    'SELL_SHORT': -1
+}
+
+# The columns of the trade list.
+TRADE_COLUMNS = [
+    'symbol', 'side', 'quantity', 'entry_time', 'entry_price', 'exit_time',
+    'exit_price', 'commission', 'pnl', 'return', 'is_open'
+]
+
+# A year of regular session minutes.
+MINUTES_PER_YEAR = 252 * 390
+
+
+class BacktestResult():
+
+    """
+    Represents the outcome of a backtest: the equity curve, the round
+    trip trades and the summary statistics.
+    """
+
+    def __init__(self, equity_curve: pd.Series, trades: pd.DataFrame, stats: dict) -> None:
+        """Initalizes the Backtest Result.
+
+        Arguments:
+        ----
+        equity_curve {pd.Series} -- The account value at each bar time.
+
+        trades {pd.DataFrame} -- One row per round trip trade.
+
+        stats {dict} -- The summary statistics.
+        """
+
+        self.equity_curve = equity_curve
+        self.trades = trades
+        self.stats = stats
+
+    def __repr__(self) -> str:
+        return '<BacktestResult trades={trades} total_return={total_return:.4f}>'.format(
+            trades=self.stats['trades'],
+            total_return=self.stats['total_return']
+        )
+
+
+def performance_stats(equity_curve: pd.Series, trades: pd.DataFrame, initial_cash: float,
+                      total_commission: float, periods_per_year: int = MINUTES_PER_YEAR) -> dict:
+    """Calculates the summary statistics of a backtest.
+
+    Arguments:
+    ----
+    equity_curve {pd.Series} -- The account value at each bar time.
+
+    trades {pd.DataFrame} -- The round trip trades.
+
+    initial_cash {float} -- The starting account value.
+
+    total_commission {float} -- The commissions paid.
+
+    Keyword Arguments:
+    ----
+    periods_per_year {int} -- The number of bars in a year, used to annualize
+        the Sharpe ratio. (default: {MINUTES_PER_YEAR})
+
+    Returns:
+    ----
+    {dict} -- The statistics.
+    """
+
+    equity = equity_curve.to_numpy(dtype=float)
+    returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.array([])
+    drawdowns = equity / np.maximum.accumulate(equity) - 1.0 if len(equity) else np.array([0.0])
+
+    if len(returns) > 1 and returns.std(ddof=1) > 0:
+        sharpe = returns.mean() / returns.std(ddof=1) * np.sqrt(periods_per_year)
+    else:
+        sharpe = np.nan
+
+    pnl = trades['pnl'].to_numpy(dtype=float)
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
+
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = np.inf if gross_profit > 0 else np.nan
+
+    final_equity = float(equity[-1]) if len(equity) else initial_cash
+
+    return {
+        'initial_cash': initial_cash,
+        'final_equity': final_equity,
+        'total_return': final_equity / initial_cash - 1.0,
+        'max_drawdown': float(drawdowns.min()),
+        'sharpe': float(sharpe),
+        'trades': len(trades),
+        'win_rate': float((pnl > 0).mean()) if len(pnl) else np.nan,
+        'profit_factor': float(profit_factor),
+        'commission': total_commission
+    }
+
+
+class TradeLedger():
+
+    """
+    Represents the round trip trades of a backtest, paired up from the
+    fills of each symbol as they happen.
+    """
+
+    def __init__(self) -> None:
+        """Initalizes the Trade Ledger.
+
+        Overview:
+        ----
+        A fill on a flat symbol opens a trade. Fills on the same side add to it,
+        at the average price, and fills on the other side close it, in part or
+        in full. A fill larger than the position closes the trade and opens one
+        on the other side with the rest. The entry commission is charged to the
+        first exit.
+
+        Usage:
+        ----
+            >>> trade_ledger = TradeLedger()
+            >>> trade_ledger.add_fill(symbol='MSFT', quantity=10, price=101.0, time=entry_time, commission=1.0)
+            >>> trade_ledger.add_fill(symbol='MSFT', quantity=-10, price=112.0, time=exit_time, commission=1.0)
+            >>> trade_ledger.to_frame()
+        """
+
+        self.trades: List[dict] = []
+        self._open_trades: Dict[str, dict] = {}
+
+    def add_fill(self, symbol: str, quantity: float, price: float, time: object, commission: float = 0.0) -> None:
+        """Adds a fill to the symbol's open trade.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        quantity {float} -- The shares filled, negative for a sale.
+
+        price {float} -- The fill price.
+
+        time {object} -- When the fill happened.
+
+        Keyword Arguments:
+        ----
+        commission {float} -- The commission of the fill. (default: {0.0})
+        """
+
+        open_trade = self._open_trades.get(symbol)
+        direction = 1 if quantity > 0 else -1
+
+        if open_trade is None:
+            self._open_trades[symbol] = {
+                'symbol': symbol,
+                'side': 'long' if direction > 0 else 'short',
+                'quantity': abs(quantity),
+                'entry_time': time,
+                'entry_price': price,
+                'commission': commission
+            }
+            return
+
+        # A fill on the same side adds to the trade.
+        if (direction > 0) == (open_trade['side'] == 'long'):
+
+            total = open_trade['quantity'] + abs(quantity)
+            open_trade['entry_price'] = (
+                open_trade['entry_price'] * open_trade['quantity'] + price * abs(quantity)
+            ) / total
+            open_trade['quantity'] = total
+            open_trade['commission'] += commission
+            return
+
+        closed = min(abs(quantity), open_trade['quantity'])
+
+        self.trades.append(self._close_trade(
+            open_trade=open_trade,
+            quantity=closed,
+            exit_time=time,
+            exit_price=price,
+            commission=commission,
+            is_open=False
+        ))
+
+        open_trade['quantity'] -= closed
+        open_trade['commission'] = 0.0
+
+        if open_trade['quantity'] == 0:
+            del self._open_trades[symbol]
+
+        # Whatever is left over opens a trade on the other side.
+        if abs(quantity) > closed:
+            self.add_fill(symbol=symbol, quantity=direction * (abs(quantity) - closed), price=price, time=time)
+
+    def mark_open(self, symbol: str, time: object, price: float) -> None:
+        """Closes the symbol's open trade at a price, flagging it as still open.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        time {object} -- The time of the price, normally the last bar.
+
+        price {float} -- The price, normally the last close.
+        """
+
+        open_trade = self._open_trades.pop(symbol, None)
+
+        if open_trade is not None:
+            self.trades.append(self._close_trade(
+                open_trade=open_trade,
+                quantity=open_trade['quantity'],
+                exit_time=time,
+                exit_price=price,
+                commission=0.0,
+                is_open=True
+            ))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the trades.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- One row per round trip trade.
+        """
+
+        return pd.DataFrame(self.trades, columns=TRADE_COLUMNS)
+
+    @staticmethod
+    def _close_trade(open_trade: dict, quantity: float, exit_time: object, exit_price: float,
+                     commission: float, is_open: bool) -> dict:
+        """Builds a round trip trade from its entry and exit.
+
+        Arguments:
+        ----
+        open_trade {dict} -- The entry of the trade.
+
+        quantity {float} -- The shares closed.
+
+        exit_time {object} -- When the exit filled.
+
+        exit_price {float} -- The price of the exit fill.
+
+        commission {float} -- The commission of the exit fill.
+
+        is_open {bool} -- `True` if the trade was marked to a price instead.
+
+        Returns:
+        ----
+        {dict} -- The trade.
+        """
+
+        direction = 1 if open_trade['side'] == 'long' else -1
+        commission = open_trade['commission'] + commission
+        pnl = direction * (exit_price - open_trade['entry_price']) * quantity - commission
+
+        return {
+            'symbol': open_trade['symbol'],
+            'side': open_trade['side'],
+            'quantity': quantity,
+            'entry_time': open_trade['entry_time'],
+            'entry_price': open_trade['entry_price'],
+            'exit_time': exit_time,
+            'exit_price': exit_price,
+            'commission': commission,
+            'pnl': pnl,
+            'return': pnl / (open_trade['entry_price'] * quantity),
+            'is_open': is_open
+        }
+
+
+class Backtester():
+
+    """
+    Represents a vectorized backtest of the signals of an `Indicators`
+    object over every bar of a StockFrame.
+    """
+
+    def __init__(self, stock_frame: StockFrame, indicator_client: Indicators, trades_to_execute: dict,
+                 initial_cash: float = 100000.0, slippage: float = 0.0, commission: float = 0.0,
+                 commission_per_share: float = 0.0, periods_per_year: int = MINUTES_PER_YEAR) -> None:
+        """Initalizes the Backtester.
+
+        Overview:
+        ----
+        The signals are evaluated over every bar at once, with the same compiled
+        signal plan `check_signals` uses. A run of signals on the same side only
+        places one order, which stays working until the next signal on the other
+        side. Orders never fill on the bar that signaled: a market order fills at
+        the next bar's open, a limit order on the first bar that trades through its
+        price and a stop order on the first bar that touches its price, at the open
+        if the bar gapped past it.
+
+        A `BUY` or `SELL_SHORT` order opens a position when the symbol is flat, and a
+        `SELL` or `BUY_TO_COVER` order closes it. Slippage is a fraction of the price,
+        charged against market and stop fills. Only the order search runs in Python,
+        once per change of side, everything else works on whole arrays.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The bars to test over.
+
+        indicator_client {Indicators} -- The indicators and signals to test.
+
+        trades_to_execute {dict} -- The trade templates, in the format
+            `PyRobot.execute_signals` expects. A limit or stop template without a
+            price uses the close of the bar that signaled, and one without a
+            quantity trades 1 share.
+
+        Keyword Arguments:
+        ----
+        initial_cash {float} -- The starting account value. (default: {100000.0})
+
+        slippage {float} -- The fraction of the price lost on market and stop
+            fills. (default: {0.0})
+
+        commission {float} -- The commission charged on each fill. (default: {0.0})
+
+        commission_per_share {float} -- The commission charged on each share
+            filled. (default: {0.0})
+
+        periods_per_year {int} -- The number of bars in a year, used to annualize
+            the Sharpe ratio. (default: {MINUTES_PER_YEAR})
+
+        Usage:
+        ----
+            >>> indicator_client = Indicators(price_data_frame=stock_frame)
+            >>> indicator_client.rsi(period=14)
+            >>> indicator_client.set_indicator_signal(
+                    indicator='rsi',
+                    buy=30.0,
+                    sell=70.0,
+                    condition_buy=operator.le,
+                    condition_sell=operator.ge
+                )
+            >>> backtester = Backtester(
+                    stock_frame=stock_frame,
+                    indicator_client=indicator_client,
+                    trades_to_execute=trades_dict,
+                    slippage=0.0005,
+                    commission=1.0
+                )
+            >>> backtest_result = backtester.run()
+            >>> backtest_result.stats['sharpe']
+        """
+
+        self.stock_frame = stock_frame
+        self.indicator_client = indicator_client
+        self.trades_to_execute = trades_to_execute
+        self.initial_cash = initial_cash
+        self.slippage = slippage
+        self.commission = commission
+        self.commission_per_share = commission_per_share
+        self.periods_per_year = periods_per_year
+
+        self._templates = {
+            symbol: {
+                side: self._order_template(trade_obj=trade_info['trade_func'])
+                for side, trade_info in symbol_trades.items()
+            }
+            for symbol, symbol_trades in trades_to_execute.items()
+        }
+
+    @staticmethod
+    def _order_template(trade_obj: Trade) -> dict:
+        """Grabs what the backtest needs from a Trade object.
+
+        Arguments:
+        ----
+        trade_obj {Trade} -- The trade template.
+
+        Returns:
+        ----
+        {dict} -- The order type, instruction, quantity and price.
+        """
+
+        if trade_obj.order_type not in FILLABLE_ORDER_TYPES:
+            raise ValueError(
+                "The backtester can only fill these order types: {types}".format(types=FILLABLE_ORDER_TYPES)
+            )
+
+        leg = trade_obj.order['orderLegCollection'][0]
+
+        return {
+            'order_type': trade_obj.order_type,
+            'instruction': leg['instruction'],
+            'quantity': leg['quantity'] or 1,
+            'price': trade_obj.price
+        }
+
+    def _signal_changes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the rows where the signal of a symbol changes side.
+
+        Returns:
+        ----
+        {Tuple[np.ndarray, np.ndarray]} -- The row positions, in frame order, and their
+            side, `0` for buy and `1` for sell.
+        """
+
+        # Only the indicators the signals read need to be current.
+        if self.indicator_client.lazy:
+            self.indicator_client.ensure_current(column_names=self.indicator_client._signal_columns())
+
+        signals = self.stock_frame._signal_masks(signal_plan=self.indicator_client.signal_plan)
+
+        buy_positions = np.flatnonzero(signals['buys'])
+        sell_positions = np.flatnonzero(signals['sells'])
+
+        positions = np.concatenate([buy_positions, sell_positions])
+        sides = np.concatenate([
+            np.zeros(len(buy_positions), dtype=np.int8),
+            np.ones(len(sell_positions), dtype=np.int8)
+        ])
+
+        order = np.argsort(positions, kind='stable')
+        positions = positions[order]
+        sides = sides[order]
+
+        # Number the symbols, so a run of signals doesn't carry over to the next one.
+        starts = np.array([start for _, start, _ in self.stock_frame.symbol_bounds], dtype=int)
+        symbol_ids = np.searchsorted(starts, positions, side='right')
+
+        changes = np.ones(len(positions), dtype=bool)
+        changes[1:] = (sides[1:] != sides[:-1]) | (symbol_ids[1:] != symbol_ids[:-1])
+
+        return positions[changes], sides[changes]
+
+    def _fill(self, template: dict, reference_price: float, window: slice, bars: Dict[str, np.ndarray]) -> Tuple[int, float]:
+        """Finds when and at what price an order fills.
+
+        Arguments:
+        ----
+        template {dict} -- The order template.
+
+        reference_price {float} -- The close of the bar that signaled.
+
+        window {slice} -- The rows the order is working over.
+
+        bars {Dict[str, np.ndarray]} -- The open, high and low of the symbol.
+
+        Returns:
+        ----
+        {Tuple[int, float]} -- The row the order filled on and the fill price, or
+            `(-1, nan)` if it never filled.
+        """
+
+        if window.start >= window.stop:
+            return -1, np.nan
+
+        direction = INSTRUCTION_DIRECTION[template['instruction']]
+        opens = bars['open'][window]
+
+        if template['order_type'] == 'mkt':
+            return window.start, opens[0] * (1 + direction * self.slippage)
+
+        price = template['price'] or reference_price
+
+        if template['order_type'] == 'lmt':
+
+            if direction > 0:
+                touched = np.flatnonzero(bars['low'][window] <= price)
+            else:
+                touched = np.flatnonzero(bars['high'][window] >= price)
+
+            if not len(touched):
+                return -1, np.nan
+
+            # A bar that opens through the limit fills at the better open.
+            open_price = opens[touched[0]]
+            fill_price = min(open_price, price) if direction > 0 else max(open_price, price)
+
+            return window.start + touched[0], fill_price
+
+        if direction > 0:
+            touched = np.flatnonzero(bars['high'][window] >= price)
+        else:
+            touched = np.flatnonzero(bars['low'][window] <= price)
+
+        if not len(touched):
+            return -1, np.nan
+
+        # A bar that gaps through the stop fills at the worse open.
+        open_price = opens[touched[0]]
+        fill_price = max(open_price, price) if direction > 0 else min(open_price, price)
+
+        return window.start + touched[0], fill_price * (1 + direction * self.slippage)
+
+    def run(self) -> BacktestResult:
+        """Runs the backtest.
+
+        Returns:
+        ----
+        {BacktestResult} -- The equity curve, the trade list and the statistics.
+        """
+
+        frame = self.stock_frame.frame
+        positions, sides = self._signal_changes()
+
+        bar_times = frame.index.get_level_values(1)
+        opens = frame['open'].to_numpy(dtype=float)
+        highs = frame['high'].to_numpy(dtype=float)
+        lows = frame['low'].to_numpy(dtype=float)
+        closes = frame['close'].to_numpy(dtype=float)
+
+        trade_ledger = TradeLedger()
+        equity_times = []
+        equity_changes = []
+        total_commission = 0.0
+
+        for symbol, start, stop in self.stock_frame.symbol_bounds:
+
+            if symbol not in self._templates:
+                continue
+
+            templates = self._templates[symbol]
+            bars = {'open': opens[start:stop], 'high': highs[start:stop], 'low': lows[start:stop]}
+            symbol_closes = closes[start:stop]
+
+            # The signal changes of this symbol, as positions within it.
+            first, last = np.searchsorted(positions, [start, stop])
+            symbol_positions = (positions[first:last] - start).tolist()
+            symbol_sides = sides[first:last].tolist()
+
+            fill_rows = []
+            fill_quantities = []
+            fill_prices = []
+            fill_commissions = []
+
+            position = 0
+
+            for index, (row, side) in enumerate(zip(symbol_positions, symbol_sides)):
+
+                template = templates.get('buy' if side == 0 else 'sell')
+
+                if template is None:
+                    continue
+
+                instruction = template['instruction']
+
+                if instruction in ('BUY', 'SELL_SHORT') and position != 0:
+                    continue
+                if instruction == 'SELL' and position <= 0:
+                    continue
+                if instruction == 'BUY_TO_COVER' and position >= 0:
+                    continue
+
+                # The order works from the next bar until the next signal's order replaces it.
+                window_stop = symbol_positions[index + 1] + 1 if index + 1 < len(symbol_positions) else stop - start
+                fill_row, fill_price = self._fill(
+                    template=template,
+                    reference_price=symbol_closes[row],
+                    window=slice(row + 1, window_stop),
+                    bars=bars
+                )
+
+                if fill_row < 0:
+                    continue
+
+                direction = INSTRUCTION_DIRECTION[instruction]
+
+                if instruction in ('BUY', 'SELL_SHORT'):
+                    quantity = template['quantity']
+                else:
+                    quantity = min(template['quantity'], abs(position))
+
+                fill_commission = self.commission + self.commission_per_share * quantity
+                total_commission += fill_commission
+
+                fill_rows.append(fill_row)
+                fill_quantities.append(direction * quantity)
+                fill_prices.append(fill_price)
+                fill_commissions.append(fill_commission)
+
+                position += direction * quantity
+
+                # The ledger keeps row positions, they're turned into times at the end.
+                trade_ledger.add_fill(
+                    symbol=symbol,
+                    quantity=direction * quantity,
+                    price=fill_price,
+                    time=start + fill_row,
+                    commission=fill_commission
+                )
+
+            # Mark anything still open to the last close.
+            trade_ledger.mark_open(symbol=symbol, time=stop - 1, price=symbol_closes[-1])
+
+            if not fill_rows:
+                continue
+
+            # The symbol's cash and shares after every bar, and so its value.
+            fill_rows = np.array(fill_rows)
+            fill_quantities = np.array(fill_quantities, dtype=float)
+
+            share_changes = np.zeros(stop - start)
+            cash_changes = np.zeros(stop - start)
+            np.add.at(share_changes, fill_rows, fill_quantities)
+            np.add.at(cash_changes, fill_rows, -fill_quantities * np.array(fill_prices) - np.array(fill_commissions))
+
+            values = np.cumsum(cash_changes) + np.cumsum(share_changes) * symbol_closes
+
+            equity_times.append(bar_times[start:stop])
+            equity_changes.append(np.diff(values, prepend=0.0))
+
+        equity_curve = self._equity_curve(bar_times=bar_times, equity_times=equity_times, equity_changes=equity_changes)
+        trades_frame = trade_ledger.to_frame()
+
+        # Looking up the times one trade at a time is slow, so it's done at once.
+        for column in ['entry_time', 'exit_time']:
+            trades_frame[column] = bar_times[trades_frame[column].to_numpy(dtype=int)]
+
+        return BacktestResult(
+            equity_curve=equity_curve,
+            trades=trades_frame,
+            stats=performance_stats(
+                equity_curve=equity_curve,
+                trades=trades_frame,
+                initial_cash=self.initial_cash,
+                total_commission=total_commission,
+                periods_per_year=self.periods_per_year
+            )
+        )
+
+    def _equity_curve(self, bar_times: pd.Index, equity_times: List[pd.Index], equity_changes: List[np.ndarray]) -> pd.Series:
+        """Adds up the value of every symbol at each bar time.
+
+        Overview:
+        ----
+        Each symbol contributes the change in its value at its own bar times, so
+        a symbol without a bar at some time keeps its last value, without
+        building a frame with a column per symbol.
+
+        Arguments:
+        ----
+        bar_times {pd.Index} -- The bar times of the whole frame.
+
+        equity_times {List[pd.Index]} -- The bar times of each traded symbol.
+
+        equity_changes {List[np.ndarray]} -- The change in value of each traded symbol.
+
+        Returns:
+        ----
+        {pd.Series} -- The account value, indexed by time.
+        """
+
+        all_times = bar_times.unique().sort_values()
+
+        if not equity_changes:
+            return pd.Series(self.initial_cash, index=all_times, name='equity')
+
+        changes = pd.Series(
+            np.concatenate(equity_changes),
+            index=equity_times[0].append(equity_times[1:]) if len(equity_times) > 1 else equity_times[0]
+        )
+        changes = changes.groupby(level=0).sum().reindex(all_times, fill_value=0.0)
+
+        equity_curve = changes.cumsum() + self.initial_cash
+        equity_curve.name = 'equity'
+
+        return equity_curve
+
+
+class EventBacktester(ReplayEngine):
+
+    """
+    Represents a backtest that plays bars through the robot's live
+    pipeline, one at a time, against a simulated broker.
+    """
+
+    def __init__(self, trading_robot: PyRobot, source: ReplayDataSource, warmup_bars: int = 50, bar_size: int = 1,
+                 bar_type: str = 'minute', initial_cash: float = 100000.0, slippage: float = 0.0,
+                 commission: float = 0.0, commission_per_share: float = 0.0,
+                 periods_per_year: int = MINUTES_PER_YEAR) -> None:
+        """Initalizes the Event Backtester.
+
+        Overview:
+        ----
+        Unlike the `Backtester`, nothing here is specific to backtesting: every bar goes
+        through `get_latest_bar`, `add_rows`, `Indicators.refresh`, `check_signals` and
+        `execute_signals`, exactly like it does live, and the orders are sent with
+        `execute_orders`. Only the session is different, a `SimulatedBroker` fills the
+        `Trade.order` payloads, including their stop loss, take profit and OCO children.
+
+        Before each bar reaches the robot, the broker fills the orders placed on the bars
+        before it, so an order never fills on the bar that signaled it. The robot's orders
+        aren't written to `data/orders.json`. Build the indicators with `incremental=True`,
+        so each bar only calculates the new rows and the backtest stays linear in the
+        number of bars.
+
+        Arguments:
+        ----
+        trading_robot {PyRobot} -- The robot to test.
+
+        source {ReplayDataSource} -- The bars to test over.
+
+        Keyword Arguments:
+        ----
+        warmup_bars {int} -- The number of timestamps used to build the StockFrame. (default: {50})
+
+        bar_size {int} -- The size of each stored bar. (default: {1})
+
+        bar_type {str} -- The type of each stored bar. (default: {'minute'})
+
+        initial_cash {float} -- The starting account value. (default: {100000.0})
+
+        slippage {float} -- The fraction of the price lost on market and stop
+            fills. (default: {0.0})
+
+        commission {float} -- The commission charged on each fill. (default: {0.0})
+
+        commission_per_share {float} -- The commission charged on each share
+            filled. (default: {0.0})
+
+        periods_per_year {int} -- The number of bars in a year, used to annualize
+            the Sharpe ratio. (default: {MINUTES_PER_YEAR})
+
+        Usage:
+        ----
+            >>> event_backtester = EventBacktester(
+                    trading_robot=trading_robot,
+                    source=ReplayDataSource.from_file(path='data/minute_bars.parquet'),
+                    commission=1.0
+                )
+            >>> indicator_client = Indicators(price_data_frame=trading_robot.stock_frame, incremental=True)
+            >>> indicator_client.sma(period=20)
+            >>> trading_robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+            >>> backtest_result = event_backtester.run()
+        """
+
+        self.broker = SimulatedBroker(
+            source=source,
+            initial_cash=initial_cash,
+            slippage=slippage,
+            commission=commission,
+            commission_per_share=commission_per_share
+        )
+
+        super().__init__(
+            trading_robot=trading_robot,
+            source=source,
+            warmup_bars=warmup_bars,
+            bar_size=bar_size,
+            bar_type=bar_type,
+            session=self.broker
+        )
+
+        # Send the orders to the broker, instead of making up an order ID.
+        trading_robot.paper_trading = False
+        trading_robot.record_orders = False
+
+        self.initial_cash = initial_cash
+        self.periods_per_year = periods_per_year
+
+        self._equity_times: List[int] = []
+        self._equity_values: List[float] = []
+
+    def step(self) -> Event:
+        """Fills the working orders against the next timestamp, then processes its bars.
+
+        Returns:
+        ----
+        {Event} -- The published `bar` event.
+        """
+
+        timestamp = int(self.source.timestamps[self._position])
+
+        self.broker.fill_bars(bars=self.source.bars_at(timestamp=timestamp))
+
+        bar_event = super().step()
+
+        self._equity_times.append(timestamp)
+        self._equity_values.append(self.broker.equity())
+
+        return bar_event
+
+    def run(self, max_bars: int = None) -> BacktestResult:
+        """Runs the backtest over the remaining bars.
+
+        Keyword Arguments:
+        ----
+        max_bars {int} -- The most timestamps to play back. (default: {all of them})
+
+        Returns:
+        ----
+        {BacktestResult} -- The equity curve, the trade list and the statistics, which
+            include the replay's bars, seconds and bars per second.
+        """
+
+        replay_stats = super().run(max_bars=max_bars)
+
+        equity_curve = pd.Series(
+            self._equity_values,
+            index=pd.to_datetime(self._equity_times, unit='ms'),
+            name='equity',
+            dtype=float
+        )
+
+        trade_ledger = TradeLedger()
+        total_commission = 0.0
+
+        for fill in self.broker.fills:
+
+            total_commission += fill['commission']
+            trade_ledger.add_fill(
+                symbol=fill['symbol'],
+                quantity=fill['quantity'],
+                price=fill['price'],
+                time=fill['time'],
+                commission=fill['commission']
+            )
+
+        # Mark anything still open to the last close.
+        for symbol, last_price in self.broker.last_prices.items():
+            trade_ledger.mark_open(symbol=symbol, time=self.session.clock, price=last_price)
+
+        trades_frame = trade_ledger.to_frame()
+
+        for column in ['entry_time', 'exit_time']:
+            trades_frame[column] = pd.to_datetime(trades_frame[column].to_numpy(dtype='int64'), unit='ms')
+
+        stats = performance_stats(
+            equity_curve=equity_curve,
+            trades=trades_frame,
+            initial_cash=self.initial_cash,
+            total_commission=total_commission,
+            periods_per_year=self.periods_per_year
+        )
+        stats.update(replay_stats)
+
+        return BacktestResult(equity_curve=equity_curve, trades=trades_frame, stats=stats)
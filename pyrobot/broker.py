@@ -0,0 +1,564 @@
+import copy
+import pandas as pd
+
+from typing import Dict
+from typing import List
+from typing import Union
+
+from pyrobot.replay import ReplaySession
+from pyrobot.replay import ReplayDataSource
+from pyrobot.session_clock import MARKET_TIMEZONE
+
+
+# Which way each instruction moves the position.
+INSTRUCTION_DIRECTION = {
+    'BUY': 1,
+    'BUY_TO_COVER': 1,
+    'SELL': -1,
+    'SELL_SHORT': -1
+}
+
+# When a bar touches several orders of an OCO group, the stop is assumed to fill first.
+STOP_ORDER_TYPES = ['STOP', 'STOP_LIMIT', 'TRAILING_STOP']
+
+
+class SimulatedBroker(ReplaySession):
+
+    """
+    Represents a TD session that fills the orders it's sent against the
+    bars of a replay data source, instead of sending them to TD.
+    """
+
+    def __init__(self, source: ReplayDataSource, initial_cash: float = 100000.0, slippage: float = 0.0,
+                 commission: float = 0.0, commission_per_share: float = 0.0, account_number: str = 'SIMULATED') -> None:
+        """Initalizes the Simulated Broker.
+
+        Overview:
+        ----
+        `place_order` takes the same `Trade.order` payloads TD does. A `SINGLE` order
+        starts working right away. A `TRIGGER` order's `childOrderStrategies` are placed
+        once it fills, and the children of an `OCO` strategy cancel each other as soon
+        as one of them fills. Orders only fill against bars after the one they were
+        placed on:
+
+        - `MARKET` fills at the open.
+        - `LIMIT` fills once the bar trades through its `price`, at the open if it
+           opened past it.
+        - `STOP` fills once the bar touches its `stopPrice`, at the open if it gapped
+           past it.
+        - `STOP_LIMIT` becomes a limit at its `price` once the stop is touched.
+        - `TRAILING_STOP` moves its stop `stopPriceOffset` away from the best price
+           since it was placed, in dollars or, with a `PERCENT` link type, percent.
+
+        Slippage is a fraction of the price, charged against market and stop fills.
+        `DAY` orders expire when the New York trading day changes. A `SELL` or
+        `BUY_TO_COVER` for more shares than the position is rejected.
+
+        Arguments:
+        ----
+        source {ReplayDataSource} -- The bars to play back.
+
+        Keyword Arguments:
+        ----
+        initial_cash {float} -- The starting cash. (default: {100000.0})
+
+        slippage {float} -- The fraction of the price lost on market and stop
+            fills. (default: {0.0})
+
+        commission {float} -- The commission charged on each fill. (default: {0.0})
+
+        commission_per_share {float} -- The commission charged on each share
+            filled. (default: {0.0})
+
+        account_number {str} -- The account number `get_accounts` reports. (default: {'SIMULATED'})
+
+        Usage:
+        ----
+            >>> simulated_broker = SimulatedBroker(source=replay_source, commission=1.0)
+            >>> trading_robot.session = simulated_broker
+            >>> simulated_broker.fill_bars(bars=replay_source.bars_at(timestamp=timestamp))
+            >>> simulated_broker.equity()
+        """
+
+        super().__init__(source=source)
+
+        self.initial_cash = initial_cash
+        self.cash = initial_cash
+        self.slippage = slippage
+        self.commission = commission
+        self.commission_per_share = commission_per_share
+
+        self.account_number = account_number
+        self.positions: Dict[str, float] = {}
+        self.average_prices: Dict[str, float] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.fills: List[dict] = []
+
+        self._order_book: Dict[str, dict] = {}
+        self._working: Dict[str, List[dict]] = {}
+        self._next_order_id = 1
+        self._session_days: Dict[int, object] = {}
+
+    def place_order(self, account: str, order: dict) -> dict:
+
+        order_id = self._submit(order=copy.deepcopy(order), placed_time=self.clock)
+        self.orders.append({'orderId': order_id, 'order': order, 'time': self.clock})
+
+        return {'order_id': order_id, 'headers': {}, 'request_body': order}
+
+    def get_orders(self, account: str, order_id: str = None, **kwargs) -> Union[dict, List[dict]]:
+
+        if order_id is not None:
+            return self._order_status(record=self._order_book[order_id])
+
+        return [self._order_status(record=record) for record in self._order_book.values()]
+
+    def cancel_order(self, account: str, order_id: str) -> dict:
+
+        record = self._order_book[order_id]
+        self._cancel(record=record, status='CANCELED')
+
+        return {'order_id': order_id, 'status': record['status']}
+
+    def get_accounts(self, account: str = 'all', fields: List[str] = None) -> Union[dict, List[dict]]:
+
+        account_info = {
+            'accountId': self.account_number if account == 'all' else account,
+            'type': 'MARGIN',
+            'currentBalances': self._balances()
+        }
+
+        if fields and 'positions' in fields:
+            account_info['positions'] = self._positions()
+
+        if fields and 'orders' in fields:
+            account_info['orderStrategies'] = self.get_orders(account=account)
+
+        if account == 'all':
+            return [{'securitiesAccount': account_info}]
+
+        return {'securitiesAccount': account_info}
+
+    def _submit(self, order: dict, placed_time: int, oco_group: dict = None) -> str:
+        """Adds an order strategy to the order book.
+
+        Arguments:
+        ----
+        order {dict} -- The order payload.
+
+        placed_time {int} -- When the order was placed, in milliseconds since epoch.
+
+        Keyword Arguments:
+        ----
+        oco_group {dict} -- The OCO strategy the order belongs to. (default: {None})
+
+        Returns:
+        ----
+        {str} -- The order ID.
+        """
+
+        order_id = str(self._next_order_id)
+        self._next_order_id += 1
+
+        strategy_type = order.get('orderStrategyType', 'SINGLE')
+
+        record = {
+            'orderId': order_id,
+            'order': order,
+            'status': 'WORKING',
+            'placed_time': placed_time,
+            'oco_group': oco_group,
+            'executions': []
+        }
+        self._order_book[order_id] = record
+
+        # An OCO strategy is only a group, its children are the orders.
+        if strategy_type == 'OCO':
+
+            record['members'] = []
+
+            for child_order in order.get('childOrderStrategies', []):
+                child_id = self._submit(order=child_order, placed_time=placed_time, oco_group=record)
+                record['members'].append(self._order_book[child_id])
+
+            return order_id
+
+        leg = order['orderLegCollection'][0]
+
+        record['symbol'] = leg['instrument']['symbol']
+        record['instruction'] = leg['instruction']
+        record['quantity'] = leg['quantity']
+        record['children'] = order.get('childOrderStrategies', []) if strategy_type == 'TRIGGER' else []
+        record['triggered'] = False
+        record['best_price'] = None
+
+        self._working.setdefault(record['symbol'], []).append(record)
+
+        return order_id
+
+    def _session_day(self, timestamp: int) -> object:
+        """Returns the New York trading day of a time.
+
+        Arguments:
+        ----
+        timestamp {int} -- The time, in milliseconds since epoch.
+
+        Returns:
+        ----
+        {date} -- The day.
+        """
+
+        if timestamp not in self._session_days:
+            self._session_days[timestamp] = pd.Timestamp(timestamp, unit='ms', tz='UTC').tz_convert(MARKET_TIMEZONE).date()
+
+        return self._session_days[timestamp]
+
+    def fill_bars(self, bars: List[dict]) -> List[dict]:
+        """Fills the working orders against the bars of one timestamp.
+
+        Arguments:
+        ----
+        bars {List[dict]} -- The bars, with their `symbol`, `datetime`, `open`, `high`,
+            `low` and `close`.
+
+        Returns:
+        ----
+        {List[dict]} -- The fills.
+        """
+
+        fills = []
+
+        for bar in bars:
+
+            symbol = bar['symbol']
+            working = self._working.get(symbol)
+
+            if working:
+
+                # Only the orders placed before the bar can fill on it.
+                candidates = [record for record in working if record['placed_time'] < bar['datetime']]
+                candidates.sort(key=lambda record: record['order']['orderType'] not in STOP_ORDER_TYPES)
+
+                for record in candidates:
+
+                    if record['status'] != 'WORKING':
+                        continue
+
+                    if record['order'].get('duration') == 'DAY' and (
+                        self._session_day(timestamp=record['placed_time']) != self._session_day(timestamp=bar['datetime'])
+                    ):
+                        self._cancel(record=record, status='EXPIRED')
+                        continue
+
+                    fill_price = self._fill_price(record=record, bar=bar)
+
+                    if fill_price is not None:
+                        fill = self._execute(record=record, price=fill_price, bar=bar)
+
+                        if fill is not None:
+                            fills.append(fill)
+
+                self._working[symbol] = [record for record in self._working[symbol] if record['status'] == 'WORKING']
+
+            self.last_prices[symbol] = bar['close']
+
+        return fills
+
+    def _fill_price(self, record: dict, bar: dict) -> Union[float, None]:
+        """Finds the price an order fills at on a bar.
+
+        Arguments:
+        ----
+        record {dict} -- The working order.
+
+        bar {dict} -- The bar.
+
+        Returns:
+        ----
+        {Union[float, None]} -- The fill price, or `None` if the order doesn't fill.
+        """
+
+        order = record['order']
+        order_type = order['orderType']
+        direction = INSTRUCTION_DIRECTION[record['instruction']]
+        open_price = bar['open']
+
+        if order_type == 'MARKET':
+            return open_price * (1 + direction * self.slippage)
+
+        if order_type == 'LIMIT':
+            return self._limit_price(price=order['price'], direction=direction, bar=bar)
+
+        if order_type == 'TRAILING_STOP':
+            stop_price = self._trailing_stop_price(record=record, bar=bar)
+        else:
+            stop_price = order['stopPrice']
+
+        if not record['triggered']:
+
+            touched = bar['high'] >= stop_price if direction > 0 else bar['low'] <= stop_price
+
+            if not touched:
+                return None
+
+            record['triggered'] = True
+
+            if order_type != 'STOP_LIMIT':
+
+                # A bar that gaps through the stop fills at the worse open.
+                fill_price = max(open_price, stop_price) if direction > 0 else min(open_price, stop_price)
+
+                return fill_price * (1 + direction * self.slippage)
+
+        return self._limit_price(price=order['price'], direction=direction, bar=bar)
+
+    @staticmethod
+    def _limit_price(price: float, direction: int, bar: dict) -> Union[float, None]:
+        """Finds the price a limit order fills at on a bar.
+
+        Arguments:
+        ----
+        price {float} -- The limit price.
+
+        direction {int} -- `1` for a buy and `-1` for a sell.
+
+        bar {dict} -- The bar.
+
+        Returns:
+        ----
+        {Union[float, None]} -- The fill price, or `None` if the bar didn't reach the limit.
+        """
+
+        if direction > 0 and bar['low'] <= price:
+            return min(bar['open'], price)
+
+        if direction < 0 and bar['high'] >= price:
+            return max(bar['open'], price)
+
+        return None
+
+    @staticmethod
+    def _trailing_stop_price(record: dict, bar: dict) -> float:
+        """Moves a trailing stop with the best price since it was placed.
+
+        Arguments:
+        ----
+        record {dict} -- The working order.
+
+        bar {dict} -- The bar.
+
+        Returns:
+        ----
+        {float} -- The stop price for the bar.
+        """
+
+        order = record['order']
+        direction = INSTRUCTION_DIRECTION[record['instruction']]
+        offset = order.get('stopPriceOffset', 0.0)
+
+        # A sell trails below the highest price, a buy above the lowest one. The
+        # stop is set from the bars before this one, so it can't see its own range.
+        best_price = record['best_price'] if record['best_price'] is not None else bar['open']
+
+        if order.get('stopPriceLinkType') == 'PERCENT':
+            stop_price = best_price * (1 + direction * offset / 100)
+        else:
+            stop_price = best_price + direction * offset
+
+        if direction < 0:
+            record['best_price'] = max(best_price, bar['high'])
+        else:
+            record['best_price'] = min(best_price, bar['low'])
+
+        return stop_price
+
+    def _execute(self, record: dict, price: float, bar: dict) -> Union[dict, None]:
+        """Fills an order, updating the cash and positions.
+
+        Arguments:
+        ----
+        record {dict} -- The working order.
+
+        price {float} -- The fill price.
+
+        bar {dict} -- The bar it filled on.
+
+        Returns:
+        ----
+        {Union[dict, None]} -- The fill, or `None` if the order was rejected.
+        """
+
+        symbol = record['symbol']
+        instruction = record['instruction']
+        quantity = record['quantity']
+        position = self.positions.get(symbol, 0)
+
+        # Only shares that are held can be sold, and only a short can be covered.
+        if (instruction == 'SELL' and position < quantity) or (instruction == 'BUY_TO_COVER' and -position < quantity):
+            self._cancel(record=record, status='REJECTED')
+            return None
+
+        direction = INSTRUCTION_DIRECTION[instruction]
+        commission = self.commission + self.commission_per_share * quantity
+
+        self.positions[symbol] = position + direction * quantity
+        self.cash -= direction * quantity * price + commission
+
+        # Adding to a position moves its average price, closing it out doesn't.
+        if self.positions[symbol] == 0:
+            self.average_prices.pop(symbol, None)
+        elif position == 0 or (position > 0) != (self.positions[symbol] > 0):
+            self.average_prices[symbol] = price
+        elif (position > 0) == (direction > 0):
+            self.average_prices[symbol] = (
+                self.average_prices[symbol] * abs(position) + price * quantity
+            ) / abs(self.positions[symbol])
+
+        fill = {
+            'orderId': record['orderId'],
+            'symbol': symbol,
+            'instruction': instruction,
+            'quantity': direction * quantity,
+            'price': price,
+            'commission': commission,
+            'time': bar['datetime']
+        }
+
+        self.fills.append(fill)
+        record['status'] = 'FILLED'
+        record['executions'].append({'price': price, 'quantity': quantity, 'time': bar['datetime']})
+
+        # The other orders of an OCO strategy are canceled.
+        if record['oco_group'] is not None:
+
+            record['oco_group']['status'] = 'FILLED'
+
+            for member in record['oco_group']['members']:
+                if member is not record:
+                    self._cancel(record=member, status='CANCELED')
+
+        # The children of a trigger are placed once it fills.
+        for child_order in record['children']:
+            self._submit(order=child_order, placed_time=bar['datetime'])
+
+        return fill
+
+    def _cancel(self, record: dict, status: str) -> None:
+        """Takes an order, or every order of an OCO strategy, out of the book.
+
+        Arguments:
+        ----
+        record {dict} -- The order.
+
+        status {str} -- The final status, like `CANCELED` or `EXPIRED`.
+        """
+
+        if record['status'] != 'WORKING':
+            return
+
+        record['status'] = status
+
+        for member in record.get('members', []):
+            self._cancel(record=member, status=status)
+
+    def _order_status(self, record: dict) -> dict:
+        """Describes an order the way the TD orders endpoint does.
+
+        Arguments:
+        ----
+        record {dict} -- The order.
+
+        Returns:
+        ----
+        {dict} -- The order, with its `orderId`, `status` and executions.
+        """
+
+        order_status = dict(record['order'])
+        filled_quantity = sum(execution['quantity'] for execution in record['executions'])
+
+        order_status.update({
+            'orderId': record['orderId'],
+            'status': record['status'],
+            'filledQuantity': filled_quantity,
+            'remainingQuantity': record.get('quantity', 0) - filled_quantity if record['status'] == 'WORKING' else 0,
+            'orderActivityCollection': [
+                {'activityType': 'EXECUTION', 'executionLegs': [execution]} for execution in record['executions']
+            ]
+        })
+
+        return order_status
+
+    def _balances(self) -> dict:
+        """Describes the cash and market value of the account, like the TD accounts endpoint.
+
+        Returns:
+        ----
+        {dict} -- The current balances.
+        """
+
+        long_value = sum(
+            quantity * self.last_prices.get(symbol, 0.0) for symbol, quantity in self.positions.items() if quantity > 0
+        )
+        short_value = sum(
+            quantity * self.last_prices.get(symbol, 0.0) for symbol, quantity in self.positions.items() if quantity < 0
+        )
+
+        return {
+            'cashBalance': self.cash,
+            'longMarketValue': long_value,
+            'shortMarketValue': short_value,
+            'liquidationValue': self.cash + long_value + short_value,
+            'availableFunds': self.cash,
+            'buyingPower': self.cash,
+            'cashAvailableForTrading': self.cash
+        }
+
+    def _positions(self) -> List[dict]:
+        """Describes the open positions, like the TD accounts endpoint.
+
+        Overview:
+        ----
+        The broker doesn't keep the previous day's close, so the day's profit and
+        loss is measured from the average price.
+
+        Returns:
+        ----
+        {List[dict]} -- The positions.
+        """
+
+        positions = []
+
+        for symbol, quantity in self.positions.items():
+
+            if quantity == 0:
+                continue
+
+            last_price = self.last_prices.get(symbol, 0.0)
+            average_price = self.average_prices[symbol]
+            profit_loss = (last_price - average_price) * quantity
+
+            positions.append({
+                'instrument': {'symbol': symbol, 'cusip': '', 'assetType': 'EQUITY'},
+                'averagePrice': average_price,
+                'marketValue': quantity * last_price,
+                'longQuantity': max(quantity, 0),
+                'shortQuantity': max(-quantity, 0),
+                'settledLongQuantity': max(quantity, 0),
+                'settledShortQuantity': max(-quantity, 0),
+                'currentDayProfitLoss': profit_loss,
+                'currentDayProfitLossPercentage': profit_loss / abs(average_price * quantity) * 100
+            })
+
+        return positions
+
+    def equity(self) -> float:
+        """The cash plus the positions at their last price.
+
+        Returns:
+        ----
+        {float} -- The account value.
+        """
+
+        return self.cash + sum(
+            quantity * self.last_prices.get(symbol, 0.0) for symbol, quantity in self.positions.items()
+        )
@@ -0,0 +1,218 @@
+import os
+import hashlib
+import pathlib
+import tempfile
+import threading
+import numpy as np
+
+from collections import OrderedDict
+
+from typing import Dict
+from typing import Union
+from typing import Optional
+
+
+class IndicatorCache():
+
+    """
+    Represents a memo cache for indicator results, so the same
+    indicator isn't calculated twice over the same prices.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, directory: Union[str, pathlib.Path] = None) -> None:
+        """Initalizes the Indicator Cache.
+
+        Overview:
+        ----
+        Results are stored per symbol and keyed by the kernel name, its arguments,
+        the symbol and a hash of the symbol's input prices. Any change to the
+        prices gives a new key, so a cached result is never stale. The in-memory
+        results are evicted least recently used first once they take up more than
+        `max_bytes`. If a `directory` is given, results are also written to disk so
+        they survive between runs; the disk copy is never evicted.
+
+        Keyword Arguments:
+        ----
+        max_bytes {int} -- The most memory the cached arrays can use. (default: {256 MB})
+
+        directory {Union[str, pathlib.Path]} -- A folder used to persist results to disk. (default: {None})
+
+        Usage:
+        ----
+            >>> cache = IndicatorCache(max_bytes=64 * 1024 * 1024, directory='data/indicator_cache')
+            >>> indicator_client = Indicators(price_data_frame=stock_frame, cache=cache)
+            >>> indicator_client.sma(period=200)
+        """
+
+        self.max_bytes = max_bytes
+        self.directory = pathlib.Path(directory) if directory else None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+        if self.directory and not self.directory.exists():
+            self.directory.mkdir(parents=True)
+
+    @property
+    def size_bytes(self) -> int:
+        """The number of bytes the in-memory results are using.
+
+        Returns:
+        ----
+        {int} -- The size in bytes.
+        """
+
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(self, indicator: str, params: dict, symbol: str, inputs: Dict[str, np.ndarray]) -> str:
+        """Builds the key for a single symbol's indicator result.
+
+        Arguments:
+        ----
+        indicator {str} -- The name of the indicator kernel.
+
+        params {dict} -- The arguments the kernel is called with.
+
+        symbol {str} -- The symbol the result belongs to.
+
+        inputs {Dict[str, np.ndarray]} -- The symbol's input price arrays.
+
+        Returns:
+        ----
+        {str} -- A hex digest that identifies the result.
+        """
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((indicator, sorted(params.items()), symbol)).encode())
+
+        for name in sorted(inputs):
+            values = np.ascontiguousarray(inputs[name])
+            digest.update(name.encode())
+            digest.update(str(values.dtype).encode())
+            digest.update(values.tobytes())
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Looks up a result, checking memory first and then the disk.
+
+        Arguments:
+        ----
+        key {str} -- A key built by `make_key`.
+
+        Returns:
+        ----
+        {Optional[Dict[str, np.ndarray]]} -- The cached outputs, or `None` if they
+            aren't cached.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.directory:
+
+            file_path = self.directory.joinpath(key + '.npz')
+
+            if file_path.exists():
+                with np.load(file_path) as stored:
+                    outputs = {name: stored[name] for name in stored.files}
+
+                with self._lock:
+                    self._store(key=key, outputs=outputs)
+                    self.hits += 1
+
+                return outputs
+
+        with self._lock:
+            self.misses += 1
+
+        return None
+
+    def put(self, key: str, outputs: Dict[str, np.ndarray]) -> None:
+        """Adds a result to the cache.
+
+        Arguments:
+        ----
+        key {str} -- A key built by `make_key`.
+
+        outputs {Dict[str, np.ndarray]} -- The indicator outputs for a single symbol.
+        """
+
+        with self._lock:
+            self._store(key=key, outputs=outputs)
+
+        if self.directory:
+
+            file_path = self.directory.joinpath(key + '.npz')
+
+            # Write to a temporary file first, so readers never see half a file.
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.npz')
+
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                np.savez(temp_file, **outputs)
+
+            os.replace(temp_path, file_path)
+
+    def _store(self, key: str, outputs: Dict[str, np.ndarray]) -> None:
+        """Adds a result to memory and evicts the oldest results if needed.
+
+        Arguments:
+        ----
+        key {str} -- A key built by `make_key`.
+
+        outputs {Dict[str, np.ndarray]} -- The indicator outputs for a single symbol.
+        """
+
+        size = sum(values.nbytes for values in outputs.values())
+
+        # Anything bigger than the whole cache isn't worth keeping in memory.
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._size_bytes -= sum(values.nbytes for values in self._entries.pop(key).values())
+
+        self._entries[key] = outputs
+        self._size_bytes += size
+
+        while self._size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= sum(values.nbytes for values in evicted.values())
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every result from memory. Results on disk are kept."""
+
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+
+_default_cache: IndicatorCache = None
+
+
+def default_cache() -> IndicatorCache:
+    """Returns the process wide Indicator Cache, creating it on first use.
+
+    Returns:
+    ----
+    {IndicatorCache} -- The shared cache.
+    """
+
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+
+    return _default_cache
@@ -0,0 +1,361 @@
+import time
+import bisect
+import itertools
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+
+
+# The topics published by the trading robot, in the order they happen.
+BAR_EVENT = 'bar'
+INDICATORS_EVENT = 'indicators'
+SIGNALS_EVENT = 'signals'
+ORDERS_EVENT = 'orders'
+
+# The upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Event():
+
+    """
+    Represents something that happened in the trading robot, like a new
+    bar arriving or signals being found.
+    """
+
+    def __init__(self, topic: str, data: Any, origin: 'Event' = None, bar_close: float = None) -> None:
+        """Initalizes the Event.
+
+        Arguments:
+        ----
+        topic {str} -- The topic the event is published to, for example `bar`.
+
+        data {Any} -- The payload, for example the latest bars.
+
+        Keyword Arguments:
+        ----
+        origin {Event} -- The event this one was published in response to. Events
+            published in response to a bar share its start time, so their latency
+            is measured from when the bar arrived. (default: {None})
+
+        bar_close {float} -- The UNIX timestamp, in seconds, when the bar closed. If given,
+            the delay between the bar closing and arriving is measured. (default: {None})
+        """
+
+        self.topic = topic
+        self.data = data
+        self.origin = origin
+        self.created_at = time.perf_counter()
+
+        if origin is not None:
+            self.started_at = origin.started_at
+            self.bar_close = origin.bar_close
+        else:
+            self.started_at = self.created_at
+            self.bar_close = bar_close
+
+    @property
+    def latency(self) -> float:
+        """The seconds between the bar arriving and this event being published.
+
+        Returns:
+        ----
+        {float} -- The latency in seconds.
+        """
+
+        return self.created_at - self.started_at
+
+    def __repr__(self) -> str:
+        return "Event(topic={topic!r}, latency={latency:.6f})".format(topic=self.topic, latency=self.latency)
+
+
+class StageTimer():
+
+    """Keeps running latency statistics for a single stage."""
+
+    def __init__(self) -> None:
+        """Initalizes the Stage Timer."""
+
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Adds a measurement.
+
+        Arguments:
+        ----
+        seconds {float} -- The latency in seconds.
+        """
+
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """The average latency in seconds."""
+
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """Summarizes the timer in milliseconds.
+
+        Returns:
+        ----
+        {dict} -- The count, and the mean, last and max latency in milliseconds.
+        """
+
+        return {
+            'count': self.count,
+            'mean_ms': self.mean * 1000,
+            'last_ms': self.last * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class LatencyHistogram(StageTimer):
+
+    """Keeps running latency statistics for a single stage, and how they're distributed."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initalizes the Latency Histogram.
+
+        Keyword Arguments:
+        ----
+        buckets {Tuple[float, ...]} -- The upper bounds of the buckets in seconds, in
+            ascending order. Anything slower lands in a final, unbounded bucket.
+            (default: {LATENCY_BUCKETS})
+        """
+
+        super().__init__()
+
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def record(self, seconds: float) -> None:
+        """Adds a measurement.
+
+        Arguments:
+        ----
+        seconds {float} -- The latency in seconds.
+        """
+
+        super().record(seconds=seconds)
+
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """Counts the measurements at or under each bucket's upper bound.
+
+        Returns:
+        ----
+        {List[Tuple[float, int]]} -- Each upper bound and its count, ending with
+            `inf` and the total count.
+        """
+
+        return list(zip(self.buckets + (float('inf'),), itertools.accumulate(self.bucket_counts)))
+
+    def percentile(self, percent: float) -> float:
+        """Estimates a percentile from the buckets, by the upper bound of the bucket it falls in.
+
+        Arguments:
+        ----
+        percent {float} -- The percentile, between 0 and 100.
+
+        Returns:
+        ----
+        {float} -- The latency in seconds, or the max latency if it falls in the last bucket.
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percent / 100
+
+        for upper_bound, count in self.cumulative_counts():
+            if count >= rank:
+                return min(upper_bound, self.max)
+
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Summarizes the histogram in milliseconds.
+
+        Returns:
+        ----
+        {dict} -- The count, the mean, last and max latency, and the estimated 50th,
+            90th and 99th percentiles, all in milliseconds.
+        """
+
+        summary = super().to_dict()
+        summary['p50_ms'] = self.percentile(percent=50) * 1000
+        summary['p90_ms'] = self.percentile(percent=90) * 1000
+        summary['p99_ms'] = self.percentile(percent=99) * 1000
+
+        return summary
+
+
+class EventBus():
+
+    """
+    Represents a publish and subscribe bus, used to run each stage of
+    the trading robot as soon as the stage before it has finished.
+    """
+
+    def __init__(self, metrics: 'MetricsSink' = None) -> None:
+        """Initalizes the Event Bus.
+
+        Overview:
+        ----
+        Subscribers are called in the order they subscribed, on the thread that
+        publishes. A subscriber can publish its own event in response, passing the
+        event it received as the `origin`, which is how the bar, indicator, signal
+        and order stages are chained together. Several strategies can subscribe to
+        the same topic, so they share one data feed.
+
+        For each topic, the bus measures the time from the bar arriving to the
+        event being published (`latency`) and the time its subscribers take to run
+        (`handler_time`), which includes any events they publish in turn.
+
+        Keyword Arguments:
+        ----
+        metrics {MetricsSink} -- Also sends both timings to a metrics sink, as the
+            `event_latency` and `event_handler_duration` histograms tagged with
+            the topic. (default: {None})
+
+        Usage:
+        ----
+            >>> event_bus = EventBus()
+            >>> event_bus.subscribe(topic='signals', callback=lambda event: print(event.data))
+            >>> event_bus.publish(topic='signals', data=signals)
+        """
+
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self.latency: Dict[str, StageTimer] = {}
+        self.handler_time: Dict[str, StageTimer] = {}
+        self.bar_delay = StageTimer()
+        self.metrics = metrics
+
+    def subscribe(self, topic: str, callback: Callable[[Event], Any]) -> Callable[[Event], Any]:
+        """Calls a function every time an event is published to a topic.
+
+        Arguments:
+        ----
+        topic {str} -- The topic, for example `bar` or `signals`.
+
+        callback {Callable[[Event], Any]} -- The function, which receives the `Event`.
+
+        Returns:
+        ----
+        {Callable[[Event], Any]} -- The callback, so it can be used as a decorator.
+        """
+
+        self._subscribers.setdefault(topic, []).append(callback)
+
+        return callback
+
+    def unsubscribe(self, topic: str, callback: Callable[[Event], Any]) -> None:
+        """Stops calling a function for a topic.
+
+        Arguments:
+        ----
+        topic {str} -- The topic the function subscribed to.
+
+        callback {Callable[[Event], Any]} -- The function to remove.
+        """
+
+        if callback in self._subscribers.get(topic, []):
+            self._subscribers[topic].remove(callback)
+
+    def subscribers(self, topic: str) -> List[Callable]:
+        """Returns the functions subscribed to a topic.
+
+        Arguments:
+        ----
+        topic {str} -- The topic.
+
+        Returns:
+        ----
+        {List[Callable]} -- The subscribed functions, in the order they're called.
+        """
+
+        return list(self._subscribers.get(topic, []))
+
+    def publish(self, topic: str, data: Any = None, origin: Event = None, bar_close: float = None) -> Event:
+        """Publishes an event and calls every subscriber of its topic.
+
+        Arguments:
+        ----
+        topic {str} -- The topic, for example `bar` or `signals`.
+
+        Keyword Arguments:
+        ----
+        data {Any} -- The payload. (default: {None})
+
+        origin {Event} -- The event this one is published in response to. (default: {None})
+
+        bar_close {float} -- For bar events, the UNIX timestamp in seconds when the bar
+            closed. (default: {None})
+
+        Returns:
+        ----
+        {Event} -- The published event.
+        """
+
+        event = Event(topic=topic, data=data, origin=origin, bar_close=bar_close)
+
+        self.latency.setdefault(topic, StageTimer()).record(event.latency)
+
+        if origin is None and bar_close is not None:
+            self.bar_delay.record(max(time.time() - bar_close, 0.0))
+
+        handler_start = time.perf_counter()
+
+        for callback in self.subscribers(topic=topic):
+            callback(event)
+
+        handler_time = time.perf_counter() - handler_start
+        self.handler_time.setdefault(topic, StageTimer()).record(handler_time)
+
+        if self.metrics is not None and self.metrics.enabled:
+            self.metrics.observe(name='event_latency', seconds=event.latency, tags={'topic': topic})
+            self.metrics.observe(name='event_handler_duration', seconds=handler_time, tags={'topic': topic})
+
+        return event
+
+    def latency_report(self) -> Dict[str, dict]:
+        """Summarizes the latency of every stage.
+
+        Returns:
+        ----
+        {Dict[str, dict]} -- For each topic, the latency since the bar arrived and the
+            time its subscribers took, both in milliseconds. The `bar_delay` entry is
+            the time between a bar closing and arriving.
+
+        Usage:
+        ----
+            >>> trading_robot.events.latency_report()
+            {
+                'bar': {'latency': {...}, 'handler_time': {...}},
+                'indicators': {'latency': {...}, 'handler_time': {...}},
+                'bar_delay': {'count': 10, 'mean_ms': 950.4, ...}
+            }
+        """
+
+        report = {
+            topic: {
+                'latency': timer.to_dict(),
+                'handler_time': self.handler_time[topic].to_dict() if topic in self.handler_time else None
+            }
+            for topic, timer in self.latency.items()
+        }
+
+        report['bar_delay'] = self.bar_delay.to_dict()
+
+        return report
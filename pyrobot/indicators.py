@@ -1,10 +1,32 @@
+import time
 import numpy as np
 import pandas as pd
 
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Union
-
+from typing import Callable
+
+from pyrobot import kernels
+from pyrobot.cache import IndicatorCache
+from pyrobot.cache import default_cache
+from pyrobot.metrics import MetricsSink
+from pyrobot.plugins import EMAPlugin
+from pyrobot.plugins import RSIPlugin
+from pyrobot.plugins import SMAPlugin
+from pyrobot.plugins import MACDPlugin
+from pyrobot.plugins import IndicatorPlugin
+from pyrobot.plugins import RateOfChangePlugin
+from pyrobot.plugins import AverageTrueRangePlugin
+from pyrobot.plugins import BollingerBandsPlugin
+from pyrobot.plugins import StandardDeviationPlugin
+from pyrobot.plugins import StochasticOscillatorPlugin
+from pyrobot.plugins import CommodityChannelIndexPlugin
+from pyrobot.rules import SignalPlan
+from pyrobot.rules import SignalRule
+from pyrobot.rules import rule_from_dict
+from pyrobot.rules import compile_signals
 from pyrobot.stock_frame import StockFrame
 
 class Indicators():
@@ -14,14 +36,38 @@ class Indicators():
     to easily add technical indicators to a StockFrame.
     """    
     
-    def __init__(self, price_data_frame: StockFrame) -> None:
+    def __init__(self, price_data_frame: StockFrame, lazy: bool = False, cache: Union[bool, IndicatorCache] = None,
+                 workers: int = 1, signal_combine: str = 'all', incremental: bool = False, metrics: MetricsSink = None) -> None:
         """Initalizes the Indicator Client.
 
         Arguments:
         ----
         price_data_frame {pyrobot.StockFrame} -- The price data frame which is used to add indicators to.
             At a minimum this data frame must have the following columns: `['timestamp','close','open','high','low']`.
-        
+
+        Keyword Arguments:
+        ----
+        lazy {bool} -- If `True`, `refresh` will only mark the indicators as stale and they will be
+            recalculated the first time a signal check or `get_indicator` reads them. (default: {False})
+
+        cache {Union[bool, IndicatorCache]} -- Memoizes the indicator results for each symbol, so the same
+            indicator over the same prices is only calculated once. Pass `True` to use the process wide
+            cache, or pass your own `IndicatorCache`. (default: {None})
+
+        workers {int} -- The number of threads each indicator shards its symbols across. (default: {1})
+
+        signal_combine {str} -- How the signals of one side are combined when checking signals. Use `all`
+            to require every signal to be met, or `any` to require at least one. (default: {'all'})
+
+        incremental {bool} -- If `True`, the SMA, EMA, RSI, Rate of Change, ATR and MACD keep their state
+            for each symbol, like the plugin based indicators, so a refresh only calculates the rows that
+            were appended. Use it when bars are added one at a time, for example in a replay or an event
+            driven backtest. (default: {False})
+
+        metrics {MetricsSink} -- Where `refresh` and `check_signals` report their duration, as
+            stages, and where each recalculated indicator reports its own, tagged with its key.
+            (default: {the StockFrame's sink})
+
         Usage:
         ----
             >>> historical_prices_df = trading_robot.grab_historical_prices(
@@ -43,6 +89,25 @@ class Indicators():
 
         self._indicators_comp_key = []
         self._indicators_key = []
+        self._signal_rules = []
+        self._signal_plan = None
+
+        self._lazy = lazy
+        self._indicator_versions = {}
+
+        if cache is True:
+            self._cache = default_cache()
+        elif isinstance(cache, IndicatorCache):
+            self._cache = cache
+        else:
+            self._cache = None
+
+        self._workers = workers
+        self._incremental = incremental
+        self._plugin_states = {}
+        self.signal_combine = signal_combine
+        self._groups_version = self._stock_frame.version
+        self.metrics: MetricsSink = metrics or self._stock_frame.metrics
         
         if self.is_multi_index:
             True
@@ -112,6 +177,9 @@ class Indicators():
         self._indicator_signals[indicator]['buy_operator_max'] = condition_buy_max
         self._indicator_signals[indicator]['sell_operator_max'] = condition_sell_max
 
+        # The signals changed, so they need to be compiled again.
+        self._signal_plan = None
+
     def set_indicator_signal_compare(self, indicator_1: str, indicator_2: str, condition_buy: Any, condition_sell: Any) -> None:
         """Used to set an indicator where one indicator is compared to another indicator.
 
@@ -157,6 +225,390 @@ class Indicators():
         indicator_dict['buy_operator'] = condition_buy
         indicator_dict['sell_operator'] = condition_sell
 
+        # The signals changed, so they need to be compiled again.
+        self._signal_plan = None
+
+    def set_indicator_signal_crossover(self, indicator_1: str, indicator_2: Union[str, float], buy: str = 'above',
+                                       sell: str = 'below') -> None:
+        """Used to set a signal where one indicator crosses above or below another indicator.
+
+        Overview:
+        ----
+        Unlike `set_indicator_signal_compare`, which is met on every bar the comparison
+        holds, a crossover is only met on the bar where the first indicator crosses the
+        second one. For example, the Golden Cross is the 50-day SMA crossing above the
+        200-day SMA. The crossover is found by comparing the last two bars of each symbol.
+
+        Arguments:
+        ----
+        indicator_1 {str} -- The indicator that crosses, for example `sma_50`.
+
+        indicator_2 {Union[str, float]} -- The indicator, or a value, that is crossed. For
+            example, `sma_200`.
+
+        Keyword Arguments:
+        ----
+        buy {str} -- The direction that is a buy signal, `above`, `below` or `None` for no
+            buy signal. (default: {'above'})
+
+        sell {str} -- The direction that is a sell signal, `above`, `below` or `None` for no
+            sell signal. (default: {'below'})
+
+        Usage:
+        ----
+            >>> indicator_client.sma(period=50, column_name='sma_50')
+            >>> indicator_client.sma(period=200, column_name='sma_200')
+            >>> indicator_client.set_indicator_signal_crossover(
+                    indicator_1='sma_50',
+                    indicator_2='sma_200',
+                    buy='above',
+                    sell='below'
+                )
+        """
+
+        # Define the key.
+        key = "{ind_1}_cross_{ind_2}".format(
+            ind_1=indicator_1,
+            ind_2=indicator_2
+        )
+
+        # Add the signals.
+        self._indicator_signals[key] = {
+            'type': 'crossover',
+            'indicator_1': indicator_1,
+            'indicator_2': indicator_2,
+            'buy_operator': buy,
+            'sell_operator': sell
+        }
+
+        # The signals changed, so they need to be compiled again.
+        self._signal_plan = None
+
+    def add_signal_rule(self, rule: SignalRule) -> None:
+        """Adds a signal rule, alongside the signals set with `set_indicator_signal`.
+
+        Arguments:
+        ----
+        rule {SignalRule} -- The rule, for example a `ThresholdRule` or a `CompareRule`.
+
+        Usage:
+        ----
+            >>> indicator_client.add_signal_rule(
+                    rule=ThresholdRule(side='buy', indicator='rsi', condition='<=', value=30.0)
+                )
+        """
+
+        self._signal_rules.append(rule)
+        self._signal_plan = None
+
+    @property
+    def signal_plan(self) -> SignalPlan:
+        """The signals and signal rules compiled into a single evaluation plan.
+
+        Overview:
+        ----
+        The plan is compiled the first time it's needed and then reused until
+        a signal is added or changed.
+
+        Returns:
+        ----
+        {SignalPlan} -- The compiled plan.
+        """
+
+        if self._signal_plan is None:
+            self._signal_plan = compile_signals(
+                indicator_signals=self._indicator_signals,
+                rules=self._signal_rules,
+                combine=self._signal_combine
+            )
+
+        return self._signal_plan
+
+    def signals_to_dict(self) -> dict:
+        """Serializes every signal, so a strategy can be stored in a config file.
+
+        Returns:
+        ----
+        {dict} -- The combine mode and the serialized rules.
+
+        Usage:
+        ----
+            >>> with open('config/strategy.json', 'w') as strategy_file:
+                    json.dump(indicator_client.signals_to_dict(), strategy_file)
+        """
+
+        return self.signal_plan.to_dict()
+
+    def load_signals(self, signals_dict: dict) -> None:
+        """Adds the signals serialized with `signals_to_dict`.
+
+        Arguments:
+        ----
+        signals_dict {dict} -- The serialized signals.
+
+        Usage:
+        ----
+            >>> with open('config/strategy.json', 'r') as strategy_file:
+                    indicator_client.load_signals(signals_dict=json.load(strategy_file))
+        """
+
+        self.signal_combine = signals_dict.get('combine', self._signal_combine)
+
+        for rule_dict in signals_dict['rules']:
+            self.add_signal_rule(rule=rule_from_dict(rule_dict=rule_dict))
+
+    @property
+    def lazy(self) -> bool:
+        """Specifies whether the indicators are only calculated when they are read.
+
+        Returns:
+        ----
+        {bool} -- `True` if lazy evaluation is turned on, `False` otherwise.
+        """
+
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self, lazy: bool) -> None:
+        """Turns lazy evaluation on or off.
+
+        Arguments:
+        ----
+        lazy {bool} -- `True` to turn on lazy evaluation, `False` to turn it off.
+        """
+
+        self._lazy = lazy
+
+    @property
+    def incremental(self) -> bool:
+        """Specifies whether the built-in moving averages only calculate the appended rows.
+
+        Returns:
+        ----
+        {bool} -- `True` if incremental calculation is turned on, `False` otherwise.
+        """
+
+        return self._incremental
+
+    @property
+    def signal_combine(self) -> str:
+        """How the signals of one side are combined, either `all` or `any`.
+
+        Returns:
+        ----
+        {str} -- The combine mode used by `check_signals`.
+        """
+
+        return self._signal_combine
+
+    @signal_combine.setter
+    def signal_combine(self, signal_combine: str) -> None:
+        """Sets how the signals of one side are combined.
+
+        Arguments:
+        ----
+        signal_combine {str} -- Either `all` or `any`.
+        """
+
+        if signal_combine not in ('all', 'any'):
+            raise ValueError("The signals can only be combined with 'all' or 'any'.")
+
+        self._signal_combine = signal_combine
+        self._signal_plan = None
+
+    @property
+    def cache(self) -> Union[IndicatorCache, None]:
+        """The cache used to memoize indicator results, if there is one.
+
+        Returns:
+        ----
+        {Union[IndicatorCache, None]} -- The Indicator Cache or `None`.
+        """
+
+        return self._cache
+
+    def _register_indicator(self, column_name: str, func: Callable, args: dict, columns: List[str] = None) -> None:
+        """Stores an indicator so it can be recalculated when the StockFrame changes.
+
+        Arguments:
+        ----
+        column_name {str} -- The key of the indicator, normally the column it creates.
+
+        func {Callable} -- The method used to calculate the indicator.
+
+        args {dict} -- The arguments passed through to `func` when refreshing.
+
+        Keyword Arguments:
+        ----
+        columns {List[str]} -- The columns the indicator writes to the StockFrame, if they are
+            different from `column_name`. (default: {None})
+        """
+
+        self._current_indicators[column_name] = {}
+        self._current_indicators[column_name]['args'] = args
+        self._current_indicators[column_name]['func'] = func
+        self._current_indicators[column_name]['columns'] = columns or [column_name]
+
+        # The indicator is calculated right after it's registered, so it's current.
+        self._indicator_versions[column_name] = self._stock_frame.version
+
+    def is_stale(self, indicator: str) -> bool:
+        """Specifies whether an indicator needs to be recalculated.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key, for example `ema` or `sma`.
+
+        Returns:
+        ----
+        {bool} -- `True` if rows were added since the indicator was last calculated.
+        """
+
+        return self._indicator_versions.get(indicator) != self._stock_frame.version
+
+    def _evaluate_indicator(self, indicator: str) -> None:
+        """Recalculates a single indicator using the arguments it was registered with.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key, for example `ema` or `sma`.
+        """
+
+        # Make sure the groups include any rows that were added.
+        if self._groups_version != self._stock_frame.version:
+            self._price_groups = self._stock_frame.symbol_groups
+            self._groups_version = self._stock_frame.version
+
+        indicator_argument = self._current_indicators[indicator]['args']
+        indicator_function = self._current_indicators[indicator]['func']
+
+        if not self.metrics.enabled:
+            indicator_function(**indicator_argument)
+            return
+
+        indicator_start = time.perf_counter()
+        indicator_function(**indicator_argument)
+        self.metrics.observe(name='indicator_duration', seconds=time.perf_counter() - indicator_start, tags={'indicator': indicator})
+
+    def _apply_kernel(self, kernel: Callable, inputs: List[str], columns: Dict[str, str], kernel_name: str = None, **params) -> pd.DataFrame:
+        """Runs a kernel one symbol at a time and writes the outputs to the StockFrame.
+
+        Arguments:
+        ----
+        kernel {Callable} -- A kernel from `pyrobot.kernels`, for example `kernels.sma`.
+
+        inputs {List[str]} -- The StockFrame columns the kernel reads, for example `['close']`.
+
+        columns {Dict[str, str]} -- Maps each kernel output to the StockFrame column it's
+            written to.
+
+        Keyword Arguments:
+        ----
+        kernel_name {str} -- The name used for the kernel in cache keys. (default: {None})
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The StockFrame with the new columns.
+        """
+
+        arrays = {
+            name: self._frame[name].to_numpy(dtype=float) for name in inputs
+        }
+
+        outputs = kernels.run_segmented(
+            kernel=kernel,
+            inputs=arrays,
+            bounds=self._stock_frame.symbol_bounds,
+            cache=self._cache,
+            kernel_name=kernel_name,
+            workers=self._workers,
+            **params
+        )
+
+        for output, column in columns.items():
+            self._frame[column] = outputs.get(output, np.full(len(self._frame), np.nan))
+
+        return self._frame
+
+    def _indicators_for_columns(self, column_names: List[str]) -> List[str]:
+        """Finds the indicators that write to the columns specified.
+
+        Arguments:
+        ----
+        column_names {List[str]} -- A list of StockFrame column names.
+
+        Returns:
+        ----
+        {List[str]} -- The keys of the indicators that produce those columns.
+        """
+
+        column_names = set(column_names)
+
+        return [
+            indicator for indicator in self._current_indicators
+            if column_names.intersection(self._current_indicators[indicator]['columns'])
+        ]
+
+    def _signal_columns(self) -> List[str]:
+        """Returns the columns that the registered signals read.
+
+        Returns:
+        ----
+        {List[str]} -- A list of StockFrame column names.
+        """
+
+        return list(self.signal_plan.columns)
+
+    def ensure_current(self, column_names: List[str] = None) -> None:
+        """Recalculates any stale indicators, memoizing them until rows are added again.
+
+        Keyword Arguments:
+        ----
+        column_names {List[str]} -- Only recalculate the indicators that produce these
+            columns. If `None`, every stale indicator is recalculated. (default: {None})
+        """
+
+        if column_names is None:
+            indicators = list(self._current_indicators)
+        else:
+            indicators = self._indicators_for_columns(column_names=column_names)
+
+        for indicator in indicators:
+            if self.is_stale(indicator=indicator):
+                self._evaluate_indicator(indicator=indicator)
+
+    def get_indicator(self, indicator: str) -> pd.DataFrame:
+        """Returns the columns for an indicator, calculating them first if they are stale.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key, for example `ema` or `sma`.
+
+        Raises:
+        ----
+        KeyError: If the indicator was never added.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The indicator columns from the StockFrame.
+
+        Usage:
+        ----
+            >>> indicator_client = Indicators(price_data_frame=stock_frame, lazy=True)
+            >>> indicator_client.sma(period=100)
+            >>> stock_frame.add_rows(data=latest_bars)
+            >>> indicator_client.refresh()
+            >>> indicator_client.get_indicator(indicator='sma')
+        """
+
+        if indicator not in self._current_indicators:
+            raise KeyError("The indicator {indicator} has not been added.".format(indicator=indicator))
+
+        if self.is_stale(indicator=indicator):
+            self._evaluate_indicator(indicator=indicator)
+
+        return self._frame[self._current_indicators[indicator]['columns']]
+
     @property
     def price_data_frame(self) -> pd.DataFrame:
         """Return the raw Pandas Dataframe Object.
@@ -204,12 +656,17 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
         
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.change_in_price
+        self._register_indicator(
+            column_name=column_name,
+            func=self.change_in_price,
+            args=locals_data
+        )
 
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.diff()
+        # Calculate the Change in Price for each symbol.
+        self._apply_kernel(
+            kernel=kernels.change_in_price,
+            inputs=['close'],
+            columns={'change_in_price': column_name}
         )
 
         return self._frame
@@ -246,49 +703,25 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.rsi
-
-        # First calculate the Change in Price.
-        if 'change_in_price' not in self._frame.columns:
-            self.change_in_price()
-
-        # Define the up days.
-        self._frame['up_day'] = self._price_groups['change_in_price'].transform(
-            lambda x : np.where(x >= 0, x, 0)
-        )
-
-        # Define the down days.
-        self._frame['down_day'] = self._price_groups['change_in_price'].transform(
-            lambda x : np.where(x < 0, x.abs(), 0)
-        )
-
-        # Calculate the EWMA for the Up days.
-        self._frame['ewma_up'] = self._price_groups['up_day'].transform(
-            lambda x: x.ewm(span = period).mean()
-        )
-
-        # Calculate the EWMA for the Down days.
-        self._frame['ewma_down'] = self._price_groups['down_day'].transform(
-            lambda x: x.ewm(span = period).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.rsi,
+            args=locals_data
         )
 
-        # Calculate the Relative Strength
-        relative_strength = self._frame['ewma_up'] / self._frame['ewma_down']
-
-        # Calculate the Relative Strength Index
-        relative_strength_index = 100.0 - (100.0 / (1.0 + relative_strength))
-
-        # Add the info to the data frame.
-        self._frame['rsi'] = np.where(relative_strength_index == 0, 100, 100 - (100 / (1 + relative_strength_index)))
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['ewma_up', 'ewma_down', 'down_day', 'up_day', 'change_in_price'],
-            axis=1,
-            inplace=True
-        )
+        # Calculate the Relative Strength Index for each symbol.
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=RSIPlugin(period=period, column_name=column_name)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.rsi,
+                inputs=['close'],
+                columns={'rsi': column_name},
+                period=period
+            )
 
         return self._frame
 
@@ -319,14 +752,25 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.sma
+        self._register_indicator(
+            column_name=column_name,
+            func=self.sma,
+            args=locals_data
+        )
 
         # Add the SMA
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.rolling(window=period).mean()
-        )
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=SMAPlugin(period=period, column_name=column_name)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.sma,
+                inputs=['close'],
+                columns={'sma': column_name},
+                period=period
+            )
 
         return self._frame
 
@@ -359,14 +803,25 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.ema
+        self._register_indicator(
+            column_name=column_name,
+            func=self.ema,
+            args=locals_data
+        )
 
         # Add the EMA
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.ewm(span=period).mean()
-        )
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=EMAPlugin(period=period, column_name=column_name)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.ema,
+                inputs=['close'],
+                columns={'ema': column_name},
+                period=period
+            )
 
         return self._frame
 
@@ -397,14 +852,25 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.rate_of_change
+        self._register_indicator(
+            column_name=column_name,
+            func=self.rate_of_change,
+            args=locals_data
+        )
 
         # Add the Momentum indicator.
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.pct_change(periods=period)
-        )
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=RateOfChangePlugin(period=period, column_name=column_name)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.rate_of_change,
+                inputs=['close'],
+                columns={'rate_of_change': column_name},
+                period=period
+            )
 
         return self._frame        
 
@@ -436,35 +902,17 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.bollinger_bands
-
-        # Define the Moving Avg.
-        self._frame['moving_avg'] = self._price_groups['close'].transform(
-            lambda x : x.rolling(window=period).mean()
-        )
-
-        # Define Moving Std.
-        self._frame['moving_std'] = self._price_groups['close'].transform(
-            lambda x : x.rolling(window=period).std()
-        )
-
-        # Define the Upper Band.
-        self._frame['band_upper'] = 4 * (self._frame['moving_std'] / self._frame['moving_avg'])
-
-        # Define the lower band
-        self._frame['band_lower'] = (
-            (self._frame['close'] - self._frame['moving_avg']) + 
-            (2 * self._frame['moving_std']) / 
-            (4 * self._frame['moving_std'])
+        self._register_indicator(
+            column_name=column_name,
+            func=self.bollinger_bands,
+            args=locals_data,
+            columns=['band_upper', 'band_lower']
         )
 
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['moving_avg', 'moving_std'],
-            axis=1,
-            inplace=True
+        # Add the Upper and Lower Bands, only calculating new rows on refresh.
+        self._run_plugin(
+            plugin=self._rolling_plugin(key=column_name, plugin=BollingerBandsPlugin(period=period)),
+            key=column_name
         )
 
         return self._frame   
@@ -497,36 +945,44 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.average_true_range
-
-
-        # Calculate the different parts of True Range.
-        self._frame['true_range_0'] = abs(self._frame['high'] - self._frame['low'])
-        self._frame['true_range_1'] = abs(self._frame['high'] - self._frame['close'].shift())
-        self._frame['true_range_2'] = abs(self._frame['low'] - self._frame['close'].shift())
-
-        # Grab the Max.
-        self._frame['true_range'] = self._frame[['true_range_0', 'true_range_1', 'true_range_2']].max(axis=1)
-
-        # Calculate the Average True Range.
-        self._frame['average_true_range'] = self._frame['true_range'].transform(
-            lambda x: x.ewm(span = period, min_periods = period).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.average_true_range,
+            args=locals_data
         )
 
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['true_range_0', 'true_range_1', 'true_range_2', 'true_range'],
-            axis=1,
-            inplace=True
-        )
+        # Calculate the Average True Range.
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=AverageTrueRangePlugin(period=period, column_name=column_name)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.average_true_range,
+                inputs=['high', 'low', 'close'],
+                columns={'average_true_range': column_name},
+                period=period
+            )
 
         return self._frame
 
-    def stochastic_oscillator(self, column_name: str = 'stochastic_oscillator') -> pd.DataFrame:
+    def stochastic_oscillator(self, column_name: str = 'stochastic_oscillator', period: int = 14) -> pd.DataFrame:
         """Calculates the Stochastic Oscillator.
 
+        Overview:
+        ----
+        The oscillator (%K) measures where the close sits within the highest high
+        and the lowest low of the last `period` bars, on a scale of 0 to 100.
+
+        Arguments:
+        ----
+        column_name {str} -- The name of the column the oscillator is stored in.
+            (default: {'stochastic_oscillator'})
+
+        period {int} -- The number of periods to use when finding the highest
+            high and the lowest low. (default: {14})
+
         Returns:
         ----
         {pd.DataFrame} -- A Pandas data frame with the Stochastic Oscillator included.
@@ -541,20 +997,22 @@ class Indicators():
             )
             >>> price_data_frame = pd.DataFrame(data=historical_prices)
             >>> indicator_client = Indicators(price_data_frame=price_data_frame)
-            >>> indicator_client.stochastic_oscillator()
+            >>> indicator_client.stochastic_oscillator(period=14)
         """
 
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.stochastic_oscillator
+        self._register_indicator(
+            column_name=column_name,
+            func=self.stochastic_oscillator,
+            args=locals_data
+        )
 
-        # Calculate the stochastic_oscillator.
-        self._frame['stochastic_oscillator'] = (
-            self._frame['close'] - self._frame['low'] / 
-            self._frame['high'] - self._frame['low']
+        # Calculate the Stochastic Oscillator, only calculating new rows on refresh.
+        self._run_plugin(
+            plugin=self._rolling_plugin(key=column_name, plugin=StochasticOscillatorPlugin(period=period, column_name=column_name)),
+            key=column_name
         )
 
         return self._frame 
@@ -590,27 +1048,27 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.macd
-
-        # Calculate the Fast Moving MACD.
-        self._frame['macd_fast'] = self._frame['close'].transform(
-            lambda x: x.ewm(span = fast_period, min_periods = fast_period).mean()
-        )
-
-        # Calculate the Slow Moving MACD.
-        self._frame['macd_slow'] = self._frame['close'].transform(
-            lambda x: x.ewm(span = slow_period, min_periods = slow_period).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.macd,
+            args=locals_data,
+            columns=['macd_fast', 'macd_slow', 'macd_diff', 'macd']
         )
 
-        # Calculate the difference between the fast and the slow.
-        self._frame['macd_diff'] = self._frame['macd_fast'] - self._frame['macd_slow']
-
-        # Calculate the Exponential moving average of the fast.
-        self._frame['macd'] = self._frame['macd_diff'].transform(
-            lambda x: x.ewm(span = 9, min_periods = 8).mean()
-        )
+        # Calculate the MACD.
+        if self._incremental:
+            self._run_plugin(
+                plugin=self._rolling_plugin(key=column_name, plugin=MACDPlugin(fast_period=fast_period, slow_period=slow_period)),
+                key=column_name
+            )
+        else:
+            self._apply_kernel(
+                kernel=kernels.macd,
+                inputs=['close'],
+                columns={'macd_fast': 'macd_fast', 'macd_slow': 'macd_slow', 'macd_diff': 'macd_diff', 'macd': 'macd'},
+                fast_period=fast_period,
+                slow_period=slow_period
+            )
 
         return self._frame 
 
@@ -642,36 +1100,18 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.mass_index
-
-        # Calculate the Diff.
-        self._frame['diff'] = self._frame['high'] - self._frame['low']
-
-        # Calculate Mass Index 1
-        self._frame['mass_index_1'] = self._frame['diff'].transform(
-            lambda x: x.ewm(span = period, min_periods = period - 1).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.mass_index,
+            args=locals_data
         )
 
-        # Calculate Mass Index 2
-        self._frame['mass_index_2'] = self._frame['mass_index_1'].transform(
-            lambda x: x.ewm(span = period, min_periods = period - 1).mean()
-        )
-        
-        # Grab the raw index.
-        self._frame['mass_index_raw'] = self._frame['mass_index_1'] / self._frame['mass_index_2']
-
         # Calculate the Mass Index.
-        self._frame['mass_index'] = self._frame['mass_index_raw'].transform(
-            lambda x: x.rolling(window=25).sum()
-        )
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['diff', 'mass_index_1', 'mass_index_2', 'mass_index_raw'],
-            axis=1,
-            inplace=True
+        self._apply_kernel(
+            kernel=kernels.mass_index,
+            inputs=['high', 'low'],
+            columns={'mass_index': column_name},
+            period=period
         )
 
         return self._frame
@@ -704,12 +1144,19 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.force_index
+        self._register_indicator(
+            column_name=column_name,
+            func=self.force_index,
+            args=locals_data
+        )
 
         # Calculate the Force Index.
-        self._frame[column_name] = self._frame['close'].diff(period)  * self._frame['volume'].diff(period)
+        self._apply_kernel(
+            kernel=kernels.force_index,
+            inputs=['close', 'volume'],
+            columns={'force_index': column_name},
+            period=period
+        )
 
         return self._frame
 
@@ -741,25 +1188,18 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.ease_of_movement
-        
-        # Calculate the ease of movement.
-        high_plus_low = (self._frame['high'].diff(1) + self._frame['low'].diff(1))
-        diff_divi_vol = (self._frame['high'] - self._frame['low']) / (2 * self._frame['volume'])
-        self._frame['ease_of_movement_raw'] = high_plus_low * diff_divi_vol
-
-        # Calculate the Rolling Average of the Ease of Movement.
-        self._frame['ease_of_movement'] = self._frame['ease_of_movement_raw'].transform(
-            lambda x: x.rolling(window=period).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.ease_of_movement,
+            args=locals_data
         )
 
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['ease_of_movement_raw'],
-            axis=1,
-            inplace=True
+        # Calculate the ease of movement.
+        self._apply_kernel(
+            kernel=kernels.ease_of_movement,
+            inputs=['high', 'low', 'volume'],
+            columns={'ease_of_movement': column_name},
+            period=period
         )
 
         return self._frame
@@ -792,31 +1232,16 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.commodity_channel_index
-
-        # Calculate the Typical Price.
-        self._frame['typical_price'] = (self._frame['high'] + self._frame['low'] + self._frame['close']) / 3
-
-        # Calculate the Rolling Average of the Typical Price.
-        self._frame['typical_price_mean'] = self._frame['pp'].transform(
-            lambda x: x.rolling(window=period).mean()
-        )
-
-        # Calculate the Rolling Standard Deviation of the Typical Price.
-        self._frame['typical_price_std'] = self._frame['pp'].transform(
-            lambda x: x.rolling(window=period).std()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.commodity_channel_index,
+            args=locals_data
         )
 
-        # Calculate the Commodity Channel Index.
-        self._frame[column_name] = self._frame['typical_price_mean'] / self._frame['typical_price_std']
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['typical_price', 'typical_price_mean', 'typical_price_std'],
-            axis=1,
-            inplace=True
+        # Calculate the Commodity Channel Index, only calculating new rows on refresh.
+        self._run_plugin(
+            plugin=self._rolling_plugin(key=column_name, plugin=CommodityChannelIndexPlugin(period=period, column_name=column_name)),
+            key=column_name
         )
 
         return self._frame
@@ -849,13 +1274,16 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.standard_deviation
+        self._register_indicator(
+            column_name=column_name,
+            func=self.standard_deviation,
+            args=locals_data
+        )
 
-        # Calculate the Standard Deviation.
-        self._frame[column_name] = self._frame['close'].transform(
-            lambda x: x.ewm(span=period).std()
+        # Calculate the Standard Deviation, only calculating new rows on refresh.
+        self._run_plugin(
+            plugin=self._rolling_plugin(key=column_name, plugin=StandardDeviationPlugin(period=period, column_name=column_name)),
+            key=column_name
         )
 
         return self._frame
@@ -888,50 +1316,39 @@ class Indicators():
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.chaikin_oscillator
-
-        # Calculate the Money Flow Multiplier.
-        money_flow_multiplier_top = 2 * (self._frame['close'] - self._frame['high'] - self._frame['low'])
-        money_flow_multiplier_bot = (self._frame['high'] - self._frame['low'])
-
-        # Calculate Money Flow Volume
-        self._frame['money_flow_volume'] = (money_flow_multiplier_top / money_flow_multiplier_bot) * self._frame['volume']
-
-        # Calculate the 3-Day moving average of the Money Flow Volume.
-        self._frame['money_flow_volume_3'] = self._frame['money_flow_volume'].transform(
-            lambda x: x.ewm(span=3, min_periods=2).mean()
-        )
-
-        # Calculate the 10-Day moving average of the Money Flow Volume.
-        self._frame['money_flow_volume_10'] = self._frame['money_flow_volume'].transform(
-            lambda x: x.ewm(span=10, min_periods=9).mean()
+        self._register_indicator(
+            column_name=column_name,
+            func=self.chaikin_oscillator,
+            args=locals_data
         )
 
         # Calculate the Chaikin Oscillator.
-        self._frame[column_name] = self._frame['money_flow_volume_3'] - self._frame['money_flow_volume_10']
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['money_flow_volume_3', 'money_flow_volume_10', 'money_flow_volume'],
-            axis=1,
-            inplace=True
+        self._apply_kernel(
+            kernel=kernels.chaikin_oscillator,
+            inputs=['high', 'low', 'close', 'volume'],
+            columns={'chaikin_oscillator': column_name}
         )
 
         return self._frame
 
-    def kst_oscillator(self, r1: int, r2: int, r3: int, r4: int, n1: int, n2: int, n3: int, n4: int, column_name: str = 'kst_oscillator') -> pd.DataFrame:
-        """Calculates the Mass Index indicator.
+    def kst_oscillator(self, r1: int, r2: int, r3: int, r4: int, n1: int, n2: int, n3: int, n4: int,
+                       signal_period: int = 9, column_name: str = 'kst_oscillator') -> pd.DataFrame:
+        """Calculates the KST Oscillator.
 
         Arguments:
         ----
-        period {int} -- The number of periods to use when calculating 
-            the mass index. (default: {9})
+        r1, r2, r3, r4 {int} -- The rate of change periods for each of the four components.
+
+        n1, n2, n3, n4 {int} -- The number of periods each rate of change is summed over.
+
+        Keyword Arguments:
+        ----
+        signal_period {int} -- The number of periods used for the signal line, which is
+            the moving average of the oscillator. (default: {9})
 
         Returns:
         ----
-        {pd.DataFrame} -- A Pandas data frame with the Mass Index included.
+        {pd.DataFrame} -- A Pandas data frame with the KST Oscillator and signal line included.
 
         Usage:
         ----
@@ -943,80 +1360,243 @@ class Indicators():
             )
             >>> price_data_frame = pd.DataFrame(data=historical_prices)
             >>> indicator_client = Indicators(price_data_frame=price_data_frame)
-            >>> indicator_client.mass_index(period=9)
+            >>> indicator_client.kst_oscillator(r1=10, r2=15, r3=20, r4=30, n1=10, n2=10, n3=10, n4=15)
         """
 
         locals_data = locals()
         del locals_data['self']
 
-        self._current_indicators[column_name] = {}
-        self._current_indicators[column_name]['args'] = locals_data
-        self._current_indicators[column_name]['func'] = self.kst_oscillator
+        self._register_indicator(
+            column_name=column_name,
+            func=self.kst_oscillator,
+            args=locals_data,
+            columns=[column_name, column_name + '_signal']
+        )
 
-        # Calculate the ROC 1.
-        self._frame['roc_1'] = self._frame['close'].diff(r1 - 1)  / self._frame['close'].shift(r1 - 1)
+        # Calculate the KST Oscillator and its signal line.
+        self._apply_kernel(
+            kernel=kernels.kst_oscillator,
+            inputs=['close'],
+            columns={'kst_oscillator': column_name, 'kst_oscillator_signal': column_name + '_signal'},
+            r1=r1,
+            r2=r2,
+            r3=r3,
+            r4=r4,
+            n1=n1,
+            n2=n2,
+            n3=n3,
+            n4=n4,
+            signal_period=signal_period
+        )
 
-        # Calculate the ROC 2.
-        self._frame['roc_2'] = self._frame['close'].diff(r2 - 1)  / self._frame['close'].shift(r2 - 1)
+        return self._frame
 
-        # Calculate the ROC 3.
-        self._frame['roc_3'] = self._frame['close'].diff(r3 - 1)  / self._frame['close'].shift(r3 - 1)
+    def add_plugin(self, plugin: IndicatorPlugin) -> pd.DataFrame:
+        """Adds a custom indicator to the StockFrame.
 
-        # Calculate the ROC 4.
-        self._frame['roc_4'] = self._frame['close'].diff(r4 - 1)  / self._frame['close'].shift(r4 - 1)
+        Overview:
+        ----
+        The plugin is calculated for each symbol and registered like any other
+        indicator, so it's recalculated by `refresh` and read by signal checks.
+        On refresh, only the rows appended since the last calculation are
+        calculated, see `IndicatorPlugin` for how. If rows are inserted before
+        the last calculated row of a symbol, that symbol is recalculated in full.
 
+        Arguments:
+        ----
+        plugin {IndicatorPlugin} -- The plugin to add.
 
-        # Calculate the Mass Index.
-        self._frame['roc_1_n'] = self._frame['roc_1'].transform(
-            lambda x: x.rolling(window=n1).sum()
-        )
+        Returns:
+        ----
+        {pd.DataFrame} -- A Pandas data frame with the plugin's outputs included.
 
-        # Calculate the Mass Index.
-        self._frame['roc_2_n'] = self._frame['roc_2'].transform(
-            lambda x: x.rolling(window=n2).sum()
-        )
+        Usage:
+        ----
+            >>> indicator_client = Indicators(price_data_frame=price_data_frame)
+            >>> indicator_client.add_plugin(plugin=TypicalPrice())
+        """
 
-        # Calculate the Mass Index.
-        self._frame['roc_3_n'] = self._frame['roc_3'].transform(
-            lambda x: x.rolling(window=n3).sum()
-        )
+        locals_data = locals()
+        del locals_data['self']
 
-        # Calculate the Mass Index.
-        self._frame['roc_4_n'] = self._frame['roc_4'].transform(
-            lambda x: x.rolling(window=n4).sum()
+        self._register_indicator(
+            column_name=plugin.name,
+            func=self.add_plugin,
+            args=locals_data,
+            columns=plugin.outputs
         )
 
-        self._frame[column_name] = 100 * (self._frame['roc_1_n'] + 2 * self._frame['roc_2_n'] + 3 * self._frame['roc_3_n'] + 4 * self._frame['roc_4_n'])
-        self._frame[column_name + "_signal"] = self._frame['column_name'].transform(
-            lambda x: x.rolling().mean()
-        )
-        
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['roc_1', 'roc_2', 'roc_3', 'roc_4', 'roc_1_n', 'roc_2_n', 'roc_3_n', 'roc_4_n'],
-            axis=1,
-            inplace=True
-        )
+        return self._run_plugin(plugin=plugin, key=plugin.name)
+
+    def _rolling_plugin(self, key: str, plugin: IndicatorPlugin) -> IndicatorPlugin:
+        """Grabs the plugin a built-in indicator was last calculated with.
+
+        Overview:
+        ----
+        The built-in rolling window indicators create a new plugin each time
+        they're called. If the indicator is refreshed with the same arguments,
+        the plugin it was last calculated with is reused so its state carries on.
+
+        Arguments:
+        ----
+        key {str} -- The indicator key.
+
+        plugin {IndicatorPlugin} -- The plugin for the arguments the indicator was called with.
+
+        Returns:
+        ----
+        {IndicatorPlugin} -- The existing plugin if it has the same key, otherwise `plugin`.
+        """
+
+        plugin_state = self._plugin_states.get(key)
+
+        if plugin_state is not None and plugin_state['plugin'].key == plugin.key:
+            return plugin_state['plugin']
+
+        return plugin
+
+    def _run_plugin(self, plugin: IndicatorPlugin, key: str) -> pd.DataFrame:
+        """Calculates a plugin, in full the first time and then only the new rows.
+
+        Arguments:
+        ----
+        plugin {IndicatorPlugin} -- The plugin to calculate.
+
+        key {str} -- The indicator key the plugin's state is stored under.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- A Pandas data frame with the plugin's outputs included.
+        """
+
+        # A new plugin under an old key starts from scratch.
+        plugin_state = self._plugin_states.get(key)
+
+        if plugin_state is None or plugin_state['plugin'] is not plugin:
+            plugin_state = {'plugin': plugin, 'symbols': {}}
+            self._plugin_states[key] = plugin_state
+
+        if not plugin_state['symbols']:
+
+            # Calculate every symbol in full the first time.
+            self._apply_kernel(
+                kernel=plugin.batch,
+                inputs=plugin.inputs,
+                columns={output: output for output in plugin.outputs},
+                kernel_name=plugin.key
+            )
+
+        else:
+            self._update_plugin(plugin=plugin, symbol_states=plugin_state['symbols'])
+
+        # Remember how far each symbol has been calculated.
+        timestamps = self._frame.index.get_level_values(1)
+        symbol_states = plugin_state['symbols']
+
+        for symbol, start, stop in self._stock_frame.symbol_bounds:
+
+            symbol_state = symbol_states.setdefault(symbol, {'state': None})
+            symbol_state['rows'] = stop - start
+            symbol_state['last_timestamp'] = timestamps[stop - 1]
 
         return self._frame
 
+    def _update_plugin(self, plugin: IndicatorPlugin, symbol_states: dict) -> None:
+        """Calculates a plugin for the rows appended since it was last calculated.
+
+        Arguments:
+        ----
+        plugin {IndicatorPlugin} -- The plugin to update.
+
+        symbol_states {dict} -- How far each symbol was calculated, and the plugin's
+            state for each symbol.
+        """
+
+        timestamps = self._frame.index.get_level_values(1)
+        inputs = {name: self._frame[name].to_numpy(dtype=float) for name in plugin.inputs}
+
+        outputs = {}
+
+        for output in plugin.outputs:
+            if output in self._frame.columns:
+                outputs[output] = self._frame[output].to_numpy(dtype=float, copy=True)
+            else:
+                outputs[output] = np.full(len(self._frame), np.nan)
+
+        def slice_inputs(start: int, stop: int) -> Dict[str, np.ndarray]:
+            return {name: values[start:stop] for name, values in inputs.items()}
+
+        for symbol, start, stop in self._stock_frame.symbol_bounds:
+
+            symbol_state = symbol_states.get(symbol)
+            calculated = start + symbol_state['rows'] if symbol_state else start
+
+            # Only rows appended after the last calculated row can be updated.
+            appended_only = (
+                symbol_state is not None and
+                calculated <= stop and
+                timestamps[calculated - 1] == symbol_state['last_timestamp']
+            )
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+
+                if not appended_only:
+                    write_from = start
+                    results = plugin.batch(**slice_inputs(start=start, stop=stop))
+
+                    if symbol_state is not None:
+                        symbol_state['state'] = None
+
+                elif calculated == stop:
+                    continue
+
+                elif plugin.has_update:
+
+                    # Build up the state from the history the first time.
+                    if symbol_state['state'] is None:
+                        symbol_state['state'] = {}
+                        plugin.update(symbol_state['state'], **slice_inputs(start=start, stop=calculated))
+
+                    write_from = calculated
+                    results = plugin.update(symbol_state['state'], **slice_inputs(start=calculated, stop=stop))
+
+                else:
+
+                    # Recalculate the new rows with just enough history before them.
+                    window_start = max(start, calculated - plugin.lookback)
+                    write_from = calculated
+                    results = plugin.batch(**slice_inputs(start=window_start, stop=stop))
+                    results = {
+                        name: values[calculated - window_start:] for name, values in results.items()
+                    }
+
+            for output in plugin.outputs:
+                outputs[output][write_from:stop] = results[output]
+
+        for output in plugin.outputs:
+            self._frame[output] = outputs[output]
+
     def refresh(self):
-        """Updates the Indicator columns after adding the new rows."""
+        """Updates the Indicator columns after adding the new rows.
+
+        Overview:
+        ----
+        If the client is lazy, nothing is calculated here. The indicators are
+        stale as soon as rows are added to the StockFrame, and they will be
+        recalculated the next time a signal check or `get_indicator` reads them.
+        """
 
         # First update the groups since, we have new rows.
         self._price_groups = self._stock_frame.symbol_groups
+        self._groups_version = self._stock_frame.version
 
-        # Grab all the details of the indicators so far.
-        for indicator in self._current_indicators:
-            
-            # Grab the function.
-            indicator_argument = self._current_indicators[indicator]['args']
-
-            # Grab the arguments.
-            indicator_function = self._current_indicators[indicator]['func']
+        if self._lazy:
+            return
 
-            # Update the function.
-            indicator_function(**indicator_argument)
+        # Grab all the details of the indicators so far.
+        with self.metrics.timer(name='stage_duration', tags={'stage': 'refresh'}):
+            for indicator in list(self._current_indicators):
+                self._evaluate_indicator(indicator=indicator)
 
     def check_signals(self) -> Union[pd.DataFrame, None]:
         """Checks to see if any signals have been generated.
@@ -1027,14 +1607,51 @@ class Indicators():
             is returned otherwise nothing is returned.
         """
 
-        signals_df = self._stock_frame._check_signals(
-            indicators=self._indicator_signals,
-            indciators_comp_key=self._indicators_comp_key,
-            indicators_key=self._indicators_key
-        )
+        with self.metrics.timer(name='stage_duration', tags={'stage': 'check_signals'}):
+
+            # Only the indicators the signals read need to be current.
+            if self._lazy:
+                self.ensure_current(column_names=self._signal_columns())
+
+            signals_df = self._stock_frame._check_signals(signal_plan=self.signal_plan)
 
         return signals_df
 
+    def check_signals_history(self) -> pd.DataFrame:
+        """Finds every bar where the signals would have been generated.
+
+        Overview:
+        ----
+        `check_signals` only looks at the last bar of each symbol. This evaluates
+        the same compiled signals over every bar of the StockFrame in one pass,
+        which is useful to analyze a strategy or as the starting point of a
+        backtest.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- One row per signal, with a `symbol`, `datetime` and `side`
+            column. The side is either `buy` or `sell`.
+
+        Usage:
+        ----
+            >>> indicator_client.rsi(period=14)
+            >>> indicator_client.set_indicator_signal(
+                    indicator='rsi',
+                    buy=30.0,
+                    sell=70.0,
+                    condition_buy=operator.le,
+                    condition_sell=operator.ge
+                )
+            >>> signals_history = indicator_client.check_signals_history()
+            >>> signals_history[signals_history['side'] == 'buy']
+        """
+
+        # Only the indicators the signals read need to be current.
+        if self._lazy:
+            self.ensure_current(column_names=self._signal_columns())
+
+        return self._stock_frame._check_signals_history(signal_plan=self.signal_plan)
+
 
 # #KST Oscillator  
 # def KST(df, r1, r2, r3, r4, n1, n2, n3, n4):  
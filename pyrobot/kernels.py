@@ -0,0 +1,337 @@
+"""Per-symbol array kernels used by the `Indicators` object.
+
+Each kernel receives the price arrays for a single symbol, in time order,
+and returns a dictionary of output arrays of the same length. The kernels
+never see more than one symbol at a time, so shifts, windows and moving
+averages can't bleed from one symbol into the next. `run_segmented` is
+the driver that slices a whole StockFrame into symbols and stitches the
+results back together.
+"""
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+
+from pyrobot.cache import IndicatorCache
+from pyrobot.rolling import rolling_statistics
+
+
+def run_segmented(kernel: Callable, inputs: Dict[str, np.ndarray], bounds: List[Tuple[str, int, int]],
+                  cache: IndicatorCache = None, kernel_name: str = None, workers: int = 1, **params) -> Dict[str, np.ndarray]:
+    """Runs a kernel over each symbol block and joins the outputs.
+
+    Arguments:
+    ----
+    kernel {Callable} -- The kernel to run, for example `kernels.sma`.
+
+    inputs {Dict[str, np.ndarray]} -- The full length input arrays, keyed by the
+        kernel argument name. For example, `{'close': close_array}`.
+
+    bounds {List[Tuple[str, int, int]]} -- The `(symbol, start, stop)` tuples
+        returned by `StockFrame.symbol_bounds`.
+
+    Keyword Arguments:
+    ----
+    cache {IndicatorCache} -- If given, each symbol's outputs are looked up in the cache
+        before running the kernel, and stored in it afterwards. (default: {None})
+
+    kernel_name {str} -- The name used for the kernel in cache keys. Defaults to the
+        kernel's module and function name. (default: {None})
+
+    workers {int} -- The number of threads the symbols are sharded across. NumPy and
+        pandas release the GIL for most of their work, so large frames with many
+        symbols benefit from more than one. (default: {1})
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- The full length output arrays, keyed by output name.
+    """
+
+    length = len(next(iter(inputs.values())))
+    outputs = {}
+
+    if kernel_name is None:
+        kernel_name = kernel.__module__ + '.' + kernel.__name__
+
+    def run_symbol(bound: Tuple[str, int, int]) -> Dict[str, np.ndarray]:
+
+        symbol, start, stop = bound
+
+        # Slice out this symbol's block.
+        segment = {name: values[start:stop] for name, values in inputs.items()}
+        results = None
+
+        if cache is not None:
+            key = cache.make_key(
+                indicator=kernel_name,
+                params=params,
+                symbol=symbol,
+                inputs=segment
+            )
+            results = cache.get(key=key)
+
+        if results is None:
+
+            # Match pandas, dividing by zero gives `inf` or `NaN` without a warning.
+            with np.errstate(divide='ignore', invalid='ignore'):
+                results = kernel(**segment, **params)
+
+            if cache is not None:
+                cache.put(key=key, outputs=results)
+
+        return results
+
+    if workers > 1 and len(bounds) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            all_results = list(executor.map(run_symbol, bounds))
+    else:
+        all_results = [run_symbol(bound) for bound in bounds]
+
+    for (_, start, stop), results in zip(bounds, all_results):
+
+        for name, values in results.items():
+
+            if name not in outputs:
+                outputs[name] = np.full(length, np.nan)
+
+            outputs[name][start:stop] = values
+
+    return outputs
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shifts an array forward, filling the start with `NaN`."""
+
+    shifted = np.full(len(values), np.nan)
+
+    if periods == 0:
+        shifted[:] = values
+    elif periods < len(values):
+        shifted[periods:] = values[:-periods]
+
+    return shifted
+
+
+def _diff(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Calculates the difference from `periods` rows ago."""
+
+    return values - _shift(values=values, periods=periods)
+
+
+def _rolling(values: np.ndarray, window: int):
+    """Returns a pandas rolling window over an array."""
+
+    return pd.Series(values).rolling(window=window)
+
+
+def _ewm_mean(values: np.ndarray, span: int, min_periods: int = 0) -> np.ndarray:
+    """Calculates an exponentially weighted moving average."""
+
+    return pd.Series(values).ewm(span=span, min_periods=min_periods).mean().to_numpy()
+
+
+def change_in_price(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calculates the change in price from the previous bar."""
+
+    return {'change_in_price': _diff(values=close)}
+
+
+def rsi(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Relative Strength Index."""
+
+    up_day, down_day = up_and_down_days(change=_diff(values=close))
+
+    return rsi_from_averages(
+        up_average=_ewm_mean(values=up_day, span=period),
+        down_average=_ewm_mean(values=down_day, span=period)
+    )
+
+
+def up_and_down_days(change: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Splits the change in price into the gains and the losses."""
+
+    # NaN compares as False, so the first bar counts as neither up or down.
+    up_day = np.where(change >= 0, change, 0.0)
+    down_day = np.where(change < 0, np.abs(change), 0.0)
+
+    return up_day, down_day
+
+
+def rsi_from_averages(up_average: np.ndarray, down_average: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calculates the Relative Strength Index from the average gain and loss."""
+
+    relative_strength = up_average / down_average
+    relative_strength_index = 100.0 - (100.0 / (1.0 + relative_strength))
+
+    return {
+        'rsi': np.where(
+            relative_strength_index == 0,
+            100,
+            100 - (100 / (1 + relative_strength_index))
+        )
+    }
+
+
+def sma(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Simple Moving Average."""
+
+    return {'sma': _rolling(values=close, window=period).mean().to_numpy()}
+
+
+def ema(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Exponential Moving Average."""
+
+    return {'ema': _ewm_mean(values=close, span=period)}
+
+
+def rate_of_change(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the percentage change from `period` bars ago."""
+
+    return {'rate_of_change': close / _shift(values=close, periods=period) - 1}
+
+
+def bollinger_bands(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the upper and lower Bollinger Bands."""
+
+    statistics = rolling_statistics(values=close, window=period, statistics=['mean', 'std'])
+
+    return bollinger_bands_from_statistics(close=close, moving_avg=statistics['mean'], moving_std=statistics['std'])
+
+
+def bollinger_bands_from_statistics(close: np.ndarray, moving_avg: np.ndarray, moving_std: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calculates the Bollinger Bands from the rolling mean and standard deviation."""
+
+    return {
+        'band_upper': 4 * (moving_std / moving_avg),
+        'band_lower': (close - moving_avg) + (2 * moving_std) / (4 * moving_std)
+    }
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Average True Range."""
+
+    true_range = true_ranges(high=high, low=low, previous_close=_shift(values=close))
+
+    return {'average_true_range': _ewm_mean(values=true_range, span=period, min_periods=period)}
+
+
+def true_ranges(high: np.ndarray, low: np.ndarray, previous_close: np.ndarray) -> np.ndarray:
+    """Calculates the True Range of each bar."""
+
+    # The first bar has no previous close, so only the high-low range counts.
+    return np.fmax(
+        np.abs(high - low),
+        np.fmax(np.abs(high - previous_close), np.abs(low - previous_close))
+    )
+
+
+def stochastic_oscillator(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Stochastic Oscillator (%K)."""
+
+    lowest_low = rolling_statistics(values=low, window=period, statistics=['min'])['min']
+    highest_high = rolling_statistics(values=high, window=period, statistics=['max'])['max']
+
+    return stochastic_oscillator_from_statistics(close=close, lowest_low=lowest_low, highest_high=highest_high)
+
+
+def stochastic_oscillator_from_statistics(close: np.ndarray, lowest_low: np.ndarray, highest_high: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calculates %K from the rolling lowest low and highest high."""
+
+    return {'stochastic_oscillator': 100 * (close - lowest_low) / (highest_high - lowest_low)}
+
+
+def macd(close: np.ndarray, fast_period: int, slow_period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Moving Average Convergence Divergence."""
+
+    macd_fast = _ewm_mean(values=close, span=fast_period, min_periods=fast_period)
+    macd_slow = _ewm_mean(values=close, span=slow_period, min_periods=slow_period)
+    macd_diff = macd_fast - macd_slow
+
+    return {
+        'macd_fast': macd_fast,
+        'macd_slow': macd_slow,
+        'macd_diff': macd_diff,
+        'macd': _ewm_mean(values=macd_diff, span=9, min_periods=8)
+    }
+
+
+def mass_index(high: np.ndarray, low: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Mass Index."""
+
+    mass_index_1 = _ewm_mean(values=high - low, span=period, min_periods=period - 1)
+    mass_index_2 = _ewm_mean(values=mass_index_1, span=period, min_periods=period - 1)
+
+    return {'mass_index': _rolling(values=mass_index_1 / mass_index_2, window=25).sum().to_numpy()}
+
+
+def force_index(close: np.ndarray, volume: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Force Index."""
+
+    return {'force_index': _diff(values=close, periods=period) * _diff(values=volume, periods=period)}
+
+
+def ease_of_movement(high: np.ndarray, low: np.ndarray, volume: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the rolling average of the Ease of Movement."""
+
+    high_plus_low = _diff(values=high) + _diff(values=low)
+    diff_divi_vol = (high - low) / (2 * volume)
+
+    return {'ease_of_movement': _rolling(values=high_plus_low * diff_divi_vol, window=period).mean().to_numpy()}
+
+
+def commodity_channel_index(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the Commodity Channel Index."""
+
+    statistics = rolling_statistics(values=_typical_price(high=high, low=low, close=close), window=period, statistics=['mean', 'std'])
+
+    return {'commodity_channel_index': statistics['mean'] / statistics['std']}
+
+
+def _typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Calculates the Typical Price, the average of the high, low and close."""
+
+    return (high + low + close) / 3
+
+
+def standard_deviation(close: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Calculates the rolling Standard Deviation."""
+
+    return {'standard_deviation': rolling_statistics(values=close, window=period, statistics=['std'])['std']}
+
+
+def chaikin_oscillator(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calculates the Chaikin Oscillator."""
+
+    money_flow_multiplier_top = 2 * (close - high - low)
+    money_flow_multiplier_bot = high - low
+    money_flow_volume = (money_flow_multiplier_top / money_flow_multiplier_bot) * volume
+
+    return {
+        'chaikin_oscillator': (
+            _ewm_mean(values=money_flow_volume, span=3, min_periods=2) -
+            _ewm_mean(values=money_flow_volume, span=10, min_periods=9)
+        )
+    }
+
+
+def kst_oscillator(close: np.ndarray, r1: int, r2: int, r3: int, r4: int, n1: int, n2: int, n3: int, n4: int, signal_period: int) -> Dict[str, np.ndarray]:
+    """Calculates the KST Oscillator and its signal line."""
+
+    kst = np.zeros(len(close))
+
+    for weight, (rate, window) in enumerate([(r1, n1), (r2, n2), (r3, n3), (r4, n4)], start=1):
+        rate_of_change = _diff(values=close, periods=rate - 1) / _shift(values=close, periods=rate - 1)
+        kst += weight * _rolling(values=rate_of_change, window=window).sum().to_numpy()
+
+    kst = 100 * kst
+
+    return {
+        'kst_oscillator': kst,
+        'kst_oscillator_signal': _rolling(values=kst, window=signal_period).mean().to_numpy()
+    }
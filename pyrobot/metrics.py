@@ -0,0 +1,686 @@
+import time
+import socket
+import threading
+
+from http.server import ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from td.client import TDClient
+
+from pyrobot.events import LATENCY_BUCKETS
+from pyrobot.events import LatencyHistogram
+
+
+# A metric's name and its sorted tags, which is how the registry keys it.
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _NullTimer():
+
+    """A timer that measures nothing, handed out by sinks that are turned off."""
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricTimer():
+
+    """Times a block of code, and sends the time to a sink when the block exits."""
+
+    def __init__(self, sink: 'MetricsSink', name: str, tags: Dict[str, str] = None) -> None:
+        """Initalizes the Metric Timer.
+
+        Arguments:
+        ----
+        sink {MetricsSink} -- The sink the time is sent to.
+
+        name {str} -- The histogram name, for example `stage_duration`.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the measurement. (default: {None})
+        """
+
+        self.sink = sink
+        self.name = name
+        self.tags = tags
+        self.start = None
+
+    def __enter__(self) -> 'MetricTimer':
+
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.sink.observe(name=self.name, seconds=time.perf_counter() - self.start, tags=self.tags)
+
+
+class MetricsSink():
+
+    """
+    Represents where the trading robot sends its metrics. This base sink
+    drops everything, and is the default, so the instrumentation costs an
+    attribute check when metrics are turned off.
+    """
+
+    # Instrumented code skips measuring anything when this is `False`.
+    enabled = False
+
+    def increment(self, name: str, value: float = 1.0, tags: Dict[str, str] = None) -> None:
+        """Adds to a counter.
+
+        Arguments:
+        ----
+        name {str} -- The counter name, for example `rows_appended`.
+
+        Keyword Arguments:
+        ----
+        value {float} -- The amount to add. (default: {1.0})
+
+        tags {Dict[str, str]} -- The tags of the counter, for example the endpoint. (default: {None})
+        """
+
+        pass
+
+    def observe(self, name: str, seconds: float, tags: Dict[str, str] = None) -> None:
+        """Adds a latency to a histogram.
+
+        Arguments:
+        ----
+        name {str} -- The histogram name, for example `stage_duration`.
+
+        seconds {float} -- The latency in seconds.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the measurement, for example the stage. (default: {None})
+        """
+
+        pass
+
+    def timer(self, name: str, tags: Dict[str, str] = None) -> MetricTimer:
+        """Times a block of code, as a context manager.
+
+        Arguments:
+        ----
+        name {str} -- The histogram name, for example `stage_duration`.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the measurement. (default: {None})
+
+        Returns:
+        ----
+        {MetricTimer} -- The timer, or a timer that does nothing if the sink is turned off.
+
+        Usage:
+        ----
+            >>> with trading_robot.metrics.timer(name='stage_duration', tags={'stage': 'fetch'}):
+                    latest_bars = trading_robot.get_latest_bar()
+        """
+
+        if not self.enabled:
+            return _NULL_TIMER
+
+        return MetricTimer(sink=self, name=name, tags=tags)
+
+
+# The sink used when no other is given.
+NULL_METRICS = MetricsSink()
+
+
+class MetricsRegistry(MetricsSink):
+
+    """
+    Represents a sink that keeps every counter and latency histogram in
+    memory, so they can be read back or exported.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initalizes the Metrics Registry.
+
+        Keyword Arguments:
+        ----
+        buckets {Tuple[float, ...]} -- The upper bounds, in seconds, of every
+            histogram's buckets. (default: {LATENCY_BUCKETS})
+
+        Usage:
+        ----
+            >>> metrics = MetricsRegistry()
+            >>> trading_robot = PyRobot(client_id=CLIENT_ID, redirect_uri=REDIRECT_URI, metrics=metrics)
+            >>> trading_robot.process_latest_bar()
+            >>> metrics.report()['stage_duration']
+        """
+
+        self.buckets = tuple(buckets)
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, LatencyHistogram] = {}
+
+        # The prices are fetched, and the orders placed, from several threads.
+        self._lock = threading.Lock()
+
+    def _key(self, name: str, tags: Dict[str, str] = None) -> MetricKey:
+        """Builds the key a metric is stored under.
+
+        Arguments:
+        ----
+        name {str} -- The metric name.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the metric. (default: {None})
+
+        Returns:
+        ----
+        {MetricKey} -- The name and the sorted tags.
+        """
+
+        return (name, tuple(sorted((tag, str(value)) for tag, value in tags.items())) if tags else ())
+
+    def increment(self, name: str, value: float = 1.0, tags: Dict[str, str] = None) -> None:
+
+        key = self._key(name=name, tags=tags)
+
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, tags: Dict[str, str] = None) -> None:
+
+        key = self._key(name=name, tags=tags)
+
+        with self._lock:
+
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram(buckets=self.buckets)
+
+            self.histograms[key].record(seconds=seconds)
+
+    def counter(self, name: str, tags: Dict[str, str] = None) -> float:
+        """Reads a counter.
+
+        Arguments:
+        ----
+        name {str} -- The counter name.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the counter. (default: {None})
+
+        Returns:
+        ----
+        {float} -- The count, or `0.0` if nothing was counted.
+        """
+
+        return self.counters.get(self._key(name=name, tags=tags), 0.0)
+
+    def histogram(self, name: str, tags: Dict[str, str] = None) -> LatencyHistogram:
+        """Reads a latency histogram.
+
+        Arguments:
+        ----
+        name {str} -- The histogram name.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the histogram. (default: {None})
+
+        Returns:
+        ----
+        {LatencyHistogram} -- The histogram, or an empty one if nothing was measured.
+        """
+
+        return self.histograms.get(self._key(name=name, tags=tags), LatencyHistogram(buckets=self.buckets))
+
+    def report(self) -> Dict[str, dict]:
+        """Summarizes every metric.
+
+        Returns:
+        ----
+        {Dict[str, dict]} -- For each metric name, each tag combination joined by commas,
+            with its count or its latency summary in milliseconds.
+
+        Usage:
+        ----
+            >>> metrics.report()
+            {
+                'rows_appended': {'': 1200.0},
+                'stage_duration': {'stage=fetch': {'count': 60, 'mean_ms': 84.2, ...}, ...}
+            }
+        """
+
+        report = {}
+
+        with self._lock:
+
+            for (name, tags), value in self.counters.items():
+                report.setdefault(name, {})[_join_tags(tags=tags)] = value
+
+            for (name, tags), histogram in self.histograms.items():
+                report.setdefault(name, {})[_join_tags(tags=tags)] = histogram.to_dict()
+
+        return report
+
+    def reset(self) -> None:
+        """Clears every counter and histogram."""
+
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+
+class PrometheusSink(MetricsRegistry):
+
+    """
+    Represents a registry that exposes its metrics in the Prometheus text
+    format, served over HTTP for a Prometheus server to scrape.
+    """
+
+    def __init__(self, namespace: str = 'pyrobot', buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initalizes the Prometheus Sink.
+
+        Overview:
+        ----
+        Counters are exposed as `<namespace>_<name>_total` and latency histograms as
+        `<namespace>_<name>_seconds`, with the tags as labels. Call `start` to serve
+        them on `/metrics`, then add the address to the scrape targets of Prometheus,
+        or call `render` to push them some other way.
+
+        Keyword Arguments:
+        ----
+        namespace {str} -- The prefix of every metric name. (default: {'pyrobot'})
+
+        buckets {Tuple[float, ...]} -- The upper bounds, in seconds, of every
+            histogram's buckets. (default: {LATENCY_BUCKETS})
+
+        Usage:
+        ----
+            >>> metrics = PrometheusSink()
+            >>> metrics.start(port=9108)
+            >>> trading_robot = PyRobot(client_id=CLIENT_ID, redirect_uri=REDIRECT_URI, metrics=metrics)
+        """
+
+        super().__init__(buckets=buckets)
+
+        self.namespace = namespace
+        self._http_server: ThreadingHTTPServer = None
+        self._thread: threading.Thread = None
+
+    @property
+    def url(self) -> str:
+        """The URL the metrics are served on, once started."""
+
+        host, port = self._http_server.server_address[:2]
+
+        return 'http://{host}:{port}/metrics'.format(host=host, port=port)
+
+    def render(self) -> str:
+        """Writes every metric in the Prometheus text format.
+
+        Returns:
+        ----
+        {str} -- The metrics, one sample per line.
+        """
+
+        lines = []
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+
+            # Copy the bucket counts, so a measurement can't land between two lines.
+            histograms = [
+                (key, histogram.cumulative_counts(), histogram.total, histogram.count)
+                for key, histogram in histograms
+            ]
+
+        last_name = None
+
+        for (name, tags), value in counters:
+
+            metric_name = '{namespace}_{name}_total'.format(namespace=self.namespace, name=name)
+
+            if name != last_name:
+                lines.append('# TYPE {metric_name} counter'.format(metric_name=metric_name))
+                last_name = name
+
+            lines.append('{metric_name}{labels} {value}'.format(
+                metric_name=metric_name,
+                labels=_prometheus_labels(tags=tags),
+                value=_prometheus_value(value=value)
+            ))
+
+        last_name = None
+
+        for (name, tags), cumulative_counts, total, count in histograms:
+
+            metric_name = '{namespace}_{name}_seconds'.format(namespace=self.namespace, name=name)
+
+            if name != last_name:
+                lines.append('# TYPE {metric_name} histogram'.format(metric_name=metric_name))
+                last_name = name
+
+            for upper_bound, bucket_count in cumulative_counts:
+                lines.append('{metric_name}_bucket{labels} {value}'.format(
+                    metric_name=metric_name,
+                    labels=_prometheus_labels(tags=tags + (('le', _prometheus_value(value=upper_bound)),)),
+                    value=bucket_count
+                ))
+
+            lines.append('{metric_name}_sum{labels} {value}'.format(
+                metric_name=metric_name,
+                labels=_prometheus_labels(tags=tags),
+                value=_prometheus_value(value=total)
+            ))
+            lines.append('{metric_name}_count{labels} {value}'.format(
+                metric_name=metric_name,
+                labels=_prometheus_labels(tags=tags),
+                value=count
+            ))
+
+        return '\n'.join(lines) + '\n'
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> 'PrometheusSink':
+        """Serves the metrics on `/metrics`, from a background thread.
+
+        Keyword Arguments:
+        ----
+        host {str} -- The address to listen on. (default: {'127.0.0.1'})
+
+        port {int} -- The port to listen on, or `0` for any free port. (default: {0})
+
+        Returns:
+        ----
+        {PrometheusSink} -- The sink.
+        """
+
+        handler = type('PrometheusRequestHandler', (_PrometheusRequestHandler,), {'sink': self})
+
+        self._http_server = ThreadingHTTPServer((host, port), handler)
+        self._http_server.daemon_threads = True
+
+        self._thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stops serving the metrics."""
+
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+
+class _PrometheusRequestHandler(BaseHTTPRequestHandler):
+
+    """Answers the scrapes of a Prometheus server."""
+
+    sink: PrometheusSink = None
+
+    def do_GET(self) -> None:
+
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        payload = self.sink.render().encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keeps the scrapes out of the robot's output."""
+
+        pass
+
+
+class StatsDSink(MetricsSink):
+
+    """
+    Represents a sink that sends every measurement to a StatsD collector
+    over UDP, as soon as it's made.
+    """
+
+    enabled = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8125, prefix: str = 'pyrobot', dogstatsd_tags: bool = False) -> None:
+        """Initalizes the StatsD Sink.
+
+        Overview:
+        ----
+        Counters are sent as `<prefix>.<name>:<value>|c` and latencies as
+        `<prefix>.<name>:<milliseconds>|ms`. Plain StatsD has no tags, so by
+        default the tag values are added to the name, in the order of their
+        tag names, for example `pyrobot.stage_duration.fetch`. Collectors that
+        understand DogStatsD tags, like the Datadog agent or Telegraf, can get
+        them as tags instead. Packets that can't be sent are dropped, so a
+        collector that's down never slows the robot.
+
+        Keyword Arguments:
+        ----
+        host {str} -- The address of the collector. (default: {'127.0.0.1'})
+
+        port {int} -- The UDP port of the collector. (default: {8125})
+
+        prefix {str} -- The prefix of every metric name. (default: {'pyrobot'})
+
+        dogstatsd_tags {bool} -- If `True`, the tags are sent in the DogStatsD format,
+            `|#stage:fetch`. (default: {False})
+
+        Usage:
+        ----
+            >>> metrics = StatsDSink(host='127.0.0.1', port=8125)
+            >>> trading_robot = PyRobot(client_id=CLIENT_ID, redirect_uri=REDIRECT_URI, metrics=metrics)
+        """
+
+        self.address = (host, port)
+        self.prefix = prefix
+        self.dogstatsd_tags = dogstatsd_tags
+        self.dropped = 0
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def increment(self, name: str, value: float = 1.0, tags: Dict[str, str] = None) -> None:
+        self._send(name=name, value=_statsd_value(value=value), metric_type='c', tags=tags)
+
+    def observe(self, name: str, seconds: float, tags: Dict[str, str] = None) -> None:
+        self._send(name=name, value=_statsd_value(value=seconds * 1000), metric_type='ms', tags=tags)
+
+    def _send(self, name: str, value: str, metric_type: str, tags: Dict[str, str] = None) -> None:
+        """Formats a measurement and sends it to the collector.
+
+        Arguments:
+        ----
+        name {str} -- The metric name.
+
+        value {str} -- The formatted value.
+
+        metric_type {str} -- The StatsD type, `c` or `ms`.
+
+        Keyword Arguments:
+        ----
+        tags {Dict[str, str]} -- The tags of the measurement. (default: {None})
+        """
+
+        sorted_tags = sorted(tags.items()) if tags else []
+        metric_name = '.'.join([self.prefix, name]) if self.prefix else name
+
+        if self.dogstatsd_tags:
+            packet = '{metric_name}:{value}|{metric_type}'.format(metric_name=metric_name, value=value, metric_type=metric_type)
+            if sorted_tags:
+                packet += '|#' + ','.join('{tag}:{tag_value}'.format(tag=tag, tag_value=tag_value) for tag, tag_value in sorted_tags)
+        else:
+            metric_name = '.'.join([metric_name] + [_statsd_name(value=tag_value) for _, tag_value in sorted_tags])
+            packet = '{metric_name}:{value}|{metric_type}'.format(metric_name=metric_name, value=value, metric_type=metric_type)
+
+        try:
+            self._socket.sendto(packet.encode(), self.address)
+        except OSError:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Closes the socket."""
+
+        self._socket.close()
+
+
+class InstrumentedSession():
+
+    """
+    Represents a TD session that counts and times every request it sends.
+    It can be used anywhere a `TDClient` is used.
+    """
+
+    def __init__(self, session: TDClient, metrics: MetricsSink) -> None:
+        """Initalizes the Instrumented Session.
+
+        Overview:
+        ----
+        Every call counts towards `api_requests`, tagged with the endpoint and
+        whether it returned (`ok`) or raised (`error`), and its latency goes to
+        the `api_request_duration` histogram, tagged with the endpoint. The robot
+        wraps the client in this before the rate limiter and the retries, so each
+        retry is a request of its own and the time spent waiting for the rate
+        limiter isn't counted.
+
+        Arguments:
+        ----
+        session {TDClient} -- An authenticated session with the TD API.
+
+        metrics {MetricsSink} -- The sink the requests are reported to.
+        """
+
+        self.session = session
+        self.metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+
+        attribute = getattr(self.session, name)
+
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def instrumented_request(*args, **kwargs) -> Any:
+
+            status = 'error'
+            start = time.perf_counter()
+
+            try:
+                response = attribute(*args, **kwargs)
+                status = 'ok'
+                return response
+            finally:
+                self.metrics.observe(name='api_request_duration', seconds=time.perf_counter() - start, tags={'endpoint': name})
+                self.metrics.increment(name='api_requests', tags={'endpoint': name, 'status': status})
+
+        return instrumented_request
+
+
+def _join_tags(tags: Tuple[Tuple[str, str], ...]) -> str:
+    """Joins sorted tags into `name=value` pairs, separated by commas.
+
+    Arguments:
+    ----
+    tags {Tuple[Tuple[str, str], ...]} -- The sorted tags.
+
+    Returns:
+    ----
+    {str} -- The joined tags, empty if there aren't any.
+    """
+
+    return ','.join('{tag}={value}'.format(tag=tag, value=value) for tag, value in tags)
+
+
+def _prometheus_labels(tags: Tuple[Tuple[str, str], ...]) -> str:
+    """Formats tags as Prometheus labels, escaping their values.
+
+    Arguments:
+    ----
+    tags {Tuple[Tuple[str, str], ...]} -- The sorted tags.
+
+    Returns:
+    ----
+    {str} -- The labels in braces, or an empty string if there aren't any.
+    """
+
+    if not tags:
+        return ''
+
+    labels: List[str] = []
+
+    for tag, value in tags:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        labels.append('{tag}="{value}"'.format(tag=tag, value=value))
+
+    return '{' + ','.join(labels) + '}'
+
+
+def _prometheus_value(value: float) -> str:
+    """Formats a sample value, or a bucket bound, the way Prometheus writes them.
+
+    Arguments:
+    ----
+    value {float} -- The value.
+
+    Returns:
+    ----
+    {str} -- The value, with infinity as `+Inf`.
+    """
+
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value))
+
+
+def _statsd_value(value: float) -> str:
+    """Formats a StatsD value, without a trailing `.0` on whole numbers.
+
+    Arguments:
+    ----
+    value {float} -- The value.
+
+    Returns:
+    ----
+    {str} -- The formatted value.
+    """
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return '{value:.6f}'.format(value=value).rstrip('0')
+
+
+def _statsd_name(value: str) -> str:
+    """Makes a tag value safe to use in a StatsD metric name.
+
+    Arguments:
+    ----
+    value {str} -- The tag value.
+
+    Returns:
+    ----
+    {str} -- The value, with anything that isn't a letter, a digit, `-` or `_` replaced by `_`.
+    """
+
+    return ''.join(character if character.isalnum() or character in '-_' else '_' for character in str(value))
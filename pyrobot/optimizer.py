@@ -0,0 +1,669 @@
+import os
+import itertools
+import weakref
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Callable
+
+from pyrobot.cache import IndicatorCache
+from pyrobot.backtest import Backtester
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+
+# The state of the backtest worker in this process, set up by `_init_worker`.
+_worker_state: dict = {}
+
+
+def parameter_grid(param_grid: Dict[str, List[Any]]) -> List[dict]:
+    """Builds every combination of a grid of parameters.
+
+    Arguments:
+    ----
+    param_grid {Dict[str, List[Any]]} -- The values to try for each parameter.
+
+    Returns:
+    ----
+    {List[dict]} -- One dictionary of parameters per combination, with the
+        last parameter changing fastest.
+
+    Usage:
+    ----
+        >>> parameter_grid(param_grid={'rsi_period': [7, 14], 'buy_below': [20, 30]})
+        [
+            {'rsi_period': 7, 'buy_below': 20},
+            {'rsi_period': 7, 'buy_below': 30},
+            {'rsi_period': 14, 'buy_below': 20},
+            {'rsi_period': 14, 'buy_below': 30}
+        ]
+    """
+
+    names = list(param_grid.keys())
+
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*[list(param_grid[name]) for name in names])
+    ]
+
+
+def parameter_samples(param_distributions: Dict[str, Any], n_iter: int, seed: int = None) -> List[dict]:
+    """Draws random combinations of parameters.
+
+    Arguments:
+    ----
+    param_distributions {Dict[str, Any]} -- How to draw each parameter. A list,
+        tuple or range is sampled uniformly, an object with an `rvs` method, like
+        a `scipy.stats` distribution, is sampled with it, and a callable is called
+        with a `np.random.RandomState`.
+
+    n_iter {int} -- The number of combinations to draw.
+
+    Keyword Arguments:
+    ----
+    seed {int} -- The seed of the random state, for repeatable draws. (default: {None})
+
+    Returns:
+    ----
+    {List[dict]} -- One dictionary of parameters per draw.
+
+    Usage:
+    ----
+        >>> parameter_samples(
+                param_distributions={
+                    'rsi_period': range(5, 30),
+                    'stop_size': lambda random_state: random_state.uniform(0.01, 0.05)
+                },
+                n_iter=50,
+                seed=7
+            )
+    """
+
+    random_state = np.random.RandomState(seed=seed)
+    samples = []
+
+    for _ in range(n_iter):
+
+        params = {}
+
+        for name, distribution in param_distributions.items():
+
+            if hasattr(distribution, 'rvs'):
+                value = distribution.rvs(random_state=random_state)
+            elif callable(distribution):
+                value = distribution(random_state)
+            else:
+                values = list(distribution)
+                value = values[random_state.randint(len(values))]
+
+            # Keep plain Python numbers, so the parameters print and compare cleanly.
+            params[name] = value.item() if isinstance(value, np.generic) else value
+
+        samples.append(params)
+
+    return samples
+
+
+class SharedPriceArray():
+
+    """
+    Represents the numeric columns of a StockFrame, copied once into
+    shared memory so every worker process reads the same prices.
+    """
+
+    def __init__(self, stock_frame: StockFrame) -> None:
+        """Initalizes the Shared Price Array.
+
+        Overview:
+        ----
+        The numeric columns and the bar times are stored as one block of shared
+        memory, a column per row of the block, in the StockFrame's order. Workers
+        attach to the block by its name with `SharedPriceArray.attach`, so the
+        prices are never pickled, and the StockFrame they build reads the shared
+        columns in place. The block is freed by `close`, or when the array is
+        garbage collected.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The bars to share.
+
+        Usage:
+        ----
+            >>> shared_prices = SharedPriceArray(stock_frame=stock_frame)
+            >>> stock_frame_view, shared_block = SharedPriceArray.attach(spec=shared_prices.spec)
+            >>> shared_prices.close()
+        """
+
+        frame = stock_frame.frame
+
+        if frame.empty:
+            raise ValueError("The StockFrame has no rows to share.")
+
+        self.columns: List[str] = frame.select_dtypes(include='number').columns.tolist()
+        self.rows: int = len(frame)
+        self.symbol_bounds: List[Tuple[str, int, int]] = list(stock_frame.symbol_bounds)
+
+        self._shared_memory = shared_memory.SharedMemory(
+            create=True,
+            size=(len(self.columns) + 1) * self.rows * 8
+        )
+        self._finalizer = weakref.finalize(self, SharedPriceArray._release, self._shared_memory)
+
+        block = np.ndarray(
+            shape=(len(self.columns) + 1, self.rows),
+            dtype=np.float64,
+            buffer=self._shared_memory.buf
+        )
+
+        for index, column in enumerate(self.columns):
+            block[index] = frame[column].to_numpy(dtype=float)
+
+        # The bar times are kept as epoch milliseconds, like the API returns them.
+        block[-1].view(np.int64)[:] = frame.index.get_level_values(1).to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+    @property
+    def spec(self) -> dict:
+        """Everything a worker needs to attach to the shared prices.
+
+        Returns:
+        ----
+        {dict} -- The name of the block, its columns, rows and symbol bounds.
+        """
+
+        return {
+            'name': self._shared_memory.name,
+            'columns': self.columns,
+            'rows': self.rows,
+            'symbol_bounds': self.symbol_bounds
+        }
+
+    @staticmethod
+    def attach(spec: dict) -> Tuple[StockFrame, shared_memory.SharedMemory]:
+        """Builds a StockFrame over the shared prices, without copying them.
+
+        Arguments:
+        ----
+        spec {dict} -- The `spec` of a Shared Price Array.
+
+        Returns:
+        ----
+        {Tuple[StockFrame, shared_memory.SharedMemory]} -- The StockFrame and the shared
+            block it reads, which has to stay open while the StockFrame is used.
+        """
+
+        shared_block = shared_memory.SharedMemory(name=spec['name'])
+
+        block = np.ndarray(
+            shape=(len(spec['columns']) + 1, spec['rows']),
+            dtype=np.float64,
+            buffer=shared_block.buf
+        )
+
+        # Nothing in a worker may write to the shared prices.
+        block.flags.writeable = False
+
+        symbols = np.empty(spec['rows'], dtype=object)
+        for symbol, start, stop in spec['symbol_bounds']:
+            symbols[start:stop] = symbol
+
+        data = {'symbol': symbols, 'datetime': block[-1].view(np.int64)}
+        data.update({column: block[index] for index, column in enumerate(spec['columns'])})
+
+        # The rows are already sorted, so the StockFrame keeps the shared columns as they are.
+        return StockFrame(data=pd.DataFrame(data=data, copy=False)), shared_block
+
+    @staticmethod
+    def _release(shared_block: shared_memory.SharedMemory) -> None:
+        """Closes and frees a shared block.
+
+        Arguments:
+        ----
+        shared_block {shared_memory.SharedMemory} -- The block to free.
+        """
+
+        shared_block.close()
+        shared_block.unlink()
+
+    def close(self) -> None:
+        """Frees the shared memory. Workers must be done with it."""
+
+        self._finalizer()
+
+
+def _init_worker(spec: dict, strategy: Callable, backtest_args: dict, cache_args: dict) -> None:
+    """Attaches a worker process to the shared prices.
+
+    Arguments:
+    ----
+    spec {dict} -- The `spec` of the Shared Price Array.
+
+    strategy {Callable} -- The function that sets up the indicators and trades of a run.
+
+    backtest_args {dict} -- The keyword arguments of every `Backtester`.
+
+    cache_args {dict} -- The keyword arguments of the worker's `IndicatorCache`.
+    """
+
+    stock_frame, shared_block = SharedPriceArray.attach(spec=spec)
+
+    _worker_state.clear()
+    _worker_state.update({
+        'stock_frame': stock_frame,
+        'shared_block': shared_block,
+        'base_columns': stock_frame.frame.columns.tolist(),
+        'strategy': strategy,
+        'backtest_args': backtest_args,
+        'cache': IndicatorCache(**cache_args),
+        'window': None,
+        'window_frame': None
+    })
+
+
+def _close_worker() -> None:
+    """Lets go of the shared prices in this process."""
+
+    shared_block = _worker_state.get('shared_block')
+    _worker_state.clear()
+
+    if shared_block is not None:
+        shared_block.close()
+
+
+def _worker_frame(window: Tuple[int, int] = None) -> StockFrame:
+    """Grabs the worker's StockFrame, cut down to a window of time if one is given.
+
+    Keyword Arguments:
+    ----
+    window {Tuple[int, int]} -- The first and the last bar time to keep, in epoch
+        milliseconds. (default: {None})
+
+    Returns:
+    ----
+    {StockFrame} -- The StockFrame, with only the shared columns.
+    """
+
+    stock_frame = _worker_state['stock_frame']
+
+    if window is not None:
+
+        # The runs of a fold come in a row, so only the last window is kept.
+        if _worker_state['window'] != window:
+
+            frame = stock_frame.frame[_worker_state['base_columns']]
+            times = frame.index.get_level_values(1).to_numpy(dtype='datetime64[ms]').astype(np.int64)
+            window_rows = frame[(times >= window[0]) & (times <= window[1])].reset_index()
+            window_rows['datetime'] = window_rows['datetime'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+            _worker_state['window'] = window
+            _worker_state['window_frame'] = StockFrame(data=window_rows)
+
+        stock_frame = _worker_state['window_frame']
+
+    # Take off the indicators the last run added.
+    extra_columns = stock_frame.frame.columns.difference(_worker_state['base_columns'])
+    if len(extra_columns):
+        stock_frame.frame.drop(columns=extra_columns, inplace=True)
+
+    return stock_frame
+
+
+def _run_backtest(task: Tuple[dict, Tuple[int, int]]) -> dict:
+    """Runs a single backtest in a worker.
+
+    Arguments:
+    ----
+    task {Tuple[dict, Tuple[int, int]]} -- The parameters and the window of time
+        of the run.
+
+    Returns:
+    ----
+    {dict} -- The statistics of the run.
+    """
+
+    params, window = task
+
+    stock_frame = _worker_frame(window=window)
+    indicator_client = Indicators(price_data_frame=stock_frame, cache=_worker_state['cache'])
+    trades_to_execute = _worker_state['strategy'](indicator_client, **params)
+
+    backtester = Backtester(
+        stock_frame=stock_frame,
+        indicator_client=indicator_client,
+        trades_to_execute=trades_to_execute,
+        **_worker_state['backtest_args']
+    )
+
+    return backtester.run().stats
+
+
+class Optimizer():
+
+    """
+    Represents a parameter search over backtests of a strategy, run
+    across a pool of worker processes.
+    """
+
+    def __init__(self, stock_frame: StockFrame, strategy: Callable, workers: int = None, metric: str = 'sharpe',
+                 cache_bytes: int = 256 * 1024 * 1024, cache_directory: str = None, **backtest_args) -> None:
+        """Initalizes the Optimizer.
+
+        Overview:
+        ----
+        The strategy is a function that takes an `Indicators` object and the
+        parameters of a run as keyword arguments, adds its indicators and signals,
+        and returns the trade templates in the format `Backtester` expects. It runs
+        in the worker processes, so it has to be defined at the top of a module.
+
+        The prices are put in shared memory once, and each worker builds its
+        StockFrame over them when it starts, so nothing is copied per worker or
+        per run. Each worker has its own `IndicatorCache`: a run that uses the same
+        indicator parameters as an earlier run in that worker reads the columns
+        from the cache instead of calculating them. Runs are handed out in chunks
+        in the order given, so putting the indicator parameters first in a grid
+        keeps the runs that share them on the same worker. Pass `cache_directory`
+        to share the cached columns between workers, and between optimizations,
+        through the disk.
+
+        The pool is started by the first search and kept until `close`, so later
+        searches reuse the warm workers. With one worker, the runs happen in this
+        process instead.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The bars to test over.
+
+        strategy {Callable} -- The function that sets up each run.
+
+        Keyword Arguments:
+        ----
+        workers {int} -- The number of worker processes. Defaults to one per core. (default: {None})
+
+        metric {str} -- The statistic from `performance_stats` to maximize. (default: {'sharpe'})
+
+        cache_bytes {int} -- The most memory each worker's indicator cache can use. (default: {256 MB})
+
+        cache_directory {str} -- A folder to persist the indicator cache to. (default: {None})
+
+        **backtest_args -- Passed to every `Backtester`, for example `commission` or `slippage`.
+
+        Usage:
+        ----
+            >>> def rsi_strategy(indicator_client, rsi_period, buy_below, sell_above):
+                    indicator_client.rsi(period=rsi_period)
+                    indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='rsi', condition='<', value=buy_below))
+                    indicator_client.add_signal_rule(rule=ThresholdRule(side='sell', indicator='rsi', condition='>', value=sell_above))
+                    return trades_dict
+            >>> with Optimizer(stock_frame=stock_frame, strategy=rsi_strategy, commission=1.0) as optimizer:
+                    results = optimizer.grid_search(
+                        param_grid={'rsi_period': [7, 14, 21], 'buy_below': [20, 30], 'sell_above': [70, 80]}
+                    )
+            >>> results.head()
+        """
+
+        self.strategy = strategy
+        self.workers = workers or os.cpu_count() or 1
+        self.metric = metric
+        self.backtest_args = backtest_args
+
+        self._cache_args = {'max_bytes': cache_bytes, 'directory': cache_directory}
+        self._shared_prices = SharedPriceArray(stock_frame=stock_frame)
+        self._bar_times = np.unique(
+            stock_frame.frame.index.get_level_values(1).to_numpy(dtype='datetime64[ms]').astype(np.int64)
+        )
+        self._executor: ProcessPoolExecutor = None
+
+    def __enter__(self) -> 'Optimizer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _run(self, tasks: List[Tuple[dict, Tuple[int, int]]]) -> List[dict]:
+        """Runs backtests, in the worker pool if there's more than one worker.
+
+        Arguments:
+        ----
+        tasks {List[Tuple[dict, Tuple[int, int]]]} -- The parameters and window of each run.
+
+        Returns:
+        ----
+        {List[dict]} -- The statistics of each run, in the order of the tasks.
+        """
+
+        initargs = (self._shared_prices.spec, self.strategy, self.backtest_args, self._cache_args)
+
+        if self.workers == 1:
+
+            _init_worker(*initargs)
+
+            try:
+                return [_run_backtest(task=task) for task in tasks]
+            finally:
+                _close_worker()
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=initargs
+            )
+
+        # A few chunks per worker keeps every core busy without sending tasks one at a time.
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+
+        return list(self._executor.map(_run_backtest, tasks, chunksize=chunksize))
+
+    def search(self, candidates: List[dict], window: Tuple[int, int] = None) -> pd.DataFrame:
+        """Backtests each set of parameters and ranks them by the metric.
+
+        Arguments:
+        ----
+        candidates {List[dict]} -- The parameters of each run.
+
+        Keyword Arguments:
+        ----
+        window {Tuple[int, int]} -- Only test the bars between these times, in
+            epoch milliseconds. (default: {None})
+
+        Returns:
+        ----
+        {pd.DataFrame} -- One row per run, with the parameters followed by the
+            statistics, best first.
+        """
+
+        stats = self._run(tasks=[(params, window) for params in candidates])
+
+        results = pd.concat(
+            [pd.DataFrame(data=candidates), pd.DataFrame(data=stats)],
+            axis=1
+        )
+
+        # A run without a metric, like one with no trades, ranks last.
+        return results.sort_values(by=self.metric, ascending=False, na_position='last', kind='stable')
+
+    def grid_search(self, param_grid: Dict[str, List[Any]]) -> pd.DataFrame:
+        """Backtests every combination of a grid of parameters.
+
+        Arguments:
+        ----
+        param_grid {Dict[str, List[Any]]} -- The values to try for each parameter.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The runs, best first.
+        """
+
+        return self.search(candidates=parameter_grid(param_grid=param_grid))
+
+    def random_search(self, param_distributions: Dict[str, Any], n_iter: int = 20, seed: int = None) -> pd.DataFrame:
+        """Backtests random combinations of parameters.
+
+        Arguments:
+        ----
+        param_distributions {Dict[str, Any]} -- How to draw each parameter, see
+            `parameter_samples`.
+
+        Keyword Arguments:
+        ----
+        n_iter {int} -- The number of runs. (default: {20})
+
+        seed {int} -- The seed of the random draws. (default: {None})
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The runs, best first.
+        """
+
+        return self.search(
+            candidates=parameter_samples(param_distributions=param_distributions, n_iter=n_iter, seed=seed)
+        )
+
+    def walk_forward_windows(self, train_bars: int, test_bars: int, step_bars: int = None,
+                             anchored: bool = False) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Splits the bar times into training and testing windows.
+
+        Arguments:
+        ----
+        train_bars {int} -- The number of bars each training window covers.
+
+        test_bars {int} -- The number of bars each testing window covers.
+
+        Keyword Arguments:
+        ----
+        step_bars {int} -- How far each fold moves forward. Defaults to `test_bars`,
+            so the testing windows don't overlap. (default: {None})
+
+        anchored {bool} -- If `True`, every training window starts at the first bar
+            and grows, instead of rolling forward. (default: {False})
+
+        Returns:
+        ----
+        {List[Tuple[Tuple[int, int], Tuple[int, int]]]} -- The first and last time of the
+            training and the testing window of each fold.
+        """
+
+        step_bars = step_bars or test_bars
+        windows = []
+
+        for start in range(0, len(self._bar_times) - train_bars - test_bars + 1, step_bars):
+
+            train_start = 0 if anchored else start
+            test_start = start + train_bars
+
+            windows.append((
+                (int(self._bar_times[train_start]), int(self._bar_times[test_start - 1])),
+                (int(self._bar_times[test_start]), int(self._bar_times[test_start + test_bars - 1]))
+            ))
+
+        return windows
+
+    def walk_forward(self, candidates: Union[List[dict], Dict[str, List[Any]]], train_bars: int, test_bars: int,
+                     step_bars: int = None, anchored: bool = False) -> pd.DataFrame:
+        """Picks the best parameters on each training window and tests them on the next bars.
+
+        Overview:
+        ----
+        Every fold's search runs in the pool at once. The indicators of each window
+        are calculated from its own bars, so the first bars of a testing window have
+        no history to warm up from.
+
+        Arguments:
+        ----
+        candidates {Union[List[dict], Dict[str, List[Any]]]} -- The parameters to search,
+            as a list of runs or as a grid.
+
+        train_bars {int} -- The number of bars each training window covers.
+
+        test_bars {int} -- The number of bars each testing window covers.
+
+        Keyword Arguments:
+        ----
+        step_bars {int} -- How far each fold moves forward. (default: {None})
+
+        anchored {bool} -- If `True`, the training windows all start at the first bar. (default: {False})
+
+        Returns:
+        ----
+        {pd.DataFrame} -- One row per fold, with its windows, the chosen parameters,
+            their training metric and the statistics of the testing window.
+
+        Usage:
+        ----
+            >>> with Optimizer(stock_frame=stock_frame, strategy=rsi_strategy) as optimizer:
+                    folds = optimizer.walk_forward(
+                        candidates={'rsi_period': [7, 14, 21], 'buy_below': [20, 30], 'sell_above': [70, 80]},
+                        train_bars=5000,
+                        test_bars=1000
+                    )
+            >>> folds['total_return'].sum()
+        """
+
+        if isinstance(candidates, dict):
+            candidates = parameter_grid(param_grid=candidates)
+
+        windows = self.walk_forward_windows(
+            train_bars=train_bars,
+            test_bars=test_bars,
+            step_bars=step_bars,
+            anchored=anchored
+        )
+
+        if not windows:
+            raise ValueError("There aren't enough bars for a single training and testing window.")
+
+        # Search every training window in one go, so the pool stays busy between folds.
+        train_stats = self._run(tasks=[
+            (params, train_window) for train_window, _ in windows for params in candidates
+        ])
+
+        best_params = []
+        best_metrics = []
+
+        for fold in range(len(windows)):
+
+            fold_stats = train_stats[fold * len(candidates):(fold + 1) * len(candidates)]
+            metrics = np.array([stats[self.metric] for stats in fold_stats], dtype=float)
+
+            # The first candidate wins if none of them have a metric.
+            best = int(np.nanargmax(metrics)) if not np.isnan(metrics).all() else 0
+
+            best_params.append(candidates[best])
+            best_metrics.append(metrics[best])
+
+        test_stats = self._run(tasks=[
+            (params, test_window) for params, (_, test_window) in zip(best_params, windows)
+        ])
+
+        folds = []
+
+        for (train_window, test_window), params, train_metric, stats in zip(windows, best_params, best_metrics, test_stats):
+
+            fold = {
+                'train_start': pd.to_datetime(train_window[0], unit='ms'),
+                'train_end': pd.to_datetime(train_window[1], unit='ms'),
+                'test_start': pd.to_datetime(test_window[0], unit='ms'),
+                'test_end': pd.to_datetime(test_window[1], unit='ms'),
+                'params': params,
+                'train_' + self.metric: train_metric
+            }
+            fold.update(stats)
+            folds.append(fold)
+
+        return pd.DataFrame(data=folds)
+
+    def close(self) -> None:
+        """Shuts down the worker pool and frees the shared prices."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self._shared_prices.close()
@@ -0,0 +1,488 @@
+import importlib
+import numpy as np
+
+from typing import Dict
+from typing import List
+
+from pyrobot import kernels
+from pyrobot.rolling import RollingStatistics
+from pyrobot.rolling import ExponentialMovingAverage
+
+
+class IndicatorPlugin():
+
+    """
+    Represents a custom indicator that can be added to an `Indicators`
+    object with `Indicators.add_plugin`.
+
+    Overview:
+    ----
+    A plugin declares the StockFrame columns it reads (`inputs`), the columns
+    it writes (`outputs`) and how many previous bars it needs to calculate the
+    newest bar (`lookback`). It must implement `batch`, which calculates the
+    whole history of a single symbol at once. Once added, the plugin is
+    refreshed with the other indicators, its results are cached when the
+    `Indicators` object has a cache, and its symbols are sharded across the
+    `Indicators` workers.
+
+    When rows are appended, only the new rows are calculated. If the plugin
+    implements `update`, it's called with the new rows and a state dictionary
+    it can keep between calls. Otherwise `batch` is run over the new rows plus
+    the last `lookback` bars, so `lookback` must cover the indicator's window.
+
+    Usage:
+    ----
+        >>> class TypicalPrice(IndicatorPlugin):
+
+                name = 'typical_price'
+                inputs = ['high', 'low', 'close']
+                outputs = ['typical_price']
+
+                def batch(self, high, low, close):
+                    return {'typical_price': (high + low + close) / 3}
+
+                def update(self, state, high, low, close):
+                    return self.batch(high=high, low=low, close=close)
+
+        >>> indicator_client.add_plugin(plugin=TypicalPrice())
+    """
+
+    name: str = None
+    inputs: List[str] = ['close']
+    outputs: List[str] = None
+    lookback: int = 0
+
+    def __init__(self, **params) -> None:
+        """Initalizes the plugin.
+
+        Keyword Arguments:
+        ----
+        params -- Any arguments the plugin needs, for example `period=14`.
+            They are stored on `params` and are part of the cache key. A plugin
+            that overrides `__init__` should pass its own arguments through, so
+            `plugin_from_dict` can rebuild it from `params`.
+        """
+
+        self.params = params
+
+        if self.name is None:
+            raise ValueError('An indicator plugin must have a name.')
+
+        if self.outputs is None:
+            self.outputs = [self.name]
+
+    @property
+    def key(self) -> str:
+        """Identifies the plugin and its arguments, used when caching results.
+
+        Returns:
+        ----
+        {str} -- The plugin class, name and arguments.
+        """
+
+        return "{module}.{cls}:{name}{params}".format(
+            module=self.__class__.__module__,
+            cls=self.__class__.__qualname__,
+            name=self.name,
+            params=sorted(self.params.items())
+        )
+
+    def to_dict(self) -> dict:
+        """Serializes the plugin, so it can be stored in a config file.
+
+        Returns:
+        ----
+        {dict} -- The plugin's module and class, and its `params`.
+        """
+
+        return {
+            'class': "{module}:{cls}".format(module=self.__class__.__module__, cls=self.__class__.__qualname__),
+            'params': dict(self.params)
+        }
+
+    @property
+    def has_update(self) -> bool:
+        """Specifies whether the plugin implements `update`.
+
+        Returns:
+        ----
+        {bool} -- `True` if the plugin can update its state with new rows.
+        """
+
+        return type(self).update is not IndicatorPlugin.update
+
+    def batch(self, **inputs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculates the indicator for a single symbol's whole history.
+
+        Arguments:
+        ----
+        inputs {np.ndarray} -- One array per column in `inputs`, in time order.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- One array per column in `outputs`, the same
+            length as the inputs.
+        """
+
+        raise NotImplementedError('Indicator plugins must implement batch.')
+
+    def update(self, state: dict, **inputs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculates the indicator for the rows appended to a single symbol.
+
+        Overview:
+        ----
+        The first time a symbol is updated, `state` is empty and the inputs are
+        the symbol's whole history, so the plugin can build up its state. After
+        that, the inputs are only the new rows. The plugin should keep whatever
+        it needs in `state`, which is stored per symbol.
+
+        Arguments:
+        ----
+        state {dict} -- The plugin's state for the symbol.
+
+        inputs {np.ndarray} -- One array per column in `inputs`, in time order.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- One array per column in `outputs`, the same
+            length as the inputs.
+        """
+
+        raise NotImplementedError
+
+
+class RollingWindowPlugin(IndicatorPlugin):
+
+    """
+    Base class for the built-in indicators that are calculated from rolling
+    statistics. The batch kernel calculates the whole history at once, and
+    `update` keeps a `RollingStatistics` per input in the symbol's state so
+    each appended row is calculated in O(1).
+    """
+
+    def __init__(self, period: int, column_name: str = None) -> None:
+        """Initalizes the plugin.
+
+        Arguments:
+        ----
+        period {int} -- The number of periods in the rolling window.
+
+        Keyword Arguments:
+        ----
+        column_name {str} -- The column the indicator is written to, for the
+            indicators with a single output. (default: {None})
+        """
+
+        super().__init__(period=period, column_name=column_name)
+
+        if column_name is not None:
+            self.outputs = [column_name]
+
+        self.lookback = period - 1
+
+    def _statistics(self, state: dict, name: str) -> RollingStatistics:
+        """Grabs the rolling statistics for an input, creating them the first time."""
+
+        if name not in state:
+            state[name] = RollingStatistics(window=self.params['period'])
+
+        return state[name]
+
+    def _rename(self, results: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Renames a single kernel output to the plugin's output column."""
+
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: next(iter(results.values()))}
+
+        return results
+
+
+class BollingerBandsPlugin(RollingWindowPlugin):
+
+    """The Bollinger Bands, from the rolling mean and standard deviation of the close."""
+
+    name = 'bollinger_bands'
+    inputs = ['close']
+    outputs = ['band_upper', 'band_lower']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return kernels.bollinger_bands(close=close, period=self.params['period'])
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        statistics = self._statistics(state=state, name='close').update(values=close, statistics=['mean', 'std'])
+
+        return kernels.bollinger_bands_from_statistics(
+            close=close,
+            moving_avg=statistics['mean'],
+            moving_std=statistics['std']
+        )
+
+
+class StochasticOscillatorPlugin(RollingWindowPlugin):
+
+    """The Stochastic Oscillator, from the rolling lowest low and highest high."""
+
+    name = 'stochastic_oscillator'
+    inputs = ['high', 'low', 'close']
+
+    def batch(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.stochastic_oscillator(high=high, low=low, close=close, period=self.params['period']))
+
+    def update(self, state: dict, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        lowest_low = self._statistics(state=state, name='low').update(values=low, statistics=['min'])['min']
+        highest_high = self._statistics(state=state, name='high').update(values=high, statistics=['max'])['max']
+
+        return self._rename(
+            kernels.stochastic_oscillator_from_statistics(
+                close=close,
+                lowest_low=lowest_low,
+                highest_high=highest_high
+            )
+        )
+
+
+class CommodityChannelIndexPlugin(RollingWindowPlugin):
+
+    """The Commodity Channel Index, from the rolling mean and standard deviation of the typical price."""
+
+    name = 'commodity_channel_index'
+    inputs = ['high', 'low', 'close']
+
+    def batch(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.commodity_channel_index(high=high, low=low, close=close, period=self.params['period']))
+
+    def update(self, state: dict, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        typical_price = (high + low + close) / 3
+        statistics = self._statistics(state=state, name='typical_price').update(
+            values=typical_price,
+            statistics=['mean', 'std']
+        )
+
+        return self._rename({'commodity_channel_index': statistics['mean'] / statistics['std']})
+
+
+class StandardDeviationPlugin(RollingWindowPlugin):
+
+    """The rolling Standard Deviation of the close."""
+
+    name = 'standard_deviation'
+    inputs = ['close']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.standard_deviation(close=close, period=self.params['period']))
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        statistics = self._statistics(state=state, name='close').update(values=close, statistics=['std'])
+
+        return self._rename({'standard_deviation': statistics['std']})
+
+
+class SMAPlugin(RollingWindowPlugin):
+
+    """The Simple Moving Average, from the rolling mean of the close."""
+
+    name = 'sma'
+    inputs = ['close']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.sma(close=close, period=self.params['period']))
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        statistics = self._statistics(state=state, name='close').update(values=close, statistics=['mean'])
+
+        return self._rename({'sma': statistics['mean']})
+
+
+class RateOfChangePlugin(RollingWindowPlugin):
+
+    """The Rate of Change, recalculated from the last `period` closes."""
+
+    name = 'rate_of_change'
+    inputs = ['close']
+
+    def __init__(self, period: int, column_name: str = None) -> None:
+
+        super().__init__(period=period, column_name=column_name)
+
+        # The newest bar is compared to the close `period` bars before it.
+        self.lookback = period
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.rate_of_change(close=close, period=self.params['period']))
+
+
+class ExponentialPlugin(IndicatorPlugin):
+
+    """
+    Base class for the built-in indicators that are calculated from
+    exponential moving averages. The batch kernel calculates the whole
+    history at once, and `update` keeps an `ExponentialMovingAverage` per
+    average in the symbol's state so each appended row is calculated in O(1).
+    """
+
+    def __init__(self, column_name: str = None, **params) -> None:
+        """Initalizes the plugin.
+
+        Keyword Arguments:
+        ----
+        column_name {str} -- The column the indicator is written to, for the
+            indicators with a single output. (default: {None})
+
+        params -- The periods of the indicator, for example `period=14`.
+        """
+
+        super().__init__(column_name=column_name, **params)
+
+        if column_name is not None:
+            self.outputs = [column_name]
+
+    def _average(self, state: dict, name: str, span: int, min_periods: int = 0) -> ExponentialMovingAverage:
+        """Grabs one of the moving averages, creating it the first time."""
+
+        if name not in state:
+            state[name] = ExponentialMovingAverage(span=span, min_periods=min_periods)
+
+        return state[name]
+
+    @staticmethod
+    def _previous(state: dict, name: str, values: np.ndarray) -> np.ndarray:
+        """Returns the value before each one, carrying the last one over between updates."""
+
+        if not len(values):
+            return np.empty(0)
+
+        previous = np.empty(len(values))
+        previous[0] = state.get(name, np.nan)
+        previous[1:] = values[:-1]
+        state[name] = values[-1]
+
+        return previous
+
+    def _rename(self, results: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Renames a single kernel output to the plugin's output column."""
+
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: next(iter(results.values()))}
+
+        return results
+
+
+class EMAPlugin(ExponentialPlugin):
+
+    """The Exponential Moving Average of the close."""
+
+    name = 'ema'
+    inputs = ['close']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.ema(close=close, period=self.params['period']))
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        average = self._average(state=state, name='close', span=self.params['period'])
+
+        return self._rename({'ema': average.update(values=close)})
+
+
+class RSIPlugin(ExponentialPlugin):
+
+    """The Relative Strength Index, from the moving averages of the gains and losses."""
+
+    name = 'rsi'
+    inputs = ['close']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.rsi(close=close, period=self.params['period']))
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        period = self.params['period']
+        change = close - self._previous(state=state, name='last_close', values=close)
+        up_day, down_day = kernels.up_and_down_days(change=change)
+
+        return self._rename(
+            kernels.rsi_from_averages(
+                up_average=self._average(state=state, name='up', span=period).update(values=up_day),
+                down_average=self._average(state=state, name='down', span=period).update(values=down_day)
+            )
+        )
+
+
+class AverageTrueRangePlugin(ExponentialPlugin):
+
+    """The Average True Range, from the moving average of the true range."""
+
+    name = 'average_true_range'
+    inputs = ['high', 'low', 'close']
+
+    def batch(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._rename(kernels.average_true_range(high=high, low=low, close=close, period=self.params['period']))
+
+    def update(self, state: dict, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        period = self.params['period']
+        true_range = kernels.true_ranges(
+            high=high,
+            low=low,
+            previous_close=self._previous(state=state, name='last_close', values=close)
+        )
+        average = self._average(state=state, name='true_range', span=period, min_periods=period)
+
+        return self._rename({'average_true_range': average.update(values=true_range)})
+
+
+class MACDPlugin(ExponentialPlugin):
+
+    """The Moving Average Convergence Divergence, from a fast, a slow and a signal average."""
+
+    name = 'macd'
+    inputs = ['close']
+    outputs = ['macd_fast', 'macd_slow', 'macd_diff', 'macd']
+
+    def batch(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        return kernels.macd(close=close, fast_period=self.params['fast_period'], slow_period=self.params['slow_period'])
+
+    def update(self, state: dict, close: np.ndarray) -> Dict[str, np.ndarray]:
+
+        fast_period = self.params['fast_period']
+        slow_period = self.params['slow_period']
+
+        macd_fast = self._average(state=state, name='fast', span=fast_period, min_periods=fast_period).update(values=close)
+        macd_slow = self._average(state=state, name='slow', span=slow_period, min_periods=slow_period).update(values=close)
+        macd_diff = macd_fast - macd_slow
+
+        return {
+            'macd_fast': macd_fast,
+            'macd_slow': macd_slow,
+            'macd_diff': macd_diff,
+            'macd': self._average(state=state, name='signal', span=9, min_periods=8).update(values=macd_diff)
+        }
+
+
+def plugin_from_dict(plugin_dict: dict) -> IndicatorPlugin:
+    """Rebuilds a plugin serialized with `IndicatorPlugin.to_dict`.
+
+    Arguments:
+    ----
+    plugin_dict {dict} -- The serialized plugin.
+
+    Returns:
+    ----
+    {IndicatorPlugin} -- The plugin, created with its `params`.
+    """
+
+    module_name, _, class_name = plugin_dict['class'].partition(':')
+    plugin_class = importlib.import_module(module_name)
+
+    for attribute in class_name.split('.'):
+        plugin_class = getattr(plugin_class, attribute)
+
+    if not (isinstance(plugin_class, type) and issubclass(plugin_class, IndicatorPlugin)):
+        raise ValueError("Unknown indicator plugin: {plugin}".format(plugin=plugin_dict['class']))
+
+    return plugin_class(**plugin_dict.get('params', {}))
@@ -0,0 +1,204 @@
+import time
+import heapq
+import itertools
+import threading
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from td.client import TDClient
+
+from pyrobot.events import StageTimer
+
+
+# Lower numbers go first.
+ORDER_PRIORITY = 0
+DATA_PRIORITY = 1
+
+# The session methods that place, change or cancel orders.
+ORDER_METHODS = {'place_order', 'modify_order', 'cancel_order'}
+
+
+class RateLimiter():
+
+    """
+    Represents a token bucket shared by every request sent to the TD API,
+    so the robot stays under TD's per minute request quota.
+    """
+
+    def __init__(self, requests_per_minute: int = 120, burst: int = 10) -> None:
+        """Initalizes the Rate Limiter.
+
+        Overview:
+        ----
+        The bucket holds up to `burst` tokens and refills at `requests_per_minute`
+        tokens a minute. Each request takes a token, and waits while the bucket
+        is empty. Waiting requests are served by priority, and then in the order
+        they arrived, so an order placed while 50 price requests are queued is
+        sent as soon as the next token is available.
+
+        Keyword Arguments:
+        ----
+        requests_per_minute {int} -- The requests allowed each minute. TD allows 120.
+            (default: {120})
+
+        burst {int} -- The most requests that can be sent back to back, after the
+            robot was idle. (default: {10})
+
+        Usage:
+        ----
+            >>> rate_limiter = RateLimiter(requests_per_minute=120)
+            >>> rate_limiter.acquire(priority=ORDER_PRIORITY)
+            >>> rate_limiter.metrics()
+        """
+
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.rate = requests_per_minute / 60.0
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting: List[tuple] = []
+        self._arrivals = itertools.count()
+
+        self.requests: Dict[int, int] = {}
+        self.wait_time: Dict[int, StageTimer] = {}
+        self.max_queue_depth = 0
+
+    def _refill(self) -> None:
+        """Adds the tokens earned since the last refill."""
+
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of requests waiting for a token.
+
+        Returns:
+        ----
+        {int} -- The number of waiting requests.
+        """
+
+        return len(self._waiting)
+
+    def acquire(self, priority: int = DATA_PRIORITY) -> float:
+        """Waits until the request can be sent, and takes a token.
+
+        Keyword Arguments:
+        ----
+        priority {int} -- The request's priority, `ORDER_PRIORITY` or `DATA_PRIORITY`.
+            Lower numbers go first. (default: {DATA_PRIORITY})
+
+        Returns:
+        ----
+        {float} -- The seconds the request waited.
+        """
+
+        start_time = time.monotonic()
+
+        with self._condition:
+
+            ticket = (priority, next(self._arrivals))
+            heapq.heappush(self._waiting, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiting))
+
+            while True:
+
+                self._refill()
+
+                # Only the first request in line can take a token.
+                if self._waiting[0] == ticket:
+
+                    if self._tokens >= 1.0:
+                        break
+
+                    self._condition.wait(timeout=(1.0 - self._tokens) / self.rate)
+
+                else:
+                    self._condition.wait()
+
+            heapq.heappop(self._waiting)
+            self._tokens -= 1.0
+
+            waited = time.monotonic() - start_time
+            self.requests[priority] = self.requests.get(priority, 0) + 1
+            self.wait_time.setdefault(priority, StageTimer()).record(waited)
+
+            # Let the next request in line check the bucket.
+            self._condition.notify_all()
+
+        return waited
+
+    def metrics(self) -> dict:
+        """Summarizes the rate limiter.
+
+        Returns:
+        ----
+        {dict} -- The current and max queue depth, the tokens left, and for each priority
+            the number of requests and their wait time in milliseconds.
+
+        Usage:
+        ----
+            >>> trading_robot.rate_limiter.metrics()
+            {
+                'queue_depth': 0,
+                'max_queue_depth': 12,
+                'tokens': 3.5,
+                'requests': {'order': 2, 'data': 140},
+                'wait_time': {'order': {'count': 2, 'mean_ms': 210.4, ...}, 'data': {...}}
+            }
+        """
+
+        names = {ORDER_PRIORITY: 'order', DATA_PRIORITY: 'data'}
+
+        with self._condition:
+
+            self._refill()
+
+            return {
+                'queue_depth': len(self._waiting),
+                'max_queue_depth': self.max_queue_depth,
+                'tokens': self._tokens,
+                'requests': {names.get(priority, priority): count for priority, count in self.requests.items()},
+                'wait_time': {names.get(priority, priority): timer.to_dict() for priority, timer in self.wait_time.items()}
+            }
+
+
+class RateLimitedSession():
+
+    """
+    Represents a TD session where every request waits for the rate limiter.
+    It can be used anywhere a `TDClient` is used.
+    """
+
+    def __init__(self, session: TDClient, rate_limiter: RateLimiter) -> None:
+        """Initalizes the Rate Limited Session.
+
+        Arguments:
+        ----
+        session {TDClient} -- An authenticated session with the TD API.
+
+        rate_limiter {RateLimiter} -- The rate limiter shared by every request.
+        """
+
+        self.session = session
+        self.rate_limiter = rate_limiter
+
+    def __getattr__(self, name: str) -> Any:
+
+        attribute = getattr(self.session, name)
+
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        priority = ORDER_PRIORITY if name in ORDER_METHODS else DATA_PRIORITY
+
+        def rate_limited_request(*args, **kwargs) -> Any:
+            self.rate_limiter.acquire(priority=priority)
+            return attribute(*args, **kwargs)
+
+        return rate_limited_request
@@ -0,0 +1,424 @@
+import time
+import pathlib
+import numpy as np
+import pandas as pd
+
+from typing import Dict
+from typing import List
+from typing import Union
+
+from pyrobot.robot import PyRobot
+from pyrobot.events import Event
+from pyrobot.events import ORDERS_EVENT
+
+
+# The columns of a stored bar.
+BAR_COLUMNS = ['symbol', 'datetime', 'open', 'close', 'high', 'low', 'volume']
+
+
+class ReplayDataSource():
+
+    """
+    Represents stored bars that can be played back, one timestamp
+    at a time, in place of the TD API.
+    """
+
+    def __init__(self, bars: Union[List[dict], pd.DataFrame]) -> None:
+        """Initalizes the Replay Data Source.
+
+        Arguments:
+        ----
+        bars {Union[List[dict], pd.DataFrame]} -- The bars, with the `symbol`, `datetime`
+            (in milliseconds since epoch), `open`, `close`, `high`, `low` and `volume`
+            of each one.
+
+        Usage:
+        ----
+            >>> replay_source = ReplayDataSource.from_file(path='data/minute_bars.parquet')
+            >>> replay_source = ReplayDataSource.from_historical_prices(
+                    historical_prices=trading_robot.historical_prices
+                )
+        """
+
+        bars_frame = pd.DataFrame(bars, columns=BAR_COLUMNS)
+        bars_frame['datetime'] = bars_frame['datetime'].astype('int64')
+        bars_frame = bars_frame.sort_values(by=['datetime', 'symbol'], kind='mergesort').reset_index(drop=True)
+
+        self.bars = bars_frame
+        self.timestamps: np.ndarray = np.unique(bars_frame['datetime'].to_numpy())
+        self._bar_times: np.ndarray = bars_frame['datetime'].to_numpy()
+        self._bar_records: List[dict] = bars_frame.to_dict(orient='records')
+        self.symbols: List[str] = list(pd.unique(bars_frame['symbol']))
+
+        # The bars of each symbol, in time order, so a window is two binary searches.
+        self._symbol_times: Dict[str, np.ndarray] = {}
+        self._symbol_candles: Dict[str, List[dict]] = {}
+
+        for symbol, symbol_bars in bars_frame.groupby('symbol', sort=False):
+
+            self._symbol_times[symbol] = symbol_bars['datetime'].to_numpy()
+            self._symbol_candles[symbol] = symbol_bars.drop(columns=['symbol']).to_dict(orient='records')
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_historical_prices(cls, historical_prices: dict) -> 'ReplayDataSource':
+        """Creates a data source from `PyRobot.historical_prices`.
+
+        Arguments:
+        ----
+        historical_prices {dict} -- The historical prices, with every bar under `aggregated`.
+
+        Returns:
+        ----
+        {ReplayDataSource} -- The data source.
+        """
+
+        return cls(bars=historical_prices['aggregated'])
+
+    @classmethod
+    def from_file(cls, path: Union[str, pathlib.Path]) -> 'ReplayDataSource':
+        """Loads a data source from a CSV or Parquet file.
+
+        Overview:
+        ----
+        Parquet files need `pyarrow` or `fastparquet` to be installed.
+
+        Arguments:
+        ----
+        path {Union[str, pathlib.Path]} -- The file, ending in `.csv` or `.parquet`.
+
+        Returns:
+        ----
+        {ReplayDataSource} -- The data source.
+        """
+
+        path = pathlib.Path(path)
+
+        if path.suffix == '.parquet':
+            bars_frame = pd.read_parquet(path)
+        elif path.suffix == '.csv':
+            bars_frame = pd.read_csv(path)
+        else:
+            raise ValueError("Bars can only be loaded from .csv or .parquet files.")
+
+        return cls(bars=bars_frame)
+
+    def save(self, path: Union[str, pathlib.Path]) -> None:
+        """Stores the bars in a CSV or Parquet file.
+
+        Arguments:
+        ----
+        path {Union[str, pathlib.Path]} -- The file, ending in `.csv` or `.parquet`.
+        """
+
+        path = pathlib.Path(path)
+
+        if path.suffix == '.parquet':
+            self.bars.to_parquet(path, index=False)
+        elif path.suffix == '.csv':
+            self.bars.to_csv(path, index=False)
+        else:
+            raise ValueError("Bars can only be saved to .csv or .parquet files.")
+
+    def bars_between(self, start: int, end: int, symbols: List[str] = None) -> List[dict]:
+        """Returns the bars between two times, in time order.
+
+        Arguments:
+        ----
+        start {int} -- The first time, in milliseconds since epoch.
+
+        end {int} -- The last time, in milliseconds since epoch.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- Only return these symbols. (default: {every symbol})
+
+        Returns:
+        ----
+        {List[dict]} -- The bars.
+        """
+
+        in_window = (self.bars['datetime'] >= start) & (self.bars['datetime'] <= end)
+
+        if symbols is not None:
+            in_window &= self.bars['symbol'].isin(symbols)
+
+        return self.bars[in_window].to_dict(orient='records')
+
+    def bars_at(self, timestamp: int) -> List[dict]:
+        """Returns the bars of every symbol at a time.
+
+        Arguments:
+        ----
+        timestamp {int} -- The time, in milliseconds since epoch.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars.
+        """
+
+        first = np.searchsorted(self._bar_times, timestamp, side='left')
+        last = np.searchsorted(self._bar_times, timestamp, side='right')
+
+        return self._bar_records[first:last]
+
+    def candles(self, symbol: str, start: int, end: int) -> List[dict]:
+        """Returns a symbol's candles between two times, like a price history response.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        start {int} -- The first time, in milliseconds since epoch.
+
+        end {int} -- The last time, in milliseconds since epoch.
+
+        Returns:
+        ----
+        {List[dict]} -- The candles, without the symbol.
+        """
+
+        if symbol not in self._symbol_times:
+            return []
+
+        symbol_times = self._symbol_times[symbol]
+        first = np.searchsorted(symbol_times, start, side='left')
+        last = np.searchsorted(symbol_times, end, side='right')
+
+        return self._symbol_candles[symbol][first:last]
+
+
+class ReplaySession():
+
+    """
+    Represents a TD session that answers from a replay data source,
+    only showing the bars up to the replay clock.
+    """
+
+    def __init__(self, source: ReplayDataSource) -> None:
+        """Initalizes the Replay Session.
+
+        Arguments:
+        ----
+        source {ReplayDataSource} -- The bars to play back.
+        """
+
+        self.source = source
+        self.clock: int = None
+        self.orders: List[dict] = []
+
+    def get_price_history(self, symbol: str, start_date: str = None, end_date: str = None, **kwargs) -> dict:
+
+        end = self.clock if end_date is None else min(int(end_date), self.clock)
+        start = 0 if start_date is None else int(start_date)
+
+        candles = self.source.candles(symbol=symbol, start=start, end=end)
+
+        return {'symbol': symbol, 'empty': not candles, 'candles': candles}
+
+    def get_quotes(self, instruments: List[str]) -> dict:
+
+        quotes = {}
+
+        for symbol in instruments:
+
+            candles = self.source.candles(symbol=symbol, start=0, end=self.clock)
+
+            if candles:
+                quotes[symbol] = {
+                    'symbol': symbol,
+                    'lastPrice': candles[-1]['close'],
+                    'totalVolume': sum(candle['volume'] for candle in candles),
+                    'quoteTimeInLong': candles[-1]['datetime']
+                }
+
+        return quotes
+
+    def place_order(self, account: str, order: dict) -> dict:
+
+        order_id = str(len(self.orders) + 1)
+        self.orders.append({'orderId': order_id, 'order': order, 'time': self.clock})
+
+        return {'order_id': order_id, 'headers': {}, 'request_body': order}
+
+
+class ReplayEngine():
+
+    """
+    Represents a load test of the trading robot, which plays stored bars
+    through the same path the robot runs live.
+    """
+
+    def __init__(self, trading_robot: PyRobot, source: ReplayDataSource, speed: Union[str, float] = 'afap',
+                 warmup_bars: int = 50, bar_size: int = 1, bar_type: str = 'minute',
+                 session: ReplaySession = None) -> None:
+        """Initalizes the Replay Engine.
+
+        Overview:
+        ----
+        The robot's session is replaced with a `ReplaySession`, and its StockFrame is
+        built from the first `warmup_bars` timestamps, so the indicators and signals
+        can be set up on `trading_robot.stock_frame` before running. Each step moves the
+        replay clock to the next timestamp and calls `process_latest_bar`, so the bars go
+        through `get_latest_bar`, `add_rows`, the indicators' `refresh`, `check_signals`
+        and `execute_signals`, exactly like they do live.
+
+        Arguments:
+        ----
+        trading_robot {PyRobot} -- The robot to drive. Any symbol in the data source that
+            isn't in its portfolio is added.
+
+        source {ReplayDataSource} -- The bars to play back.
+
+        Keyword Arguments:
+        ----
+        speed {Union[str, float]} -- `realtime` waits the time between bars, a number `N`
+            plays back `N` times faster, and `afap` doesn't wait at all. (default: {'afap'})
+
+        warmup_bars {int} -- The number of timestamps used to build the StockFrame. (default: {50})
+
+        bar_size {int} -- The size of each stored bar. (default: {1})
+
+        bar_type {str} -- The type of each stored bar. (default: {'minute'})
+
+        session {ReplaySession} -- The session the robot talks to, for example a
+            `SimulatedBroker`. (default: {a new `ReplaySession`})
+
+        Usage:
+        ----
+            >>> replay_engine = ReplayEngine(
+                    trading_robot=trading_robot,
+                    source=ReplayDataSource.from_file(path='data/minute_bars.csv'),
+                    speed=60
+                )
+            >>> indicator_client = Indicators(price_data_frame=trading_robot.stock_frame)
+            >>> indicator_client.sma(period=20)
+            >>> trading_robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+            >>> replay_engine.run()
+            {'bars': 3900, 'rows': 390000, 'seconds': 12.4, 'bars_per_second': 314.5, ...}
+        """
+
+        if speed == 'realtime':
+            speed = 1.0
+        elif speed != 'afap' and (not isinstance(speed, (int, float)) or speed <= 0):
+            raise ValueError("The speed must be 'realtime', 'afap' or a positive number.")
+
+        self.trading_robot = trading_robot
+        self.source = source
+        self.speed = speed
+        self.session = session if session is not None else ReplaySession(source=source)
+        self.orders = 0
+
+        # Point the robot, and anything it handed the session to, at the replay.
+        trading_robot.session = self.session
+
+        if not hasattr(trading_robot, 'portfolio'):
+            trading_robot.create_portfolio()
+
+        trading_robot.portfolio.td_client = self.session
+
+        for symbol in source.symbols:
+            if not trading_robot.portfolio.in_portfolio(symbol=symbol):
+                trading_robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+        trading_robot._bar_size = bar_size
+        trading_robot._bar_type = bar_type
+        trading_robot.scheduler.bar_size = bar_size
+        trading_robot.scheduler.bar_type = bar_type
+
+        warmup_bars = min(max(warmup_bars, 1), len(source))
+        self.session.clock = int(source.timestamps[warmup_bars - 1])
+        self._position = warmup_bars
+
+        warmup_prices = source.bars_between(start=0, end=self.session.clock)
+        trading_robot.create_stock_frame(data=warmup_prices)
+        trading_robot._track_last_bar_times(prices=warmup_prices)
+
+        trading_robot.events.subscribe(topic=ORDERS_EVENT, callback=self._count_orders)
+
+    def _count_orders(self, event: Event) -> None:
+        """Counts the orders the robot sends.
+
+        Arguments:
+        ----
+        event {Event} -- The `orders` event. Strategies publish their orders under
+            `orders`, the connected pipeline publishes the list itself.
+        """
+
+        orders = event.data['orders'] if isinstance(event.data, dict) else event.data
+
+        self.orders += len(orders)
+
+    @property
+    def remaining(self) -> int:
+        """The number of timestamps left to play back.
+
+        Returns:
+        ----
+        {int} -- The number of timestamps.
+        """
+
+        return len(self.source) - self._position
+
+    def step(self) -> Event:
+        """Moves the replay clock to the next timestamp, and processes its bars.
+
+        Returns:
+        ----
+        {Event} -- The published `bar` event.
+        """
+
+        self.session.clock = int(self.source.timestamps[self._position])
+        self._position += 1
+
+        return self.trading_robot.process_latest_bar()
+
+    def run(self, max_bars: int = None) -> dict:
+        """Plays back the remaining bars.
+
+        Keyword Arguments:
+        ----
+        max_bars {int} -- The most timestamps to play back. (default: {all of them})
+
+        Returns:
+        ----
+        {dict} -- The timestamps and rows processed, the seconds it took, and the
+            timestamps, rows and orders per second.
+        """
+
+        bars = 0
+        rows = 0
+        orders_before = self.orders
+        start_time = time.perf_counter()
+        replay_start = None
+
+        while self.remaining and (max_bars is None or bars < max_bars):
+
+            next_timestamp = self.source.timestamps[self._position]
+
+            # Keep the replay in step with the clock, sped up.
+            if self.speed != 'afap':
+
+                if replay_start is None:
+                    replay_start = (start_time, next_timestamp)
+
+                due = replay_start[0] + (next_timestamp - replay_start[1]) / 1000 / self.speed
+                time.sleep(max(due - time.perf_counter(), 0.0))
+
+            bar_event = self.step()
+
+            bars += 1
+            rows += len(bar_event.data)
+
+        seconds = time.perf_counter() - start_time
+
+        return {
+            'bars': bars,
+            'rows': rows,
+            'orders': self.orders - orders_before,
+            'seconds': seconds,
+            'bars_per_second': bars / seconds if seconds else 0.0,
+            'rows_per_second': rows / seconds if seconds else 0.0
+        }
@@ -0,0 +1,265 @@
+import time
+import random
+import threading
+import contextlib
+import contextvars
+
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Callable
+from typing import Iterator
+
+import requests
+
+from td.client import TDClient
+from td.exceptions import ServerError
+from td.exceptions import ExdLmtError
+
+from pyrobot.rate_limit import ORDER_METHODS
+
+
+# Errors that usually go away if the request is sent again: 500 and 503 responses, 429
+# and dropped connections. `GeneralError` isn't one of them, as TD raises it for any
+# other status above 400, like a 422, which fails the same way every time.
+TRANSIENT_ERRORS = (
+    ServerError,
+    ExdLmtError,
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout
+)
+
+# Errors where the order surely wasn't placed, so placing it again can't duplicate it.
+ORDER_TRANSIENT_ERRORS = (ExdLmtError,)
+
+# The deadline of the requests sent by the current thread or task.
+_DEADLINE: contextvars.ContextVar = contextvars.ContextVar('retry_deadline', default=None)
+
+
+@contextlib.contextmanager
+def retry_deadline(deadline: float) -> Iterator[None]:
+    """Stops retrying the requests sent inside the block once a deadline has passed.
+
+    Overview:
+    ----
+    The deadline only applies to the current thread or task, so requests sent at the
+    same time by other threads keep their own deadline. It's used for requests that go
+    through a `RetryingSession`, which can't pass a deadline to `RetryPolicy.call`.
+
+    Arguments:
+    ----
+    deadline {float} -- The UNIX timestamp, or `None` for no deadline.
+
+    Usage:
+    ----
+        >>> with retry_deadline(deadline=time.time() + 60):
+                price_history = retrying_session.get_price_history(symbol='MSFT')
+    """
+
+    token = _DEADLINE.set(deadline)
+
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+class RetryPolicy():
+
+    """
+    Represents how failed TD API requests are sent again: how many times,
+    how long to wait in between and which errors are worth retrying.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0, jitter: bool = True,
+                 retry_on: Tuple[type, ...] = TRANSIENT_ERRORS, order_retry_on: Tuple[type, ...] = ORDER_TRANSIENT_ERRORS) -> None:
+        """Initalizes the Retry Policy.
+
+        Overview:
+        ----
+        The wait before retry `n` is `base_delay * 2 ** n`, capped at `max_delay`. With
+        `jitter`, a random wait between zero and that value is used instead, so the
+        requests of several symbols that failed together don't retry together.
+
+        Only the errors in `retry_on` are retried, like server errors, rate limit errors
+        and dropped connections. Errors such as a bad request or a missing symbol are
+        raised straight away. Orders are only retried for the errors in `order_retry_on`,
+        which TD raises before the order is placed, so an order is never placed twice.
+
+        A request can be given a deadline, for example the UNIX timestamp when the next
+        bar is released. A retry that would end after it isn't attempted and the last
+        error is raised. The policy is shared by every request, so the deadline is passed
+        to `call`, or set with `retry_deadline`, and never stored on the policy.
+
+        Keyword Arguments:
+        ----
+        max_attempts {int} -- The most times a request is sent, including the first. Must be
+            at least 1. (default: {3})
+
+        base_delay {float} -- The seconds to wait before the first retry. (default: {0.25})
+
+        max_delay {float} -- The longest wait between two attempts, in seconds. (default: {4.0})
+
+        jitter {bool} -- If `True`, each wait is randomized. (default: {True})
+
+        retry_on {Tuple[type, ...]} -- The errors that are retried. (default: {TRANSIENT_ERRORS})
+
+        order_retry_on {Tuple[type, ...]} -- The errors that are retried when placing, changing
+            or cancelling an order. (default: {ORDER_TRANSIENT_ERRORS})
+
+        Usage:
+        ----
+            >>> retry_policy = RetryPolicy(max_attempts=5, base_delay=0.5)
+            >>> price_history = retry_policy.call(
+                    td_client.get_price_history,
+                    endpoint='get_price_history',
+                    symbol='MSFT'
+                )
+        """
+
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1, got {max_attempts}.".format(max_attempts=max_attempts))
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.order_retry_on = order_retry_on
+
+        # Requests are retried from several threads at once.
+        self._lock = threading.Lock()
+        self.retries: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+
+    def delay(self, retry: int) -> float:
+        """Calculates the wait before a retry.
+
+        Arguments:
+        ----
+        retry {int} -- The number of retries already made.
+
+        Returns:
+        ----
+        {float} -- The seconds to wait.
+        """
+
+        delay = min(self.max_delay, self.base_delay * 2 ** retry)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def is_retryable(self, error: Exception, endpoint: str) -> bool:
+        """Checks whether a request that raised an error is worth sending again.
+
+        Arguments:
+        ----
+        error {Exception} -- The error the request raised.
+
+        endpoint {str} -- The name of the session method.
+
+        Returns:
+        ----
+        {bool} -- `True` if the request should be retried.
+        """
+
+        if endpoint in ORDER_METHODS:
+            return isinstance(error, self.order_retry_on)
+
+        return isinstance(error, self.retry_on)
+
+    def call(self, func: Callable, *args, endpoint: str = None, deadline: float = None, **kwargs) -> Any:
+        """Calls a function, retrying it while it raises a retryable error.
+
+        Arguments:
+        ----
+        func {Callable} -- The function, usually a session method.
+
+        Keyword Arguments:
+        ----
+        endpoint {str} -- The name used in the metrics. (default: {the function's name})
+
+        deadline {float} -- The UNIX timestamp after which the function isn't retried.
+            (default: {the deadline set with `retry_deadline`, if any})
+
+        Returns:
+        ----
+        {Any} -- Whatever the function returns.
+        """
+
+        endpoint = endpoint or func.__name__
+
+        if deadline is None:
+            deadline = _DEADLINE.get()
+
+        for retry in range(self.max_attempts):
+
+            try:
+                return func(*args, **kwargs)
+            except Exception as request_error:
+
+                delay = self.delay(retry=retry)
+                last_attempt = retry + 1 >= self.max_attempts
+                past_deadline = deadline is not None and time.time() + delay > deadline
+
+                if last_attempt or past_deadline or not self.is_retryable(error=request_error, endpoint=endpoint):
+                    with self._lock:
+                        self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+                    raise
+
+            with self._lock:
+                self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+            time.sleep(delay)
+
+    def metrics(self) -> dict:
+        """Summarizes the retries.
+
+        Returns:
+        ----
+        {dict} -- For each endpoint, the number of retries and the number of requests
+            that failed after retrying or weren't retryable.
+        """
+
+        with self._lock:
+            return {
+                'retries': dict(self.retries),
+                'failures': dict(self.failures)
+            }
+
+
+class RetryingSession():
+
+    """
+    Represents a TD session where every request is retried by a retry
+    policy. It can be used anywhere a `TDClient` is used.
+    """
+
+    def __init__(self, session: TDClient, retry_policy: RetryPolicy) -> None:
+        """Initalizes the Retrying Session.
+
+        Arguments:
+        ----
+        session {TDClient} -- An authenticated session with the TD API.
+
+        retry_policy {RetryPolicy} -- The retry policy shared by every request.
+        """
+
+        self.session = session
+        self.retry_policy = retry_policy
+
+    def __getattr__(self, name: str) -> Any:
+
+        attribute = getattr(self.session, name)
+
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def retried_request(*args, **kwargs) -> Any:
+            return self.retry_policy.call(attribute, *args, endpoint=name, **kwargs)
+
+        return retried_request
@@ -9,10 +9,33 @@ from datetime import timedelta
 
 from typing import List
 from typing import Dict
+from typing import Tuple
 from typing import Union
 
+from concurrent.futures import ThreadPoolExecutor
+
 from pyrobot.trades import Trade
+from pyrobot.events import Event
+from pyrobot.events import EventBus
+from pyrobot.events import BAR_EVENT
+from pyrobot.events import ORDERS_EVENT
+from pyrobot.events import SIGNALS_EVENT
+from pyrobot.events import INDICATORS_EVENT
+from pyrobot.strategy import Strategy
+from pyrobot.strategy import StrategyRegistry
 from pyrobot.portfolio import Portfolio
+from pyrobot.metrics import MetricsSink
+from pyrobot.metrics import NULL_METRICS
+from pyrobot.metrics import InstrumentedSession
+from pyrobot.rate_limit import RateLimiter
+from pyrobot.rate_limit import RateLimitedSession
+from pyrobot.retry import RetryPolicy
+from pyrobot.retry import RetryingSession
+from pyrobot.retry import retry_deadline
+from pyrobot.scheduler import BAR_SECONDS
+from pyrobot.scheduler import BarScheduler
+from pyrobot.session_clock import SessionClock
+from pyrobot.indicators import Indicators
 from pyrobot.stock_frame import StockFrame
 
 from td.client import TDClient
@@ -24,7 +47,9 @@ milliseconds_since_epoch = TDUtilities().milliseconds_since_epoch
 
 class PyRobot():
 
-    def __init__(self, client_id: str, redirect_uri: str, paper_trading: bool = True, credentials_path: str = None, trading_account: str = None) -> None:
+    def __init__(self, client_id: str, redirect_uri: str, paper_trading: bool = True, credentials_path: str = None,
+                 trading_account: str = None, max_workers: int = 1, requests_per_minute: int = 120,
+                 retry_policy: RetryPolicy = None, metrics: MetricsSink = None) -> None:
         """Initalizes a new instance of the robot and logs into the API platform specified.
 
         Arguments:
@@ -42,6 +67,25 @@ class PyRobot():
 
         trading_account {str} -- Your TD Ameritrade account number. (default: {None})
 
+        max_workers {int} -- The number of price requests `get_latest_bar` and
+            `grab_historical_prices` send at once. With `1`, the symbols are requested
+            one after the other. Otherwise the requests run on a thread pool that's
+            started on the first request and shut down by `close`. (default: {1})
+
+        requests_per_minute {int} -- The TD API requests the robot, its portfolio and its
+            trades can send each minute, together. Order placements skip ahead of price
+            requests. Set it to `None` to turn the rate limiter off. (default: {120})
+
+        retry_policy {RetryPolicy} -- How failed TD API requests are retried. Every retry
+            waits for the rate limiter too. Use `RetryPolicy(max_attempts=1)` to turn
+            retries off. (default: {RetryPolicy()})
+
+        metrics {MetricsSink} -- Where the robot reports how long each stage of the bar loop
+            takes (`fetch`, `add_rows`, `refresh`, `check_signals`, `place_order` and
+            `save_orders`), how long each indicator takes, the rows appended and every TD
+            API request. Use a `MetricsRegistry` to read them back, or a `PrometheusSink`
+            or `StatsDSink` to export them. (default: {NULL_METRICS}, which measures nothing)
+
         """
 
         # Set the attirbutes
@@ -49,11 +93,26 @@ class PyRobot():
         self.client_id = client_id
         self.redirect_uri = redirect_uri
         self.credentials_path = credentials_path
+        self.rate_limiter: RateLimiter = RateLimiter(requests_per_minute=requests_per_minute) if requests_per_minute else None
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.metrics: MetricsSink = metrics or NULL_METRICS
         self.session: TDClient = self._create_session()
         self.trades = {}
         self.historical_prices = {}
         self.stock_frame: StockFrame = None
         self.paper_trading = paper_trading
+        self.record_orders = True
+        self.events = EventBus(metrics=self.metrics)
+        self.strategies: StrategyRegistry = None
+        self._pipeline_frames = []
+        self.max_workers = max_workers
+        self._fetch_executor: ThreadPoolExecutor = None
+        self._fetch_executor_workers = 0
+        self.fetch_errors: Dict[str, Exception] = {}
+        self._last_bar_times: Dict[str, int] = {}
+        self._last_total_volumes: Dict[str, int] = {}
+        self.scheduler = BarScheduler()
+        self.session_clock = SessionClock()
 
         self._bar_size = None
         self._bar_type = None
@@ -66,7 +125,8 @@ class PyRobot():
 
         Returns:
         ----
-        TDClient -- A TDClient object with an authenticated sessions.
+        TDClient -- A TDClient object with an authenticated sessions, wrapped in a
+            `RetryingSession` and, when the rate limiter is on, a `RateLimitedSession`.
 
         """
 
@@ -80,14 +140,39 @@ class PyRobot():
         # log the client into the new session
         td_client.login()
 
-        return td_client
+        return self._wrap_session(td_client=td_client)
+
+    def _wrap_session(self, td_client: TDClient) -> RetryingSession:
+        """Wraps a logged in client with the robot's rate limiter and retry policy.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- The logged in client.
+
+        Returns:
+        ----
+        RetryingSession -- The client, wrapped in a `RetryingSession` and, when the
+            rate limiter is on, a `RateLimitedSession`. When metrics are on, each request
+            is counted and timed by an `InstrumentedSession` inside both.
+        """
+
+        # Count every request that goes out, retries included, without the rate limit wait.
+        if self.metrics.enabled:
+            td_client = InstrumentedSession(session=td_client, metrics=self.metrics)
+
+        # Every request from here on shares the rate limiter.
+        if self.rate_limiter:
+            td_client = RateLimitedSession(session=td_client, rate_limiter=self.rate_limiter)
+
+        # And is retried, so each retry takes its own token.
+        return RetryingSession(session=td_client, retry_policy=self.retry_policy)
 
     @property
     def pre_market_open(self) -> bool:
         """Checks if pre-market is open.
 
-        Uses the datetime module to create US Pre-Market Equity hours in
-        UTC time.
+        Uses the robot's `SessionClock`, which knows the US Pre-Market Equity hours
+        in New York time, holidays and daylight saving time.
 
         Usage:
         ----
@@ -106,31 +191,14 @@ class PyRobot():
 
         """
 
-        pre_market_start_time = datetime.utcnow().replace(
-            hour=8,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        market_start_time = datetime.utcnow().replace(
-            hour=13,
-            minute=30,
-            second=00
-        ).timestamp()
-
-        right_now = datetime.utcnow().timestamp()
-
-        if market_start_time >= right_now >= pre_market_start_time:
-            return True
-        else:
-            return False
+        return self.session_clock.is_open(session='pre')
 
     @property
     def post_market_open(self):
         """Checks if post-market is open.
 
-        Uses the datetime module to create US Post-Market Equity hours in
-        UTC time.
+        Uses the robot's `SessionClock`, which knows the US Post-Market Equity hours
+        in New York time, holidays, early closes and daylight saving time.
 
         Usage:
         ----
@@ -149,31 +217,14 @@ class PyRobot():
 
         """
 
-        post_market_end_time = datetime.utcnow().replace(
-            hour=00,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        market_end_time = datetime.utcnow().replace(
-            hour=20,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        right_now = datetime.utcnow().timestamp()
-
-        if post_market_end_time >= right_now >= market_end_time:
-            return True
-        else:
-            return False
+        return self.session_clock.is_open(session='post')
 
     @property
     def regular_market_open(self):
         """Checks if regular market is open.
 
-        Uses the datetime module to create US Regular Market Equity hours in
-        UTC time.
+        Uses the robot's `SessionClock`, which knows the US Regular Market Equity hours
+        in New York time, holidays, early closes and daylight saving time.
 
         Usage:
         ----
@@ -192,24 +243,28 @@ class PyRobot():
 
         """
 
-        market_start_time = datetime.utcnow().replace(
-            hour=13,
-            minute=30,
-            second=00
-        ).timestamp()
+        return self.session_clock.is_open(session='regular')
 
-        market_end_time = datetime.utcnow().replace(
-            hour=20,
-            minute=00,
-            second=00
-        ).timestamp()
+    def wait_till_market_open(self, session: str = 'regular') -> float:
+        """Sleeps until a market session opens, instead of polling through closed hours.
 
-        right_now = datetime.utcnow().timestamp()
+        Keyword Arguments:
+        ----
+        session {str} -- One of `['pre', 'regular', 'post']`, or `any` for any of
+            them. (default: {'regular'})
 
-        if market_end_time >= right_now >= market_start_time:
-            return True
-        else:
-            return False
+        Returns:
+        ----
+        {float} -- The seconds slept, `0.0` if the session was open.
+
+        Usage:
+        ----
+            >>> while True:
+                    trading_robot.wait_till_market_open(session='regular')
+                    trading_robot.process_latest_bar(wait=True)
+        """
+
+        return self.session_clock.sleep_until_open(session=session)
 
     def create_portfolio(self) -> Portfolio:
         """Create a new portfolio.
@@ -469,7 +524,8 @@ class PyRobot():
 
         Returns:
         ----
-        {List[Dict]} -- The historical price candles.
+        {List[Dict]} -- The historical price candles. Symbols whose request failed are
+            left out, and their errors are stored in `fetch_errors`.
 
         Usage:
         ----
@@ -490,6 +546,8 @@ class PyRobot():
 
         self._bar_size = bar_size
         self._bar_type = bar_type
+        self.scheduler.bar_size = bar_size
+        self.scheduler.bar_type = bar_type
 
         start = str(milliseconds_since_epoch(dt_object=start))
         end = str(milliseconds_since_epoch(dt_object=end))
@@ -499,43 +557,45 @@ class PyRobot():
         if not symbols:
             symbols = self.portfolio.positions
 
-        for symbol in symbols:
+        price_histories = self._fetch_price_histories(
+            symbols=symbols,
+            start=start,
+            end=end,
+            bar_size=bar_size,
+            bar_type=bar_type
+        )
 
-            historical_prices_response = self.session.get_price_history(
-                symbol=symbol,
-                period_type='day',
-                start_date=start,
-                end_date=end,
-                frequency_type=bar_type,
-                frequency=bar_size,
-                extended_hours=True
-            )
+        for symbol, historical_prices_response in price_histories:
 
             self.historical_prices[symbol] = {}
             self.historical_prices[symbol]['candles'] = historical_prices_response['candles']
 
-            for candle in historical_prices_response['candles']:
-
-                new_price_mini_dict = {}
-                new_price_mini_dict['symbol'] = symbol
-                new_price_mini_dict['open'] = candle['open']
-                new_price_mini_dict['close'] = candle['close']
-                new_price_mini_dict['high'] = candle['high']
-                new_price_mini_dict['low'] = candle['low']
-                new_price_mini_dict['volume'] = candle['volume']
-                new_price_mini_dict['datetime'] = candle['datetime']
-                new_prices.append(new_price_mini_dict)
+            new_prices += self._parse_candles(
+                symbol=symbol,
+                candles=historical_prices_response['candles']
+            )
 
         self.historical_prices['aggregated'] = new_prices
+        self._track_last_bar_times(prices=new_prices)
 
         return self.historical_prices
 
     def get_latest_bar(self) -> List[dict]:
         """Returns the latest bar for each symbol in the portfolio.
 
+        Overview:
+        ----
+        The robot remembers the last bar it ingested for each symbol, from
+        `grab_historical_prices` or earlier calls, and only requests the bars
+        from then on. If a symbol's request fails, its bar is built from a
+        single quotes request for all the failed symbols.
+
         Returns:
         ---
-        {List[dict]} -- A simplified quote list.
+        {List[dict]} -- A simplified quote list, in the same order as the portfolio positions.
+            Each symbol has the bars that weren't ingested yet or, if there aren't any, its
+            latest bar again. Symbols without a bar are left out, and their errors are stored
+            in `fetch_errors`.
 
         Usage:
         ----
@@ -552,97 +612,637 @@ class PyRobot():
         bar_size = self._bar_size
         bar_type = self._bar_type
 
-        # Define the start and end date.
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=1)
-        start = str(milliseconds_since_epoch(dt_object=start_date))
-        end = str(milliseconds_since_epoch(dt_object=end_date))
+        symbols = list(self.portfolio.positions)
+        end = str(milliseconds_since_epoch(dt_object=datetime.today()))
+
+        with self.metrics.timer(name='stage_duration', tags={'stage': 'fetch'}):
+
+            # Don't keep retrying once the next bar is out.
+            price_histories = self._fetch_price_histories(
+                symbols=symbols,
+                start=self._latest_bar_windows(symbols=symbols),
+                end=end,
+                bar_size=bar_size,
+                bar_type=bar_type,
+                deadline=self._next_bar_time()
+            )
+
+            return self._latest_bars(symbols=symbols, price_histories=price_histories)
+
+    def _latest_bar_windows(self, symbols: List[str]) -> Dict[str, str]:
+        """Defines the start date of each symbol's latest bar request.
+
+        Overview:
+        ----
+        A symbol whose bars were already ingested only requests the bars from
+        its last ingested bar on, which is usually one or two candles instead
+        of a full day. Other symbols request the last day.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols.
+
+        Returns:
+        ----
+        {Dict[str, str]} -- The start date of each symbol, in milliseconds since epoch.
+        """
+
+        full_day = str(milliseconds_since_epoch(dt_object=datetime.today() - timedelta(days=1)))
+
+        return {
+            symbol: str(self._last_bar_times[symbol]) if symbol in self._last_bar_times else full_day
+            for symbol in symbols
+        }
+
+    def _latest_bars(self, symbols: List[str], price_histories: List[Tuple[str, dict]]) -> List[dict]:
+        """Parses the bars that weren't ingested yet, and falls back to quotes for failed symbols.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols that were requested.
+
+        price_histories {List[Tuple[str, dict]]} -- The symbol and price history response
+            of each request that succeeded.
+
+        Returns:
+        ----
+        {List[dict]} -- The new bars of each symbol or, if there aren't any, its latest bar again.
+        """
 
         latest_prices = []
 
-        # Loop through each symbol.
-        for symbol in self.portfolio.positions:
+        # parse the candles.
+        for symbol, historical_prices_response in price_histories:
 
-            try:
+            candles = historical_prices_response['candles']
+            last_bar_time = self._last_bar_times.get(symbol)
 
-                # Grab the request.
-                historical_prices_response = self.session.get_price_history(
-                    symbol=symbol,
-                    period_type='day',
-                    start_date=start,
-                    end_date=end,
-                    frequency_type=bar_type,
-                    frequency=bar_size,
-                    extended_hours=True
-                )
+            # Without an ingested bar, only the latest one is new.
+            if last_bar_time is None:
+                new_candles = candles[-1:]
+            else:
+                new_candles = [candle for candle in candles if candle['datetime'] > last_bar_time]
+
+            latest_prices += self._parse_candles(
+                symbol=symbol,
+                candles=new_candles or candles[-1:]
+            )
+
+        # Build bars from a single quotes request for the symbols that failed.
+        if self.fetch_errors:
+            latest_prices += self._quote_bars(symbols=[symbol for symbol in symbols if symbol in self.fetch_errors])
+
+        self._track_last_bar_times(prices=latest_prices)
+
+        return latest_prices
+
+    def _quote_bars(self, symbols: List[str]) -> List[dict]:
+        """Builds a bar for each symbol from its latest quote.
+
+        Overview:
+        ----
+        The quote only has the last price, so the bar's open, high, low and close are
+        all the last price, and its volume is the volume traded since the previous
+        quote bar. Bars built this way are flagged with `from_quote`. A symbol that
+        gets a quote bar is removed from `fetch_errors`.
+
+        The quote falls in the bar still in progress, so a quote bar doesn't count as
+        ingested. The next request starts from the last real candle again, and when
+        that bar's candle arrives it replaces the quote bar in the StockFrame.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols.
+
+        Returns:
+        ----
+        {List[dict]} -- One bar per symbol that has a quote.
+        """
 
-            except:
+        if not symbols or self._bar_type not in BAR_SECONDS or not self._bar_size:
+            return []
 
-                time_true.sleep(2)
+        try:
+            quotes = self.session.get_quotes(instruments=symbols)
+        except Exception:
+            return []
+
+        bar_milliseconds = 1000 * self.scheduler.bar_seconds
+        quote_bars = []
+
+        for symbol in symbols:
+
+            quote = quotes.get(symbol)
+
+            if not quote or 'lastPrice' not in quote:
+                continue
+
+            total_volume = quote.get('totalVolume', 0)
+            previous_volume = self._last_total_volumes.get(symbol, total_volume)
+            self._last_total_volumes[symbol] = total_volume
+
+            quote_bars.append({
+                'symbol': symbol,
+                'open': quote['lastPrice'],
+                'close': quote['lastPrice'],
+                'high': quote['lastPrice'],
+                'low': quote['lastPrice'],
+                'volume': max(total_volume - previous_volume, 0),
+                'datetime': quote['quoteTimeInLong'] // bar_milliseconds * bar_milliseconds,
+                'from_quote': True
+            })
+
+            self.fetch_errors.pop(symbol)
+
+        return quote_bars
+
+    def _track_last_bar_times(self, prices: List[dict]) -> None:
+        """Stores the time of the last bar ingested for each symbol.
+
+        Arguments:
+        ----
+        prices {List[dict]} -- The bars, as returned by `_parse_candles`. Bars built
+            from a quote are skipped, so their candle is still requested.
+        """
 
-                # Grab the request.
-                historical_prices_response = self.session.get_price_history(
+        for price in prices:
+            if price.get('from_quote'):
+                continue
+            if price['datetime'] > self._last_bar_times.get(price['symbol'], -1):
+                self._last_bar_times[price['symbol']] = price['datetime']
+
+    def _fetch_price_histories(self, symbols: List[str], start: Union[str, Dict[str, str]], end: str, bar_size: int,
+                               bar_type: str, deadline: float = None) -> List[Tuple[str, dict]]:
+        """Grabs the price history of several symbols, sending up to `max_workers` requests at once.
+
+        Overview:
+        ----
+        A symbol whose request fails, after any retries, doesn't stop the others.
+        Its error is stored in `fetch_errors`, keyed by the symbol, and it's left
+        out of the results. `fetch_errors` is cleared at the start of every call.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols.
+
+        start {Union[str, Dict[str, str]]} -- The start date, in milliseconds since epoch,
+            or the start date of each symbol.
+
+        end {str} -- The end date, in milliseconds since epoch.
+
+        bar_size {int} -- The size of each bar.
+
+        bar_type {str} -- The bar type, for example `minute`.
+
+        Keyword Arguments:
+        ----
+        deadline {float} -- The UNIX timestamp after which failed requests aren't
+            retried. (default: {None})
+
+        Returns:
+        ----
+        {List[Tuple[str, dict]]} -- The symbol and price history response of each request
+            that succeeded, in the same order as `symbols`.
+        """
+
+        symbols = list(symbols)
+
+        def fetch(symbol: str) -> Union[dict, Exception]:
+
+            try:
+                return self._fetch_price_history(
                     symbol=symbol,
-                    period_type='day',
-                    start_date=start,
-                    end_date=end,
-                    frequency_type=bar_type,
-                    frequency=bar_size,
-                    extended_hours=True
+                    start=start[symbol] if isinstance(start, dict) else start,
+                    end=end,
+                    bar_size=bar_size,
+                    bar_type=bar_type,
+                    deadline=deadline
                 )
+            except Exception as fetch_error:
+                return fetch_error
 
-            # parse the candles.
-            for candle in historical_prices_response['candles'][-1:]:
+        # Only use threads when there's more than one request to send at once.
+        if min(self.max_workers, len(symbols)) > 1:
+            responses = list(self._fetch_pool().map(fetch, symbols))
+        else:
+            responses = [fetch(symbol=symbol) for symbol in symbols]
 
-                new_price_mini_dict = {}
-                new_price_mini_dict['symbol'] = symbol
-                new_price_mini_dict['open'] = candle['open']
-                new_price_mini_dict['close'] = candle['close']
-                new_price_mini_dict['high'] = candle['high']
-                new_price_mini_dict['low'] = candle['low']
-                new_price_mini_dict['volume'] = candle['volume']
-                new_price_mini_dict['datetime'] = candle['datetime']
-                latest_prices.append(new_price_mini_dict)
+        return self._collect_price_histories(symbols=symbols, responses=responses)
 
-        return latest_prices
+    def _fetch_pool(self) -> ThreadPoolExecutor:
+        """Grabs the thread pool the price requests run on, starting it the first time.
+
+        Overview:
+        ----
+        The pool is kept between bars, so each bar doesn't pay for starting and
+        joining threads. It has `max_workers` threads, and is replaced if
+        `max_workers` changes.
+
+        Returns:
+        ----
+        {ThreadPoolExecutor} -- The thread pool.
+        """
+
+        if self._fetch_executor is not None and self._fetch_executor_workers != self.max_workers:
+            self._fetch_executor.shutdown(wait=True)
+            self._fetch_executor = None
+
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pyrobot-fetch')
+            self._fetch_executor_workers = self.max_workers
+
+        return self._fetch_executor
+
+    def close(self) -> None:
+        """Shuts down the thread pool used for the price requests, if it was started."""
+
+        if self._fetch_executor is not None:
+            self._fetch_executor.shutdown(wait=True)
+            self._fetch_executor = None
+
+    def _collect_price_histories(self, symbols: List[str], responses: List[Union[dict, Exception]]) -> List[Tuple[str, dict]]:
+        """Pairs each symbol with its response, storing the failed ones in `fetch_errors`.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols.
+
+        responses {List[Union[dict, Exception]]} -- The response, or the error raised,
+            for each symbol.
+
+        Returns:
+        ----
+        {List[Tuple[str, dict]]} -- The symbol and response of each request that succeeded.
+        """
+
+        self.fetch_errors = {}
+        price_histories = []
+
+        for symbol, response in zip(symbols, responses):
+
+            if isinstance(response, Exception):
+                self.fetch_errors[symbol] = response
+            else:
+                price_histories.append((symbol, response))
+
+        return price_histories
+
+    def _fetch_price_history(self, symbol: str, start: str, end: str, bar_size: int, bar_type: str,
+                             deadline: float = None) -> dict:
+        """Grabs the price history of a single symbol, including extended hours.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        start {str} -- The start date, in milliseconds since epoch.
+
+        end {str} -- The end date, in milliseconds since epoch.
+
+        bar_size {int} -- The size of each bar.
+
+        bar_type {str} -- The bar type, for example `minute`.
+
+        Keyword Arguments:
+        ----
+        deadline {float} -- The UNIX timestamp after which a failed request isn't
+            retried. It only applies to this request, which runs on the calling
+            thread. (default: {None})
+
+        Returns:
+        ----
+        {dict} -- The price history response, with the bars under `candles`.
+        """
+
+        with retry_deadline(deadline=deadline):
+            return self.session.get_price_history(
+                symbol=symbol,
+                period_type='day',
+                start_date=start,
+                end_date=end,
+                frequency_type=bar_type,
+                frequency=bar_size,
+                extended_hours=True
+            )
+
+    def _parse_candles(self, symbol: str, candles: List[dict]) -> List[dict]:
+        """Converts the candles of a price history response into StockFrame rows.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol the candles belong to.
+
+        candles {List[dict]} -- The candles from the price history response.
+
+        Returns:
+        ----
+        {List[dict]} -- One price dictionary per candle.
+        """
+
+        new_prices = []
+
+        for candle in candles:
+
+            new_price_mini_dict = {}
+            new_price_mini_dict['symbol'] = symbol
+            new_price_mini_dict['open'] = candle['open']
+            new_price_mini_dict['close'] = candle['close']
+            new_price_mini_dict['high'] = candle['high']
+            new_price_mini_dict['low'] = candle['low']
+            new_price_mini_dict['volume'] = candle['volume']
+            new_price_mini_dict['datetime'] = candle['datetime']
+            new_prices.append(new_price_mini_dict)
+
+        return new_prices
+
+    def _next_bar_time(self) -> Union[float, None]:
+        """Calculates when the next bar opens.
+
+        Returns:
+        ----
+        {Union[float, None]} -- The UNIX timestamp, in seconds, of the next bar boundary,
+            or `None` if the bars don't have a fixed length.
+        """
+
+        if self._bar_type not in BAR_SECONDS or not self._bar_size:
+            return None
+
+        return self.scheduler.next_boundary()
+
+    def _last_bar_time(self) -> Union[float, None]:
+        """Finds the open time of the newest bar ingested, for any symbol.
+
+        Returns:
+        ----
+        {Union[float, None]} -- The UNIX timestamp in seconds, or `None` if no bars were ingested.
+        """
+
+        if not self._last_bar_times:
+            return None
+
+        return max(self._last_bar_times.values()) / 1000
 
     def wait_till_next_bar(self, last_bar_timestamp: pd.DatetimeIndex) -> None:
         """Waits the number of seconds till the next bar is released.
 
+        Overview:
+        ----
+        The wait ends `scheduler.publish_delay` seconds after the next bar opens, to
+        the fraction of a second. Use `process_latest_bar(wait=True)` to also poll
+        until the new bar is published.
+
         Arguments:
         ----
         last_bar_timestamp {pd.DatetimeIndex} -- The last bar's timestamp.
         """
 
+        time_true.sleep(self._time_till_next_bar(last_bar_timestamp=last_bar_timestamp))
+
+    def _time_till_next_bar(self, last_bar_timestamp: pd.DatetimeIndex) -> float:
+        """Calculates the number of seconds till the next bar is released.
+
+        Arguments:
+        ----
+        last_bar_timestamp {pd.DatetimeIndex} -- The last bar's timestamp.
+
+        Returns:
+        ----
+        {float} -- The number of seconds to wait.
+        """
+
         last_bar_time = last_bar_timestamp.to_pydatetime()[0].replace(tzinfo=timezone.utc)
-        next_bar_time = last_bar_time + timedelta(seconds=60)
-        curr_bar_time = datetime.now(tz=timezone.utc)
 
-        last_bar_timestamp = int(last_bar_time.timestamp())
-        next_bar_timestamp = int(next_bar_time.timestamp())
-        curr_bar_timestamp = int(curr_bar_time.timestamp())
+        return self.scheduler.time_till_next_bar(last_bar_time=last_bar_time.timestamp())
 
-        time_to_wait_now = next_bar_timestamp - curr_bar_timestamp
+    def connect_pipeline(self, indicator_client: Indicators, trades_to_execute: dict = None) -> None:
+        """Subscribes an Indicators object and its trades to the robot's events.
 
-        if time_to_wait_now < 0:
-            time_to_wait_now = 0
+        Overview:
+        ----
+        Once connected, each stage runs as soon as the stage before it publishes:
 
-        print("=" * 80)
-        print("Pausing for the next bar")
-        print("-" * 80)
-        print("Curr Time: {time_curr}".format(
-            time_curr=curr_bar_time.strftime("%Y-%m-%d %H:%M:%S")
-        )
-        )
-        print("Next Time: {time_next}".format(
-            time_next=next_bar_time.strftime("%Y-%m-%d %H:%M:%S")
-        )
+            1. `bar` -- The latest bars are added to the StockFrame and the
+               indicators are refreshed, then `indicators` is published.
+            2. `indicators` -- The signals are checked, then `signals` is published.
+            3. `signals` -- The trades for the signals are executed, then `orders`
+               is published with the order responses.
+
+        Several Indicators objects can be connected to the same robot, they all
+        receive the same bars. Each one only reacts to the events it published.
+
+        Arguments:
+        ----
+        indicator_client {Indicators} -- The indicators and signals to run on each bar.
+
+        Keyword Arguments:
+        ----
+        trades_to_execute {dict} -- The trades to execute when signals are found, in the
+            format `execute_signals` expects. If not given, the signals are published but
+            no trades are executed. (default: {None})
+
+        Usage:
+        ----
+            >>> trading_robot.connect_pipeline(
+                    indicator_client=indicator_client,
+                    trades_to_execute=trades_dict
+                )
+            >>> trading_robot.events.subscribe(topic='orders', callback=print)
+            >>> trading_robot.process_latest_bar()
+        """
+
+        self._connect_stock_frame(stock_frame=indicator_client._stock_frame)
+
+        def on_bar(event: Event) -> None:
+
+            indicator_client.refresh()
+            self.events.publish(topic=INDICATORS_EVENT, data=indicator_client, origin=event)
+
+        def on_indicators(event: Event) -> None:
+
+            if event.data is not indicator_client:
+                return
+
+            signals = indicator_client.check_signals()
+            self.events.publish(
+                topic=SIGNALS_EVENT,
+                data={'indicator_client': indicator_client, 'signals': signals},
+                origin=event
+            )
+
+        def on_signals(event: Event) -> None:
+
+            if event.data.get('indicator_client') is not indicator_client or not trades_to_execute:
+                return
+
+            order_responses = self.execute_signals(
+                signals=event.data['signals'],
+                trades_to_execute=trades_to_execute
+            )
+            self.events.publish(topic=ORDERS_EVENT, data=order_responses, origin=event)
+
+        self.events.subscribe(topic=BAR_EVENT, callback=on_bar)
+        self.events.subscribe(topic=INDICATORS_EVENT, callback=on_indicators)
+        self.events.subscribe(topic=SIGNALS_EVENT, callback=on_signals)
+
+    def _connect_stock_frame(self, stock_frame: StockFrame) -> None:
+        """Adds the published bars to a StockFrame, once however many strategies share it.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The StockFrame to add the bars to.
+        """
+
+        if any(connected is stock_frame for connected in self._pipeline_frames):
+            return
+
+        def on_bar_add_rows(event: Event) -> None:
+            stock_frame.add_rows(data=event.data)
+
+        self._pipeline_frames.append(stock_frame)
+        self.events.subscribe(topic=BAR_EVENT, callback=on_bar_add_rows)
+
+    def add_strategy(self, strategy: Strategy, **indicator_options) -> Strategy:
+        """Adds a strategy to the robot's strategy registry.
+
+        Overview:
+        ----
+        Every strategy added to the robot runs on the robot's StockFrame and shares one
+        `Indicators` object, so an indicator used by several strategies is calculated
+        once per bar. Each strategy's signals only execute its own trades. The first
+        time a strategy is added, the registry is created and connected to the robot's
+        events, so publishing a bar runs every strategy.
+
+        Arguments:
+        ----
+        strategy {Strategy} -- The strategy to add.
+
+        Keyword Arguments:
+        ----
+        indicator_options -- Passed through to the shared `Indicators` object the first
+            time a strategy is added, for example `lazy=True`.
+
+        Returns:
+        ----
+        {Strategy} -- The strategy.
+
+        Usage:
+        ----
+            >>> trading_robot.create_stock_frame(data=historical_prices['aggregated'])
+            >>> trading_robot.add_strategy(strategy=golden_cross)
+            >>> trading_robot.add_strategy(strategy=rsi_reversal)
+            >>> trading_robot.process_latest_bar()
+        """
+
+        if self.strategies is None:
+
+            if self.stock_frame is None:
+                raise ValueError('Create the StockFrame before adding a strategy.')
+
+            self.strategies = StrategyRegistry(stock_frame=self.stock_frame, **indicator_options)
+            self._connect_strategies()
+
+        return self.strategies.add_strategy(strategy=strategy)
+
+    def _connect_strategies(self) -> None:
+        """Subscribes the strategy registry to the robot's events."""
+
+        strategies = self.strategies
+
+        self._connect_stock_frame(stock_frame=strategies.stock_frame)
+
+        def on_bar(event: Event) -> None:
+            strategies.refresh()
+            self.events.publish(topic=INDICATORS_EVENT, data=strategies, origin=event)
+
+        def on_indicators(event: Event) -> None:
+
+            if event.data is not strategies:
+                return
+
+            for name, signals in strategies.check_signals().items():
+                self.events.publish(
+                    topic=SIGNALS_EVENT,
+                    data={'strategy': strategies.strategies[name], 'signals': signals},
+                    origin=event
+                )
+
+        def on_signals(event: Event) -> None:
+
+            strategy = event.data.get('strategy')
+
+            if strategy is None or strategies.strategies.get(strategy.name) is not strategy:
+                return
+
+            if not strategy.trades_to_execute:
+                return
+
+            order_responses = self.execute_signals(
+                signals=event.data['signals'],
+                trades_to_execute=strategy.trades_to_execute
+            )
+            self.events.publish(
+                topic=ORDERS_EVENT,
+                data={'strategy': strategy, 'orders': order_responses},
+                origin=event
+            )
+
+        self.events.subscribe(topic=BAR_EVENT, callback=on_bar)
+        self.events.subscribe(topic=INDICATORS_EVENT, callback=on_indicators)
+        self.events.subscribe(topic=SIGNALS_EVENT, callback=on_signals)
+
+    def process_latest_bar(self, wait: bool = False) -> Event:
+        """Grabs the latest bars and publishes them, running every connected stage.
+
+        Keyword Arguments:
+        ----
+        wait {bool} -- If `True`, waits for the bar after the last one ingested, polling
+            until it's published. See `BarScheduler.wait_for_new_bar`. (default: {False})
+
+        Returns:
+        ----
+        {Event} -- The published `bar` event.
+
+        Usage:
+        ----
+            >>> trading_robot.connect_pipeline(indicator_client=indicator_client)
+            >>> while True:
+                    bar_event = trading_robot.process_latest_bar(wait=True)
+        """
+
+        last_bar_time = self._last_bar_time()
+
+        if wait and last_bar_time is not None:
+            latest_bars = self.scheduler.wait_for_new_bar(
+                fetch=self.get_latest_bar,
+                last_bar_time=last_bar_time
+            )
+        else:
+            latest_bars = self.get_latest_bar()
+
+        return self.events.publish(
+            topic=BAR_EVENT,
+            data=latest_bars,
+            bar_close=self._bar_close(bars=latest_bars)
         )
-        print("Sleep Time: {seconds}".format(seconds=time_to_wait_now))
-        print("-" * 80)
-        print('')
 
-        time_true.sleep(time_to_wait_now)
+    def _bar_close(self, bars: List[dict]) -> Union[float, None]:
+        """Finds when the newest of the bars closed.
+
+        Arguments:
+        ----
+        bars {List[dict]} -- The bars, with a `datetime` in milliseconds when the bar opened.
+
+        Returns:
+        ----
+        {Union[float, None]} -- The UNIX timestamp in seconds, or `None` if it's unknown.
+        """
+
+        if not bars or self._bar_type not in BAR_SECONDS or not self._bar_size:
+            return None
+
+        bar_open = max(bar['datetime'] for bar in bars) / 1000
+
+        return bar_open + self.scheduler.bar_seconds
 
     def create_stock_frame(self, data: List[dict]) -> StockFrame:
         """Generates a new StockFrame Object.
@@ -656,8 +1256,8 @@ class PyRobot():
         StockFrame -- A multi-index pandas data frame built for trading.
         """
 
-        # Create the Frame.
-        self.stock_frame = StockFrame(data=data)
+        # Create the Frame, reporting to the robot's metrics.
+        self.stock_frame = StockFrame(data=data, metrics=self.metrics)
 
         return self.stock_frame
 
@@ -697,6 +1297,7 @@ class PyRobot():
         sells: pd.Series = signals['sells']
 
         order_responses = []
+        live_trades = []
 
         # If we have buys or sells continue.
         if not buys.empty:
@@ -722,18 +1323,8 @@ class PyRobot():
 
                     if not self.paper_trading:
 
-                        # Execute the order.
-                        order_response = self.execute_orders(
-                            trade_obj=trade_obj
-                        )
-
-                        order_response = {
-                            'order_id': order_response['order_id'],
-                            'request_body': order_response['request_body'],
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        order_responses.append(order_response)
+                        # Send the orders together, once every trade is known.
+                        live_trades.append(trade_obj)
 
                     else:
 
@@ -769,18 +1360,8 @@ class PyRobot():
 
                     if not self.paper_trading:
 
-                        # Execute the order.
-                        order_response = self.execute_orders(
-                            trade_obj=trade_obj
-                        )
-
-                        order_response = {
-                            'order_id': order_response['order_id'],
-                            'request_body': order_response['request_body'],
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        order_responses.append(order_response)
+                        # Send the orders together, once every trade is known.
+                        live_trades.append(trade_obj)
 
                     else:
 
@@ -792,11 +1373,33 @@ class PyRobot():
 
                         order_responses.append(order_response)
 
-        # Save the response.
-        self.save_orders(order_response_dict=order_responses)
+        for order_response in self._place_orders(trade_objs=live_trades):
+            order_responses.append({
+                'order_id': order_response['order_id'],
+                'request_body': order_response['request_body'],
+                'timestamp': datetime.now().isoformat()
+            })
+
+        # Save the response, without rewriting the file when nothing was executed.
+        if order_responses and self.record_orders:
+            self.save_orders(order_response_dict=order_responses)
 
         return order_responses
 
+    def _place_orders(self, trade_objs: List[Trade]) -> List[dict]:
+        """Executes the trades a set of signals triggered, one after the other.
+
+        Arguments:
+        ----
+        trade_objs {List[Trade]} -- The trade objects, with the `order` property filled out.
+
+        Returns:
+        ----
+        {List[dict]} -- The order responses, in the same order as the trades.
+        """
+
+        return [self.execute_orders(trade_obj=trade_obj) for trade_obj in trade_objs]
+
     def execute_orders(self, trade_obj: Trade) -> dict:
         """Executes a Trade Object.
 
@@ -816,10 +1419,11 @@ class PyRobot():
         """
 
         # Execute the order.
-        order_dict = self.session.place_order(
-            account=self.trading_account,
-            order=trade_obj.order
-        )
+        with self.metrics.timer(name='stage_duration', tags={'stage': 'place_order'}):
+            order_dict = self.session.place_order(
+                account=self.trading_account,
+                order=trade_obj.order
+            )
 
         # Store the order.
         trade_obj._order_response = order_dict
@@ -841,6 +1445,9 @@ class PyRobot():
         {bool} -- `True` if the orders were successfully saved.
         """
 
+        if self.metrics.enabled:
+            save_start = time_true.perf_counter()
+
         def default(obj):
 
             if isinstance(obj, bytes):
@@ -872,6 +1479,9 @@ class PyRobot():
         with open(file='data/orders.json', mode='w+') as order_json:
             json.dump(obj=orders_list, fp=order_json, indent=4, default=default)
 
+        if self.metrics.enabled:
+            self.metrics.observe(name='stage_duration', seconds=time_true.perf_counter() - save_start, tags={'stage': 'save_orders'})
+
         return True
 
     def get_accounts(self, account_number: str = None, all_accounts: bool = False) -> dict:
@@ -0,0 +1,325 @@
+import math
+import numpy as np
+import pandas as pd
+
+from collections import deque
+
+from typing import Dict
+from typing import List
+
+
+class RollingStatistics():
+
+    """
+    Represents the rolling mean, standard deviation, minimum and maximum
+    over a fixed window, updated one value at a time in O(1).
+
+    Overview:
+    ----
+    The minimum and maximum are kept in monotonic deques, so each value is
+    added and removed at most once. The mean and variance use Welford's
+    method, extended so the oldest value can be removed when the window is
+    full. Like a pandas rolling window, a statistic is `NaN` until the window
+    is full, or while a `NaN` is inside the window.
+    """
+
+    def __init__(self, window: int, ddof: int = 1) -> None:
+        """Initalizes the Rolling Statistics.
+
+        Arguments:
+        ----
+        window {int} -- The number of values in the window.
+
+        Keyword Arguments:
+        ----
+        ddof {int} -- The delta degrees of freedom for the variance. (default: {1})
+
+        Usage:
+        ----
+            >>> statistics = RollingStatistics(window=20)
+            >>> statistics.push(value=101.5)
+            >>> statistics.mean
+        """
+
+        if window < 1:
+            raise ValueError('The window must be at least 1.')
+
+        self.window = window
+        self.ddof = ddof
+
+        self._values = deque()
+        self._index = 0
+        self._nan_count = 0
+
+        # Welford's running mean and sum of squared differences.
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+        # Monotonic deques of (index, value) for the minimum and maximum.
+        self._min_deque = deque()
+        self._max_deque = deque()
+
+    @property
+    def is_ready(self) -> bool:
+        """Specifies whether the window is full and has no `NaN` values.
+
+        Returns:
+        ----
+        {bool} -- `True` if the statistics are defined.
+        """
+
+        return len(self._values) == self.window and self._nan_count == 0
+
+    @property
+    def mean(self) -> float:
+        """The mean of the window."""
+
+        return self._mean if self.is_ready else np.nan
+
+    @property
+    def variance(self) -> float:
+        """The variance of the window."""
+
+        if not self.is_ready or self._count <= self.ddof:
+            return np.nan
+
+        return max(self._m2, 0.0) / (self._count - self.ddof)
+
+    @property
+    def std(self) -> float:
+        """The standard deviation of the window."""
+
+        return math.sqrt(self.variance) if self.is_ready else np.nan
+
+    @property
+    def min(self) -> float:
+        """The minimum of the window."""
+
+        return self._min_deque[0][1] if self.is_ready else np.nan
+
+    @property
+    def max(self) -> float:
+        """The maximum of the window."""
+
+        return self._max_deque[0][1] if self.is_ready else np.nan
+
+    def push(self, value: float) -> None:
+        """Adds the newest value, removing the oldest one if the window is full.
+
+        Arguments:
+        ----
+        value {float} -- The newest value.
+        """
+
+        if len(self._values) == self.window:
+            self._remove(value=self._values.popleft())
+
+        self._values.append(value)
+        index = self._index
+        self._index += 1
+
+        if value != value:
+            self._nan_count += 1
+            return
+
+        # Add the value to the mean and variance.
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+        # Drop anything the new value makes irrelevant, then add it.
+        while self._min_deque and self._min_deque[-1][1] >= value:
+            self._min_deque.pop()
+        self._min_deque.append((index, value))
+
+        while self._max_deque and self._max_deque[-1][1] <= value:
+            self._max_deque.pop()
+        self._max_deque.append((index, value))
+
+        # Drop anything that fell out of the window.
+        oldest_index = self._index - self.window
+
+        while self._min_deque[0][0] < oldest_index:
+            self._min_deque.popleft()
+
+        while self._max_deque[0][0] < oldest_index:
+            self._max_deque.popleft()
+
+    def _remove(self, value: float) -> None:
+        """Removes the oldest value from the mean and variance.
+
+        Arguments:
+        ----
+        value {float} -- The value leaving the window.
+        """
+
+        if value != value:
+            self._nan_count -= 1
+            return
+
+        if self._count == 1:
+            self._count = 0
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+
+        delta = value - self._mean
+        self._count -= 1
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def update(self, values: np.ndarray, statistics: List[str] = None) -> Dict[str, np.ndarray]:
+        """Pushes several values, returning the statistics after each one.
+
+        Arguments:
+        ----
+        values {np.ndarray} -- The new values, in time order.
+
+        Keyword Arguments:
+        ----
+        statistics {List[str]} -- The statistics to return, any of `['mean', 'std', 'min', 'max']`.
+            (default: {all of them})
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- One array per statistic, the same length as `values`.
+        """
+
+        statistics = statistics or ['mean', 'std', 'min', 'max']
+        results = {name: np.empty(len(values)) for name in statistics}
+
+        for position, value in enumerate(values):
+
+            self.push(value=float(value))
+
+            for name in statistics:
+                results[name][position] = getattr(self, name)
+
+        return results
+
+
+class ExponentialMovingAverage():
+
+    """
+    Represents an exponentially weighted moving average, updated one value
+    at a time in O(1).
+
+    Overview:
+    ----
+    The average matches `pd.Series.ewm(span=span, min_periods=min_periods).mean()`,
+    which weighs the observations so far instead of seeding the average with
+    the first one. The weighted sum and the sum of the weights are both decayed
+    on every value, so a `NaN` keeps the last average but still ages the older
+    values, like pandas does.
+    """
+
+    def __init__(self, span: int, min_periods: int = 0) -> None:
+        """Initalizes the Exponential Moving Average.
+
+        Arguments:
+        ----
+        span {int} -- The span of the average, so `alpha` is `2 / (span + 1)`.
+
+        Keyword Arguments:
+        ----
+        min_periods {int} -- The number of values needed before the average
+            is defined. (default: {0})
+
+        Usage:
+        ----
+            >>> average = ExponentialMovingAverage(span=12)
+            >>> average.push(value=101.5)
+            >>> average.value
+        """
+
+        if span < 1:
+            raise ValueError('The span must be at least 1.')
+
+        self.span = span
+        self.min_periods = max(min_periods, 1)
+
+        self._decay = 1.0 - 2.0 / (span + 1.0)
+        self._weighted_sum = 0.0
+        self._weights = 0.0
+        self._count = 0
+
+    @property
+    def value(self) -> float:
+        """The average, or `NaN` until `min_periods` values were pushed."""
+
+        if self._count < self.min_periods:
+            return np.nan
+
+        return self._weighted_sum / self._weights
+
+    def push(self, value: float) -> None:
+        """Adds the newest value.
+
+        Arguments:
+        ----
+        value {float} -- The newest value.
+        """
+
+        self._weighted_sum *= self._decay
+        self._weights *= self._decay
+
+        if value == value:
+            self._weighted_sum += value
+            self._weights += 1.0
+            self._count += 1
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """Pushes several values, returning the average after each one.
+
+        Arguments:
+        ----
+        values {np.ndarray} -- The new values, in time order.
+
+        Returns:
+        ----
+        {np.ndarray} -- The averages, the same length as `values`.
+        """
+
+        results = np.empty(len(values))
+
+        for position, value in enumerate(values):
+
+            self.push(value=float(value))
+            results[position] = self.value
+
+        return results
+
+
+def rolling_statistics(values: np.ndarray, window: int, statistics: List[str] = None) -> Dict[str, np.ndarray]:
+    """Calculates rolling statistics over a whole array at once.
+
+    Overview:
+    ----
+    This is the batch version of `RollingStatistics`, used when a symbol's
+    history is calculated in full. It returns the same values as pushing the
+    array through `RollingStatistics.update` one value at a time.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The values, in time order.
+
+    window {int} -- The number of values in the window.
+
+    Keyword Arguments:
+    ----
+    statistics {List[str]} -- The statistics to return, any of `['mean', 'std', 'min', 'max']`.
+        (default: {all of them})
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- One array per statistic, the same length as `values`.
+    """
+
+    statistics = statistics or ['mean', 'std', 'min', 'max']
+    rolling_window = pd.Series(values).rolling(window=window)
+
+    return {
+        name: getattr(rolling_window, name)().to_numpy() for name in statistics
+    }
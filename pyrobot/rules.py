@@ -0,0 +1,696 @@
+"""Signal rules and the compiler that fuses them into a single evaluation plan.
+
+A rule is one condition on the indicator columns for one side, `buy` or
+`sell`. Most rules only read the current bar, crossovers also read the
+bar before it. `compile_signals` takes every rule registered on an `Indicators`
+object and builds a `SignalPlan`, which groups the conditions by operator
+so each group is a single NumPy ufunc call over every symbol at once. The
+same plan is evaluated on the last row of each symbol when checking
+signals, or on every row when looking back over history.
+
+Rules, and whole plans, can be written to and read from plain dictionaries
+so a strategy can be stored in a config file.
+"""
+
+import operator
+import numpy as np
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from typing import Callable
+
+
+# The operators a rule can be compiled with, by name.
+OPERATORS = {
+    'gt': np.greater,
+    'ge': np.greater_equal,
+    'lt': np.less,
+    'le': np.less_equal,
+    'eq': np.equal,
+    'ne': np.not_equal
+}
+
+# The symbols that can be used in place of the operator names.
+OPERATOR_SYMBOLS = {
+    '>': 'gt',
+    '>=': 'ge',
+    '<': 'lt',
+    '<=': 'le',
+    '==': 'eq',
+    '!=': 'ne'
+}
+
+SIDES = ('buy', 'sell')
+
+# The bar a term reads its columns from.
+CURRENT_BAR = 0
+PREVIOUS_BAR = 1
+
+
+def operator_name(condition: Union[str, Callable]) -> Union[str, None]:
+    """Finds the name of a condition operator.
+
+    Arguments:
+    ----
+    condition {Union[str, Callable]} -- An operator name like `ge`, a symbol like `>=`,
+        a function from the `operator` module like `operator.ge`, or a NumPy ufunc.
+
+    Returns:
+    ----
+    {Union[str, None]} -- The operator name, or `None` if the condition is some
+        other callable.
+    """
+
+    if isinstance(condition, str):
+
+        name = OPERATOR_SYMBOLS.get(condition, condition)
+
+        if name not in OPERATORS:
+            raise ValueError("Unknown operator: {condition}".format(condition=condition))
+
+        return name
+
+    for name, ufunc in OPERATORS.items():
+        if condition is ufunc or condition is getattr(operator, name):
+            return name
+
+    return None
+
+
+class SignalRule():
+
+    """
+    Represents a single condition for either the buy or the sell side.
+    Subclasses declare the columns they read and how to evaluate them.
+    """
+
+    rule_type: str = None
+
+    def __init__(self, side: str, condition: Union[str, Callable]) -> None:
+        """Initalizes the rule.
+
+        Arguments:
+        ----
+        side {str} -- Either `buy` or `sell`.
+
+        condition {Union[str, Callable]} -- The operator, see `operator_name`.
+        """
+
+        if side not in SIDES:
+            raise ValueError("A rule's side must be 'buy' or 'sell'.")
+
+        self.side = side
+        self.condition = condition
+        self.operator = operator_name(condition=condition)
+
+    @property
+    def columns(self) -> List[str]:
+        """The StockFrame columns the rule reads."""
+
+        raise NotImplementedError
+
+    def _operands(self) -> tuple:
+        """The left and right operands, a column name or a number each."""
+
+        raise NotImplementedError
+
+    def terms(self) -> List[tuple]:
+        """Breaks the rule into `(left, operator, right, bar)` terms that must all be met.
+
+        Returns:
+        ----
+        {List[tuple]} -- The terms, where `operator` is a name from `OPERATORS` or
+            the original callable, and `bar` is `CURRENT_BAR` or `PREVIOUS_BAR`.
+        """
+
+        left, right = self._operands()
+
+        return [(left, self.operator or self.condition, right, CURRENT_BAR)]
+
+    def to_dict(self) -> dict:
+        """Serializes the rule, so it can be stored in a config file.
+
+        Returns:
+        ----
+        {dict} -- The rule's type, side and arguments.
+        """
+
+        if self.operator is None:
+            raise ValueError('Rules with a custom operator function can not be serialized.')
+
+        rule_dict = {'type': self.rule_type, 'side': self.side}
+        rule_dict.update(self._arguments())
+
+        return rule_dict
+
+    def _arguments(self) -> dict:
+        """The arguments needed to rebuild the rule."""
+
+        raise NotImplementedError
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def __repr__(self) -> str:
+        return "{cls}(side={side!r}, {arguments})".format(
+            cls=self.__class__.__name__,
+            side=self.side,
+            arguments=', '.join(
+                '{name}={value!r}'.format(name=name, value=value) for name, value in self._arguments().items()
+            )
+        )
+
+
+class ThresholdRule(SignalRule):
+
+    """An indicator compared against a fixed value, for example `rsi >= 70`."""
+
+    rule_type = 'threshold'
+
+    def __init__(self, side: str, indicator: str, condition: Union[str, Callable], value: float) -> None:
+        """Initalizes the rule.
+
+        Arguments:
+        ----
+        side {str} -- Either `buy` or `sell`.
+
+        indicator {str} -- The indicator column, for example `rsi`.
+
+        condition {Union[str, Callable]} -- The operator, for example `>=`.
+
+        value {float} -- The threshold.
+        """
+
+        super().__init__(side=side, condition=condition)
+
+        self.indicator = indicator
+        self.value = value
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.indicator]
+
+    def _operands(self) -> tuple:
+        return self.indicator, float(self.value)
+
+    def _arguments(self) -> dict:
+        return {'indicator': self.indicator, 'condition': self.operator, 'value': self.value}
+
+
+class RangeRule(ThresholdRule):
+
+    """
+    An indicator compared against a threshold and a maximum, for example
+    `rsi >= 70` but not when `rsi > 90`. This is what the `buy_max` and
+    `sell_max` arguments of `Indicators.set_indicator_signal` compile to.
+    """
+
+    rule_type = 'range'
+
+    def __init__(self, side: str, indicator: str, condition: Union[str, Callable], value: float,
+                 condition_max: Union[str, Callable], value_max: float) -> None:
+        """Initalizes the rule.
+
+        Arguments:
+        ----
+        side {str} -- Either `buy` or `sell`.
+
+        indicator {str} -- The indicator column, for example `rsi`.
+
+        condition {Union[str, Callable]} -- The operator for the threshold, for example `>=`.
+
+        value {float} -- The threshold.
+
+        condition_max {Union[str, Callable]} -- The operator for the maximum, for example `<=`.
+            The indicator must meet this condition as well for the rule to be met.
+
+        value_max {float} -- The maximum.
+        """
+
+        super().__init__(side=side, indicator=indicator, condition=condition, value=value)
+
+        self.condition_max = condition_max
+        self.operator_max = operator_name(condition=condition_max)
+        self.value_max = value_max
+
+    def terms(self) -> List[tuple]:
+        return super().terms() + [
+            (self.indicator, self.operator_max or self.condition_max, float(self.value_max), CURRENT_BAR)
+        ]
+
+    def to_dict(self) -> dict:
+
+        if self.operator_max is None:
+            raise ValueError('Rules with a custom operator function can not be serialized.')
+
+        return super().to_dict()
+
+    def _arguments(self) -> dict:
+
+        arguments = super()._arguments()
+        arguments['condition_max'] = self.operator_max
+        arguments['value_max'] = self.value_max
+
+        return arguments
+
+
+class CompareRule(SignalRule):
+
+    """One indicator compared against another, for example `sma >= ema`."""
+
+    rule_type = 'compare'
+
+    def __init__(self, side: str, indicator_1: str, condition: Union[str, Callable], indicator_2: str) -> None:
+        """Initalizes the rule.
+
+        Arguments:
+        ----
+        side {str} -- Either `buy` or `sell`.
+
+        indicator_1 {str} -- The indicator column on the left, for example `sma`.
+
+        condition {Union[str, Callable]} -- The operator, for example `>=`.
+
+        indicator_2 {str} -- The indicator column on the right, for example `ema`.
+        """
+
+        super().__init__(side=side, condition=condition)
+
+        self.indicator_1 = indicator_1
+        self.indicator_2 = indicator_2
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.indicator_1, self.indicator_2]
+
+    def _operands(self) -> tuple:
+        return self.indicator_1, self.indicator_2
+
+    def _arguments(self) -> dict:
+        return {'indicator_1': self.indicator_1, 'condition': self.operator, 'indicator_2': self.indicator_2}
+
+
+class CrossoverRule(SignalRule):
+
+    """
+    An indicator crossing above or below another indicator, or a fixed
+    value, on the current bar. For example, `sma_50` crossing above `sma_200`
+    is met on the bar of the Golden Cross and not on the bars after it.
+    """
+
+    rule_type = 'crossover'
+
+    def __init__(self, side: str, indicator_1: str, direction: str, indicator_2: Union[str, float]) -> None:
+        """Initalizes the rule.
+
+        Arguments:
+        ----
+        side {str} -- Either `buy` or `sell`.
+
+        indicator_1 {str} -- The indicator column that crosses, for example `sma_50`.
+
+        direction {str} -- Either `above` or `below`.
+
+        indicator_2 {Union[str, float]} -- The indicator column, or value, that is
+            crossed. For example, `sma_200` or `50.0`.
+        """
+
+        if direction not in ('above', 'below'):
+            raise ValueError("A crossover's direction must be 'above' or 'below'.")
+
+        super().__init__(side=side, condition='gt' if direction == 'above' else 'lt')
+
+        self.indicator_1 = indicator_1
+        self.direction = direction
+        self.indicator_2 = indicator_2
+
+    @property
+    def columns(self) -> List[str]:
+
+        if isinstance(self.indicator_2, str):
+            return [self.indicator_1, self.indicator_2]
+
+        return [self.indicator_1]
+
+    def _operands(self) -> tuple:
+
+        if isinstance(self.indicator_2, str):
+            return self.indicator_1, self.indicator_2
+
+        return self.indicator_1, float(self.indicator_2)
+
+    def terms(self) -> List[tuple]:
+
+        left, right = self._operands()
+
+        # It wasn't across on the previous bar, and it is on the current bar.
+        previous_condition = 'le' if self.direction == 'above' else 'ge'
+
+        return [
+            (left, previous_condition, right, PREVIOUS_BAR),
+            (left, self.operator, right, CURRENT_BAR)
+        ]
+
+    def _arguments(self) -> dict:
+        return {'indicator_1': self.indicator_1, 'direction': self.direction, 'indicator_2': self.indicator_2}
+
+
+RULE_TYPES = {
+    ThresholdRule.rule_type: ThresholdRule,
+    RangeRule.rule_type: RangeRule,
+    CompareRule.rule_type: CompareRule,
+    CrossoverRule.rule_type: CrossoverRule
+}
+
+
+def rule_from_dict(rule_dict: dict) -> SignalRule:
+    """Rebuilds a rule serialized with `SignalRule.to_dict`.
+
+    Arguments:
+    ----
+    rule_dict {dict} -- The serialized rule.
+
+    Returns:
+    ----
+    {SignalRule} -- The rule.
+    """
+
+    arguments = dict(rule_dict)
+    rule_type = arguments.pop('type')
+
+    if rule_type not in RULE_TYPES:
+        raise ValueError("Unknown rule type: {rule_type}".format(rule_type=rule_type))
+
+    return RULE_TYPES[rule_type](**arguments)
+
+
+class SignalPlan():
+
+    """
+    Represents a set of rules compiled into a single evaluation over
+    every symbol, or every row, at once.
+    """
+
+    def __init__(self, rules: List[SignalRule], combine: str = 'all') -> None:
+        """Compiles the rules.
+
+        Overview:
+        ----
+        Every rule is broken into terms, and the terms are grouped by operator.
+        Evaluating the plan stacks the columns the rules read, on the current
+        and the previous bar, into one matrix,
+        runs each operator group as a single ufunc call and writes the results
+        into a rows x terms boolean matrix. The terms of a rule are then AND'ed
+        together, and the rules of a side are combined with `all` or `any`.
+
+        Arguments:
+        ----
+        rules {List[SignalRule]} -- The rules to compile.
+
+        Keyword Arguments:
+        ----
+        combine {str} -- How the rules of one side are combined, either `all` or
+            `any`. (default: {'all'})
+        """
+
+        if combine not in ('all', 'any'):
+            raise ValueError("The signals can only be combined with 'all' or 'any'.")
+
+        self.rules = list(rules)
+        self.combine = combine
+        self.columns: List[str] = []
+        self.previous_columns: List[str] = []
+
+        for rule in self.rules:
+            for left, _, right, bar in rule.terms():
+                for operand in (left, right):
+
+                    if not isinstance(operand, str):
+                        continue
+
+                    if operand not in self.columns:
+                        self.columns.append(operand)
+
+                    if bar == PREVIOUS_BAR and operand not in self.previous_columns:
+                        self.previous_columns.append(operand)
+
+        # The matrix holds the current bar's columns, then the previous bar's.
+        column_positions = {(CURRENT_BAR, column): position for position, column in enumerate(self.columns)}
+        column_positions.update({
+            (PREVIOUS_BAR, column): len(self.columns) + position for position, column in enumerate(self.previous_columns)
+        })
+
+        # The terms are laid out side by side, grouped by rule.
+        self._groups: Dict[Any, dict] = {}
+        self._rule_starts = {side: [] for side in SIDES}
+        self._side_terms = {side: [] for side in SIDES}
+
+        term_position = 0
+
+        for rule in self.rules:
+
+            self._rule_starts[rule.side].append(len(self._side_terms[rule.side]))
+
+            for left, condition, right, bar in rule.terms():
+
+                group = self._groups.setdefault(
+                    condition, {'terms': [], 'left': [], 'right_columns': [], 'right_values': []}
+                )
+                group['terms'].append(term_position)
+                group['left'].append(column_positions[(bar, left)])
+
+                if isinstance(right, str):
+                    group['right_columns'].append(column_positions[(bar, right)])
+                    group['right_values'].append(np.nan)
+                else:
+                    group['right_columns'].append(-1)
+                    group['right_values'].append(right)
+
+                self._side_terms[rule.side].append(term_position)
+                term_position += 1
+
+        self._term_count = term_position
+
+        # Split each group into the terms against a column and against a value.
+        for group in self._groups.values():
+
+            terms = np.array(group.pop('terms'), dtype=int)
+            left = np.array(group.pop('left'), dtype=int)
+            right_columns = np.array(group.pop('right_columns'), dtype=int)
+            right_values = np.array(group.pop('right_values'), dtype=float)
+            is_column = right_columns >= 0
+
+            group['column_terms'] = (terms[is_column], left[is_column], right_columns[is_column])
+            group['value_terms'] = (terms[~is_column], left[~is_column], right_values[~is_column])
+
+        for side in SIDES:
+            self._side_terms[side] = np.array(self._side_terms[side], dtype=int)
+            self._rule_starts[side] = np.array(self._rule_starts[side], dtype=int)
+
+    @property
+    def needs_previous(self) -> bool:
+        """Specifies whether any rule reads the previous bar.
+
+        Returns:
+        ----
+        {bool} -- `True` if `evaluate` needs the previous bar's values.
+        """
+
+        return len(self.previous_columns) > 0
+
+    def evaluate(self, values: Dict[str, np.ndarray], previous: Dict[str, np.ndarray] = None,
+                 length: int = None) -> Dict[str, np.ndarray]:
+        """Evaluates the plan.
+
+        Arguments:
+        ----
+        values {Dict[str, np.ndarray]} -- One array per column in `columns`, all the same
+            length. For example, the last row of each symbol.
+
+        Keyword Arguments:
+        ----
+        previous {Dict[str, np.ndarray]} -- One array per column in `previous_columns`, with
+            the values of the bar before. Use `NaN` where there is no previous bar. Only
+            needed if the plan has crossover rules. (default: {None})
+
+        length {int} -- The number of rows, only needed if the plan has no rules.
+            (default: {None})
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- A boolean array for `buys` and one for `sells`, `True`
+            where the side's rules are met.
+        """
+
+        if length is None:
+            length = len(next(iter(values.values()))) if values else 0
+
+        if not self.columns:
+            return {'buys': np.zeros(length, dtype=bool), 'sells': np.zeros(length, dtype=bool)}
+
+        if self.needs_previous and previous is None:
+            raise ValueError('The plan has crossover rules, so it needs the previous bar.')
+
+        matrix = np.column_stack(
+            [np.asarray(values[column], dtype=float) for column in self.columns] +
+            [np.asarray(previous[column], dtype=float) for column in self.previous_columns]
+        )
+        terms = np.zeros((len(matrix), self._term_count), dtype=bool)
+
+        # NaN never meets a condition, so comparisons don't need to warn about it.
+        with np.errstate(invalid='ignore'):
+
+            for condition, group in self._groups.items():
+
+                ufunc = OPERATORS[condition] if isinstance(condition, str) else condition
+
+                term_positions, left, right = group['column_terms']
+                if len(term_positions):
+                    terms[:, term_positions] = ufunc(matrix[:, left], matrix[:, right])
+
+                term_positions, left, right = group['value_terms']
+                if len(term_positions):
+                    terms[:, term_positions] = ufunc(matrix[:, left], right)
+
+        return {
+            'buys': self._combine_side(terms=terms, side='buy'),
+            'sells': self._combine_side(terms=terms, side='sell')
+        }
+
+    def _combine_side(self, terms: np.ndarray, side: str) -> np.ndarray:
+        """Combines the terms of one side into a single boolean per row.
+
+        Arguments:
+        ----
+        terms {np.ndarray} -- The rows x terms boolean matrix.
+
+        side {str} -- Either `buy` or `sell`.
+
+        Returns:
+        ----
+        {np.ndarray} -- `True` where the side's rules are met.
+        """
+
+        side_terms = self._side_terms[side]
+
+        if len(side_terms) == 0:
+            return np.zeros(len(terms), dtype=bool)
+
+        # AND the terms of each rule together, then combine the rules.
+        rules_met = np.logical_and.reduceat(terms[:, side_terms], self._rule_starts[side], axis=1)
+
+        if self.combine == 'all':
+            return rules_met.all(axis=1)
+
+        return rules_met.any(axis=1)
+
+    def to_dict(self) -> dict:
+        """Serializes the plan's rules, so they can be stored in a config file.
+
+        Returns:
+        ----
+        {dict} -- The combine mode and the serialized rules.
+        """
+
+        return {
+            'combine': self.combine,
+            'rules': [rule.to_dict() for rule in self.rules]
+        }
+
+    @classmethod
+    def from_dict(cls, plan_dict: dict) -> 'SignalPlan':
+        """Compiles a plan serialized with `to_dict`.
+
+        Arguments:
+        ----
+        plan_dict {dict} -- The serialized plan.
+
+        Returns:
+        ----
+        {SignalPlan} -- The compiled plan.
+        """
+
+        return cls(
+            rules=[rule_from_dict(rule_dict=rule_dict) for rule_dict in plan_dict['rules']],
+            combine=plan_dict.get('combine', 'all')
+        )
+
+
+def compile_signals(indicator_signals: dict, rules: List[SignalRule] = None, combine: str = 'all') -> SignalPlan:
+    """Compiles the signals set on an `Indicators` object into a plan.
+
+    Arguments:
+    ----
+    indicator_signals {dict} -- The signals, keyed by indicator, as stored by
+        `Indicators.set_indicator_signal`, `Indicators.set_indicator_signal_compare`
+        and `Indicators.set_indicator_signal_crossover`.
+
+    Keyword Arguments:
+    ----
+    rules {List[SignalRule]} -- Any rules added directly, which are compiled after
+        the signals. (default: {None})
+
+    combine {str} -- How the rules of one side are combined, either `all` or
+        `any`. (default: {'all'})
+
+    Returns:
+    ----
+    {SignalPlan} -- The compiled plan.
+    """
+
+    compiled_rules = []
+
+    for indicator, signal in indicator_signals.items():
+
+        for side in SIDES:
+
+            condition = signal.get(side + '_operator')
+
+            if not condition:
+                continue
+
+            if signal.get('type') == 'crossover':
+                compiled_rules.append(
+                    CrossoverRule(
+                        side=side,
+                        indicator_1=signal['indicator_1'],
+                        direction=condition,
+                        indicator_2=signal['indicator_2']
+                    )
+                )
+
+            elif signal.get('type') == 'comparison':
+                compiled_rules.append(
+                    CompareRule(
+                        side=side,
+                        indicator_1=signal['indicator_1'],
+                        condition=condition,
+                        indicator_2=signal['indicator_2']
+                    )
+                )
+
+            elif signal.get(side + '_max') is not None and signal.get(side + '_operator_max'):
+                compiled_rules.append(
+                    RangeRule(
+                        side=side,
+                        indicator=indicator,
+                        condition=condition,
+                        value=signal[side],
+                        condition_max=signal[side + '_operator_max'],
+                        value_max=signal[side + '_max']
+                    )
+                )
+
+            else:
+                compiled_rules.append(
+                    ThresholdRule(
+                        side=side,
+                        indicator=indicator,
+                        condition=condition,
+                        value=signal[side]
+                    )
+                )
+
+    return SignalPlan(rules=compiled_rules + list(rules or []), combine=combine)
@@ -0,0 +1,193 @@
+import time
+
+from typing import List
+from typing import Callable
+from typing import Iterator
+
+
+# The length of each bar type, in seconds.
+BAR_SECONDS = {
+    'minute': 60,
+    'daily': 86400,
+    'weekly': 604800
+}
+
+
+class BarScheduler():
+
+    """
+    Represents the clock of the trading robot, which knows when the next
+    bar is published and keeps polling until it is.
+    """
+
+    def __init__(self, bar_size: int = 1, bar_type: str = 'minute', publish_delay: float = 0.5,
+                 poll_interval: float = 0.25, max_poll_interval: float = 2.0) -> None:
+        """Initalizes the Bar Scheduler.
+
+        Overview:
+        ----
+        Bars are aligned to the wall clock. A 5 minute bar that opens at 9:35:00
+        is followed by one that opens at 9:40:00. TD publishes the new bar a
+        moment after its open time, so the scheduler waits `publish_delay` seconds
+        past the boundary before the first request. If the new bar isn't there
+        yet, it polls again after `poll_interval` seconds, doubling the wait up
+        to `max_poll_interval`. It stops once the bar after that one is due.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- The number of `bar_type` units in each bar. (default: {1})
+
+        bar_type {str} -- The bar type, one of `['minute', 'daily', 'weekly']`. (default: {'minute'})
+
+        publish_delay {float} -- The seconds between a bar's open time and the first
+            request for it. (default: {0.5})
+
+        poll_interval {float} -- The seconds to wait before polling again, when the bar
+            isn't published yet. (default: {0.25})
+
+        max_poll_interval {float} -- The longest wait between two polls. (default: {2.0})
+
+        Usage:
+        ----
+            >>> bar_scheduler = BarScheduler(bar_size=5, publish_delay=1.0)
+            >>> latest_bars = bar_scheduler.wait_for_new_bar(
+                    fetch=trading_robot.get_latest_bar,
+                    last_bar_time=1586390400.0
+                )
+        """
+
+        self.bar_size = bar_size
+        self.bar_type = bar_type
+        self.publish_delay = publish_delay
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    @property
+    def bar_seconds(self) -> int:
+        """The length of each bar, in seconds.
+
+        Raises:
+        ----
+        ValueError: If the bar type doesn't have a fixed length.
+
+        Returns:
+        ----
+        {int} -- The number of seconds.
+        """
+
+        if self.bar_type not in BAR_SECONDS:
+            raise ValueError("Bars of type {bar_type} don't have a fixed length.".format(bar_type=self.bar_type))
+
+        return BAR_SECONDS[self.bar_type] * self.bar_size
+
+    def next_boundary(self, now: float = None) -> float:
+        """Calculates when the next bar opens.
+
+        Keyword Arguments:
+        ----
+        now {float} -- The UNIX timestamp to start from, in seconds. (default: {time.time()})
+
+        Returns:
+        ----
+        {float} -- The UNIX timestamp of the next bar boundary, in seconds.
+        """
+
+        if now is None:
+            now = time.time()
+
+        return (now // self.bar_seconds + 1) * self.bar_seconds
+
+    def next_release(self, last_bar_time: float) -> float:
+        """Calculates when the bar after the last one should be published.
+
+        Arguments:
+        ----
+        last_bar_time {float} -- The open time of the last bar, as a UNIX timestamp in seconds.
+
+        Returns:
+        ----
+        {float} -- The UNIX timestamp, in seconds.
+        """
+
+        return last_bar_time + self.bar_seconds + self.publish_delay
+
+    def time_till_next_bar(self, last_bar_time: float, now: float = None) -> float:
+        """Calculates the seconds left till the bar after the last one should be published.
+
+        Arguments:
+        ----
+        last_bar_time {float} -- The open time of the last bar, as a UNIX timestamp in seconds.
+
+        Keyword Arguments:
+        ----
+        now {float} -- The UNIX timestamp to start from, in seconds. (default: {time.time()})
+
+        Returns:
+        ----
+        {float} -- The seconds to wait, or `0.0` if the bar should be out already.
+        """
+
+        if now is None:
+            now = time.time()
+
+        return max(self.next_release(last_bar_time=last_bar_time) - now, 0.0)
+
+    def poll_delays(self) -> Iterator[float]:
+        """Generates the waits between polls, doubling up to `max_poll_interval`.
+
+        Returns:
+        ----
+        {Iterator[float]} -- The seconds to wait before each poll.
+        """
+
+        delay = self.poll_interval
+
+        while True:
+            yield delay
+            delay = min(delay * 2, self.max_poll_interval)
+
+    def is_new(self, bars: List[dict], last_bar_time: float) -> bool:
+        """Checks whether any of the bars opened after the last bar.
+
+        Arguments:
+        ----
+        bars {List[dict]} -- The bars, with a `datetime` in milliseconds.
+
+        last_bar_time {float} -- The open time of the last bar, as a UNIX timestamp in seconds.
+
+        Returns:
+        ----
+        {bool} -- `True` if there's a new bar.
+        """
+
+        return any(bar['datetime'] / 1000 > last_bar_time for bar in bars)
+
+    def wait_for_new_bar(self, fetch: Callable[[], List[dict]], last_bar_time: float) -> List[dict]:
+        """Waits till the bar after the last one is published, and returns it.
+
+        Arguments:
+        ----
+        fetch {Callable[[], List[dict]]} -- Requests the latest bars, for example
+            `PyRobot.get_latest_bar`.
+
+        last_bar_time {float} -- The open time of the last bar, as a UNIX timestamp in seconds.
+
+        Returns:
+        ----
+        {List[dict]} -- The first bars that include a new one or, if the following bar is
+            due before one shows up, the last bars fetched.
+        """
+
+        time.sleep(self.time_till_next_bar(last_bar_time=last_bar_time))
+
+        # Give up once the bar after the new one is due.
+        deadline = last_bar_time + 2 * self.bar_seconds
+
+        for delay in self.poll_delays():
+
+            bars = fetch()
+
+            if self.is_new(bars=bars, last_bar_time=last_bar_time) or time.time() + delay > deadline:
+                return bars
+
+            time.sleep(delay)
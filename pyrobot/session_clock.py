@@ -0,0 +1,387 @@
+import time
+import numpy as np
+import pandas as pd
+
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from pandas.tseries.holiday import Holiday
+from pandas.tseries.holiday import GoodFriday
+from pandas.tseries.holiday import USLaborDay
+from pandas.tseries.holiday import USMemorialDay
+from pandas.tseries.holiday import USPresidentsDay
+from pandas.tseries.holiday import USThanksgivingDay
+from pandas.tseries.holiday import USMartinLutherKingJr
+from pandas.tseries.holiday import AbstractHolidayCalendar
+from pandas.tseries.holiday import nearest_workday
+from pandas.tseries.holiday import sunday_to_monday
+
+
+# US equities trade on New York time.
+MARKET_TIMEZONE = 'America/New_York'
+
+# The sessions, and the New York times they start and end at.
+SESSIONS = ['pre', 'regular', 'post']
+SESSION_HOURS = {
+    'pre': ((4, 0), (9, 30)),
+    'regular': ((9, 30), (16, 0)),
+    'post': ((16, 0), (20, 0))
+}
+EARLY_CLOSE_HOURS = {
+    'pre': ((4, 0), (9, 30)),
+    'regular': ((9, 30), (13, 0)),
+    'post': ((13, 0), (17, 0))
+}
+CLOSED = 'closed'
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+
+    """The days the New York Stock Exchange is closed."""
+
+    rules = [
+        # A New Year's Day on a Saturday isn't made up on the Friday before.
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+class SessionClock():
+
+    """
+    Represents the trading calendar of US equities, with the pre-market,
+    regular and post-market sessions of every trading day.
+    """
+
+    def __init__(self, start_year: int = None, end_year: int = None, extra_holidays: List[date] = None) -> None:
+        """Initalizes the Session Clock.
+
+        Overview:
+        ----
+        The calendar is built once, for every day between `start_year` and `end_year`.
+        Weekends, NYSE holidays and `extra_holidays` are closed. The regular session
+        closes at 1:00 PM on the day before Independence Day, the day after Thanksgiving
+        and Christmas Eve. The hours are New York hours, so they follow daylight saving
+        time, and are stored as sorted UNIX timestamps.
+
+        Checking the session looks up the interval the time falls in, and keeps it. As
+        the robot asks about the current time over and over, the answer usually comes
+        from that interval, which takes two comparisons. A time outside the calendar's
+        years extends the calendar.
+
+        Keyword Arguments:
+        ----
+        start_year {int} -- The first year in the calendar. (default: {last year})
+
+        end_year {int} -- The last year in the calendar. (default: {next year})
+
+        extra_holidays {List[date]} -- Other days the market is closed, for example a
+            national day of mourning. (default: {None})
+
+        Usage:
+        ----
+            >>> session_clock = SessionClock()
+            >>> session_clock.session()
+            'regular'
+            >>> session_clock.is_open(session='pre')
+            False
+            >>> session_clock.sleep_until_open(session='regular')
+        """
+
+        this_year = datetime.today().year
+
+        self.extra_holidays = {pd.Timestamp(holiday).date() for holiday in (extra_holidays or [])}
+
+        self._edges: np.ndarray = np.array([])
+        self._sessions: List[str] = []
+        self._cached_interval: Tuple[float, float, str] = (0.0, 0.0, CLOSED)
+
+        self._build(
+            start_year=start_year if start_year is not None else this_year - 1,
+            end_year=end_year if end_year is not None else this_year + 1
+        )
+
+    def _build(self, start_year: int, end_year: int) -> None:
+        """Builds the session intervals for every day between two years.
+
+        Arguments:
+        ----
+        start_year {int} -- The first year.
+
+        end_year {int} -- The last year.
+        """
+
+        self.start_year = start_year
+        self.end_year = end_year
+
+        first_day = pd.Timestamp(year=start_year, month=1, day=1)
+        last_day = pd.Timestamp(year=end_year, month=12, day=31)
+
+        holidays = {
+            holiday.date() for holiday in NYSEHolidayCalendar().holidays(start=first_day, end=last_day)
+        } | self.extra_holidays
+
+        self.holidays = holidays
+        self.early_closes = set()
+        self.trading_days = []
+
+        for day in pd.date_range(start=first_day, end=last_day, freq='D'):
+
+            day = day.date()
+
+            if day.weekday() >= 5 or day in holidays:
+                continue
+
+            self.trading_days.append(day)
+
+            if self._is_early_close(day=day, holidays=holidays):
+                self.early_closes.add(day)
+
+        local_edges = []
+        sessions = []
+
+        for day in self.trading_days:
+
+            hours = EARLY_CLOSE_HOURS if day in self.early_closes else SESSION_HOURS
+            day_start = datetime(day.year, day.month, day.day)
+
+            # Close the gap since the last session.
+            if local_edges:
+                sessions.append(CLOSED)
+            local_edges.append(day_start + timedelta(hours=hours['pre'][0][0], minutes=hours['pre'][0][1]))
+
+            for session in SESSIONS:
+
+                end_hour, end_minute = hours[session][1]
+
+                sessions.append(session)
+                local_edges.append(day_start + timedelta(hours=end_hour, minutes=end_minute))
+
+        # Convert every edge from New York time at once.
+        utc_edges = pd.DatetimeIndex(local_edges).tz_localize(MARKET_TIMEZONE).tz_convert('UTC').tz_localize(None)
+        edges = (utc_edges - pd.Timestamp('1970-01-01')) / pd.Timedelta(seconds=1)
+
+        # Interval `i` runs from `edges[i]` to `edges[i + 1]`.
+        self._edges = np.asarray(edges, dtype=float)
+        self._sessions = sessions
+        self._cached_interval = (0.0, 0.0, CLOSED)
+
+    @staticmethod
+    def _is_early_close(day: date, holidays: set) -> bool:
+        """Checks whether the regular session closes early on a trading day.
+
+        Arguments:
+        ----
+        day {date} -- The trading day.
+
+        holidays {set} -- The holidays.
+
+        Returns:
+        ----
+        {bool} -- `True` if the market closes at 1:00 PM.
+        """
+
+        next_day = day + timedelta(days=1)
+        previous_day = day - timedelta(days=1)
+
+        # The day before Independence Day, when the 4th is the next day and a trading holiday.
+        if day.month == 7 and day.day == 3 and next_day in holidays:
+            return True
+
+        # The day after Thanksgiving.
+        if previous_day in holidays and previous_day.month == 11 and previous_day.weekday() == 3:
+            return True
+
+        # Christmas Eve.
+        return day.month == 12 and day.day == 24
+
+    @staticmethod
+    def _timestamp(day: date, hour_minute: Tuple[int, int]) -> float:
+        """Converts a New York time on a day to a UNIX timestamp.
+
+        Arguments:
+        ----
+        day {date} -- The day.
+
+        hour_minute {Tuple[int, int]} -- The New York hour and minute.
+
+        Returns:
+        ----
+        {float} -- The UNIX timestamp, in seconds.
+        """
+
+        local_time = pd.Timestamp(
+            year=day.year,
+            month=day.month,
+            day=day.day,
+            hour=hour_minute[0],
+            minute=hour_minute[1]
+        ).tz_localize(MARKET_TIMEZONE)
+
+        return local_time.timestamp()
+
+    def _interval(self, now: float) -> Tuple[float, float, str]:
+        """Finds the interval a time falls in.
+
+        Arguments:
+        ----
+        now {float} -- The UNIX timestamp, in seconds.
+
+        Returns:
+        ----
+        {Tuple[float, float, str]} -- The start and end of the interval, and its session.
+        """
+
+        start, end, session = self._cached_interval
+
+        if start <= now < end:
+            return self._cached_interval
+
+        # Extend the calendar, if the time is outside of it.
+        if now < self._edges[0] or now >= self._edges[-1]:
+
+            year = datetime.fromtimestamp(now, tz=timezone.utc).year
+            self._build(start_year=min(self.start_year, year - 1), end_year=max(self.end_year, year + 1))
+
+        position = int(np.searchsorted(self._edges, now, side='right')) - 1
+        self._cached_interval = (self._edges[position], self._edges[position + 1], self._sessions[position])
+
+        return self._cached_interval
+
+    def session(self, now: float = None) -> str:
+        """Returns the session the market is in.
+
+        Keyword Arguments:
+        ----
+        now {float} -- The UNIX timestamp, in seconds. (default: {time.time()})
+
+        Returns:
+        ----
+        {str} -- One of `['pre', 'regular', 'post', 'closed']`.
+        """
+
+        if now is None:
+            now = time.time()
+
+        return self._interval(now=now)[2]
+
+    def is_open(self, session: str = 'regular', now: float = None) -> bool:
+        """Checks whether a session is open.
+
+        Keyword Arguments:
+        ----
+        session {str} -- One of `['pre', 'regular', 'post']`, or `any` for any of
+            them. (default: {'regular'})
+
+        now {float} -- The UNIX timestamp, in seconds. (default: {time.time()})
+
+        Returns:
+        ----
+        {bool} -- `True` if the session is open.
+        """
+
+        current_session = self.session(now=now)
+
+        if session == 'any':
+            return current_session != CLOSED
+
+        return current_session == session
+
+    def next_open(self, session: str = 'regular', now: float = None) -> float:
+        """Finds when a session next opens.
+
+        Keyword Arguments:
+        ----
+        session {str} -- One of `['pre', 'regular', 'post']`, or `any` for any of
+            them. (default: {'regular'})
+
+        now {float} -- The UNIX timestamp, in seconds. (default: {time.time()})
+
+        Returns:
+        ----
+        {float} -- The UNIX timestamp, in seconds, or `now` if the session is open.
+        """
+
+        if now is None:
+            now = time.time()
+
+        if self.is_open(session=session, now=now):
+            return now
+
+        position = int(np.searchsorted(self._edges, now, side='right'))
+
+        while True:
+
+            # Extend the calendar, if the session doesn't open again in it.
+            if position >= len(self._sessions):
+                self._build(start_year=self.start_year, end_year=self.end_year + 1)
+                position = int(np.searchsorted(self._edges, now, side='right'))
+                continue
+
+            interval_session = self._sessions[position]
+
+            if interval_session == session or (session == 'any' and interval_session != CLOSED):
+                return float(self._edges[position])
+
+            position += 1
+
+    def sleep_until_open(self, session: str = 'regular') -> float:
+        """Sleeps until a session opens, instead of polling through closed hours.
+
+        Keyword Arguments:
+        ----
+        session {str} -- One of `['pre', 'regular', 'post']`, or `any` for any of
+            them. (default: {'regular'})
+
+        Returns:
+        ----
+        {float} -- The seconds slept.
+        """
+
+        now = time.time()
+        seconds = max(self.next_open(session=session, now=now) - now, 0.0)
+
+        time.sleep(seconds)
+
+        return seconds
+
+    def day_hours(self, day: date) -> Dict[str, Tuple[float, float]]:
+        """Returns the start and end of each session on a day.
+
+        Arguments:
+        ----
+        day {date} -- The day.
+
+        Returns:
+        ----
+        {Dict[str, Tuple[float, float]]} -- The UNIX timestamps of each session, or an
+            empty dictionary if the market is closed.
+        """
+
+        # Extend the calendar, if the day is outside of it.
+        if not self.start_year <= day.year <= self.end_year:
+            self._build(start_year=min(self.start_year, day.year - 1), end_year=max(self.end_year, day.year + 1))
+
+        if day.weekday() >= 5 or day in self.holidays:
+            return {}
+
+        hours = EARLY_CLOSE_HOURS if day in self.early_closes else SESSION_HOURS
+
+        return {
+            session: (self._timestamp(day=day, hour_minute=start), self._timestamp(day=day, hour_minute=end))
+            for session, (start, end) in hours.items()
+        }
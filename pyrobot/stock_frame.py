@@ -1,29 +1,64 @@
+import time
+import numpy as np
 import pandas as pd
 
 from typing import List
 from typing import Dict
+from typing import Tuple
 from typing import Union
 
 from pandas.core.groupby import DataFrameGroupBy
 from pandas.core.window import RollingGroupby
 from pandas.core.window import Window
 
+from pyrobot.rules import SignalPlan
+from pyrobot.metrics import MetricsSink
+from pyrobot.metrics import NULL_METRICS
+
 
 class StockFrame():
 
-    def __init__(self, data: List[Dict]) -> None:
+    def __init__(self, data: List[Dict], metrics: MetricsSink = None) -> None:
         """Initalizes the Stock Data Frame Object.
 
         Arguments:
         ----
         data {List[Dict]} -- The data to convert to a frame. Normally, this is 
             returned from the historical prices endpoint.
+
+        Keyword Arguments:
+        ----
+        metrics {MetricsSink} -- Where `add_rows` reports its duration, as the `add_rows`
+            stage, and the number of rows appended. Indicators built on the frame report
+            to it too. (default: {NULL_METRICS})
         """
 
         self._data = data
         self._frame: pd.DataFrame = self.create_frame()
         self._symbol_groups = None
         self._symbol_rolling_groups = None
+        self._symbol_bounds = None
+        self._symbol_bounds_key = None
+        self._tail_positions = None
+        self._tail_positions_key = None
+        self._version = 0
+        self.metrics: MetricsSink = metrics or NULL_METRICS
+
+    @property
+    def version(self) -> int:
+        """The number of times rows have been added to the frame.
+
+        Overview:
+        ----
+        Objects that derive data from the StockFrame, like the `Indicators`
+        object, can compare the version they last used against this value
+        to know if their results are stale.
+
+        Returns:
+        ----
+        int -- The current version of the frame.
+        """
+        return self._version
 
     @property
     def frame(self) -> pd.DataFrame:
@@ -81,6 +116,103 @@ class StockFrame():
 
         return self._symbol_rolling_groups
 
+    @property
+    def symbol_bounds(self) -> List[Tuple[str, int, int]]:
+        """Returns the row positions where each symbol starts and stops.
+
+        Overview:
+        ----
+        The frame is sorted by symbol and then by time, so each symbol is a
+        contiguous block of rows. Indicators use these bounds to run their
+        calculations one symbol at a time on plain arrays, which keeps windows
+        from bleeding across symbols without the overhead of a `groupby`. The
+        bounds are cached until rows are added to the frame.
+
+        Returns:
+        ----
+        {List[Tuple[str, int, int]]} -- A list of `(symbol, start, stop)` tuples, where
+            `stop` is exclusive.
+        """
+
+        bounds_key = (self._version, len(self._frame))
+
+        if self._symbol_bounds_key != bounds_key:
+
+            symbols = self._frame.index.get_level_values(0).to_numpy()
+
+            # A new block starts wherever the symbol changes.
+            changes = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+            starts = np.concatenate([[0], changes]).astype(int)
+            stops = np.concatenate([changes, [len(symbols)]]).astype(int)
+
+            if len(symbols) == 0:
+                starts = stops = []
+
+            self._symbol_bounds = [
+                (symbols[start], int(start), int(stop)) for start, stop in zip(starts, stops)
+            ]
+            self._symbol_bounds_key = bounds_key
+
+        return self._symbol_bounds
+
+    @property
+    def last_row_positions(self) -> np.ndarray:
+        """Returns the row position of the latest bar for each symbol.
+
+        Overview:
+        ----
+        Signal checks only look at the latest bar of each symbol. Taking these
+        positions from a column's array is much cheaper than `symbol_groups.tail(1)`,
+        and the positions are cached until rows are added to the frame.
+
+        Returns:
+        ----
+        {np.ndarray} -- One integer position per symbol, in the same order as
+            `symbol_bounds`.
+        """
+
+        return self._tail_index()[0]
+
+    @property
+    def previous_row_positions(self) -> np.ndarray:
+        """Returns the row position of the bar before the latest one for each symbol.
+
+        Overview:
+        ----
+        Crossover signals compare the latest bar with the one before it. Symbols
+        with a single bar have no previous bar, and their position is `-1`.
+
+        Returns:
+        ----
+        {np.ndarray} -- One integer position per symbol, in the same order as
+            `symbol_bounds`.
+        """
+
+        return self._tail_index()[1]
+
+    def _tail_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Builds the positions of the last two bars of each symbol, cached until rows are added.
+
+        Returns:
+        ----
+        {Tuple[np.ndarray, np.ndarray]} -- The last and previous row positions.
+        """
+
+        bounds = self.symbol_bounds
+
+        if self._tail_positions_key != self._symbol_bounds_key:
+
+            last_positions = np.array([stop - 1 for _, _, stop in bounds], dtype=int)
+            previous_positions = np.array(
+                [stop - 2 if stop - start > 1 else -1 for _, start, stop in bounds],
+                dtype=int
+            )
+
+            self._tail_positions = (last_positions, previous_positions)
+            self._tail_positions_key = self._symbol_bounds_key
+
+        return self._tail_positions
+
     def create_frame(self) -> pd.DataFrame:
         """Creates a new data frame with the data passed through.
 
@@ -131,6 +263,9 @@ class StockFrame():
 
         price_df = price_df.set_index(keys=['symbol', 'datetime'])
 
+        # Keep each symbol's rows together and in time order.
+        price_df = price_df.sort_index()
+
         return price_df
 
     def add_rows(self, data: Dict) -> None:
@@ -161,6 +296,9 @@ class StockFrame():
 
         column_names = ['open', 'close', 'high', 'low', 'volume']
 
+        if self.metrics.enabled:
+            add_rows_start = time.perf_counter()
+
         for quote in data:
 
             # Parse the Timestamp.
@@ -190,6 +328,13 @@ class StockFrame():
 
             self.frame.sort_index(inplace=True)
 
+        # Let anything built on the frame know the data changed.
+        self._version += 1
+
+        if self.metrics.enabled:
+            self.metrics.observe(name='stage_duration', seconds=time.perf_counter() - add_rows_start, tags={'stage': 'add_rows'})
+            self.metrics.increment(name='rows_appended', value=len(data))
+
     def do_indicator_exist(self, column_names: List[str]) -> bool:
         """Checks to see if the indicator columns specified exist.
 
@@ -221,7 +366,7 @@ class StockFrame():
                     self._frame.columns)
             ))
 
-    def _check_signals(self, indicators: dict, indciators_comp_key: List[str], indicators_key: List[str]) -> Union[pd.DataFrame, None]:
+    def _check_signals(self, signal_plan: SignalPlan) -> Union[pd.DataFrame, None]:
         """Returns the last row of the StockFrame if conditions are met.
 
         Overview:
@@ -232,18 +377,17 @@ class StockFrame():
         compare the indicator column values with the conditions specified
         by the user.
 
+        The conditions are compiled into a `SignalPlan`, which evaluates
+        every condition for every symbol at once and combines them with
+        `all` or `any`. Crossover conditions also read the bar before the
+        last one, so they are only met on the bar of the crossover.
+
         If the conditions are met the row will be returned back to the user.
 
         Arguments:
         ----
-        indicators {dict} -- A dictionary containing all the indicators to be checked
-            along with their buy and sell criteria.
-
-        indicators_comp_key List[str] -- A list of the indicators where we are comparing
-            one indicator to another indicator.
-
-        indicators_key List[str] -- A list of the indicators where we are comparing
-            one indicator to a numerical value.
+        signal_plan {SignalPlan} -- The compiled buy and sell rules, normally
+            `Indicators.signal_plan`.
 
         Returns:
         ----
@@ -251,93 +395,120 @@ class StockFrame():
             will be returned. If no signals are found then nothing will be returned.
         """
 
-        # Grab the last rows.
-        last_rows = self._symbol_groups.tail(1)
-
-        # Define a list of conditions.
-        conditions = {}
+        # Grab the position of the last row for each symbol.
+        positions = self.last_row_positions
 
         # Check to see if all the columns exist.
-        if self.do_indicator_exist(column_names=indicators_key):
+        if signal_plan.columns:
+            self.do_indicator_exist(column_names=signal_plan.columns)
 
-            for indicator in indicators_key:
+        last_rows = {
+            column: self._frame[column].to_numpy()[positions] for column in signal_plan.columns
+        }
 
-                column = last_rows[indicator]
+        # Crossovers also need the bar before, which is NaN if the symbol has just one bar.
+        previous_rows = None
 
-                # Grab the Buy & Sell Condition.
-                buy_condition_target = indicators[indicator]['buy']
-                sell_condition_target = indicators[indicator]['sell']
+        if signal_plan.needs_previous:
 
-                buy_condition_operator = indicators[indicator]['buy_operator']
-                sell_condition_operator = indicators[indicator]['sell_operator']
+            previous_positions = self.previous_row_positions
+            has_previous = previous_positions >= 0
+            previous_rows = {}
 
-                condition_1: pd.Series = buy_condition_operator(
-                    column, buy_condition_target
-                )
-                condition_2: pd.Series = sell_condition_operator(
-                    column, sell_condition_target
-                )
+            for column in signal_plan.previous_columns:
+                values = np.full(len(previous_positions), np.nan)
+                values[has_previous] = self._frame[column].to_numpy(dtype=float)[previous_positions[has_previous]]
+                previous_rows[column] = values
 
-                condition_1 = condition_1.where(lambda x: x == True).dropna()
-                condition_2 = condition_2.where(lambda x: x == True).dropna()
+        signals = signal_plan.evaluate(values=last_rows, previous=previous_rows, length=len(positions))
+        last_index = self._frame.index[positions]
 
-                conditions['buys'] = condition_1
-                conditions['sells'] = condition_2
-        
-        # Store the indicators in a list.
-        check_indicators = []
-        
-        # Split the name so we can check if the indicator exist.
-        for indicator in indciators_comp_key:
-            parts = indicator.split('_comp_')
-            check_indicators += parts
+        conditions = {
+            'buys': pd.Series(True, index=last_index[signals['buys']], dtype=bool),
+            'sells': pd.Series(True, index=last_index[signals['sells']], dtype=bool)
+        }
 
-        if self.do_indicator_exist(column_names=check_indicators):
+        return conditions
+
+    def _check_signals_history(self, signal_plan: SignalPlan) -> pd.DataFrame:
+        """Finds every bar of the StockFrame where the conditions are met.
+
+        Arguments:
+        ----
+        signal_plan {SignalPlan} -- The compiled buy and sell rules, normally
+            `Indicators.signal_plan`.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- One row per signal, with a `symbol`, `datetime` and `side`
+            column, ordered by symbol and then time.
+        """
+
+        signals = self._signal_masks(signal_plan=signal_plan)
+
+        buy_positions = np.flatnonzero(signals['buys'])
+        sell_positions = np.flatnonzero(signals['sells'])
 
-            for indicator in indciators_comp_key:
-                
-                # Split the indicators.
-                parts = indicator.split('_comp_')
+        # Interleave the buys and sells back into frame order.
+        positions = np.concatenate([buy_positions, sell_positions])
+        sides = np.concatenate([
+            np.zeros(len(buy_positions), dtype=np.int8),
+            np.ones(len(sell_positions), dtype=np.int8)
+        ])
+        order = np.argsort(positions, kind='stable')
+        positions = positions[order]
 
-                # Grab the indicators that need to be compared.
-                indicator_1 = last_rows[parts[0]]
-                indicator_2 = last_rows[parts[1]]
+        signal_index = self._frame.index[positions]
 
-                # If we have a buy operator, grab it.
-                if indicators[indicator]['buy_operator']:
+        return pd.DataFrame(
+            data={
+                'symbol': signal_index.get_level_values(0),
+                'datetime': signal_index.get_level_values(1),
+                'side': pd.Categorical.from_codes(sides[order], categories=['buy', 'sell'])
+            }
+        )
 
-                    # Grab the Buy Operator.
-                    buy_condition_operator = indicators[indicator]['buy_operator']
+    def _signal_masks(self, signal_plan: SignalPlan) -> Dict[str, np.ndarray]:
+        """Evaluates the signals over every row of the StockFrame.
 
-                    # Grab the Condition.
-                    condition_1: pd.Series = buy_condition_operator(
-                        indicator_1, indicator_2
-                    )
+        Overview:
+        ----
+        The signal plan is evaluated once over every row, instead of just the
+        last row of each symbol. For crossovers, the previous bar is each
+        column shifted down by one row within its symbol, so the first bar of
+        a symbol never crosses.
 
-                    # Keep the one's that aren't null.
-                    condition_1 = condition_1.where(lambda x: x == True).dropna()
+        Arguments:
+        ----
+        signal_plan {SignalPlan} -- The compiled buy and sell rules.
 
-                    # Add it as a buy signal.
-                    conditions['buys'] = condition_1
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- A boolean array under `buys` and `sells`, with one
+            value per row, in frame order.
+        """
 
-                # If we have a sell operator, grab it.
-                if indicators[indicator]['sell_operator']:
+        if signal_plan.columns:
+            self.do_indicator_exist(column_names=signal_plan.columns)
 
-                    # Grab the Sell Operator.
-                    sell_condition_operator = indicators[indicator]['sell_operator']
+        values = {
+            column: self._frame[column].to_numpy(dtype=float) for column in signal_plan.columns
+        }
 
-                    # Store it in a Pd.Series.
-                    condition_2: pd.Series = sell_condition_operator(
-                        indicator_1, indicator_2
-                    )
+        previous = None
 
-                    # keep the one's that aren't null.
-                    condition_2 = condition_2.where(lambda x: x == True).dropna()
+        if signal_plan.needs_previous:
 
-                    # Add it as a sell signal.
-                    conditions['sells'] = condition_2
+            first_rows = np.array([start for _, start, _ in self.symbol_bounds], dtype=int)
+            previous = {}
 
-        return conditions
+            for column in signal_plan.previous_columns:
+                shifted = np.empty(len(self._frame))
+                shifted[1:] = values[column][:-1]
+                shifted[first_rows] = np.nan
+                previous[column] = shifted
+
+        return signal_plan.evaluate(values=values, previous=previous, length=len(self._frame))
 
     def grab_current_bar(self, symbol: str) -> pd.Series:
         """Grabs the current trading bar.
@@ -0,0 +1,361 @@
+import inspect
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from pyrobot.rules import SignalPlan
+from pyrobot.rules import SignalRule
+from pyrobot.rules import rule_from_dict
+from pyrobot.plugins import IndicatorPlugin
+from pyrobot.plugins import plugin_from_dict
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+
+# The indicators that write to the same columns, whatever their `column_name` is.
+FIXED_OUTPUT_COLUMNS = {
+    'bollinger_bands': ['band_upper', 'band_lower'],
+    'macd': ['macd_fast', 'macd_slow', 'macd_diff', 'macd']
+}
+
+class Strategy():
+
+    """
+    Represents a trading strategy: the indicators it needs, the rules
+    that generate its signals and the trades it executes.
+    """
+
+    def __init__(self, name: str, indicators: List[dict], rules: List[SignalRule], trades_to_execute: dict = None,
+                 combine: str = 'all') -> None:
+        """Initalizes the Strategy.
+
+        Arguments:
+        ----
+        name {str} -- A unique name for the strategy.
+
+        indicators {List[dict]} -- The indicators the strategy needs. Each one has the name of
+            an `Indicators` method under `indicator`, and the arguments for it. For example,
+            `{'indicator': 'sma', 'period': 50, 'column_name': 'sma_50'}`.
+
+        rules {List[SignalRule]} -- The rules that generate the strategy's signals.
+
+        Keyword Arguments:
+        ----
+        trades_to_execute {dict} -- The trades to execute for the strategy's signals, in the
+            format `PyRobot.execute_signals` expects. (default: {None})
+
+        combine {str} -- How the rules of one side are combined, either `all` or `any`.
+            (default: {'all'})
+
+        Usage:
+        ----
+            >>> golden_cross = Strategy(
+                    name='golden_cross',
+                    indicators=[
+                        {'indicator': 'sma', 'period': 50, 'column_name': 'sma_50'},
+                        {'indicator': 'sma', 'period': 200, 'column_name': 'sma_200'}
+                    ],
+                    rules=[
+                        CrossoverRule(side='buy', indicator_1='sma_50', direction='above', indicator_2='sma_200'),
+                        CrossoverRule(side='sell', indicator_1='sma_50', direction='below', indicator_2='sma_200')
+                    ],
+                    trades_to_execute=trades_dict
+                )
+            >>> trading_robot.add_strategy(strategy=golden_cross)
+        """
+
+        self.name = name
+        self.indicators = [dict(indicator) for indicator in indicators]
+        self.rules = list(rules)
+        self.trades_to_execute = trades_to_execute
+        self.signal_plan = SignalPlan(rules=self.rules, combine=combine)
+
+        for indicator in self.indicators:
+            if not hasattr(Indicators, indicator.get('indicator', '')):
+                raise ValueError("Unknown indicator: {indicator}".format(indicator=indicator.get('indicator')))
+
+    def to_dict(self) -> dict:
+        """Serializes the strategy's indicators and rules, so it can be stored in a config file.
+
+        Overview:
+        ----
+        Plugin indicators are stored with `IndicatorPlugin.to_dict`, as their class
+        and `params`, so the plugin class must be importable when the strategy is
+        rebuilt with `from_dict`.
+
+        Returns:
+        ----
+        {dict} -- The strategy's name, indicators, rules and combine mode.
+        """
+
+        plan_dict = self.signal_plan.to_dict()
+        indicators = []
+
+        for indicator in self.indicators:
+
+            indicator = dict(indicator)
+
+            if isinstance(indicator.get('plugin'), IndicatorPlugin):
+                indicator['plugin'] = indicator['plugin'].to_dict()
+
+            indicators.append(indicator)
+
+        return {
+            'name': self.name,
+            'indicators': indicators,
+            'rules': plan_dict['rules'],
+            'combine': plan_dict['combine']
+        }
+
+    @classmethod
+    def from_dict(cls, strategy_dict: dict, trades_to_execute: dict = None) -> 'Strategy':
+        """Rebuilds a strategy serialized with `to_dict`.
+
+        Arguments:
+        ----
+        strategy_dict {dict} -- The serialized strategy.
+
+        Keyword Arguments:
+        ----
+        trades_to_execute {dict} -- The trades to execute for the strategy's signals.
+            (default: {None})
+
+        Returns:
+        ----
+        {Strategy} -- The strategy.
+        """
+
+        indicators = []
+
+        for indicator in strategy_dict['indicators']:
+
+            indicator = dict(indicator)
+
+            if isinstance(indicator.get('plugin'), dict):
+                indicator['plugin'] = plugin_from_dict(plugin_dict=indicator['plugin'])
+
+            indicators.append(indicator)
+
+        return cls(
+            name=strategy_dict['name'],
+            indicators=indicators,
+            rules=[rule_from_dict(rule_dict=rule_dict) for rule_dict in strategy_dict['rules']],
+            trades_to_execute=trades_to_execute,
+            combine=strategy_dict.get('combine', 'all')
+        )
+
+
+class StrategyRegistry():
+
+    """
+    Represents every strategy running on one StockFrame, sharing a single
+    `Indicators` object so each distinct indicator is calculated once.
+    """
+
+    def __init__(self, stock_frame: StockFrame, **indicator_options) -> None:
+        """Initalizes the Strategy Registry.
+
+        Overview:
+        ----
+        When a strategy is added, its indicators are compared with the ones
+        already added. An indicator with the same method and arguments is
+        only added once, so refreshing costs the same however many strategies
+        use it. Each strategy keeps its own compiled rules, which are evaluated
+        on the shared columns, and its own trades.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The StockFrame the strategies trade on.
+
+        Keyword Arguments:
+        ----
+        indicator_options -- Passed through to the shared `Indicators` object, for
+            example `lazy=True` or `cache=True`.
+        """
+
+        self.stock_frame = stock_frame
+        self.indicator_client = Indicators(price_data_frame=stock_frame, **indicator_options)
+        self.strategies: Dict[str, Strategy] = {}
+
+        # The arguments each indicator was calculated with, and the indicator that writes each column.
+        self._columns: Dict[str, Tuple[str, tuple]] = {}
+        self._outputs: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.strategies)
+
+    def _indicator_key(self, indicator: dict) -> Tuple[str, str, tuple]:
+        """Finds the column an indicator writes to, and the arguments that identify it.
+
+        Arguments:
+        ----
+        indicator {dict} -- The indicator, with the `Indicators` method under `indicator`.
+
+        Returns:
+        ----
+        {Tuple[str, str, tuple]} -- The column name, the method name and the arguments,
+            including any defaults.
+        """
+
+        arguments = dict(indicator)
+        method_name = arguments.pop('indicator')
+
+        bound_arguments = inspect.signature(getattr(Indicators, method_name)).bind(None, **arguments)
+        bound_arguments.apply_defaults()
+
+        all_arguments = dict(bound_arguments.arguments)
+        all_arguments.pop('self')
+
+        # Plugins are keyed by their name, like `Indicators.add_plugin` does, and two
+        # plugins of the same class and params are the same indicator.
+        if method_name == 'add_plugin':
+            column_name = all_arguments['plugin'].name
+            all_arguments['plugin'] = all_arguments['plugin'].key
+        else:
+            column_name = all_arguments.get('column_name', method_name)
+
+        return column_name, method_name, tuple(sorted(all_arguments.items(), key=lambda item: item[0]))
+
+    def _output_columns(self, column_name: str, method_name: str, indicator: dict) -> List[str]:
+        """Lists the StockFrame columns an indicator writes to.
+
+        Arguments:
+        ----
+        column_name {str} -- The indicator's key, as returned by `_indicator_key`.
+
+        method_name {str} -- The `Indicators` method.
+
+        indicator {dict} -- The indicator, as the strategy lists it.
+
+        Returns:
+        ----
+        {List[str]} -- The column names.
+        """
+
+        if method_name in FIXED_OUTPUT_COLUMNS:
+            return FIXED_OUTPUT_COLUMNS[method_name]
+
+        if method_name == 'kst_oscillator':
+            return [column_name, column_name + '_signal']
+
+        if method_name == 'add_plugin':
+            return list(indicator['plugin'].outputs)
+
+        return [column_name]
+
+    def add_strategy(self, strategy: Strategy) -> Strategy:
+        """Adds a strategy and calculates any indicators it needs that aren't calculated yet.
+
+        Arguments:
+        ----
+        strategy {Strategy} -- The strategy to add.
+
+        Raises:
+        ----
+        ValueError: If the strategy's name is taken, or one of its indicators writes to a
+            column another indicator writes to with different arguments. `bollinger_bands`
+            and `macd` always write to the same columns, so only one set of arguments
+            can be used for each, whatever the `column_name`.
+
+        Returns:
+        ----
+        {Strategy} -- The strategy.
+        """
+
+        if strategy.name in self.strategies:
+            raise ValueError("A strategy named {name} was already added.".format(name=strategy.name))
+
+        new_indicators = {}
+        new_outputs = {}
+
+        # Check everything first, so a conflict doesn't leave the strategy half added.
+        for indicator in strategy.indicators:
+
+            column_name, method_name, arguments = self._indicator_key(indicator=indicator)
+            if column_name in new_indicators:
+                existing = new_indicators[column_name][:2]
+            else:
+                existing = self._columns.get(column_name)
+
+            # The same indicator is only calculated once.
+            if existing == (method_name, arguments):
+                continue
+
+            if existing is not None:
+                raise ValueError(
+                    "The {column} column is already calculated with different arguments, "
+                    "use a different column_name.".format(column=column_name)
+                )
+
+            outputs = self._output_columns(column_name=column_name, method_name=method_name, indicator=indicator)
+            taken = [output for output in outputs if output in self._outputs or output in new_outputs]
+
+            if taken:
+                raise ValueError(
+                    "The {columns} columns are already written by another indicator, and {method} "
+                    "can't write them with different arguments.".format(columns=', '.join(taken), method=method_name)
+                )
+
+            new_indicators[column_name] = (method_name, arguments, indicator)
+            new_outputs.update({output: column_name for output in outputs})
+
+        for column_name, (method_name, arguments, indicator) in new_indicators.items():
+
+            indicator_arguments = dict(indicator)
+            indicator_arguments.pop('indicator')
+
+            getattr(self.indicator_client, method_name)(**indicator_arguments)
+            self._columns[column_name] = (method_name, arguments)
+
+        self._outputs.update(new_outputs)
+
+        self.strategies[strategy.name] = strategy
+
+        return strategy
+
+    def remove_strategy(self, name: str) -> None:
+        """Stops running a strategy. Its indicators keep being calculated.
+
+        Arguments:
+        ----
+        name {str} -- The strategy's name.
+        """
+
+        self.strategies.pop(name, None)
+
+    @property
+    def indicator_count(self) -> int:
+        """The number of distinct indicators calculated for all the strategies.
+
+        Returns:
+        ----
+        {int} -- The number of indicators.
+        """
+
+        return len(self._columns)
+
+    def refresh(self) -> None:
+        """Recalculates the shared indicators once, after new rows were added."""
+
+        self.indicator_client.refresh()
+
+    def check_signals(self) -> Dict[str, dict]:
+        """Checks the signals of every strategy on the last bar of each symbol.
+
+        Returns:
+        ----
+        {Dict[str, dict]} -- The `buys` and `sells` of each strategy, keyed by its name.
+        """
+
+        signals = {}
+
+        for name, strategy in self.strategies.items():
+
+            # In lazy mode, only the columns the strategy reads need to be current.
+            if self.indicator_client.lazy:
+                self.indicator_client.ensure_current(column_names=strategy.signal_plan.columns)
+
+            signals[name] = self.stock_frame._check_signals(signal_plan=strategy.signal_plan)
+
+        return signals
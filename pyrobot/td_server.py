@@ -0,0 +1,560 @@
+import re
+import json
+import time
+import random
+import pathlib
+import tempfile
+import threading
+import numpy as np
+
+from collections import deque
+from http.server import ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+from unittest.mock import patch
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from td.client import TDClient
+
+from pyrobot.robot import PyRobot
+from pyrobot.broker import SimulatedBroker
+from pyrobot.replay import ReplayDataSource
+
+
+# The TD endpoints the server answers, as the `TDClient` method, HTTP method and path.
+ROUTES = [
+    ('get_quotes', 'GET', re.compile(r'^/v1/marketdata/quotes$')),
+    ('get_price_history', 'GET', re.compile(r'^/v1/marketdata/(?P<symbol>[^/]+)/pricehistory$')),
+    ('get_accounts', 'GET', re.compile(r'^/v1/accounts(/(?P<account>[^/]+))?$')),
+    ('get_orders', 'GET', re.compile(r'^/v1/accounts/(?P<account>[^/]+)/orders(/(?P<order_id>[^/]+))?$')),
+    ('place_order', 'POST', re.compile(r'^/v1/accounts/(?P<account>[^/]+)/orders$')),
+    ('cancel_order', 'DELETE', re.compile(r'^/v1/accounts/(?P<account>[^/]+)/orders/(?P<order_id>[^/]+)$'))
+]
+
+
+def random_walk_bars(symbols: List[str], bars: int, end_time: int = None, bar_seconds: int = 60,
+                     start_price: float = 100.0, volatility: float = 0.001, seed: int = None) -> List[dict]:
+    """Builds random walk bars for a list of symbols.
+
+    Arguments:
+    ----
+    symbols {List[str]} -- The ticker symbols.
+
+    bars {int} -- The number of bars of each symbol.
+
+    Keyword Arguments:
+    ----
+    end_time {int} -- The time of the last bar, in milliseconds since epoch.
+        (default: {the start of the current bar})
+
+    bar_seconds {int} -- The seconds between bars. (default: {60})
+
+    start_price {float} -- The first open of each symbol. (default: {100.0})
+
+    volatility {float} -- The standard deviation of each bar's return. (default: {0.001})
+
+    seed {int} -- The seed of the random walk, for repeatable bars. (default: {None})
+
+    Returns:
+    ----
+    {List[dict]} -- The bars, with the `symbol`, `datetime`, `open`, `close`, `high`,
+        `low` and `volume` of each one.
+
+    Usage:
+    ----
+        >>> replay_source = ReplayDataSource(bars=random_walk_bars(symbols=['MSFT', 'AAPL'], bars=390, seed=1))
+    """
+
+    if end_time is None:
+        end_time = int(time.time()) // bar_seconds * bar_seconds * 1000
+
+    random_state = np.random.RandomState(seed=seed)
+    times = end_time - np.arange(bars)[::-1] * bar_seconds * 1000
+    price_bars = []
+
+    for symbol in symbols:
+
+        returns = random_state.normal(scale=volatility, size=bars)
+        closes = start_price * np.exp(np.cumsum(returns))
+        opens = np.concatenate([[start_price], closes[:-1]])
+        wicks = np.abs(random_state.normal(scale=volatility, size=(2, bars))) * closes
+        volumes = random_state.randint(100, 10000, size=bars)
+
+        for index in range(bars):
+            price_bars.append({
+                'symbol': symbol,
+                'datetime': int(times[index]),
+                'open': float(opens[index]),
+                'close': float(closes[index]),
+                'high': float(max(opens[index], closes[index]) + wicks[0, index]),
+                'low': float(min(opens[index], closes[index]) - wicks[1, index]),
+                'volume': float(volumes[index])
+            })
+
+    return price_bars
+
+
+class SimulatedTDServer():
+
+    """
+    Represents a local HTTP server that stands in for the TD Ameritrade
+    API, answering from a simulated broker.
+    """
+
+    def __init__(self, source: ReplayDataSource = None, broker: SimulatedBroker = None, clock: int = None,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 500,
+                 requests_per_minute: int = None, seed: int = None) -> None:
+        """Initalizes the Simulated TD Server.
+
+        Overview:
+        ----
+        The server answers the TD endpoints the robot uses over real HTTP, on a free
+        port of `127.0.0.1`, so a real `TDClient` and everything around it, like the
+        rate limiter and the retries, can be tested without logging in to TD:
+
+        - `GET /v1/marketdata/quotes`
+        - `GET /v1/marketdata/{symbol}/pricehistory`
+        - `GET /v1/accounts` and `GET /v1/accounts/{account}`, with positions and orders.
+        - `GET`, `POST` and `DELETE` on `/v1/accounts/{account}/orders`.
+
+        Prices and orders come from a `SimulatedBroker`, which only shows the bars up to
+        its clock and fills the orders on the bars after it. Bars are served as they're
+        stored, whatever frequency is asked for. Move the clock forward with `advance`.
+
+        Every request waits `latency` seconds, plus up to `jitter` more, while the
+        other requests carry on, so concurrency can be measured. A share of the
+        requests, `error_rate`, fail with `error_status`, and `fail_next` fails the
+        next requests of an endpoint on purpose. With `requests_per_minute`, the
+        requests over that many in the last minute get a `429`, like TD's limit.
+
+        Keyword Arguments:
+        ----
+        source {ReplayDataSource} -- The bars to serve. (default: {390 random walk bars
+            for MSFT, AAPL and SQ, ending at the current minute})
+
+        broker {SimulatedBroker} -- The broker that holds the account. (default: {a new
+            `SimulatedBroker` over the source})
+
+        clock {int} -- The time of the last bar that's visible, in milliseconds since
+            epoch. (default: {the last bar of the source})
+
+        latency {float} -- The seconds each request takes. (default: {0.0})
+
+        jitter {float} -- The most extra seconds a request can take, at random. (default: {0.0})
+
+        error_rate {float} -- The chance, between 0 and 1, that a request fails. (default: {0.0})
+
+        error_status {int} -- The HTTP status of the random failures. (default: {500})
+
+        requests_per_minute {int} -- The requests allowed in any minute. (default: {None})
+
+        seed {int} -- The seed of the latency jitter and the random failures. (default: {None})
+
+        Usage:
+        ----
+            >>> with SimulatedTDServer(latency=0.05, error_rate=0.01, requests_per_minute=120) as td_server:
+                    with td_server.patch_robot():
+                        trading_robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI')
+                    trading_robot.get_positions(account_number='123456789')
+            >>> td_server.stats
+        """
+
+        if source is None:
+            source = ReplayDataSource(bars=random_walk_bars(symbols=['MSFT', 'AAPL', 'SQ'], bars=390, seed=seed))
+
+        self.source = source
+        self.broker = broker or SimulatedBroker(source=source)
+        self.broker.clock = int(source.timestamps[-1]) if clock is None else clock
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests_per_minute = requests_per_minute
+
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'throttled': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'endpoints': {}
+        }
+
+        self._random = random.Random(seed)
+        self._failures: Dict[str, deque] = {}
+        self._request_times: deque = deque()
+        self._lock = threading.Lock()
+
+        self._http_server: ThreadingHTTPServer = None
+        self._thread: threading.Thread = None
+        self._credentials_directory: tempfile.TemporaryDirectory = None
+
+    @property
+    def url(self) -> str:
+        """The address of the server, like `https://api.tdameritrade.com`.
+
+        Returns:
+        ----
+        {str} -- The address, with the port.
+        """
+
+        host, port = self._http_server.server_address[:2]
+
+        return 'http://{host}:{port}'.format(host=host, port=port)
+
+    def __enter__(self) -> 'SimulatedTDServer':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> 'SimulatedTDServer':
+        """Starts serving requests on a background thread.
+
+        Returns:
+        ----
+        {SimulatedTDServer} -- The server.
+        """
+
+        handler = type('SimulatedTDRequestHandler', (_SimulatedTDRequestHandler,), {'td_server': self})
+
+        self._http_server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._http_server.daemon_threads = True
+
+        self._thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and removes the credentials it created."""
+
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+        if self._credentials_directory is not None:
+            self._credentials_directory.cleanup()
+            self._credentials_directory = None
+
+    def advance(self, bars: int = 1) -> List[dict]:
+        """Moves the clock forward, filling the working orders on each new bar.
+
+        Keyword Arguments:
+        ----
+        bars {int} -- The number of timestamps to move forward. (default: {1})
+
+        Returns:
+        ----
+        {List[dict]} -- The fills.
+        """
+
+        fills = []
+
+        with self._lock:
+
+            position = int(np.searchsorted(self.source.timestamps, self.broker.clock, side='right'))
+
+            for timestamp in self.source.timestamps[position:position + bars]:
+                fills.extend(self.broker.fill_bars(bars=self.source.bars_at(timestamp=timestamp)))
+                self.broker.clock = int(timestamp)
+
+        return fills
+
+    def fail_next(self, endpoint: str, status: int = 500, count: int = 1) -> None:
+        """Fails the next requests to an endpoint.
+
+        Arguments:
+        ----
+        endpoint {str} -- The `TDClient` method, for example `get_price_history`.
+
+        Keyword Arguments:
+        ----
+        status {int} -- The HTTP status to answer with. (default: {500})
+
+        count {int} -- The number of requests to fail. (default: {1})
+        """
+
+        with self._lock:
+            self._failures.setdefault(endpoint, deque()).extend([status] * count)
+
+    def create_client(self, client_id: str = 'CLIENT_ID', redirect_uri: str = 'REDIRECT_URI') -> TDClient:
+        """Creates a logged in `TDClient` that sends its requests to the server.
+
+        Overview:
+        ----
+        The client is given a credentials file with tokens that don't expire for a
+        year, so it logs in without going through OAuth.
+
+        Keyword Arguments:
+        ----
+        client_id {str} -- The Consumer ID. (default: {'CLIENT_ID'})
+
+        redirect_uri {str} -- The redirect URL. (default: {'REDIRECT_URI'})
+
+        Returns:
+        ----
+        {TDClient} -- The client.
+        """
+
+        if self._credentials_directory is None:
+            self._credentials_directory = tempfile.TemporaryDirectory()
+
+        credentials_path = pathlib.Path(self._credentials_directory.name).joinpath('td_state.json')
+        expires_at = time.time() + 365 * 24 * 60 * 60
+
+        with open(file=credentials_path, mode='w') as credentials_file:
+            json.dump(
+                obj={
+                    'access_token': 'SIMULATED_ACCESS_TOKEN',
+                    'refresh_token': 'SIMULATED_REFRESH_TOKEN',
+                    'logged_in': True,
+                    'access_token_expires_at': expires_at,
+                    'refresh_token_expires_at': expires_at
+                },
+                fp=credentials_file
+            )
+
+        td_client = TDClient(
+            client_id=client_id,
+            redirect_uri=redirect_uri,
+            credentials_path=str(credentials_path)
+        )
+        td_client.config['api_endpoint'] = self.url
+        td_client.login()
+
+        return td_client
+
+    def patch_robot(self) -> Any:
+        """Points `PyRobot._create_session` at the server.
+
+        Overview:
+        ----
+        The robot still wraps the client in its rate limiter and retry policy. The
+        patch works as a context manager, a decorator, or with `start` and `stop` in a
+        test's `setUp` and `tearDown`.
+
+        Returns:
+        ----
+        {Any} -- The patch.
+
+        Usage:
+        ----
+            >>> with td_server.patch_robot():
+                    trading_robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI')
+        """
+
+        def create_session(trading_robot: PyRobot) -> Any:
+            return trading_robot._wrap_session(
+                td_client=self.create_client(
+                    client_id=trading_robot.client_id,
+                    redirect_uri=trading_robot.redirect_uri
+                )
+            )
+
+        return patch.object(PyRobot, '_create_session', autospec=True, side_effect=create_session)
+
+    def _admit(self, endpoint: str) -> Tuple[int, str]:
+        """Counts a request and decides if it fails before it's answered.
+
+        Arguments:
+        ----
+        endpoint {str} -- The `TDClient` method the request is for.
+
+        Returns:
+        ----
+        {Tuple[int, str]} -- The HTTP status and message to fail with, or `(None, None)`.
+        """
+
+        with self._lock:
+
+            now = time.monotonic()
+
+            self.stats['requests'] += 1
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+
+            if self.requests_per_minute:
+
+                while self._request_times and now - self._request_times[0] >= 60.0:
+                    self._request_times.popleft()
+
+                if len(self._request_times) >= self.requests_per_minute:
+                    self.stats['throttled'] += 1
+                    return 429, 'Individual App\'s transactions per seconds restriction reached.'
+
+                self._request_times.append(now)
+
+            failures = self._failures.get(endpoint)
+
+            if failures:
+                self.stats['errors'] += 1
+                return failures.popleft(), 'A failure was injected.'
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return self.error_status, 'A random failure was injected.'
+
+        return None, None
+
+    def _wait(self) -> None:
+        """Waits for the latency, keeping count of the requests in flight."""
+
+        with self._lock:
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+            delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.stats['in_flight'] -= 1
+
+    def _answer(self, endpoint: str, params: Dict[str, str], body: Any, **path_args) -> Tuple[int, Any, Dict[str, str]]:
+        """Answers a request from the broker.
+
+        Arguments:
+        ----
+        endpoint {str} -- The `TDClient` method the request is for.
+
+        params {Dict[str, str]} -- The query parameters.
+
+        body {Any} -- The JSON body, if there is one.
+
+        **path_args -- The parts of the path, like the account or the symbol.
+
+        Returns:
+        ----
+        {Tuple[int, Any, Dict[str, str]]} -- The HTTP status, the JSON response and the headers.
+        """
+
+        with self._lock:
+
+            if endpoint == 'get_quotes':
+                return 200, self.broker.get_quotes(instruments=params.get('symbol', '').split(',')), {}
+
+            if endpoint == 'get_price_history':
+                return 200, self.broker.get_price_history(
+                    symbol=path_args['symbol'],
+                    start_date=params.get('startDate'),
+                    end_date=params.get('endDate')
+                ), {}
+
+            if endpoint == 'get_accounts':
+                fields = params['fields'].split(',') if 'fields' in params else None
+                return 200, self.broker.get_accounts(account=path_args['account'] or 'all', fields=fields), {}
+
+            if endpoint == 'place_order':
+                order_response = self.broker.place_order(account=path_args['account'], order=body)
+                location = '{url}/v1/accounts/{account}/orders/{order_id}'.format(
+                    url=self.url,
+                    account=path_args['account'],
+                    order_id=order_response['order_id']
+                )
+                return 201, None, {'Location': location}
+
+            order_id = path_args.get('order_id')
+
+            if order_id is not None and order_id not in self.broker._order_book:
+                return 404, {'error': 'Order {order_id} was not found.'.format(order_id=order_id)}, {}
+
+            if endpoint == 'get_orders':
+                return 200, self.broker.get_orders(account=path_args['account'], order_id=order_id), {}
+
+            self.broker.cancel_order(account=path_args['account'], order_id=order_id)
+            return 200, None, {}
+
+
+class _SimulatedTDRequestHandler(BaseHTTPRequestHandler):
+
+    """Routes the HTTP requests of a `TDClient` to the Simulated TD Server."""
+
+    td_server: SimulatedTDServer = None
+
+    def do_GET(self) -> None:
+        self._handle(method='GET')
+
+    def do_POST(self) -> None:
+        self._handle(method='POST')
+
+    def do_DELETE(self) -> None:
+        self._handle(method='DELETE')
+
+    def log_message(self, format: str, *args) -> None:
+        """Keeps the requests out of the test output."""
+
+        pass
+
+    def _handle(self, method: str) -> None:
+        """Answers a request, after the latency and any failures.
+
+        Arguments:
+        ----
+        method {str} -- The HTTP method.
+        """
+
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        for endpoint, route_method, route_path in ROUTES:
+
+            match = route_path.match(url.path)
+
+            if match and route_method == method:
+                break
+
+        else:
+            self._respond(status=404, content={'error': 'The endpoint {path} was not found.'.format(path=url.path)})
+            return
+
+        status, message = self.td_server._admit(endpoint=endpoint)
+        self.td_server._wait()
+
+        if status is not None:
+            self._respond(status=status, content={'error': message})
+            return
+
+        status, content, headers = self.td_server._answer(
+            endpoint=endpoint,
+            params=params,
+            body=body,
+            **match.groupdict()
+        )
+
+        self._respond(status=status, content=content, headers=headers)
+
+    def _respond(self, status: int, content: Any, headers: Dict[str, str] = None) -> None:
+        """Writes the JSON response.
+
+        Arguments:
+        ----
+        status {int} -- The HTTP status.
+
+        content {Any} -- The JSON content, or `None` for an empty body.
+
+        Keyword Arguments:
+        ----
+        headers {Dict[str, str]} -- Extra headers. (default: {None})
+        """
+
+        payload = json.dumps(content).encode() if content is not None else b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(payload)
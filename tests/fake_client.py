@@ -0,0 +1,118 @@
+"""A fake TD Ameritrade client for the unit tests.
+
+Every request sleeps for a fixed latency, so the tests can measure how
+many requests run at once and how long a batch of requests takes,
+without logging in to TD Ameritrade.
+"""
+
+import time
+import threading
+
+from typing import List
+
+
+class FakeTDClient():
+
+    """A stand in for `td.client.TDClient`, where every request takes a while."""
+
+    def __init__(self, latency: float = 0.05, failing_symbols: List[str] = None, bars: int = 3,
+                 first_bar_time: int = None) -> None:
+        """Initalizes the Fake TD Client.
+
+        Keyword Arguments:
+        ----
+        latency {float} -- The seconds each request takes. (default: {0.05})
+
+        failing_symbols {List[str]} -- Symbols whose price history requests raise
+            a `ConnectionError`. (default: {None})
+
+        bars {int} -- The number of one minute bars returned by each price history
+            request. (default: {3})
+
+        first_bar_time {int} -- The time of the first bar, in milliseconds since epoch.
+            (default: {the minute `bars` minutes ago})
+        """
+
+        if first_bar_time is None:
+            first_bar_time = (int(time.time()) // 60 - bars) * 60000
+
+        self.latency = latency
+        self.failing_symbols = set(failing_symbols or [])
+        self.bars = bars
+        self.first_bar_time = first_bar_time
+
+        self.requests = 0
+        self.price_history_requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.order_polls = {}
+        self._lock = threading.Lock()
+
+    def _request(self) -> None:
+        """Waits for the latency, keeping count of the requests in flight."""
+
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(self.latency)
+
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_price_history(self, symbol: str, start_date: str = None, **kwargs) -> dict:
+
+        self._request()
+
+        with self._lock:
+            self.price_history_requests.append((symbol, start_date))
+
+        if symbol in self.failing_symbols:
+            raise ConnectionError("Couldn't grab the price history for {symbol}.".format(symbol=symbol))
+
+        candles = [
+            {
+                'open': 100.0, 'close': 100.0 + index, 'high': 101.0 + index, 'low': 99.0,
+                'volume': 10.0, 'datetime': self.first_bar_time + index * 60000
+            }
+            for index in range(self.bars)
+        ]
+
+        # Like TD, only return the candles from the start date on.
+        if start_date is not None:
+            candles = [candle for candle in candles if candle['datetime'] >= int(start_date)]
+
+        return {'symbol': symbol, 'empty': not candles, 'candles': candles}
+
+    def get_quotes(self, instruments: List[str]) -> dict:
+
+        self._request()
+
+        return {
+            symbol: {'symbol': symbol, 'lastPrice': 100.0, 'totalVolume': 10, 'quoteTimeInLong': self.first_bar_time}
+            for symbol in instruments
+        }
+
+    def place_order(self, account: str, order: dict) -> dict:
+
+        self._request()
+
+        with self._lock:
+            order_id = str(len(self.order_polls) + 1)
+            self.order_polls[order_id] = 0
+
+        return {'order_id': order_id, 'headers': {}, 'request_body': order}
+
+    def get_orders(self, account: str, order_id: str) -> dict:
+
+        self._request()
+
+        with self._lock:
+            self.order_polls[order_id] = self.order_polls.get(order_id, 0) + 1
+            polls = self.order_polls[order_id]
+
+        # Order 2 takes two polls to fill.
+        status = 'WORKING' if order_id == '2' and polls < 2 else 'FILLED'
+
+        return {'orderId': order_id, 'status': status}
@@ -0,0 +1,68 @@
+"""Generated minute bars for the unit tests.
+
+Every bar's close is a random walk that starts around 100, so the tests
+can compare the indicators against pandas without downloading prices.
+The same seed always gives the same bars.
+"""
+
+from typing import List
+
+import numpy as np
+
+
+# The time of the first generated bar, in milliseconds since epoch.
+FIRST_BAR_TIME = 1586390400000
+
+
+def random_walk_prices(symbols: List[str], bars: int, seed: int, first_bar_time: int = FIRST_BAR_TIME,
+                       open_offset: float = 0.0, random_range: bool = False, volume: float = 100.0,
+                       volume_step: float = 0.0) -> List[dict]:
+    """Builds one minute bars for a list of symbols, one symbol after the other.
+
+    Arguments:
+    ----
+    symbols {List[str]} -- The ticker symbols.
+
+    bars {int} -- The number of bars of each symbol.
+
+    seed {int} -- The seed of the random walk.
+
+    Keyword Arguments:
+    ----
+    first_bar_time {int} -- The time of the first bar, in milliseconds since epoch.
+        (default: {FIRST_BAR_TIME})
+
+    open_offset {float} -- How far below the close each bar opens. (default: {0.0})
+
+    random_range {bool} -- If `True`, the high and low are a random distance, up to 1,
+        from the close. Otherwise they're 0.5 away. (default: {False})
+
+    volume {float} -- The volume of the first bar. (default: {100.0})
+
+    volume_step {float} -- How much the volume grows with each bar. (default: {0.0})
+
+    Returns:
+    ----
+    {List[dict]} -- The bars, with the `symbol`, `datetime`, `open`, `close`, `high`,
+        `low` and `volume` of each one.
+    """
+
+    random_state = np.random.RandomState(seed=seed)
+    prices = []
+
+    for symbol in symbols:
+
+        closes = 100 + np.cumsum(random_state.normal(size=bars))
+
+        for index, close in enumerate(closes):
+            prices.append({
+                'symbol': symbol,
+                'datetime': first_bar_time + index * 60000,
+                'open': close - open_offset,
+                'close': close,
+                'high': close + (random_state.uniform() if random_range else 0.5),
+                'low': close - (random_state.uniform() if random_range else 0.5),
+                'volume': volume + index * volume_step
+            })
+
+    return prices
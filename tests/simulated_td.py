@@ -0,0 +1,58 @@
+"""Points the tests at a Simulated TD Server when there are no credentials.
+
+The tests that talk to TD read their credentials from `configs/config.ini`.
+Without that file, `load_config` starts a Simulated TD Server for the test,
+points `PyRobot._create_session` at it and fills in placeholder credentials,
+so the same tests run offline.
+"""
+
+from unittest import TestCase
+from configparser import ConfigParser
+
+from pyrobot.td_server import SimulatedTDServer
+
+
+def load_config(test_case: TestCase, path: str = 'configs/config.ini') -> ConfigParser:
+    """Reads the TD credentials, or falls back to a Simulated TD Server.
+
+    Arguments:
+    ----
+    test_case {TestCase} -- The test, which gets a `td_server` attribute, set to `None`
+        when the real API is used.
+
+    Keyword Arguments:
+    ----
+    path {str} -- The configuration file. (default: {'configs/config.ini'})
+
+    Returns:
+    ----
+    {ConfigParser} -- The configuration, with a `main` section.
+    """
+
+    config = ConfigParser()
+    config.read(path)
+
+    test_case.td_server = None
+
+    if config.has_section('main'):
+        return config
+
+    td_server = SimulatedTDServer(seed=1).start()
+    test_case.addCleanup(td_server.stop)
+
+    robot_patch = td_server.patch_robot()
+    robot_patch.start()
+    test_case.addCleanup(robot_patch.stop)
+
+    config.read_dict({
+        'main': {
+            'CLIENT_ID': 'CLIENT_ID',
+            'REDIRECT_URI': 'REDIRECT_URI',
+            'JSON_PATH': 'td_state.json',
+            'ACCOUNT_NUMBER': td_server.broker.account_number
+        }
+    })
+
+    test_case.td_server = td_server
+
+    return config
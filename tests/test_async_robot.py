@@ -0,0 +1,180 @@
+"""Unit test module for the AsyncPyRobot Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that the requests for each symbol run concurrently and that
+the responses keep the order of the symbols.
+"""
+
+import time
+import asyncio
+import unittest
+
+from datetime import datetime
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.trades import Trade
+from pyrobot.rules import ThresholdRule
+from pyrobot.indicators import Indicators
+from pyrobot.async_robot import AsyncPyRobot
+
+from fake_client import FakeTDClient
+
+
+class PyRobotAsyncTest(TestCase):
+
+    """Will perform a unit test for the AsyncPyRobot Object."""
+
+    def setUp(self) -> None:
+        """Set up an async robot with a slow, fake session."""
+
+        with patch.object(AsyncPyRobot, '_create_session', return_value=None):
+            self.robot = AsyncPyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                paper_trading=True,
+                max_concurrency=4
+            )
+
+        self.session = FakeTDClient(latency=0.05)
+        self.robot.session = self.session
+        self.robot.create_portfolio()
+
+        self.symbols = ['MSFT', 'AAPL', 'SQ', 'TSLA', 'AMZN', 'FB', 'NFLX', 'GOOG']
+
+        for symbol in self.symbols:
+            self.robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's an AsyncPyRobot object."""
+
+        self.assertIsInstance(self.robot, AsyncPyRobot)
+
+    def test_historical_prices_are_concurrent(self):
+        """Test that the price history requests run concurrently, and keep their order."""
+
+        start_time = time.perf_counter()
+
+        historical_prices = asyncio.run(
+            self.robot.grab_historical_prices_async(
+                start=datetime.today() - timedelta(days=1),
+                end=datetime.today()
+            )
+        )
+
+        elapsed = time.perf_counter() - start_time
+        symbols = [price['symbol'] for price in historical_prices['aggregated']]
+
+        self.assertEqual(symbols, [symbol for symbol in self.symbols for _ in range(3)])
+        self.assertEqual(self.session.max_in_flight, 4)
+        self.assertLess(elapsed, 0.05 * len(self.symbols))
+
+    def test_latest_bar(self):
+        """Test that the latest bar is returned for each symbol."""
+
+        latest_bars = asyncio.run(self.robot.get_latest_bar_async())
+
+        self.assertEqual([bar['symbol'] for bar in latest_bars], self.symbols)
+        self.assertEqual([bar['close'] for bar in latest_bars], [102.0] * len(self.symbols))
+
+    def test_failed_symbol(self):
+        """Test that a failed request doesn't stop the other symbols."""
+
+        self.session.failing_symbols = {'AAPL'}
+
+        latest_bars = asyncio.run(self.robot.get_latest_bar_async())
+
+        self.assertEqual([bar['symbol'] for bar in latest_bars], [symbol for symbol in self.symbols if symbol != 'AAPL'])
+        self.assertEqual(list(self.robot.fetch_errors), ['AAPL'])
+
+    def test_wait_for_orders(self):
+        """Test that orders are polled until they're filled."""
+
+        orders = asyncio.run(self.robot.wait_for_orders(order_ids=['1', '2', '3'], interval=0.01))
+
+        self.assertEqual([order['status'] for order in orders], ['FILLED'] * 3)
+        self.assertEqual(self.session.order_polls, {'1': 1, '2': 2, '3': 1})
+
+    def test_pipeline_does_not_block(self):
+        """Test that the stages run off the event loop, and the orders are placed concurrently."""
+
+        self.robot.paper_trading = False
+        self.robot.record_orders = False
+
+        historical_prices = self.robot.grab_historical_prices(
+            start=datetime.today() - timedelta(days=1),
+            end=datetime.today()
+        )
+        self.robot.create_stock_frame(data=historical_prices['aggregated'])
+
+        indicator_client = Indicators(price_data_frame=self.robot.stock_frame)
+        indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='close', condition='>', value=0.0))
+
+        trades_dict = {}
+
+        for symbol in self.symbols:
+            trade_obj = Trade()
+            trade_obj.new_trade(trade_id=symbol, order_type='mkt', side='long', enter_or_exit='enter')
+            trade_obj.instrument(symbol=symbol, quantity=1, asset_type='EQUITY')
+            trades_dict[symbol] = {'buy': {'trade_func': trade_obj}}
+
+        self.robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+
+        heartbeats = []
+        heartbeats_at = {}
+
+        # Note how many times the loop ticked by the time the signals are checked, and the orders are in.
+        check_signals = indicator_client.check_signals
+
+        def checking_signals():
+            heartbeats_at['signals'] = len(heartbeats)
+            return check_signals()
+
+        indicator_client.check_signals = checking_signals
+
+        orders_seen = []
+
+        def on_orders(event):
+            heartbeats_at['orders'] = len(heartbeats)
+            orders_seen.append(event.data)
+
+        self.robot.events.subscribe(topic='orders', callback=on_orders)
+
+        async def process_with_heartbeat():
+
+            async def heartbeat():
+                while True:
+                    heartbeats.append(time.perf_counter())
+                    await asyncio.sleep(0.005)
+
+            heartbeat_task = asyncio.ensure_future(heartbeat())
+            await self.robot.process_latest_bar_async()
+            heartbeat_task.cancel()
+
+        self.session.max_in_flight = 0
+        asyncio.run(process_with_heartbeat())
+
+        # The 8 orders went out 4 at a time, while the loop kept ticking.
+        self.assertEqual(len(orders_seen[0]), len(self.symbols))
+        self.assertEqual(self.session.max_in_flight, 4)
+        self.assertGreater(heartbeats_at['orders'] - heartbeats_at['signals'], 5)
+
+    def test_inherited_methods_stay_synchronous(self):
+        """Test that the methods inherited from PyRobot still return their results."""
+
+        latest_bars = self.robot.get_latest_bar()
+
+        self.assertIsInstance(latest_bars, list)
+        self.assertEqual([bar['symbol'] for bar in latest_bars], self.symbols)
+
+    def tearDown(self) -> None:
+        """Teardown the Robot."""
+
+        self.robot.close()
+        self.robot = None
+        self.session = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+"""Unit test module for the Backtester Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that market, limit and stop orders fill on the bars after
+the signal, that slippage and commissions are charged and that the
+equity curve adds up to the trades. The event driven backtest is tested
+through the robot's pipeline, against the simulated broker.
+"""
+
+import unittest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.robot import PyRobot
+from pyrobot.trades import Trade
+from pyrobot.rules import CrossoverRule
+from pyrobot.rules import ThresholdRule
+from pyrobot.backtest import Backtester
+from pyrobot.backtest import BacktestResult
+from pyrobot.backtest import EventBacktester
+from pyrobot.replay import ReplayDataSource
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import random_walk_prices
+
+
+def new_trade(order_type: str, side: str, enter_or_exit: str, price: float = 0.0, symbol: str = 'MSFT') -> Trade:
+    """Creates a trade template for 10 shares of a symbol."""
+
+    trade_obj = Trade()
+    trade_obj.new_trade(
+        trade_id='backtest',
+        order_type=order_type,
+        side=side,
+        enter_or_exit=enter_or_exit,
+        price=price
+    )
+    trade_obj.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+
+    return trade_obj
+
+
+class PyRobotBacktesterTest(TestCase):
+
+    """Will perform a unit test for the Backtester Object."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with 6 bars, that buys under 100 and sells over 110."""
+
+        # The open, high, low and close of each bar.
+        bars = [
+            (100.0, 101.0, 99.0, 100.0),
+            (100.0, 100.0, 98.0, 99.0),
+            (101.0, 102.0, 100.0, 101.0),
+            (105.0, 112.0, 104.0, 111.0),
+            (112.0, 113.0, 111.0, 112.0),
+            (110.0, 111.0, 109.0, 110.0)
+        ]
+
+        self.stock_frame = StockFrame(
+            data=[
+                {
+                    'symbol': 'MSFT',
+                    'datetime': 1586390400000 + index * 60000,
+                    'open': bar[0],
+                    'high': bar[1],
+                    'low': bar[2],
+                    'close': bar[3],
+                    'volume': 100.0
+                }
+                for index, bar in enumerate(bars)
+            ]
+        )
+
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+        self.indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='close', condition='<', value=100.0))
+        self.indicator_client.add_signal_rule(rule=ThresholdRule(side='sell', indicator='close', condition='>', value=110.0))
+
+    def backtest(self, buy_trade: Trade, **kwargs) -> BacktestResult:
+        """Runs the backtest with a buy template and a market sell."""
+
+        backtester = Backtester(
+            stock_frame=self.stock_frame,
+            indicator_client=self.indicator_client,
+            trades_to_execute={
+                'MSFT': {
+                    'buy': {'trade_func': buy_trade},
+                    'sell': {'trade_func': new_trade(order_type='mkt', side='long', enter_or_exit='exit')}
+                }
+            },
+            **kwargs
+        )
+
+        return backtester.run()
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a Backtester object."""
+
+        backtester = Backtester(
+            stock_frame=self.stock_frame,
+            indicator_client=self.indicator_client,
+            trades_to_execute={}
+        )
+
+        self.assertIsInstance(backtester, Backtester)
+
+        with self.assertRaises(ValueError):
+            Backtester(
+                stock_frame=self.stock_frame,
+                indicator_client=self.indicator_client,
+                trades_to_execute={
+                    'MSFT': {'buy': {'trade_func': new_trade(order_type='stop_lmt', side='long', enter_or_exit='enter')}}
+                }
+            )
+
+    def test_market_orders(self):
+        """Test that market orders fill at the next open, with slippage and commissions."""
+
+        backtest_result = self.backtest(
+            buy_trade=new_trade(order_type='mkt', side='long', enter_or_exit='enter'),
+            slippage=0.01,
+            commission=1.0
+        )
+
+        trade = backtest_result.trades.iloc[0]
+
+        self.assertEqual(len(backtest_result.trades), 1)
+        self.assertAlmostEqual(trade['entry_price'], 101.0 * 1.01)
+        self.assertAlmostEqual(trade['exit_price'], 112.0 * 0.99)
+        self.assertAlmostEqual(trade['pnl'], (112.0 * 0.99 - 101.0 * 1.01) * 10 - 2.0)
+        self.assertFalse(trade['is_open'])
+        self.assertEqual(trade['entry_time'], self.stock_frame.frame.index[2][1])
+        self.assertEqual(trade['exit_time'], self.stock_frame.frame.index[4][1])
+
+        self.assertAlmostEqual(backtest_result.stats['final_equity'], 100000.0 + trade['pnl'])
+        self.assertEqual(backtest_result.stats['win_rate'], 1.0)
+        self.assertEqual(len(backtest_result.equity_curve), 6)
+
+    def test_limit_and_stop_orders(self):
+        """Test that limit and stop orders only fill once the price is reached."""
+
+        # The low of the next bar reaches the limit.
+        limit_result = self.backtest(buy_trade=new_trade(order_type='lmt', side='long', enter_or_exit='enter', price=100.5))
+        self.assertAlmostEqual(limit_result.trades['entry_price'].iloc[0], 100.5)
+
+        # A limit at the signal's close is never reached before the sell signal.
+        unfilled_result = self.backtest(buy_trade=new_trade(order_type='lmt', side='long', enter_or_exit='enter'))
+        self.assertEqual(len(unfilled_result.trades), 0)
+        self.assertEqual(unfilled_result.stats['final_equity'], 100000.0)
+
+        # The stop is gapped through, so it fills at the open.
+        stop_result = self.backtest(buy_trade=new_trade(order_type='stop', side='long', enter_or_exit='enter', price=104.0))
+        self.assertAlmostEqual(stop_result.trades['entry_price'].iloc[0], 105.0)
+        self.assertEqual(stop_result.trades['entry_time'].iloc[0], self.stock_frame.frame.index[3][1])
+
+    def test_equity_adds_up(self):
+        """Test that the equity curve of many symbols ends at the sum of the trades."""
+
+        prices = random_walk_prices(symbols=['AAPL', 'MSFT', 'SQ', 'TSLA'], bars=500, seed=12, open_offset=0.1)
+
+        stock_frame = StockFrame(data=prices)
+        indicator_client = Indicators(price_data_frame=stock_frame, lazy=True)
+        indicator_client.sma(period=20)
+        indicator_client.add_signal_rule(rule=CrossoverRule(side='buy', indicator_1='close', direction='above', indicator_2='sma'))
+        indicator_client.add_signal_rule(rule=CrossoverRule(side='sell', indicator_1='close', direction='below', indicator_2='sma'))
+
+        trades_dict = {
+            symbol: {
+                'buy': {'trade_func': new_trade(order_type='mkt', side='long', enter_or_exit='enter')},
+                'sell': {'trade_func': new_trade(order_type='mkt', side='long', enter_or_exit='exit')}
+            }
+            for symbol in ['AAPL', 'MSFT', 'SQ', 'TSLA']
+        }
+
+        backtest_result = Backtester(
+            stock_frame=stock_frame,
+            indicator_client=indicator_client,
+            trades_to_execute=trades_dict,
+            commission=0.5
+        ).run()
+
+        self.assertGreater(backtest_result.stats['trades'], 4)
+        self.assertEqual(set(backtest_result.trades['symbol']), {'AAPL', 'MSFT', 'SQ', 'TSLA'})
+        self.assertAlmostEqual(
+            backtest_result.equity_curve.iloc[-1],
+            100000.0 + backtest_result.trades['pnl'].sum()
+        )
+        self.assertLessEqual(backtest_result.stats['max_drawdown'], 0.0)
+
+        # No closed trade exits on the bar it entered.
+        closed_trades = backtest_result.trades[~backtest_result.trades['is_open']]
+        self.assertTrue((closed_trades['exit_time'] > closed_trades['entry_time']).all())
+
+    def test_event_backtest(self):
+        """Test that the event driven backtest runs the robot's pipeline against the broker."""
+
+        bars = random_walk_prices(symbols=['AAPL', 'MSFT'], bars=200, seed=3, open_offset=0.1)
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            trading_robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        event_backtester = EventBacktester(
+            trading_robot=trading_robot,
+            source=ReplayDataSource(bars=bars),
+            warmup_bars=30,
+            commission=1.0
+        )
+
+        indicator_client = Indicators(price_data_frame=trading_robot.stock_frame, incremental=True)
+        indicator_client.sma(period=10)
+        indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='close', condition='>', value=100.0))
+        indicator_client.add_signal_rule(rule=ThresholdRule(side='sell', indicator='close', condition='<=', value=100.0))
+
+        trades_dict = {
+            symbol: {
+                'buy': {'trade_func': new_trade(order_type='mkt', side='long', enter_or_exit='enter', symbol=symbol)},
+                'sell': {'trade_func': new_trade(order_type='mkt', side='long', enter_or_exit='exit', symbol=symbol)}
+            }
+            for symbol in ['AAPL', 'MSFT']
+        }
+
+        trading_robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+
+        backtest_result = event_backtester.run()
+
+        # Every order went to the broker, through execute_orders.
+        self.assertEqual(backtest_result.stats['bars'], 170)
+        self.assertEqual(backtest_result.stats['orders'], len(event_backtester.broker.orders))
+        self.assertGreater(len(event_backtester.broker.fills), 0)
+        self.assertEqual(len(backtest_result.equity_curve), 170)
+
+        self.assertAlmostEqual(
+            backtest_result.equity_curve.iloc[-1],
+            100000.0 + backtest_result.trades['pnl'].sum()
+        )
+
+        # No order filled on the bar that signaled it.
+        order_times = {order['orderId']: order['time'] for order in event_backtester.broker.orders}
+        for fill in event_backtester.broker.fills:
+            self.assertGreater(fill['time'], order_times[fill['orderId']])
+
+    def tearDown(self) -> None:
+        """Teardown the StockFrame."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Unit test module for the SimulatedBroker Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that orders fill on the bars after they're placed, that
+trigger orders place their children and that OCO orders cancel each other.
+"""
+
+import unittest
+
+from unittest import TestCase
+
+from pyrobot.broker import SimulatedBroker
+from pyrobot.replay import ReplayDataSource
+
+
+def new_order(instruction: str, order_type: str = 'MARKET', quantity: int = 10, **prices) -> dict:
+    """Creates an order payload for MSFT, like `Trade.order`."""
+
+    order = {
+        'orderStrategyType': 'SINGLE',
+        'orderType': order_type,
+        'session': 'NORMAL',
+        'duration': 'DAY',
+        'orderLegCollection': [
+            {
+                'instruction': instruction,
+                'quantity': quantity,
+                'instrument': {'symbol': 'MSFT', 'assetType': 'EQUITY'}
+            }
+        ]
+    }
+    order.update(prices)
+
+    return order
+
+
+class PyRobotSimulatedBrokerTest(TestCase):
+
+    """Will perform a unit test for the SimulatedBroker Object."""
+
+    def setUp(self) -> None:
+        """Set up a Simulated Broker over 4 minutes of MSFT bars."""
+
+        # The open, high, low and close of each bar.
+        bars = [
+            (100.0, 101.0, 99.0, 100.0),
+            (100.0, 102.0, 99.5, 101.0),
+            (101.0, 106.0, 100.5, 105.0),
+            (105.0, 105.5, 96.0, 97.0)
+        ]
+
+        self.times = [1586390400000 + index * 60000 for index in range(len(bars))]
+        self.source = ReplayDataSource(
+            bars=[
+                {
+                    'symbol': 'MSFT',
+                    'datetime': time,
+                    'open': bar[0],
+                    'high': bar[1],
+                    'low': bar[2],
+                    'close': bar[3],
+                    'volume': 100.0
+                }
+                for time, bar in zip(self.times, bars)
+            ]
+        )
+
+        self.broker = SimulatedBroker(source=self.source, commission=1.0)
+        self.broker.clock = self.times[0]
+
+    def play(self) -> None:
+        """Fills the working orders against every bar after the first."""
+
+        for time in self.times[1:]:
+            self.broker.fill_bars(bars=self.source.bars_at(timestamp=time))
+            self.broker.clock = time
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a SimulatedBroker object."""
+
+        self.assertIsInstance(self.broker, SimulatedBroker)
+
+    def test_market_order(self):
+        """Test that a market order fills at the next open, and is reported like TD does."""
+
+        order_response = self.broker.place_order(account='123', order=new_order(instruction='BUY'))
+        self.play()
+
+        order_status = self.broker.get_orders(account='123', order_id=order_response['order_id'])
+
+        self.assertEqual(order_status['status'], 'FILLED')
+        self.assertEqual(order_status['filledQuantity'], 10)
+        self.assertEqual(self.broker.fills[0]['price'], 100.0)
+        self.assertEqual(self.broker.fills[0]['time'], self.times[1])
+        self.assertEqual(self.broker.positions['MSFT'], 10)
+        self.assertAlmostEqual(self.broker.equity(), 100000.0 + (97.0 - 100.0) * 10 - 1.0)
+
+    def test_trigger_with_one_cancels_other(self):
+        """Test that a filled trigger places its OCO children, and the first to fill cancels the other."""
+
+        order = new_order(instruction='BUY')
+        order['orderStrategyType'] = 'TRIGGER'
+        order['childOrderStrategies'] = [
+            {
+                'orderStrategyType': 'OCO',
+                'childOrderStrategies': [
+                    new_order(instruction='SELL', order_type='LIMIT', price=110.0),
+                    new_order(instruction='SELL', order_type='STOP', stopPrice=98.0)
+                ]
+            }
+        ]
+
+        self.broker.place_order(account='123', order=order)
+        self.play()
+
+        orders = {order_status['orderId']: order_status for order_status in self.broker.get_orders(account='123')}
+
+        # The stop is gapped through on the last bar, the take profit is canceled.
+        self.assertEqual([fill['price'] for fill in self.broker.fills], [100.0, 98.0])
+        self.assertEqual(orders['3']['status'], 'CANCELED')
+        self.assertEqual(orders['4']['status'], 'FILLED')
+        self.assertEqual(self.broker.positions['MSFT'], 0)
+        self.assertAlmostEqual(self.broker.cash, 100000.0 - 20.0 - 2.0)
+
+    def test_rejects_and_expires(self):
+        """Test that selling shares that aren't held is rejected, and day orders expire."""
+
+        self.broker.place_order(account='123', order=new_order(instruction='SELL'))
+        self.play()
+
+        self.assertEqual(self.broker.get_orders(account='123', order_id='1')['status'], 'REJECTED')
+
+        # The next bar is on the next trading day.
+        self.broker.place_order(account='123', order=new_order(instruction='BUY', order_type='LIMIT', price=50.0))
+        self.broker.fill_bars(bars=[{
+            'symbol': 'MSFT',
+            'datetime': self.times[-1] + 24 * 60 * 60000,
+            'open': 40.0,
+            'high': 41.0,
+            'low': 39.0,
+            'close': 40.0
+        }])
+
+        self.assertEqual(self.broker.get_orders(account='123', order_id='2')['status'], 'EXPIRED')
+        self.assertEqual(len(self.broker.fills), 0)
+
+    def tearDown(self) -> None:
+        """Teardown the Simulated Broker."""
+
+        self.broker = None
+        self.source = None
+
+
+if __name__ == '__main__':
+    unittest.main()
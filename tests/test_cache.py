@@ -0,0 +1,116 @@
+"""Unit test module for the IndicatorCache Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that results are memoized, evicted and persisted.
+"""
+
+import tempfile
+import unittest
+import numpy as np
+
+from unittest import TestCase
+
+from pyrobot.cache import IndicatorCache
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import random_walk_prices
+
+
+class PyRobotIndicatorCacheTest(TestCase):
+
+    """Will perform a unit test for the IndicatorCache Object."""
+
+    def setUp(self) -> None:
+        """Set up the cache and some generated prices."""
+
+        self.prices = random_walk_prices(symbols=['AAPL', 'MSFT'], bars=50, seed=11, volume=1000.0)
+
+        self.cache = IndicatorCache()
+
+    def test_creates_instance_of_cache(self):
+        """Create an instance and make sure it's an IndicatorCache."""
+
+        self.assertIsInstance(self.cache, IndicatorCache)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_repeated_indicators_hit_the_cache(self):
+        """Test that a second Indicators object over the same prices reuses the results."""
+
+        first_frame = StockFrame(data=self.prices)
+        Indicators(price_data_frame=first_frame, cache=self.cache).sma(period=5)
+
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.hits, 0)
+
+        second_frame = StockFrame(data=self.prices)
+        Indicators(price_data_frame=second_frame, cache=self.cache).sma(period=5)
+
+        self.assertEqual(self.cache.hits, 2)
+        np.testing.assert_allclose(first_frame.frame['sma'], second_frame.frame['sma'])
+
+    def test_new_rows_only_miss_for_their_symbol(self):
+        """Test that adding a row to one symbol leaves the other symbol cached."""
+
+        stock_frame = StockFrame(data=self.prices)
+        indicator_client = Indicators(price_data_frame=stock_frame, cache=self.cache)
+        indicator_client.ema(period=5)
+
+        stock_frame.add_rows(data=[{
+            'symbol': 'AAPL',
+            'datetime': 1586390400000 + 50 * 60000,
+            'open': 120.0,
+            'close': 120.0,
+            'high': 120.0,
+            'low': 120.0,
+            'volume': 1000
+        }])
+        indicator_client.refresh()
+
+        self.assertEqual(self.cache.misses, 3)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertFalse(np.isnan(stock_frame.frame['ema'].loc['AAPL'].iloc[-1]))
+
+    def test_different_arguments_do_not_collide(self):
+        """Test that the kernel arguments are part of the key."""
+
+        inputs = {'close': np.arange(10, dtype=float)}
+
+        key_1 = self.cache.make_key(indicator='sma', params={'period': 5}, symbol='AAPL', inputs=inputs)
+        key_2 = self.cache.make_key(indicator='sma', params={'period': 6}, symbol='AAPL', inputs=inputs)
+
+        self.assertNotEqual(key_1, key_2)
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays under its byte limit."""
+
+        cache = IndicatorCache(max_bytes=2 * 80)
+
+        cache.put(key='a', outputs={'sma': np.zeros(10)})
+        cache.put(key='b', outputs={'sma': np.zeros(10)})
+        cache.get(key='a')
+        cache.put(key='c', outputs={'sma': np.zeros(10)})
+
+        self.assertEqual(cache.size_bytes, 160)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNotNone(cache.get(key='a'))
+        self.assertIsNone(cache.get(key='b'))
+
+    def test_persists_to_disk(self):
+        """Test that a new cache over the same folder finds the old results."""
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            IndicatorCache(directory=directory).put(key='a', outputs={'sma': np.arange(5.0)})
+            outputs = IndicatorCache(directory=directory).get(key='a')
+
+            np.testing.assert_allclose(outputs['sma'], np.arange(5.0))
+
+    def tearDown(self) -> None:
+        """Teardown the cache."""
+
+        self.cache = None
+
+
+if __name__ == '__main__':
+    unittest.main()
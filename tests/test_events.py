@@ -0,0 +1,158 @@
+"""Unit test module for the EventBus Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that events reach their subscribers, that latency is measured
+and that the robot's bar, indicator, signal and order stages are chained.
+"""
+
+import unittest
+import operator
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.events import Event
+from pyrobot.events import EventBus
+from pyrobot.robot import PyRobot
+from pyrobot.indicators import Indicators
+
+
+class PyRobotEventBusTest(TestCase):
+
+    """Will perform a unit test for the EventBus Object."""
+
+    def setUp(self) -> None:
+        """Set up the Event Bus."""
+
+        self.event_bus = EventBus()
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's an EventBus object."""
+
+        self.assertIsInstance(self.event_bus, EventBus)
+
+    def test_publish_and_subscribe(self):
+        """Test that subscribers are called in order, and can unsubscribe."""
+
+        received = []
+
+        def first(event: Event):
+            received.append(('first', event.data))
+
+        def second(event: Event):
+            received.append(('second', event.data))
+
+        self.event_bus.subscribe(topic='bar', callback=first)
+        self.event_bus.subscribe(topic='bar', callback=second)
+        self.event_bus.publish(topic='bar', data=1)
+
+        self.event_bus.unsubscribe(topic='bar', callback=first)
+        self.event_bus.publish(topic='bar', data=2)
+        self.event_bus.publish(topic='signals', data=3)
+
+        self.assertEqual(received, [('first', 1), ('second', 1), ('second', 2)])
+
+    def test_latency_from_the_bar(self):
+        """Test that chained events are timed from the bar that started them."""
+
+        def on_bar(event: Event):
+            self.event_bus.publish(topic='signals', data=None, origin=event)
+
+        self.event_bus.subscribe(topic='bar', callback=on_bar)
+        bar_event = self.event_bus.publish(topic='bar', data=[], bar_close=0.0)
+
+        report = self.event_bus.latency_report()
+
+        self.assertEqual(bar_event.latency, 0.0)
+        self.assertEqual(report['bar']['latency']['count'], 1)
+        self.assertEqual(report['signals']['latency']['count'], 1)
+        self.assertGreaterEqual(report['bar']['handler_time']['last_ms'], report['signals']['handler_time']['last_ms'])
+        self.assertGreater(report['bar_delay']['last_ms'], 0.0)
+
+    def tearDown(self) -> None:
+        """Teardown the Event Bus."""
+
+        self.event_bus = None
+
+
+class PyRobotPipelineTest(TestCase):
+
+    """Will test the bar, indicator, signal and order stages of the robot."""
+
+    def setUp(self) -> None:
+        """Set up a paper trading robot without logging in."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            self.robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        prices = [
+            {
+                'symbol': symbol,
+                'datetime': 1586390400000 + index * 60000,
+                'open': 100.0, 'close': 100.0 + index, 'high': 101.0, 'low': 99.0, 'volume': 10.0
+            }
+            for symbol in ['AAPL', 'MSFT']
+            for index in range(3)
+        ]
+
+        self.stock_frame = self.robot.create_stock_frame(data=prices)
+        self.latest_bars = [
+            {
+                'symbol': symbol,
+                'datetime': 1586390400000 + 3 * 60000,
+                'open': 100.0, 'close': close, 'high': 101.0, 'low': 99.0, 'volume': 10.0
+            }
+            for symbol, close in [('AAPL', 110.0), ('MSFT', 90.0)]
+        ]
+
+    def _strategy(self, buy_above: float) -> Indicators:
+        """Builds an Indicators object that buys when the close is above a value."""
+
+        indicator_client = Indicators(price_data_frame=self.stock_frame)
+        indicator_client.set_indicator_signal(
+            indicator='close',
+            buy=buy_above,
+            sell=0.0,
+            condition_buy=operator.gt,
+            condition_sell=None
+        )
+
+        return indicator_client
+
+    def test_pipeline(self):
+        """Test that one bar runs every stage, for two strategies sharing the frame."""
+
+        signals_seen = []
+        orders_seen = []
+
+        self.robot.connect_pipeline(indicator_client=self._strategy(buy_above=105.0))
+        self.robot.connect_pipeline(indicator_client=self._strategy(buy_above=50.0))
+
+        self.robot.events.subscribe(
+            topic='signals',
+            callback=lambda event: signals_seen.append(
+                event.data['signals']['buys'].index.get_level_values(0).to_list()
+            )
+        )
+        self.robot.events.subscribe(topic='orders', callback=orders_seen.append)
+
+        with patch.object(PyRobot, 'get_latest_bar', return_value=self.latest_bars):
+            self.robot.process_latest_bar()
+
+        # The bars were only added once.
+        self.assertEqual(len(self.stock_frame.frame), 8)
+        self.assertEqual(signals_seen, [['AAPL'], ['AAPL', 'MSFT']])
+
+        # Without trades, nothing is executed.
+        self.assertEqual(orders_seen, [])
+        self.assertEqual(self.robot.events.latency_report()['signals']['latency']['count'], 2)
+
+    def tearDown(self) -> None:
+        """Teardown the Robot."""
+
+        self.robot = None
+        self.stock_frame = None
+
+
+if __name__ == '__main__':
+    unittest.main()
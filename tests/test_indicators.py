@@ -5,17 +5,21 @@ it will test different properties and methods of the object.
 """
 import unittest
 import operator
+import numpy as np
 import pandas as pd
 
 from unittest import TestCase
 from datetime import datetime
 from datetime import timedelta
-from configparser import ConfigParser
 
 from pyrobot.robot import PyRobot
 from pyrobot.indicators import Indicators
+from pyrobot.rules import CrossoverRule
 from pyrobot.stock_frame import StockFrame
 
+from simulated_td import load_config
+from generated_prices import random_walk_prices
+
 
 class PyRobotIndicatorTest(TestCase):
 
@@ -25,8 +29,7 @@ class PyRobotIndicatorTest(TestCase):
         """Set up the Indicator Client."""
 
         # Grab configuration values.
-        config = ConfigParser()
-        config.read('configs/config.ini')       
+        config = load_config(test_case=self)
 
         CLIENT_ID = config.get('main', 'CLIENT_ID')
         REDIRECT_URI = config.get('main', 'REDIRECT_URI')
@@ -187,5 +190,392 @@ class PyRobotIndicatorTest(TestCase):
         self.indicator_client = None
 
 
+class PyRobotLazyIndicatorTest(TestCase):
+
+    """Will perform a unit test for lazy indicator evaluation, using generated prices."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with two symbols of generated prices."""
+
+        prices = random_walk_prices(symbols=['AAPL', 'MSFT'], bars=60, seed=7, open_offset=0.1, volume=1000.0, volume_step=1.0)
+
+        self.stock_frame = StockFrame(data=prices)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame, lazy=True)
+
+        self.new_bar = {
+            'symbol': 'AAPL',
+            'datetime': 1586390400000 + 60 * 60000,
+            'open': 150.0,
+            'close': 150.0,
+            'high': 150.0,
+            'low': 150.0,
+            'volume': 1000
+        }
+
+    def test_refresh_marks_indicators_stale(self):
+        """Test that a lazy refresh does not calculate the indicators."""
+
+        self.indicator_client.sma(period=5)
+        self.assertFalse(self.indicator_client.is_stale(indicator='sma'))
+
+        self.stock_frame.add_rows(data=[self.new_bar])
+        self.indicator_client.refresh()
+
+        self.assertTrue(self.indicator_client.is_stale(indicator='sma'))
+        self.assertTrue(np.isnan(self.stock_frame.frame['sma'].loc['AAPL'].iloc[-1]))
+
+    def test_get_indicator_calculates_stale_indicator(self):
+        """Test that reading an indicator recalculates it and memoizes the result."""
+
+        self.indicator_client.sma(period=5)
+        self.stock_frame.add_rows(data=[self.new_bar])
+        self.indicator_client.refresh()
+
+        sma = self.indicator_client.get_indicator(indicator='sma')
+
+        self.assertFalse(np.isnan(sma['sma'].loc['AAPL'].iloc[-1]))
+        self.assertFalse(self.indicator_client.is_stale(indicator='sma'))
+
+    def test_check_signals_only_calculates_signal_indicators(self):
+        """Test that a signal check leaves indicators nobody reads stale."""
+
+        self.indicator_client.sma(period=5)
+        self.indicator_client.ema(period=5)
+
+        self.indicator_client.set_indicator_signal(
+            indicator='sma',
+            buy=0.0,
+            sell=0.0,
+            condition_buy=operator.ge,
+            condition_sell=operator.lt
+        )
+
+        self.stock_frame.add_rows(data=[self.new_bar])
+        self.indicator_client.refresh()
+        self.indicator_client.check_signals()
+
+        self.assertFalse(self.indicator_client.is_stale(indicator='sma'))
+        self.assertTrue(self.indicator_client.is_stale(indicator='ema'))
+
+    def tearDown(self) -> None:
+        """Teardown the Indicator object."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
+
+class PyRobotMultiSymbolIndicatorTest(TestCase):
+
+    """Will make sure the indicators are calculated separately for each symbol."""
+
+    def _build_prices(self, symbol: str, start_price: float, bars: int, step: float = 1.0) -> list:
+        """Builds a straight line of prices, with a one dollar range around the close."""
+
+        prices = []
+
+        for index in range(bars):
+
+            close = start_price + step * index
+
+            prices.append({
+                'symbol': symbol,
+                'datetime': 1586390400000 + index * 60000,
+                'open': close,
+                'close': close,
+                'high': close + 1.0,
+                'low': close - 1.0,
+                'volume': 1000.0 + 10.0 * index
+            })
+
+        return prices
+
+    def setUp(self) -> None:
+        """Set up a StockFrame where each symbol trades at a very different level."""
+
+        self.prices = {
+            'AAPL': self._build_prices(symbol='AAPL', start_price=100.0, bars=80),
+            'MSFT': self._build_prices(symbol='MSFT', start_price=1000.0, bars=60),
+            'SQ': self._build_prices(symbol='SQ', start_price=10.0, bars=70, step=-0.05)
+        }
+
+        all_prices = self.prices['AAPL'] + self.prices['MSFT'] + self.prices['SQ']
+
+        self.stock_frame = StockFrame(data=all_prices)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+    def _assert_matches_single_symbol(self, method: str, columns: list, **kwargs) -> None:
+        """Checks the multi-symbol result against the same indicator on each symbol alone."""
+
+        getattr(self.indicator_client, method)(**kwargs)
+
+        for symbol, prices in self.prices.items():
+
+            single_frame = StockFrame(data=prices)
+            getattr(Indicators(price_data_frame=single_frame), method)(**kwargs)
+
+            for column in columns:
+                np.testing.assert_allclose(
+                    self.stock_frame.frame.loc[symbol][column].to_numpy(),
+                    single_frame.frame.loc[symbol][column].to_numpy(),
+                    err_msg='{method} bled across symbols for {symbol}'.format(method=method, symbol=symbol)
+                )
+
+    def test_symbol_bounds(self):
+        """Test that each symbol is a single block of rows."""
+
+        self.assertEqual(
+            self.stock_frame.symbol_bounds,
+            [('AAPL', 0, 80), ('MSFT', 80, 140), ('SQ', 140, 210)]
+        )
+
+    def test_average_true_range_golden_values(self):
+        """Test the ATR, the true range is always 2 unless the previous close leaks in."""
+
+        self.indicator_client.average_true_range(period=3)
+
+        for symbol in self.prices:
+            atr = self.stock_frame.frame.loc[symbol]['average_true_range']
+            self.assertTrue(atr.iloc[:2].isna().all())
+            np.testing.assert_allclose(atr.iloc[2:].to_numpy(), 2.0)
+
+    def test_stochastic_oscillator_golden_values(self):
+        """Test the Stochastic Oscillator, a rising line always closes at 75."""
+
+        self.indicator_client.stochastic_oscillator(period=3)
+
+        stochastic = self.stock_frame.frame.loc['AAPL']['stochastic_oscillator']
+        self.assertTrue(stochastic.iloc[:2].isna().all())
+        np.testing.assert_allclose(stochastic.iloc[2:].to_numpy(), 75.0)
+
+        stochastic = self.stock_frame.frame.loc['MSFT']['stochastic_oscillator']
+        np.testing.assert_allclose(stochastic.iloc[2:].to_numpy(), 75.0)
+
+        # The column name can still be passed first, by position.
+        self.indicator_client.stochastic_oscillator('stochastic_k', 3)
+
+        np.testing.assert_allclose(self.stock_frame.frame['stochastic_k'].to_numpy(), self.stock_frame.frame['stochastic_oscillator'].to_numpy())
+
+    def test_force_index_golden_values(self):
+        """Test the Force Index, the first bar of each symbol has no previous bar."""
+
+        self.indicator_client.force_index(period=1)
+
+        force_index = self.stock_frame.frame.loc['MSFT']['force_index']
+        self.assertTrue(np.isnan(force_index.iloc[0]))
+        np.testing.assert_allclose(force_index.iloc[1:].to_numpy(), 10.0)
+
+    def test_mass_index_golden_values(self):
+        """Test the Mass Index, a constant range sums to the window size."""
+
+        self.indicator_client.mass_index(period=9)
+
+        for symbol in self.prices:
+            mass_index = self.stock_frame.frame.loc[symbol]['mass_index']
+            self.assertTrue(mass_index.iloc[:38].isna().all())
+            np.testing.assert_allclose(mass_index.iloc[38:].to_numpy(), 25.0)
+
+    def test_macd_matches_single_symbol(self):
+        """Test the MACD against each symbol on its own."""
+
+        self._assert_matches_single_symbol(
+            method='macd',
+            columns=['macd_fast', 'macd_slow', 'macd_diff', 'macd'],
+            fast_period=12,
+            slow_period=26
+        )
+
+    def test_other_indicators_match_single_symbol(self):
+        """Test every other indicator against each symbol on its own."""
+
+        self._assert_matches_single_symbol(method='rsi', columns=['rsi'], period=14)
+        self._assert_matches_single_symbol(method='sma', columns=['sma'], period=5)
+        self._assert_matches_single_symbol(method='ema', columns=['ema'], period=5)
+        self._assert_matches_single_symbol(method='rate_of_change', columns=['rate_of_change'], period=2)
+        self._assert_matches_single_symbol(method='bollinger_bands', columns=['band_upper', 'band_lower'], period=20)
+        self._assert_matches_single_symbol(method='ease_of_movement', columns=['ease_of_movement'], period=5)
+        self._assert_matches_single_symbol(method='commodity_channel_index', columns=['commodity_channel_index'], period=5)
+        self._assert_matches_single_symbol(method='standard_deviation', columns=['standard_deviation'], period=5)
+        self._assert_matches_single_symbol(method='chaikin_oscillator', columns=['chaikin_oscillator'], period=5)
+        self._assert_matches_single_symbol(
+            method='kst_oscillator',
+            columns=['kst_oscillator', 'kst_oscillator_signal'],
+            r1=2, r2=3, r3=4, r4=5, n1=2, n2=2, n3=2, n4=3
+        )
+
+    def test_grouped_indicators_match_groupby(self):
+        """Test the SMA and EMA against a pandas groupby."""
+
+        self.indicator_client.sma(period=5)
+        self.indicator_client.ema(period=5)
+
+        groups = self.stock_frame.frame.groupby(level=0)['close']
+
+        np.testing.assert_allclose(
+            self.stock_frame.frame['sma'].to_numpy(),
+            groups.transform(lambda x: x.rolling(window=5).mean()).to_numpy()
+        )
+        np.testing.assert_allclose(
+            self.stock_frame.frame['ema'].to_numpy(),
+            groups.transform(lambda x: x.ewm(span=5).mean()).to_numpy()
+        )
+
+    def tearDown(self) -> None:
+        """Teardown the Indicator object."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
+
+
+class PyRobotSignalTest(TestCase):
+
+    """Will make sure the signals are checked on the last row of every symbol."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame where each symbol ends on a known RSI like value."""
+
+        prices = []
+
+        for symbol, last_value in [('AAPL', 120.0), ('MSFT', 50.0), ('SQ', 10.0)]:
+            for index in range(5):
+                prices.append({
+                    'symbol': symbol,
+                    'datetime': 1586390400000 + index * 60000,
+                    'open': 100.0,
+                    'close': 100.0 + index,
+                    'high': 101.0 + index,
+                    'low': 99.0 + index,
+                    'volume': 1000.0,
+                    'signal_value': last_value if index == 4 else 50.0
+                })
+
+        self.stock_frame = StockFrame(data=prices)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+    def test_last_row_positions(self):
+        """Test that the last row of each symbol is found."""
+
+        np.testing.assert_array_equal(self.stock_frame.last_row_positions, [4, 9, 14])
+
+    def test_threshold_signals(self):
+        """Test a buy and a sell threshold over every symbol."""
+
+        self.indicator_client.set_indicator_signal(
+            indicator='signal_value',
+            buy=70.0,
+            sell=30.0,
+            condition_buy=operator.ge,
+            condition_sell=operator.le
+        )
+
+        signals = self.indicator_client.check_signals()
+
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['AAPL'])
+        self.assertEqual(signals['sells'].index.get_level_values(0).to_list(), ['SQ'])
+
+    def test_combine_all_and_any(self):
+        """Test that every signal counts, not just the last one added."""
+
+        self.indicator_client.set_indicator_signal(
+            indicator='signal_value',
+            buy=40.0,
+            sell=0.0,
+            condition_buy=operator.ge,
+            condition_sell=None
+        )
+
+        self.indicator_client.set_indicator_signal_compare(
+            indicator_1='close',
+            indicator_2='signal_value',
+            condition_buy=operator.ge,
+            condition_sell=None
+        )
+
+        # MSFT is the only symbol where the close is above the value and the value is above 40.
+        signals = self.indicator_client.check_signals()
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['MSFT'])
+        self.assertTrue(signals['sells'].empty)
+
+        self.indicator_client.signal_combine = 'any'
+
+        signals = self.indicator_client.check_signals()
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['AAPL', 'MSFT', 'SQ'])
+
+        with self.assertRaises(ValueError):
+            self.indicator_client.signal_combine = 'most'
+
+    def test_crossover_fires_once(self):
+        """Test that a crossover signal is only generated on the bar it crosses."""
+
+        self.indicator_client.set_indicator_signal_crossover(
+            indicator_1='close',
+            indicator_2='signal_value',
+            buy='above',
+            sell='below'
+        )
+
+        # AAPL's value jumped above the close and SQ's stayed below it on the last bar.
+        signals = self.indicator_client.check_signals()
+        self.assertEqual(signals['sells'].index.get_level_values(0).to_list(), ['AAPL'])
+        self.assertTrue(signals['buys'].empty)
+
+        self.stock_frame.add_rows(data=[
+            {
+                'symbol': symbol,
+                'datetime': 1586390400000 + 5 * 60000,
+                'open': 100.0, 'close': 130.0, 'high': 131.0, 'low': 99.0, 'volume': 1000.0
+            }
+            for symbol in ['AAPL', 'MSFT', 'SQ']
+        ])
+
+        for symbol, value in [('AAPL', 120.0), ('MSFT', 50.0), ('SQ', 10.0)]:
+            self.stock_frame.frame.loc[(symbol, pd.Timestamp(1586390400000 + 5 * 60000, unit='ms')), 'signal_value'] = value
+
+        # AAPL crossed back above, the others were above already.
+        signals = self.indicator_client.check_signals()
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['AAPL'])
+        self.assertTrue(signals['sells'].empty)
+
+        np.testing.assert_array_equal(self.stock_frame.previous_row_positions, [4, 10, 16])
+
+    def test_check_signals_history(self):
+        """Test finding every bar where the signals would have been generated."""
+
+        self.indicator_client.set_indicator_signal(
+            indicator='signal_value',
+            buy=70.0,
+            sell=30.0,
+            condition_buy=operator.ge,
+            condition_sell=operator.le
+        )
+
+        self.indicator_client.set_indicator_signal_crossover(
+            indicator_1='signal_value',
+            indicator_2=60.0,
+            buy='above',
+            sell=None
+        )
+
+        self.indicator_client.add_signal_rule(
+            rule=CrossoverRule(side='sell', indicator_1='signal_value', direction='below', indicator_2=40.0)
+        )
+
+        signals_history = self.indicator_client.check_signals_history()
+
+        self.assertEqual(signals_history.columns.to_list(), ['symbol', 'datetime', 'side'])
+        self.assertEqual(signals_history['symbol'].to_list(), ['AAPL', 'SQ'])
+        self.assertEqual(signals_history['side'].to_list(), ['buy', 'sell'])
+        self.assertEqual(signals_history['datetime'].iloc[0], pd.Timestamp(1586390400000 + 4 * 60000, unit='ms'))
+
+        # The last bar of the history matches the live signal check.
+        signals = self.indicator_client.check_signals()
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['AAPL'])
+
+    def tearDown(self) -> None:
+        """Teardown the Indicator object."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
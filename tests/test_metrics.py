@@ -0,0 +1,208 @@
+"""Unit test module for the Metrics Objects.
+
+Will perform an instance test to make sure it creates them. Additionally,
+it will test that a robot reports each stage of the bar loop, each
+indicator and each API request, and that the Prometheus and StatsD
+exporters write the metrics in their formats.
+"""
+
+import socket
+import unittest
+import urllib.request
+
+from unittest import TestCase
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+
+from pyrobot.robot import PyRobot
+from pyrobot.trades import Trade
+from pyrobot.rules import ThresholdRule
+from pyrobot.events import LatencyHistogram
+from pyrobot.metrics import NULL_METRICS
+from pyrobot.metrics import StatsDSink
+from pyrobot.metrics import PrometheusSink
+from pyrobot.metrics import MetricsRegistry
+from pyrobot.metrics import InstrumentedSession
+from pyrobot.replay import ReplayDataSource
+from pyrobot.td_server import SimulatedTDServer
+from pyrobot.td_server import random_walk_bars
+from pyrobot.indicators import Indicators
+
+
+SYMBOLS = ['MSFT', 'AAPL', 'SQ']
+
+
+class PyRobotMetricsTest(TestCase):
+
+    """Will perform a unit test for the Metrics Objects."""
+
+    def setUp(self) -> None:
+        """Set up a server with an hour of bars for 3 symbols, and a registry."""
+
+        source = ReplayDataSource(bars=random_walk_bars(symbols=SYMBOLS, bars=60, seed=7))
+
+        self.td_server = SimulatedTDServer(source=source, clock=int(source.timestamps[-11]), seed=7)
+        self.td_server.start()
+
+        self.metrics = MetricsRegistry()
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a MetricsRegistry object."""
+
+        self.assertIsInstance(self.metrics, MetricsRegistry)
+        self.assertFalse(NULL_METRICS.enabled)
+
+        # With metrics off, nothing is measured and the session isn't wrapped.
+        with NULL_METRICS.timer(name='stage_duration', tags={'stage': 'fetch'}):
+            pass
+
+        with self.td_server.patch_robot():
+            trading_robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', requests_per_minute=None)
+
+        self.assertIs(trading_robot.metrics, NULL_METRICS)
+        self.assertNotIsInstance(trading_robot.session.session, InstrumentedSession)
+
+    def test_latency_histogram(self):
+        """Test that the histogram buckets and percentiles match the measurements."""
+
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+
+        for seconds in [0.005] * 50 + [0.05] * 40 + [0.5] * 9 + [2.0]:
+            histogram.record(seconds=seconds)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.cumulative_counts(), [(0.01, 50), (0.1, 90), (1.0, 99), (float('inf'), 100)])
+        self.assertEqual(histogram.percentile(percent=50), 0.01)
+        self.assertEqual(histogram.percentile(percent=90), 0.1)
+        self.assertEqual(histogram.percentile(percent=100), 2.0)
+        self.assertAlmostEqual(histogram.to_dict()['p99_ms'], 1000.0)
+
+    def test_robot_stages(self):
+        """Test that a bar through the pipeline reports every stage, indicator and request."""
+
+        with self.td_server.patch_robot():
+            trading_robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                trading_account='123456789',
+                paper_trading=False,
+                requests_per_minute=None,
+                metrics=self.metrics
+            )
+
+        trading_robot.record_orders = False
+        trading_robot.create_portfolio()
+
+        for symbol in SYMBOLS:
+            trading_robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+        clock = datetime.fromtimestamp(self.td_server.broker.clock / 1000, tz=timezone.utc)
+        historical_prices = trading_robot.grab_historical_prices(start=clock - timedelta(minutes=30), end=clock)
+        stock_frame = trading_robot.create_stock_frame(data=historical_prices['aggregated'])
+
+        indicator_client = Indicators(price_data_frame=stock_frame)
+        indicator_client.sma(period=5)
+        indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='sma', condition='>', value=0.0))
+
+        trades_dict = {}
+
+        for symbol in SYMBOLS:
+
+            trade_obj = Trade()
+            trade_obj.new_trade(trade_id='buy', order_type='mkt', side='long', enter_or_exit='enter')
+            trade_obj.instrument(symbol=symbol, quantity=1, asset_type='EQUITY')
+            trades_dict[symbol] = {'buy': {'trade_func': trade_obj}}
+
+        trading_robot.connect_pipeline(indicator_client=indicator_client, trades_to_execute=trades_dict)
+
+        self.td_server.advance(bars=1)
+        trading_robot.process_latest_bar()
+
+        for stage in ['fetch', 'add_rows', 'refresh', 'check_signals']:
+            self.assertEqual(self.metrics.histogram(name='stage_duration', tags={'stage': stage}).count, 1)
+
+        self.assertEqual(self.metrics.histogram(name='stage_duration', tags={'stage': 'place_order'}).count, 3)
+        self.assertEqual(self.metrics.histogram(name='indicator_duration', tags={'indicator': 'sma'}).count, 1)
+        self.assertEqual(self.metrics.histogram(name='event_latency', tags={'topic': 'orders'}).count, 1)
+        self.assertEqual(self.metrics.counter(name='rows_appended'), 3)
+
+        # Every request the server answered was counted.
+        for endpoint in ['get_price_history', 'place_order']:
+            self.assertEqual(
+                self.metrics.counter(name='api_requests', tags={'endpoint': endpoint, 'status': 'ok'}),
+                self.td_server.stats['endpoints'][endpoint]
+            )
+
+        self.assertIn('stage=fetch', self.metrics.report()['stage_duration'])
+
+    def test_prometheus(self):
+        """Test that a scrape returns the counters and histograms in the Prometheus format."""
+
+        prometheus_sink = PrometheusSink(buckets=(0.1, 1.0)).start()
+
+        try:
+            prometheus_sink.increment(name='rows_appended', value=3)
+            prometheus_sink.increment(name='api_requests', tags={'endpoint': 'get_quotes', 'status': 'ok'})
+            prometheus_sink.observe(name='stage_duration', seconds=0.05, tags={'stage': 'fetch'})
+            prometheus_sink.observe(name='stage_duration', seconds=2.0, tags={'stage': 'fetch'})
+
+            with urllib.request.urlopen(prometheus_sink.url) as response:
+                content_type = response.headers['Content-Type']
+                lines = response.read().decode().splitlines()
+
+        finally:
+            prometheus_sink.stop()
+
+        self.assertTrue(content_type.startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE pyrobot_rows_appended_total counter', lines)
+        self.assertIn('pyrobot_rows_appended_total 3.0', lines)
+        self.assertIn('pyrobot_api_requests_total{endpoint="get_quotes",status="ok"} 1.0', lines)
+        self.assertIn('# TYPE pyrobot_stage_duration_seconds histogram', lines)
+        self.assertIn('pyrobot_stage_duration_seconds_bucket{stage="fetch",le="0.1"} 1', lines)
+        self.assertIn('pyrobot_stage_duration_seconds_bucket{stage="fetch",le="1.0"} 1', lines)
+        self.assertIn('pyrobot_stage_duration_seconds_bucket{stage="fetch",le="+Inf"} 2', lines)
+        self.assertIn('pyrobot_stage_duration_seconds_sum{stage="fetch"} 2.05', lines)
+        self.assertIn('pyrobot_stage_duration_seconds_count{stage="fetch"} 2', lines)
+
+    def test_statsd(self):
+        """Test that the measurements reach a local StatsD collector."""
+
+        collector = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        collector.bind(('127.0.0.1', 0))
+        collector.settimeout(5)
+
+        port = collector.getsockname()[1]
+
+        statsd_sink = StatsDSink(port=port)
+        dogstatsd_sink = StatsDSink(port=port, dogstatsd_tags=True)
+
+        try:
+            statsd_sink.increment(name='rows_appended', value=3)
+            statsd_sink.observe(name='stage_duration', seconds=0.0125, tags={'stage': 'fetch'})
+            dogstatsd_sink.increment(name='api_requests', tags={'status': 'ok', 'endpoint': 'get_quotes'})
+
+            packets = [collector.recv(1024).decode() for _ in range(3)]
+
+        finally:
+            statsd_sink.close()
+            dogstatsd_sink.close()
+            collector.close()
+
+        self.assertEqual(packets, [
+            'pyrobot.rows_appended:3|c',
+            'pyrobot.stage_duration.fetch:12.5|ms',
+            'pyrobot.api_requests:1|c|#endpoint:get_quotes,status:ok'
+        ])
+        self.assertEqual(statsd_sink.dropped, 0)
+
+    def tearDown(self) -> None:
+        """Teardown the Server."""
+
+        self.td_server.stop()
+        self.td_server = None
+        self.metrics = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Unit test module for the Optimizer Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that grid and random searches rank every run, that the
+worker pool gives the same results as a single process, that indicator
+columns are cached between runs and that walk forward folds test on the
+bars after their training window.
+"""
+
+import pathlib
+import tempfile
+import unittest
+import numpy as np
+
+from unittest import TestCase
+
+from pyrobot.trades import Trade
+from pyrobot.rules import ThresholdRule
+from pyrobot.rules import CrossoverRule
+from pyrobot.backtest import Backtester
+from pyrobot.optimizer import Optimizer
+from pyrobot.optimizer import SharedPriceArray
+from pyrobot.optimizer import parameter_grid
+from pyrobot.optimizer import parameter_samples
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import random_walk_prices
+
+
+SYMBOLS = ['AAPL', 'MSFT', 'SQ']
+
+
+def crossover_strategy(indicator_client: Indicators, sma_period: int, buy_above: float) -> dict:
+    """Buys when the close crosses above its SMA and the price is over a level."""
+
+    indicator_client.sma(period=sma_period)
+    indicator_client.add_signal_rule(rule=CrossoverRule(side='buy', indicator_1='close', direction='above', indicator_2='sma'))
+    indicator_client.add_signal_rule(rule=ThresholdRule(side='buy', indicator='close', condition='>', value=buy_above))
+    indicator_client.add_signal_rule(rule=CrossoverRule(side='sell', indicator_1='close', direction='below', indicator_2='sma'))
+
+    trades_dict = {}
+
+    for symbol in SYMBOLS:
+
+        trades_dict[symbol] = {}
+
+        for side, enter_or_exit in [('buy', 'enter'), ('sell', 'exit')]:
+
+            trade_obj = Trade()
+            trade_obj.new_trade(trade_id=side, order_type='mkt', side='long', enter_or_exit=enter_or_exit)
+            trade_obj.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+            trades_dict[symbol][side] = {'trade_func': trade_obj}
+
+    return trades_dict
+
+
+class PyRobotOptimizerTest(TestCase):
+
+    """Will perform a unit test for the Optimizer Object."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with 600 minutes of bars for 3 symbols."""
+
+        prices = random_walk_prices(symbols=SYMBOLS, bars=600, seed=8, open_offset=0.1)
+
+        self.stock_frame = StockFrame(data=prices)
+        self.param_grid = {'sma_period': [10, 20], 'buy_above': [90.0, 100.0, 110.0]}
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's an Optimizer object."""
+
+        with Optimizer(stock_frame=self.stock_frame, strategy=crossover_strategy, workers=1) as optimizer:
+            self.assertIsInstance(optimizer, Optimizer)
+
+        self.assertEqual(len(parameter_grid(param_grid=self.param_grid)), 6)
+
+        samples = parameter_samples(param_distributions={'sma_period': range(5, 50)}, n_iter=10, seed=1)
+        self.assertEqual(len(samples), 10)
+        self.assertTrue(all(5 <= sample['sma_period'] < 50 for sample in samples))
+        self.assertEqual(samples, parameter_samples(param_distributions={'sma_period': range(5, 50)}, n_iter=10, seed=1))
+
+    def test_shared_prices(self):
+        """Test that the StockFrame a worker builds reads the shared prices in place."""
+
+        shared_prices = SharedPriceArray(stock_frame=self.stock_frame)
+        stock_frame, shared_block = SharedPriceArray.attach(spec=shared_prices.spec)
+
+        block = np.ndarray(shape=(6, len(self.stock_frame.frame)), dtype=np.float64, buffer=shared_block.buf)
+
+        self.assertTrue(np.shares_memory(stock_frame.frame['close'].to_numpy(), block))
+        self.assertTrue(stock_frame.frame.index.equals(self.stock_frame.frame.index))
+        self.assertTrue(stock_frame.frame.equals(self.stock_frame.frame))
+
+        del stock_frame, block
+        shared_block.close()
+        shared_prices.close()
+
+    def test_grid_search(self):
+        """Test that a grid search runs every combination, the same as a single backtest."""
+
+        with Optimizer(stock_frame=self.stock_frame, strategy=crossover_strategy, workers=1, commission=1.0) as optimizer:
+            results = optimizer.grid_search(param_grid=self.param_grid)
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(results['sharpe'].is_monotonic_decreasing)
+
+        indicator_client = Indicators(price_data_frame=self.stock_frame)
+        backtest_result = Backtester(
+            stock_frame=self.stock_frame,
+            indicator_client=indicator_client,
+            trades_to_execute=crossover_strategy(indicator_client=indicator_client, sma_period=20, buy_above=100.0),
+            commission=1.0
+        ).run()
+
+        run = results[(results['sma_period'] == 20) & (results['buy_above'] == 100.0)].iloc[0]
+        self.assertAlmostEqual(run['final_equity'], backtest_result.stats['final_equity'])
+        self.assertEqual(run['trades'], backtest_result.stats['trades'])
+
+    def test_worker_pool(self):
+        """Test that the worker pool matches a single process, and shares the cached indicators."""
+
+        with Optimizer(stock_frame=self.stock_frame, strategy=crossover_strategy, workers=1) as optimizer:
+            single_results = optimizer.random_search(param_distributions=self.param_grid, n_iter=8, seed=3)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            with Optimizer(stock_frame=self.stock_frame, strategy=crossover_strategy, workers=2, cache_directory=directory) as optimizer:
+                pool_results = optimizer.random_search(param_distributions=self.param_grid, n_iter=8, seed=3)
+
+            # One cached SMA per period and symbol, however many runs used it.
+            sma_periods = set(pool_results['sma_period'])
+            self.assertEqual(len(list(pathlib.Path(directory).glob('*.npz'))), len(sma_periods) * len(SYMBOLS))
+
+        self.assertTrue(pool_results.equals(single_results))
+
+    def test_walk_forward(self):
+        """Test that each fold is tested on the bars right after its training window."""
+
+        with Optimizer(stock_frame=self.stock_frame, strategy=crossover_strategy, workers=2) as optimizer:
+
+            windows = optimizer.walk_forward_windows(train_bars=300, test_bars=100)
+            folds = optimizer.walk_forward(candidates=self.param_grid, train_bars=300, test_bars=100)
+
+            with self.assertRaises(ValueError):
+                optimizer.walk_forward(candidates=self.param_grid, train_bars=600, test_bars=100)
+
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(len(folds), 3)
+
+        for (train_window, test_window), next_windows in zip(windows, windows[1:]):
+            self.assertEqual(test_window[0] - train_window[1], 60000)
+            self.assertEqual(next_windows[1][0] - test_window[1], 60000)
+
+        self.assertTrue(all(params in parameter_grid(param_grid=self.param_grid) for params in folds['params']))
+        self.assertTrue((folds['test_start'] > folds['train_end']).all())
+
+    def tearDown(self) -> None:
+        """Teardown the StockFrame."""
+
+        self.stock_frame = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""Unit test module for the IndicatorPlugin Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that plugins are refreshed, cached and updated incrementally.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from pyrobot.cache import IndicatorCache
+from pyrobot.indicators import Indicators
+from pyrobot.plugins import IndicatorPlugin
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import random_walk_prices
+
+
+class RollingHigh(IndicatorPlugin):
+
+    """A plugin without an update function, refreshed with its lookback."""
+
+    name = 'rolling_high'
+    inputs = ['high']
+    lookback = 4
+
+    def batch(self, high):
+        return {'rolling_high': pd.Series(high).rolling(window=5).max().to_numpy()}
+
+
+class CumulativeVolume(IndicatorPlugin):
+
+    """A plugin that keeps a running total in its state."""
+
+    name = 'cumulative_volume'
+    inputs = ['volume']
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.updated_rows = 0
+
+    def batch(self, volume):
+        return {'cumulative_volume': np.cumsum(volume)}
+
+    def update(self, state, volume):
+        self.updated_rows += len(volume)
+        totals = state.get('total', 0.0) + np.cumsum(volume)
+        state['total'] = totals[-1]
+        return {'cumulative_volume': totals}
+
+
+class PyRobotIndicatorPluginTest(TestCase):
+
+    """Will perform a unit test for the IndicatorPlugin Object."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with generated prices."""
+
+        prices = random_walk_prices(symbols=['AAPL', 'MSFT', 'SQ'], bars=40, seed=5, random_range=True, volume_step=1.0)
+
+        self.prices = prices
+        self.next_bar = 40
+        self.stock_frame = StockFrame(data=prices)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+    def _append_bars(self, bars: int) -> None:
+        """Appends a few bars to AAPL and MSFT."""
+
+        for index in range(self.next_bar, self.next_bar + bars):
+            self.stock_frame.add_rows(data=[
+                {
+                    'symbol': symbol,
+                    'datetime': 1586390400000 + index * 60000,
+                    'open': 100.0 + index,
+                    'close': 100.0 + index,
+                    'high': 101.0 + index,
+                    'low': 99.0 + index,
+                    'volume': 50.0
+                }
+                for symbol in ['AAPL', 'MSFT']
+            ])
+
+        self.next_bar += bars
+
+    def _full_calculation(self, plugin: IndicatorPlugin) -> np.ndarray:
+        """Calculates a plugin from scratch on a copy of the frame."""
+
+        frame_copy = StockFrame(data=self.prices)
+        frame_copy._frame = self.stock_frame.frame[['open', 'close', 'high', 'low', 'volume']].copy()
+
+        Indicators(price_data_frame=frame_copy).add_plugin(plugin=plugin)
+
+        return frame_copy.frame[plugin.outputs[0]].to_numpy()
+
+    def test_plugin_requires_a_name(self):
+        """Test that a plugin without a name is rejected."""
+
+        class Nameless(IndicatorPlugin):
+            pass
+
+        with self.assertRaises(ValueError):
+            Nameless()
+
+    def test_add_plugin(self):
+        """Test adding a plugin and registering it for refresh."""
+
+        self.indicator_client.add_plugin(plugin=RollingHigh())
+
+        self.assertIn('rolling_high', self.stock_frame.frame.columns)
+        self.assertIn('rolling_high', self.indicator_client._current_indicators)
+        self.assertTrue(np.isnan(self.stock_frame.frame.loc['MSFT']['rolling_high'].iloc[3]))
+
+    def test_refresh_with_lookback(self):
+        """Test that refreshing a plugin without an update matches a full calculation."""
+
+        self.indicator_client.add_plugin(plugin=RollingHigh())
+
+        self._append_bars(bars=3)
+        self.indicator_client.refresh()
+
+        np.testing.assert_allclose(
+            self.stock_frame.frame['rolling_high'].to_numpy(),
+            self._full_calculation(plugin=RollingHigh())
+        )
+
+    def test_refresh_with_update(self):
+        """Test that refreshing a plugin with an update only calculates the new rows."""
+
+        plugin = CumulativeVolume()
+        self.indicator_client.add_plugin(plugin=plugin)
+
+        self._append_bars(bars=2)
+        self.indicator_client.refresh()
+
+        # The history of AAPL and MSFT builds the state, then only the new rows.
+        self.assertEqual(plugin.updated_rows, 2 * 40 + 2 * 2)
+
+        self._append_bars(bars=1)
+        self.indicator_client.refresh()
+
+        self.assertEqual(plugin.updated_rows, 2 * 40 + 2 * 2 + 2)
+
+        np.testing.assert_allclose(
+            self.stock_frame.frame['cumulative_volume'].to_numpy(),
+            self._full_calculation(plugin=CumulativeVolume())
+        )
+
+    def test_incremental_indicators(self):
+        """Test that the incremental moving averages match a full calculation."""
+
+        incremental_client = Indicators(price_data_frame=self.stock_frame, incremental=True)
+        incremental_client.sma(period=5)
+        incremental_client.ema(period=5)
+        incremental_client.rsi(period=14)
+        incremental_client.rate_of_change(period=3)
+        incremental_client.average_true_range(period=14)
+        incremental_client.macd(fast_period=5, slow_period=10)
+
+        for _ in range(3):
+            self._append_bars(bars=1)
+            incremental_client.refresh()
+
+        frame_copy = StockFrame(data=self.prices)
+        frame_copy._frame = self.stock_frame.frame[['open', 'close', 'high', 'low', 'volume']].copy()
+
+        full_client = Indicators(price_data_frame=frame_copy)
+        full_client.sma(period=5)
+        full_client.ema(period=5)
+        full_client.rsi(period=14)
+        full_client.rate_of_change(period=3)
+        full_client.average_true_range(period=14)
+        full_client.macd(fast_period=5, slow_period=10)
+
+        for column in ['sma', 'ema', 'rsi', 'rate_of_change', 'average_true_range', 'macd_diff', 'macd']:
+            np.testing.assert_allclose(
+                self.stock_frame.frame[column].to_numpy(),
+                frame_copy.frame[column].to_numpy(),
+                err_msg=column
+            )
+
+        # The new rows were calculated from the state, not from scratch.
+        self.assertEqual(len(incremental_client._plugin_states['ema']['symbols']['AAPL']['state']), 1)
+
+    def test_plugin_is_cached(self):
+        """Test that plugin results are memoized with the plugin arguments."""
+
+        cache = IndicatorCache()
+
+        Indicators(price_data_frame=self.stock_frame, cache=cache).add_plugin(plugin=RollingHigh())
+        Indicators(price_data_frame=StockFrame(data=self.prices), cache=cache).add_plugin(plugin=RollingHigh())
+
+        self.assertEqual(cache.hits, 3)
+
+        Indicators(price_data_frame=StockFrame(data=self.prices), cache=cache).add_plugin(plugin=RollingHigh(window=6))
+
+        self.assertEqual(cache.misses, 6)
+
+    def test_plugin_is_sharded(self):
+        """Test that sharding the symbols across workers gives the same result."""
+
+        sharded_frame = StockFrame(data=self.prices)
+        Indicators(price_data_frame=sharded_frame, workers=3).add_plugin(plugin=RollingHigh())
+        self.indicator_client.add_plugin(plugin=RollingHigh())
+
+        np.testing.assert_allclose(
+            sharded_frame.frame['rolling_high'].to_numpy(),
+            self.stock_frame.frame['rolling_high'].to_numpy()
+        )
+
+    def tearDown(self) -> None:
+        """Teardown the Indicator object."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
+
+if __name__ == '__main__':
+    unittest.main()
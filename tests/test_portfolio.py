@@ -6,11 +6,12 @@ it will test different properties and methods of the object.
 
 import unittest
 from unittest import TestCase
-from configparser import ConfigParser
 
 from pyrobot.portfolio import Portfolio
 from td.client import TDClient
 
+from simulated_td import load_config
+
 
 class PyRobotPortfolioTest(TestCase):
 
@@ -23,21 +24,23 @@ class PyRobotPortfolioTest(TestCase):
         self.maxDiff = None
 
                 # Grab configuration values.
-        config = ConfigParser()
-        config.read('configs/config.ini')       
+        config = load_config(test_case=self)
 
         CLIENT_ID = config.get('main', 'CLIENT_ID')
         REDIRECT_URI = config.get('main', 'REDIRECT_URI')
         CREDENTIALS_PATH = config.get('main', 'JSON_PATH')
         self.ACCOUNT_NUMBER = config.get('main', 'ACCOUNT_NUMBER')
 
-        self.td_client = TDClient(
-            client_id=CLIENT_ID,
-            redirect_uri=REDIRECT_URI,
-            credentials_path=CREDENTIALS_PATH
-        )
+        if self.td_server:
+            self.td_client = self.td_server.create_client(client_id=CLIENT_ID, redirect_uri=REDIRECT_URI)
+        else:
+            self.td_client = TDClient(
+                client_id=CLIENT_ID,
+                redirect_uri=REDIRECT_URI,
+                credentials_path=CREDENTIALS_PATH
+            )
 
-        self.td_client.login()
+            self.td_client.login()
 
     def test_create_portofolio(self):
         """Make sure it's a Portfolio."""
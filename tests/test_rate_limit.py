@@ -0,0 +1,113 @@
+"""Unit test module for the RateLimiter Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that requests are held to the rate, that orders skip ahead
+of price requests and that the robot shares one limiter.
+"""
+
+import time
+import unittest
+import threading
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.robot import PyRobot
+from pyrobot.rate_limit import RateLimiter
+from pyrobot.rate_limit import RateLimitedSession
+from pyrobot.rate_limit import DATA_PRIORITY
+from pyrobot.rate_limit import ORDER_PRIORITY
+
+from fake_client import FakeTDClient
+
+
+class PyRobotRateLimiterTest(TestCase):
+
+    """Will perform a unit test for the RateLimiter Object."""
+
+    def setUp(self) -> None:
+        """Set up a Rate Limiter that allows 20 requests a second."""
+
+        self.rate_limiter = RateLimiter(requests_per_minute=1200, burst=2)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a RateLimiter object."""
+
+        self.assertIsInstance(self.rate_limiter, RateLimiter)
+
+    def test_rate(self):
+        """Test that requests past the burst wait for the bucket to refill."""
+
+        start_time = time.monotonic()
+
+        for _ in range(6):
+            self.rate_limiter.acquire()
+
+        elapsed = time.monotonic() - start_time
+        metrics = self.rate_limiter.metrics()
+
+        # Two requests go straight away, the other four wait 0.05 seconds each.
+        self.assertGreaterEqual(elapsed, 0.19)
+        self.assertEqual(metrics['requests'], {'data': 6})
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_orders_go_first(self):
+        """Test that an order waiting behind price requests is sent first."""
+
+        sent = []
+        self.rate_limiter.acquire()
+        self.rate_limiter.acquire()
+
+        def request(name: str, priority: int) -> None:
+            self.rate_limiter.acquire(priority=priority)
+            sent.append(name)
+
+        threads = [
+            threading.Thread(target=request, args=('data_{index}'.format(index=index), DATA_PRIORITY))
+            for index in range(4)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        # Wait until the price requests are all queued.
+        while self.rate_limiter.queue_depth < 4:
+            time.sleep(0.001)
+
+        order_thread = threading.Thread(target=request, args=('order', ORDER_PRIORITY))
+        order_thread.start()
+
+        for thread in threads + [order_thread]:
+            thread.join()
+
+        metrics = self.rate_limiter.metrics()
+
+        self.assertLessEqual(sent.index('order'), 1)
+        self.assertEqual(metrics['max_queue_depth'], 5)
+        self.assertEqual(metrics['requests'], {'data': 6, 'order': 1})
+
+    def test_robot_shares_the_limiter(self):
+        """Test that the robot, its portfolio and its trades use one limiter."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        robot.session = RateLimitedSession(session=FakeTDClient(latency=0.0), rate_limiter=robot.rate_limiter)
+        robot.create_portfolio()
+        robot.portfolio.add_position(symbol='MSFT', asset_type='equity')
+
+        robot.grab_current_quotes()
+        robot.portfolio.td_client.get_quotes(instruments=['MSFT'])
+        robot.session.place_order(account='123', order={})
+
+        self.assertEqual(robot.rate_limiter.metrics()['requests'], {'data': 2, 'order': 1})
+        self.assertEqual(robot.session.latency, 0.0)
+
+    def tearDown(self) -> None:
+        """Teardown the Rate Limiter."""
+
+        self.rate_limiter = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Unit test module for the ReplayEngine Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that stored bars are played back through the robot, that
+they can be loaded from a file and that the playback speed is kept.
+"""
+
+import pathlib
+import tempfile
+import unittest
+import operator
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.robot import PyRobot
+from pyrobot.rules import ThresholdRule
+from pyrobot.strategy import Strategy
+from pyrobot.replay import ReplayEngine
+from pyrobot.replay import ReplayDataSource
+from pyrobot.indicators import Indicators
+
+from generated_prices import random_walk_prices
+
+
+class PyRobotReplayTest(TestCase):
+
+    """Will perform a unit test for the ReplayEngine Object."""
+
+    def setUp(self) -> None:
+        """Set up a robot and 100 minutes of bars for 3 symbols."""
+
+        bars = random_walk_prices(symbols=['AAPL', 'MSFT', 'SQ'], bars=100, seed=4)
+
+        self.source = ReplayDataSource(bars=bars)
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            self.robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a ReplayEngine object."""
+
+        replay_engine = ReplayEngine(trading_robot=self.robot, source=self.source, warmup_bars=20)
+
+        self.assertIsInstance(replay_engine, ReplayEngine)
+        self.assertEqual(len(self.robot.stock_frame.frame), 60)
+        self.assertEqual(replay_engine.remaining, 80)
+
+    def test_replay(self):
+        """Test that every bar goes through the robot's pipeline."""
+
+        replay_engine = ReplayEngine(trading_robot=self.robot, source=self.source, warmup_bars=20)
+
+        indicator_client = Indicators(price_data_frame=self.robot.stock_frame)
+        indicator_client.sma(period=10)
+        indicator_client.set_indicator_signal(
+            indicator='sma',
+            buy=0.0,
+            sell=0.0,
+            condition_buy=operator.gt,
+            condition_sell=None
+        )
+
+        signals_seen = []
+
+        self.robot.connect_pipeline(indicator_client=indicator_client)
+        self.robot.events.subscribe(topic='signals', callback=signals_seen.append)
+
+        stats = replay_engine.run()
+
+        self.assertEqual(stats['bars'], 80)
+        self.assertEqual(stats['rows'], 240)
+        self.assertGreater(stats['bars_per_second'], 0.0)
+        self.assertEqual(len(signals_seen), 80)
+        self.assertEqual(len(self.robot.stock_frame.frame), 300)
+
+        # The indicator was refreshed on every replayed bar.
+        replayed = self.robot.stock_frame.frame.groupby(level=0).tail(80)
+        self.assertFalse(replayed['sma'].isna().any())
+
+        # Each step only requested the bars since the last one.
+        self.assertEqual(self.robot._last_bar_times['SQ'], 1586390400000 + 99 * 60000)
+
+    def test_strategy_orders(self):
+        """Test that only the orders the strategies send are counted."""
+
+        replay_engine = ReplayEngine(trading_robot=self.robot, source=self.source, warmup_bars=20)
+
+        trades_dict = {}
+
+        for symbol in ['AAPL', 'MSFT', 'SQ']:
+            trade_obj = self.robot.create_trade(trade_id=symbol, enter_or_exit='enter', long_or_short='long', order_type='mkt')
+            trade_obj.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+            trades_dict[symbol] = {'buy': {'trade_func': trade_obj}}
+
+        self.robot.record_orders = False
+        self.robot.add_strategy(strategy=Strategy(
+            name='never_fires',
+            indicators=[{'indicator': 'sma', 'period': 10}],
+            rules=[ThresholdRule(side='buy', indicator='sma', condition='<', value=0.0)],
+            trades_to_execute=trades_dict
+        ))
+        self.robot.add_strategy(strategy=Strategy(
+            name='always_fires',
+            indicators=[{'indicator': 'sma', 'period': 10}],
+            rules=[ThresholdRule(side='buy', indicator='sma', condition='>', value=0.0)],
+            trades_to_execute=trades_dict
+        ))
+
+        # Only the second strategy sends orders, one per symbol on each bar.
+        self.assertEqual(replay_engine.run(max_bars=10)['orders'], 30)
+
+    def test_from_file(self):
+        """Test that bars survive a round trip through a CSV file."""
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = pathlib.Path(directory).joinpath('bars.csv')
+            self.source.save(path=path)
+            loaded = ReplayDataSource.from_file(path=path)
+
+        self.assertEqual(loaded.symbols, self.source.symbols)
+        self.assertEqual(len(loaded), 100)
+        self.assertEqual(
+            loaded.candles(symbol='MSFT', start=1586390400000, end=1586390460000),
+            self.source.candles(symbol='MSFT', start=1586390400000, end=1586390460000)
+        )
+
+    def test_speed(self):
+        """Test that a sped up replay keeps the time between bars."""
+
+        # A minute between bars, played 600 times faster, is 0.1 seconds.
+        replay_engine = ReplayEngine(trading_robot=self.robot, source=self.source, warmup_bars=20, speed=600)
+
+        stats = replay_engine.run(max_bars=3)
+
+        self.assertEqual(stats['bars'], 3)
+        self.assertGreaterEqual(stats['seconds'], 0.2)
+
+        with self.assertRaises(ValueError):
+            ReplayEngine(trading_robot=self.robot, source=self.source, speed=-1)
+
+    def tearDown(self) -> None:
+        """Teardown the Robot."""
+
+        self.robot = None
+        self.source = None
+
+
+if __name__ == '__main__':
+    unittest.main()
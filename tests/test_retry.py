@@ -0,0 +1,245 @@
+"""Unit test module for the RetryPolicy Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test which errors are retried, that the waits back off, that the
+deadline is respected and that the robot retries its requests.
+"""
+
+import time
+import unittest
+import threading
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from td.exceptions import ServerError
+from td.exceptions import ExdLmtError
+from td.exceptions import NotFndError
+from td.exceptions import GeneralError
+
+from pyrobot.robot import PyRobot
+from pyrobot.retry import RetryPolicy
+from pyrobot.retry import RetryingSession
+from pyrobot.retry import retry_deadline
+from pyrobot.td_server import SimulatedTDServer
+
+from fake_client import FakeTDClient
+
+
+class FlakyRequest():
+
+    """A request that raises a list of errors, one per call, before succeeding."""
+
+    def __init__(self, errors: list) -> None:
+
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs) -> dict:
+
+        self.calls += 1
+
+        if self.errors:
+            raise self.errors.pop(0)
+
+        return {'calls': self.calls}
+
+
+class PyRobotRetryPolicyTest(TestCase):
+
+    """Will perform a unit test for the RetryPolicy Object."""
+
+    def setUp(self) -> None:
+        """Set up a Retry Policy with short waits."""
+
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a RetryPolicy object."""
+
+        self.assertIsInstance(self.retry_policy, RetryPolicy)
+
+        # A policy that would never send the request is refused.
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_retries_transient_errors(self):
+        """Test that server errors are retried until the request succeeds."""
+
+        request = FlakyRequest(errors=[ServerError(message='500'), ConnectionError()])
+        response = self.retry_policy.call(request, endpoint='get_quotes')
+
+        self.assertEqual(response, {'calls': 3})
+        self.assertEqual(self.retry_policy.metrics(), {'retries': {'get_quotes': 2}, 'failures': {}})
+
+    def test_raises_other_errors(self):
+        """Test that errors like a missing symbol are raised straight away."""
+
+        request = FlakyRequest(errors=[NotFndError(message='404')])
+
+        with self.assertRaises(NotFndError):
+            self.retry_policy.call(request, endpoint='get_quotes')
+
+        request = FlakyRequest(errors=[ServerError(message='500')] * 3)
+
+        with self.assertRaises(ServerError):
+            self.retry_policy.call(request, endpoint='get_price_history')
+
+        self.assertEqual(request.calls, 3)
+        self.assertEqual(self.retry_policy.failures, {'get_quotes': 1, 'get_price_history': 1})
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 422 from the server is raised after one attempt, and a 503 is retried."""
+
+        with SimulatedTDServer(seed=1) as td_server:
+
+            session = RetryingSession(session=td_server.create_client(), retry_policy=self.retry_policy)
+
+            td_server.fail_next(endpoint='get_quotes', status=422)
+
+            with self.assertRaises(GeneralError):
+                session.get_quotes(instruments=['MSFT'])
+
+            self.assertEqual(td_server.stats['endpoints']['get_quotes'], 1)
+
+            td_server.fail_next(endpoint='get_quotes', status=503)
+            session.get_quotes(instruments=['MSFT'])
+
+            self.assertEqual(td_server.stats['endpoints']['get_quotes'], 3)
+
+        self.assertEqual(self.retry_policy.metrics(), {'retries': {'get_quotes': 1}, 'failures': {'get_quotes': 1}})
+
+    def test_orders_are_not_placed_twice(self):
+        """Test that orders are only retried when TD surely didn't place them."""
+
+        request = FlakyRequest(errors=[ServerError(message='500')])
+
+        with self.assertRaises(ServerError):
+            self.retry_policy.call(request, endpoint='place_order')
+
+        request = FlakyRequest(errors=[ExdLmtError(message='429')])
+
+        self.assertEqual(self.retry_policy.call(request, endpoint='place_order'), {'calls': 2})
+
+    def test_backoff(self):
+        """Test that the waits double, up to the cap."""
+
+        retry_policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+
+        self.assertEqual([retry_policy.delay(retry=retry) for retry in range(5)], [1.0, 2.0, 4.0, 5.0, 5.0])
+        self.assertLessEqual(RetryPolicy(base_delay=1.0).delay(retry=2), 4.0)
+
+    def test_deadline(self):
+        """Test that a retry that would end after the next bar isn't attempted."""
+
+        retry_policy = RetryPolicy(base_delay=10.0, max_delay=10.0, jitter=False)
+
+        request = FlakyRequest(errors=[ServerError(message='500')])
+
+        with self.assertRaises(ServerError):
+            retry_policy.call(request, endpoint='get_price_history', deadline=time.time() + 1.0)
+
+        self.assertEqual(request.calls, 1)
+
+        # Requests sent through a session get the deadline of the block they're in.
+        session = RetryingSession(session=FakeTDClient(latency=0.0), retry_policy=retry_policy)
+        session.session.get_quotes = FlakyRequest(errors=[ServerError(message='500')])
+
+        with retry_deadline(deadline=time.time() + 1.0):
+            with self.assertRaises(ServerError):
+                session.get_quotes(instruments=['MSFT'])
+
+    def test_deadline_per_thread(self):
+        """Test that one thread's deadline doesn't cut off the retries of another."""
+
+        retry_policy = RetryPolicy(base_delay=0.05, max_delay=0.05, jitter=False)
+        request = FlakyRequest(errors=[ServerError(message='500')])
+        started = threading.Event()
+        responses = []
+
+        def retry_without_deadline():
+            started.set()
+            responses.append(retry_policy.call(request, endpoint='get_quotes'))
+
+        worker = threading.Thread(target=retry_without_deadline)
+
+        with retry_deadline(deadline=time.time()):
+            worker.start()
+            started.wait()
+
+        worker.join()
+
+        self.assertEqual(responses, [{'calls': 2}])
+        self.assertEqual(retry_policy.failures, {})
+
+    def test_counts_from_threads(self):
+        """Test that retries counted from several threads at once aren't lost."""
+
+        retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0, jitter=False)
+
+        def retry_many():
+            for _ in range(500):
+                retry_policy.call(FlakyRequest(errors=[ServerError(message='500')]), endpoint='get_quotes')
+
+        workers = [threading.Thread(target=retry_many) for _ in range(8)]
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(retry_policy.metrics()['retries'], {'get_quotes': 4000})
+
+    def test_robot_retries(self):
+        """Test that the robot's latest bar requests are retried."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                paper_trading=True,
+                retry_policy=self.retry_policy
+            )
+
+        fake_client = FakeTDClient(latency=0.0)
+        get_price_history = fake_client.get_price_history
+
+        robot.session = RetryingSession(session=fake_client, retry_policy=robot.retry_policy)
+        robot.create_portfolio()
+        robot.portfolio.add_position(symbol='MSFT', asset_type='equity')
+        robot._bar_size = 1
+        robot._bar_type = 'minute'
+
+        errors = [ConnectionError()]
+
+        def flaky_price_history(**kwargs):
+            if errors:
+                raise errors.pop(0)
+            return get_price_history(**kwargs)
+
+        fake_client.get_price_history = flaky_price_history
+
+        latest_bars = robot.get_latest_bar()
+
+        self.assertEqual([bar['symbol'] for bar in latest_bars], ['MSFT'])
+        self.assertEqual(robot.retry_policy.retries, {'get_price_history': 1})
+
+        # Once the next bar is out, the robot stops retrying and falls back on a quote.
+        errors.extend([ConnectionError(), ConnectionError()])
+        robot._next_bar_time = lambda: time.time()
+
+        latest_bars = robot.get_latest_bar()
+
+        self.assertTrue(latest_bars[0]['from_quote'])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(robot.retry_policy.failures, {'get_price_history': 1})
+
+    def tearDown(self) -> None:
+        """Teardown the Retry Policy."""
+
+        self.retry_policy = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,20 +4,25 @@ Will perform an instance test to make sure it creates it. Additionally,
 it will test different properties and methods of the object.
 """
 
+import time
 import unittest
+import threading
 import pprint
 
 from unittest import TestCase
+from unittest.mock import patch
 from datetime import datetime
 from datetime import timezone
 from datetime import timedelta
-from configparser import ConfigParser
 
 from pyrobot.trades import Trade
 from pyrobot.robot import PyRobot
 from pyrobot.portfolio import Portfolio
 from pyrobot.stock_frame import StockFrame
 
+from fake_client import FakeTDClient
+from simulated_td import load_config
+
 
 class PyRobotTest(TestCase):
 
@@ -27,8 +32,7 @@ class PyRobotTest(TestCase):
         """Set up the Robot."""
 
         # Grab configuration values.
-        config = ConfigParser()
-        config.read('configs/config.ini')       
+        config = load_config(test_case=self)
 
         CLIENT_ID = config.get('main', 'CLIENT_ID')
         REDIRECT_URI = config.get('main', 'REDIRECT_URI')
@@ -54,87 +58,22 @@ class PyRobotTest(TestCase):
         self.assertIsInstance(new_portfolio, Portfolio)
 
 
-    def test_regular_market_open(self):
-        """Tests whether Market is Open"""
-
-        # Define right now.
-        right_now = datetime.utcnow().timestamp()
-
-        # Define the start time.
-        regular_market_start_time = datetime.utcnow().replace(
-            hour=14,
-            minute=30,
-            second=00
-        ).timestamp()
-
-        # Define the end time.
-        regular_market_end_time = datetime.utcnow().replace(
-            hour=21,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        if regular_market_end_time >= right_now >= regular_market_start_time:
-            open =  True
-        else:
-            open = False
-
-        self.assertEqual(open, self.robot.regular_market_open)
-
-
-    def test_pre_market_open(self):
-        """Tests whether US Pre-Market is Open"""
-
-        # Define right now.
-        right_now = datetime.utcnow().timestamp()
-
-        # Define the start time.
-        pre_market_start_time = datetime.utcnow().replace(
-            hour=9,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        # Define the end time.
-        pre_market_end_time = datetime.utcnow().replace(
-            hour=14,
-            minute=30,
-            second=00
-        ).timestamp()
+    def test_market_open(self):
+        """Tests whether the US Pre-Market, Market and Post-Market are open at fixed times."""
 
-        if pre_market_end_time >= right_now >= pre_market_start_time:
-            open =  True
-        else:
-            open = False
+        # Tuesday, July 2nd 2024, at 8:00 AM, noon and 5:00 PM New York time.
+        for now, session in [(1719921600, 'pre'), (1719936000, 'regular'), (1719950400, 'post')]:
 
-        self.assertEqual(open, self.robot.pre_market_open)
+            with patch('pyrobot.session_clock.time.time', return_value=now):
 
-    def test_post_market_open(self):
-        """Tests whether US Post-Market is Open"""
+                self.assertEqual(self.robot.pre_market_open, session == 'pre')
+                self.assertEqual(self.robot.regular_market_open, session == 'regular')
+                self.assertEqual(self.robot.post_market_open, session == 'post')
 
-        # Define right now.
-        right_now = datetime.utcnow().timestamp()
+        # Independence Day, at noon.
+        with patch('pyrobot.session_clock.time.time', return_value=1720108800):
 
-        # Define the start time.
-        post_market_start_time = datetime.utcnow().replace(
-            hour=21,
-            minute=00,
-            second=00
-        ).timestamp()
-
-        # Define the end time.
-        post_market_end_time = datetime.utcnow().replace(
-            hour=1,
-            minute=30,
-            second=00
-        ).timestamp()
-
-        if post_market_end_time >= right_now >= post_market_start_time:
-            open = True
-        else:
-            open = False
-
-        self.assertEqual(open, self.robot.post_market_open)
+            self.assertFalse(self.robot.regular_market_open)
 
     def test_historical_prices(self):
         """Tests Grabbing historical prices."""
@@ -200,5 +139,199 @@ class PyRobotTest(TestCase):
         self.robot = None
 
 
+class PyRobotConcurrentFetchTest(TestCase):
+
+    """Will test fetching the prices of several symbols at once."""
+
+    def setUp(self) -> None:
+        """Set up a robot with a slow, fake session."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            self.robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                paper_trading=True,
+                max_workers=4
+            )
+
+        self.robot.session = FakeTDClient(latency=0.05, failing_symbols=['SQ'])
+        self.robot.create_portfolio()
+
+        self.symbols = ['MSFT', 'AAPL', 'SQ', 'TSLA', 'AMZN', 'FB', 'NFLX', 'GOOG']
+
+        for symbol in self.symbols:
+            self.robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+    def test_historical_prices_are_concurrent(self):
+        """Test that the requests overlap, keep their order and skip the failed symbol."""
+
+        start_time = time.perf_counter()
+
+        historical_prices = self.robot.grab_historical_prices(
+            start=datetime.today() - timedelta(days=1),
+            end=datetime.today()
+        )
+
+        elapsed = time.perf_counter() - start_time
+        symbols = [price['symbol'] for price in historical_prices['aggregated']]
+        expected = [symbol for symbol in self.symbols if symbol != 'SQ']
+
+        self.assertEqual(symbols, [symbol for symbol in expected for _ in range(3)])
+        self.assertEqual(list(self.robot.fetch_errors), ['SQ'])
+        self.assertIsInstance(self.robot.fetch_errors['SQ'], ConnectionError)
+        self.assertEqual(self.robot.session.max_in_flight, 4)
+        self.assertLess(elapsed, 0.05 * len(self.symbols))
+
+    def test_latest_bar(self):
+        """Test that the latest bar keeps the order of the positions, in both modes."""
+
+        self.robot.session.failing_symbols = set()
+        self.robot._bar_size = 1
+        self.robot._bar_type = 'minute'
+
+        concurrent_bars = self.robot.get_latest_bar()
+
+        self.robot.max_workers = 1
+        sequential_bars = self.robot.get_latest_bar()
+
+        self.assertEqual([bar['symbol'] for bar in concurrent_bars], self.symbols)
+        self.assertEqual(concurrent_bars, sequential_bars)
+        self.assertEqual(self.robot.fetch_errors, {})
+
+    def test_thread_pool_is_reused(self):
+        """Test that every bar runs on the same thread pool, until the robot is closed."""
+
+        self.robot.session.failing_symbols = set()
+        self.robot._bar_size = 1
+        self.robot._bar_type = 'minute'
+
+        self.robot.get_latest_bar()
+        fetch_executor = self.robot._fetch_executor
+
+        self.robot.get_latest_bar()
+
+        self.assertIs(self.robot._fetch_executor, fetch_executor)
+        self.assertEqual(self.robot.session.max_in_flight, 4)
+
+        fetch_threads = [thread for thread in threading.enumerate() if thread.name.startswith('pyrobot-fetch')]
+        self.assertLessEqual(len(fetch_threads), 4)
+
+        self.robot.close()
+
+        self.assertIsNone(self.robot._fetch_executor)
+
+        with self.assertRaises(RuntimeError):
+            fetch_executor.submit(time.sleep, 0)
+
+    def tearDown(self) -> None:
+        """Teardown the Robot."""
+
+        self.robot.close()
+        self.robot = None
+
+
+class PyRobotLatestBarTest(TestCase):
+
+    """Will test that the latest bar only requests the bars that weren't ingested."""
+
+    def setUp(self) -> None:
+        """Set up a robot with a fake session and a day of history."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            self.robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        self.robot.session = FakeTDClient(latency=0.0, bars=3, first_bar_time=1586390400000)
+        self.robot.create_portfolio()
+
+        for symbol in ['MSFT', 'AAPL']:
+            self.robot.portfolio.add_position(symbol=symbol, asset_type='equity')
+
+        # The fake session returns 3 bars, the last one at 1586390520000.
+        self.robot.grab_historical_prices(
+            start=datetime(2020, 4, 8, tzinfo=timezone.utc),
+            end=datetime(2020, 4, 9, tzinfo=timezone.utc)
+        )
+
+    def test_only_missing_bars(self):
+        """Test that only the bars since the last ingested one are requested and returned."""
+
+        self.robot.session.bars = 5
+        self.robot.session.price_history_requests = []
+
+        latest_bars = self.robot.get_latest_bar()
+
+        self.assertEqual(
+            self.robot.session.price_history_requests,
+            [('MSFT', '1586390520000'), ('AAPL', '1586390520000')]
+        )
+        self.assertEqual(
+            [(bar['symbol'], bar['datetime']) for bar in latest_bars],
+            [
+                ('MSFT', 1586390580000), ('MSFT', 1586390640000),
+                ('AAPL', 1586390580000), ('AAPL', 1586390640000)
+            ]
+        )
+
+        # Nothing new, so the latest bar comes back again.
+        latest_bars = self.robot.get_latest_bar()
+
+        self.assertEqual([bar['datetime'] for bar in latest_bars], [1586390640000] * 2)
+
+    def test_quote_bar_is_replaced(self):
+        """Test that the candle of a bar built from a quote is still requested, and replaces it."""
+
+        stock_frame = self.robot.create_stock_frame(data=self.robot.historical_prices['aggregated'])
+
+        # The quote lands half way through the minute after the last candle.
+        quotes = self.robot.session.get_quotes(instruments=['AAPL'])
+        quotes['AAPL']['quoteTimeInLong'] = 1586390610000
+        self.robot.session.get_quotes = lambda instruments: quotes
+
+        self.robot.session.failing_symbols = {'AAPL'}
+        self.robot.session.bars = 4
+
+        latest_bars = self.robot.get_latest_bar()
+        stock_frame.add_rows(data=latest_bars)
+
+        self.assertTrue(latest_bars[-1]['from_quote'])
+        self.assertEqual(latest_bars[-1]['datetime'], 1586390580000)
+        self.assertEqual(self.robot._last_bar_times['AAPL'], 1586390520000)
+
+        self.robot.session.failing_symbols = set()
+        self.robot.session.bars = 5
+        self.robot.session.price_history_requests = []
+
+        latest_bars = self.robot.get_latest_bar()
+        stock_frame.add_rows(data=latest_bars)
+
+        self.assertIn(('AAPL', '1586390520000'), self.robot.session.price_history_requests)
+        self.assertEqual(
+            [bar['datetime'] for bar in latest_bars if bar['symbol'] == 'AAPL'],
+            [1586390580000, 1586390640000]
+        )
+
+        # The candle replaced the quote bar, instead of being added next to it.
+        aapl_rows = stock_frame.frame.loc['AAPL']
+        self.assertEqual(len(aapl_rows), 5)
+        self.assertEqual(aapl_rows['close'].iloc[3], 103.0)
+
+    def test_quotes_fallback(self):
+        """Test that a symbol whose request failed gets a bar from its quote."""
+
+        self.robot.session.failing_symbols = {'AAPL'}
+
+        latest_bars = self.robot.get_latest_bar()
+
+        self.assertEqual([bar['symbol'] for bar in latest_bars], ['MSFT', 'AAPL'])
+        self.assertEqual(latest_bars[1]['close'], 100.0)
+        self.assertEqual(latest_bars[1]['datetime'], 1586390400000)
+        self.assertEqual(self.robot.fetch_errors, {})
+
+    def tearDown(self) -> None:
+        """Teardown the Robot."""
+
+        self.robot = None
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""Unit test module for the RollingStatistics Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that the rolling statistics match pandas, and that the
+indicators built on them only calculate new rows on refresh.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from pyrobot.indicators import Indicators
+from pyrobot.rolling import RollingStatistics
+from pyrobot.rolling import rolling_statistics
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import FIRST_BAR_TIME
+from generated_prices import random_walk_prices
+
+
+class PyRobotRollingStatisticsTest(TestCase):
+
+    """Will perform a unit test for the RollingStatistics Object."""
+
+    def setUp(self) -> None:
+        """Set up some generated values, with a gap in the middle."""
+
+        prices = random_walk_prices(symbols=['AAPL'], bars=200, seed=11)
+
+        self.values = np.array([price['close'] for price in prices])
+        self.values[50] = np.nan
+
+        self.rolling_statistics = RollingStatistics(window=10)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a RollingStatistics object."""
+
+        self.assertIsInstance(self.rolling_statistics, RollingStatistics)
+
+        with self.assertRaises(ValueError):
+            RollingStatistics(window=0)
+
+    def test_not_ready_until_full(self):
+        """Test that the statistics are `NaN` until the window is full."""
+
+        for value in range(9):
+            self.rolling_statistics.push(value=float(value))
+
+        self.assertFalse(self.rolling_statistics.is_ready)
+        self.assertTrue(np.isnan(self.rolling_statistics.mean))
+
+        self.rolling_statistics.push(value=9.0)
+
+        self.assertTrue(self.rolling_statistics.is_ready)
+        self.assertEqual(self.rolling_statistics.mean, 4.5)
+        self.assertEqual(self.rolling_statistics.min, 0.0)
+        self.assertEqual(self.rolling_statistics.max, 9.0)
+
+    def test_update_matches_pandas(self):
+        """Test that pushing one value at a time matches a pandas rolling window."""
+
+        results = self.rolling_statistics.update(values=self.values)
+        rolling_window = pd.Series(self.values).rolling(window=10)
+
+        for name in ['mean', 'std', 'min', 'max']:
+            np.testing.assert_allclose(
+                results[name],
+                getattr(rolling_window, name)().to_numpy(),
+                rtol=1e-9
+            )
+
+    def test_batch_matches_update(self):
+        """Test that the batch function matches the incremental one."""
+
+        batch_results = rolling_statistics(values=self.values, window=10)
+        update_results = self.rolling_statistics.update(values=self.values)
+
+        for name in ['mean', 'std', 'min', 'max']:
+            np.testing.assert_allclose(batch_results[name], update_results[name], rtol=1e-9)
+
+    def tearDown(self) -> None:
+        """Teardown the RollingStatistics object."""
+
+        self.rolling_statistics = None
+
+
+class PyRobotRollingIndicatorTest(TestCase):
+
+    """Will test the indicators that are calculated from rolling statistics."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with generated prices."""
+
+        prices = random_walk_prices(symbols=['AAPL', 'MSFT'], bars=60, seed=3, random_range=True, volume_step=1.0)
+
+        self.prices = prices
+        self.stock_frame = StockFrame(data=prices)
+        self.indicator_client = Indicators(price_data_frame=self.stock_frame)
+
+    def _add_indicators(self, indicator_client: Indicators) -> None:
+        """Adds every rolling window indicator."""
+
+        indicator_client.bollinger_bands(period=20)
+        indicator_client.stochastic_oscillator(period=14)
+        indicator_client.commodity_channel_index(period=10)
+        indicator_client.standard_deviation(period=10)
+
+    def test_refresh_matches_full_calculation(self):
+        """Test that refreshing after new rows matches calculating from scratch."""
+
+        self._add_indicators(indicator_client=self.indicator_client)
+
+        new_prices = random_walk_prices(
+            symbols=['AAPL', 'MSFT'],
+            bars=5,
+            seed=4,
+            first_bar_time=FIRST_BAR_TIME + 60 * 60000,
+            random_range=True,
+            volume=160.0,
+            volume_step=1.0
+        )
+
+        # Add the new bars one minute at a time.
+        for index in range(5):
+
+            self.stock_frame.add_rows(data=new_prices[index::5])
+            self.indicator_client.refresh()
+
+        # The built-in indicators keep their state between refreshes.
+        plugin_state = self.indicator_client._plugin_states['standard_deviation']
+        self.assertIsNotNone(plugin_state['symbols']['AAPL']['state'])
+
+        full_frame = StockFrame(data=self.prices + new_prices)
+        self._add_indicators(indicator_client=Indicators(price_data_frame=full_frame))
+
+        for column in ['band_upper', 'band_lower', 'stochastic_oscillator', 'commodity_channel_index', 'standard_deviation']:
+            np.testing.assert_allclose(
+                self.stock_frame.frame[column].to_numpy(),
+                full_frame.frame[column].to_numpy(),
+                rtol=1e-9
+            )
+
+    def test_standard_deviation_is_rolling(self):
+        """Test that the Standard Deviation is taken over the last `period` bars."""
+
+        self.indicator_client.standard_deviation(period=10)
+
+        expected = self.stock_frame.frame.loc['MSFT']['close'].rolling(window=10).std()
+
+        np.testing.assert_allclose(
+            self.stock_frame.frame.loc['MSFT']['standard_deviation'].to_numpy(),
+            expected.to_numpy()
+        )
+
+    def tearDown(self) -> None:
+        """Teardown the Indicator object."""
+
+        self.stock_frame = None
+        self.indicator_client = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""Unit test module for the SignalPlan Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that signals are compiled into rules, evaluated over every
+symbol at once and serialized to and from config.
+"""
+
+import json
+import unittest
+import operator
+import numpy as np
+
+from unittest import TestCase
+
+from pyrobot.indicators import Indicators
+from pyrobot.rules import RangeRule
+from pyrobot.rules import SignalPlan
+from pyrobot.rules import CompareRule
+from pyrobot.rules import CrossoverRule
+from pyrobot.rules import ThresholdRule
+from pyrobot.rules import compile_signals
+from pyrobot.stock_frame import StockFrame
+
+
+class PyRobotSignalPlanTest(TestCase):
+
+    """Will perform a unit test for the SignalPlan Object."""
+
+    def setUp(self) -> None:
+        """Set up the values of four symbols."""
+
+        self.values = {
+            'rsi': np.array([20.0, 50.0, 75.0, 95.0]),
+            'sma': np.array([10.0, 12.0, 9.0, np.nan]),
+            'ema': np.array([11.0, 11.0, 11.0, 11.0])
+        }
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a SignalPlan object."""
+
+        signal_plan = SignalPlan(rules=[])
+
+        self.assertIsInstance(signal_plan, SignalPlan)
+        self.assertFalse(signal_plan.evaluate(values=self.values)['buys'].any())
+
+        with self.assertRaises(ValueError):
+            SignalPlan(rules=[], combine='most')
+
+    def test_threshold_and_range(self):
+        """Test that a range rule needs both its threshold and its maximum."""
+
+        signal_plan = SignalPlan(rules=[
+            RangeRule(side='buy', indicator='rsi', condition='>=', value=70.0, condition_max='<', value_max=90.0),
+            ThresholdRule(side='sell', indicator='rsi', condition=operator.le, value=30.0)
+        ])
+
+        signals = signal_plan.evaluate(values=self.values)
+
+        np.testing.assert_array_equal(signals['buys'], [False, False, True, False])
+        np.testing.assert_array_equal(signals['sells'], [True, False, False, False])
+
+    def test_combine_all_and_any(self):
+        """Test combining the rules of one side."""
+
+        rules = [
+            ThresholdRule(side='buy', indicator='rsi', condition='ge', value=50.0),
+            CompareRule(side='buy', indicator_1='sma', condition='>', indicator_2='ema')
+        ]
+
+        np.testing.assert_array_equal(
+            SignalPlan(rules=rules, combine='all').evaluate(values=self.values)['buys'],
+            [False, True, False, False]
+        )
+
+        # A NaN never meets a condition, but the RSI rule is still met.
+        np.testing.assert_array_equal(
+            SignalPlan(rules=rules, combine='any').evaluate(values=self.values)['buys'],
+            [False, True, True, True]
+        )
+
+    def test_custom_operator(self):
+        """Test that a custom operator is evaluated but can't be serialized."""
+
+        rule = ThresholdRule(side='buy', indicator='rsi', condition=lambda x, y: x > y + 50, value=20.0)
+        signals = SignalPlan(rules=[rule]).evaluate(values=self.values)
+
+        np.testing.assert_array_equal(signals['buys'], [False, False, True, True])
+
+        with self.assertRaises(ValueError):
+            rule.to_dict()
+
+    def test_crossover(self):
+        """Test that a crossover is only met on the bar it crosses."""
+
+        signal_plan = SignalPlan(rules=[
+            CrossoverRule(side='buy', indicator_1='sma', direction='above', indicator_2='ema'),
+            CrossoverRule(side='sell', indicator_1='rsi', direction='below', indicator_2=30.0)
+        ])
+
+        previous = {
+            'sma': np.array([12.0, 10.0, 10.0, 10.0]),
+            'ema': np.array([11.0, 11.0, 11.0, 11.0]),
+            'rsi': np.array([35.0, 25.0, np.nan, 40.0])
+        }
+
+        signals = signal_plan.evaluate(values=self.values, previous=previous)
+
+        # Only MSFT's SMA went from below to above, and only AAPL's RSI from above to below.
+        np.testing.assert_array_equal(signals['buys'], [False, True, False, False])
+        np.testing.assert_array_equal(signals['sells'], [True, False, False, False])
+
+        self.assertEqual(signal_plan.previous_columns, ['sma', 'ema', 'rsi'])
+
+        with self.assertRaises(ValueError):
+            signal_plan.evaluate(values=self.values)
+
+    def test_compile_signals(self):
+        """Test compiling the signals stored by the Indicators object."""
+
+        indicator_signals = {
+            'rsi': {
+                'buy': 70.0, 'sell': 30.0, 'buy_operator': operator.ge, 'sell_operator': operator.le,
+                'buy_max': 90.0, 'sell_max': None, 'buy_operator_max': operator.lt, 'sell_operator_max': None
+            },
+            'sma_comp_ema': {
+                'type': 'comparison', 'indicator_1': 'sma', 'indicator_2': 'ema',
+                'buy_operator': operator.gt, 'sell_operator': None
+            },
+            'sma_cross_ema': {
+                'type': 'crossover', 'indicator_1': 'sma', 'indicator_2': 'ema',
+                'buy_operator': 'above', 'sell_operator': 'below'
+            }
+        }
+
+        signal_plan = compile_signals(indicator_signals=indicator_signals)
+
+        self.assertEqual(signal_plan.rules, [
+            RangeRule(side='buy', indicator='rsi', condition=operator.ge, value=70.0,
+                      condition_max=operator.lt, value_max=90.0),
+            ThresholdRule(side='sell', indicator='rsi', condition=operator.le, value=30.0),
+            CompareRule(side='buy', indicator_1='sma', condition=operator.gt, indicator_2='ema'),
+            CrossoverRule(side='buy', indicator_1='sma', direction='above', indicator_2='ema'),
+            CrossoverRule(side='sell', indicator_1='sma', direction='below', indicator_2='ema')
+        ])
+        self.assertEqual(signal_plan.columns, ['rsi', 'sma', 'ema'])
+
+    def test_serialize(self):
+        """Test that a plan survives a round trip through JSON."""
+
+        signal_plan = SignalPlan(
+            rules=[
+                RangeRule(side='buy', indicator='rsi', condition='>=', value=70.0, condition_max='<', value_max=90.0),
+                CompareRule(side='sell', indicator_1='sma', condition=operator.lt, indicator_2='ema'),
+                CrossoverRule(side='sell', indicator_1='rsi', direction='below', indicator_2=30.0)
+            ],
+            combine='any'
+        )
+
+        loaded_plan = SignalPlan.from_dict(plan_dict=json.loads(json.dumps(signal_plan.to_dict())))
+
+        self.assertEqual(loaded_plan.combine, 'any')
+        self.assertEqual(loaded_plan.to_dict(), signal_plan.to_dict())
+
+        for side in ['buys', 'sells']:
+            np.testing.assert_array_equal(
+                loaded_plan.evaluate(values=self.values, previous=self.values)[side],
+                signal_plan.evaluate(values=self.values, previous=self.values)[side]
+            )
+
+    def test_load_signals(self):
+        """Test loading a strategy's signals from config into an Indicators object."""
+
+        prices = [
+            {
+                'symbol': symbol,
+                'datetime': 1586390400000,
+                'open': close, 'close': close, 'high': close, 'low': close, 'volume': 100.0
+            }
+            for symbol, close in [('AAPL', 120.0), ('MSFT', 80.0)]
+        ]
+
+        indicator_client = Indicators(price_data_frame=StockFrame(data=prices))
+        indicator_client.load_signals(signals_dict={
+            'combine': 'all',
+            'rules': [{'type': 'threshold', 'side': 'buy', 'indicator': 'close', 'condition': '>', 'value': 100.0}]
+        })
+
+        signals = indicator_client.check_signals()
+
+        self.assertEqual(signals['buys'].index.get_level_values(0).to_list(), ['AAPL'])
+        self.assertEqual(indicator_client.signals_to_dict()['rules'][0]['condition'], 'gt')
+
+    def tearDown(self) -> None:
+        """Teardown the values."""
+
+        self.values = None
+
+
+if __name__ == '__main__':
+    unittest.main()
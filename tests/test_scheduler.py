@@ -0,0 +1,96 @@
+"""Unit test module for the BarScheduler Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that bars are aligned to the clock, that the publish delay
+is added and that the scheduler polls until the new bar is published.
+"""
+
+import unittest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.scheduler import BarScheduler
+
+
+class FakeClock():
+
+    """A clock that only moves when something sleeps."""
+
+    def __init__(self, now: float) -> None:
+
+        self.now = now
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class PyRobotBarSchedulerTest(TestCase):
+
+    """Will perform a unit test for the BarScheduler Object."""
+
+    def setUp(self) -> None:
+        """Set up a 5 minute Bar Scheduler."""
+
+        self.bar_scheduler = BarScheduler(bar_size=5, bar_type='minute', publish_delay=0.5, poll_interval=0.25)
+
+        # 2020-04-09 00:02:30.250 UTC.
+        self.clock = FakeClock(now=1586390550.25)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a BarScheduler object."""
+
+        self.assertIsInstance(self.bar_scheduler, BarScheduler)
+
+    def test_boundaries(self):
+        """Test that bars are aligned to the clock, to the fraction of a second."""
+
+        self.assertEqual(self.bar_scheduler.bar_seconds, 300)
+        self.assertEqual(self.bar_scheduler.next_boundary(now=self.clock.now), 1586390700.0)
+        self.assertEqual(
+            self.bar_scheduler.time_till_next_bar(last_bar_time=1586390400.0, now=self.clock.now),
+            150.25
+        )
+        self.assertEqual(self.bar_scheduler.time_till_next_bar(last_bar_time=1586390000.0, now=self.clock.now), 0.0)
+
+        with self.assertRaises(ValueError):
+            BarScheduler(bar_type='monthly').bar_seconds
+
+    def test_polls_until_published(self):
+        """Test that the scheduler polls with a backoff until the new bar shows up."""
+
+        old_bars = [{'symbol': 'MSFT', 'datetime': 1586390400000}]
+        new_bars = [{'symbol': 'MSFT', 'datetime': 1586390700000}]
+        responses = [old_bars, old_bars, old_bars, new_bars]
+
+        with patch('pyrobot.scheduler.time', self.clock):
+            bars = self.bar_scheduler.wait_for_new_bar(fetch=lambda: responses.pop(0), last_bar_time=1586390400.0)
+
+        self.assertEqual(bars, new_bars)
+        self.assertEqual(self.clock.sleeps, [150.25, 0.25, 0.5, 1.0])
+
+    def test_gives_up(self):
+        """Test that the scheduler stops polling once the following bar is due."""
+
+        old_bars = [{'symbol': 'MSFT', 'datetime': 1586390400000}]
+
+        with patch('pyrobot.scheduler.time', self.clock):
+            bars = self.bar_scheduler.wait_for_new_bar(fetch=lambda: old_bars, last_bar_time=1586390400.0)
+
+        self.assertEqual(bars, old_bars)
+        self.assertLessEqual(self.clock.now, 1586390400.0 + 600)
+
+    def tearDown(self) -> None:
+        """Teardown the Bar Scheduler."""
+
+        self.bar_scheduler = None
+        self.clock = None
+
+
+if __name__ == '__main__':
+    unittest.main()
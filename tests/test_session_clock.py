@@ -0,0 +1,117 @@
+"""Unit test module for the SessionClock Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test the session hours across daylight saving time, holidays
+and early closes, and finding the next time a session opens.
+"""
+
+import unittest
+
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.session_clock import SessionClock
+
+
+def utc(*args) -> float:
+    """Returns the UNIX timestamp of a UTC time."""
+
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class PyRobotSessionClockTest(TestCase):
+
+    """Will perform a unit test for the SessionClock Object."""
+
+    def setUp(self) -> None:
+        """Set up a Session Clock for 2024."""
+
+        self.session_clock = SessionClock(start_year=2024, end_year=2024)
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a SessionClock object."""
+
+        self.assertIsInstance(self.session_clock, SessionClock)
+
+    def test_daylight_saving_time(self):
+        """Test that the regular session opens at 9:30 AM New York time, in winter and summer."""
+
+        # Friday, March 8th is on EST, Monday, March 11th on EDT.
+        self.assertEqual(self.session_clock.session(now=utc(2024, 3, 8, 14, 29)), 'pre')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 3, 8, 14, 30)), 'regular')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 3, 11, 13, 30)), 'regular')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 3, 11, 20, 0)), 'post')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 3, 12, 0, 0)), 'closed')
+
+    def test_holidays_and_early_closes(self):
+        """Test that holidays are closed and early closes end at 1:00 PM."""
+
+        # Good Friday, Independence Day and a Saturday.
+        self.assertFalse(self.session_clock.is_open(session='any', now=utc(2024, 3, 29, 15, 0)))
+        self.assertFalse(self.session_clock.is_open(session='any', now=utc(2024, 7, 4, 15, 0)))
+        self.assertFalse(self.session_clock.is_open(session='any', now=utc(2024, 7, 6, 15, 0)))
+
+        self.assertEqual(
+            sorted(self.session_clock.early_closes),
+            [date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)]
+        )
+        self.assertEqual(self.session_clock.session(now=utc(2024, 7, 3, 16, 59)), 'regular')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 7, 3, 17, 0)), 'post')
+        self.assertEqual(self.session_clock.session(now=utc(2024, 11, 29, 18, 30)), 'post')
+
+    def test_next_open(self):
+        """Test that the next session is found across weekends and holidays."""
+
+        # Friday night, before Memorial Day on Monday.
+        friday_night = utc(2024, 5, 24, 23, 0)
+
+        self.assertEqual(self.session_clock.next_open(session='regular', now=friday_night), utc(2024, 5, 28, 13, 30))
+        self.assertEqual(self.session_clock.next_open(session='pre', now=friday_night), utc(2024, 5, 28, 8, 0))
+        self.assertEqual(self.session_clock.next_open(session='post', now=friday_night), friday_night)
+
+        # December 31st, so the calendar has to be extended into 2025.
+        self.assertEqual(self.session_clock.next_open(now=utc(2024, 12, 31, 22, 0)), utc(2025, 1, 2, 14, 30))
+
+    def test_day_hours(self):
+        """Test that a day's hours account for holidays and early closes, even outside the calendar."""
+
+        self.assertEqual(self.session_clock.day_hours(day=date(2024, 7, 4)), {})
+        self.assertEqual(
+            self.session_clock.day_hours(day=date(2024, 7, 3))['regular'],
+            (utc(2024, 7, 3, 13, 30), utc(2024, 7, 3, 17, 0))
+        )
+
+        # A clock for 2030 has to extend its calendar back to 2024.
+        session_clock = SessionClock(start_year=2030, end_year=2030)
+
+        self.assertEqual(session_clock.day_hours(day=date(2024, 6, 19)), {})
+        self.assertEqual(session_clock.day_hours(day=date(2024, 3, 29)), {})
+        self.assertEqual(session_clock.day_hours(day=date(2024, 7, 3))['regular'][1], utc(2024, 7, 3, 17, 0))
+        self.assertEqual(
+            session_clock.day_hours(day=date(2024, 7, 2))['regular'],
+            (utc(2024, 7, 2, 13, 30), utc(2024, 7, 2, 20, 0))
+        )
+        self.assertEqual(session_clock.start_year, 2023)
+
+    def test_sleep_until_open(self):
+        """Test that the clock sleeps once, until the session opens."""
+
+        with patch('pyrobot.session_clock.time') as mock_time:
+
+            mock_time.time.return_value = utc(2024, 3, 8, 14, 0)
+            seconds = self.session_clock.sleep_until_open(session='regular')
+
+        self.assertEqual(seconds, 30 * 60)
+        mock_time.sleep.assert_called_once_with(30 * 60)
+
+    def tearDown(self) -> None:
+        """Teardown the Session Clock."""
+
+        self.session_clock = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,11 +9,12 @@ import pandas as pd
 from unittest import TestCase
 from datetime import datetime
 from datetime import timedelta
-from configparser import ConfigParser
 
 from pyrobot.robot import PyRobot
 from pyrobot.stock_frame import StockFrame
 
+from simulated_td import load_config
+
 
 class PyRobotStockFrameTest(TestCase):
 
@@ -23,8 +24,7 @@ class PyRobotStockFrameTest(TestCase):
         """Set up the Stock Frame."""
 
         # Grab configuration values.
-        config = ConfigParser()
-        config.read('configs/config.ini')       
+        config = load_config(test_case=self)
 
         CLIENT_ID = config.get('main', 'CLIENT_ID')
         REDIRECT_URI = config.get('main', 'REDIRECT_URI')
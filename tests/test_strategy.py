@@ -0,0 +1,223 @@
+"""Unit test module for the StrategyRegistry Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that strategies share their indicators, keep their own
+signals and route them to their own trades.
+"""
+
+import json
+import unittest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrobot.robot import PyRobot
+from pyrobot.rules import CrossoverRule
+from pyrobot.rules import ThresholdRule
+from pyrobot.strategy import Strategy
+from pyrobot.strategy import StrategyRegistry
+from pyrobot.plugins import SMAPlugin
+from pyrobot.stock_frame import StockFrame
+
+from generated_prices import random_walk_prices
+
+
+class PyRobotStrategyRegistryTest(TestCase):
+
+    """Will perform a unit test for the StrategyRegistry Object."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with generated prices and two strategies."""
+
+        prices = random_walk_prices(symbols=['AAPL', 'MSFT', 'SQ'], bars=60, seed=8)
+
+        self.stock_frame = StockFrame(data=prices)
+        self.registry = StrategyRegistry(stock_frame=self.stock_frame)
+
+        self.crossover = Strategy(
+            name='crossover',
+            indicators=[
+                {'indicator': 'sma', 'period': 5, 'column_name': 'sma_5'},
+                {'indicator': 'sma', 'period': 20, 'column_name': 'sma_20'}
+            ],
+            rules=[
+                CrossoverRule(side='buy', indicator_1='sma_5', direction='above', indicator_2='sma_20'),
+                CrossoverRule(side='sell', indicator_1='sma_5', direction='below', indicator_2='sma_20')
+            ],
+            trades_to_execute={'AAPL': 'crossover trades'}
+        )
+
+        self.trend = Strategy(
+            name='trend',
+            indicators=[
+                {'indicator': 'sma', 'period': 20, 'column_name': 'sma_20'},
+                {'indicator': 'rsi', 'period': 14}
+            ],
+            rules=[
+                ThresholdRule(side='buy', indicator='close', condition='>', value=0.0)
+            ],
+            trades_to_execute={'AAPL': 'trend trades'}
+        )
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a StrategyRegistry object."""
+
+        self.assertIsInstance(self.registry, StrategyRegistry)
+
+    def test_indicators_are_shared(self):
+        """Test that an indicator used by two strategies is only added once."""
+
+        self.registry.add_strategy(strategy=self.crossover)
+        self.registry.add_strategy(strategy=self.trend)
+
+        self.assertEqual(len(self.registry), 2)
+        self.assertEqual(self.registry.indicator_count, 3)
+        self.assertEqual(
+            sorted(self.registry.indicator_client._current_indicators),
+            ['rsi', 'sma_20', 'sma_5']
+        )
+
+    def test_conflicting_column(self):
+        """Test that a column can't be calculated with two sets of arguments."""
+
+        self.registry.add_strategy(strategy=self.crossover)
+
+        conflicting = Strategy(
+            name='conflicting',
+            indicators=[{'indicator': 'sma', 'period': 10, 'column_name': 'sma_5'}],
+            rules=[]
+        )
+
+        with self.assertRaises(ValueError):
+            self.registry.add_strategy(strategy=conflicting)
+
+        with self.assertRaises(ValueError):
+            self.registry.add_strategy(strategy=self.crossover)
+
+        with self.assertRaises(ValueError):
+            Strategy(name='unknown', indicators=[{'indicator': 'moon_phase'}], rules=[])
+
+    def test_conflicting_outputs(self):
+        """Test that two indicators can't write to the same columns under different names."""
+
+        self.registry.add_strategy(strategy=Strategy(
+            name='bands_10',
+            indicators=[{'indicator': 'bollinger_bands', 'period': 10, 'column_name': 'bb_10'}],
+            rules=[]
+        ))
+
+        bands_30 = Strategy(
+            name='bands_30',
+            indicators=[
+                {'indicator': 'sma', 'period': 30, 'column_name': 'sma_30'},
+                {'indicator': 'bollinger_bands', 'period': 30, 'column_name': 'bb_30'}
+            ],
+            rules=[]
+        )
+
+        with self.assertRaises(ValueError):
+            self.registry.add_strategy(strategy=bands_30)
+
+        # Nothing from the rejected strategy was added.
+        self.assertEqual(sorted(self.registry.indicator_client._current_indicators), ['bb_10'])
+
+        # The same bands under the same name are still shared.
+        self.registry.add_strategy(strategy=Strategy(
+            name='bands_10_again',
+            indicators=[{'indicator': 'bollinger_bands', 'period': 10, 'column_name': 'bb_10'}],
+            rules=[]
+        ))
+
+        self.assertEqual(self.registry.indicator_count, 1)
+
+    def test_equal_plugins_are_shared(self):
+        """Test that two strategies with their own, but equal, plugins share one indicator."""
+
+        for name in ['fast', 'fast_again']:
+            self.registry.add_strategy(strategy=Strategy(
+                name=name,
+                indicators=[{'indicator': 'add_plugin', 'plugin': SMAPlugin(period=5)}],
+                rules=[ThresholdRule(side='buy', indicator='sma', condition='>', value=0.0)]
+            ))
+
+        self.assertEqual(self.registry.indicator_count, 1)
+
+        with self.assertRaises(ValueError):
+            self.registry.add_strategy(strategy=Strategy(
+                name='slow',
+                indicators=[{'indicator': 'add_plugin', 'plugin': SMAPlugin(period=20)}],
+                rules=[]
+            ))
+
+    def test_signals_per_strategy(self):
+        """Test that each strategy's signals come from its own rules."""
+
+        self.registry.add_strategy(strategy=self.crossover)
+        self.registry.add_strategy(strategy=self.trend)
+
+        signals = self.registry.check_signals()
+
+        self.assertEqual(sorted(signals), ['crossover', 'trend'])
+        self.assertEqual(signals['trend']['buys'].index.get_level_values(0).to_list(), ['AAPL', 'MSFT', 'SQ'])
+
+    def test_serialize(self):
+        """Test that a strategy survives a round trip through JSON."""
+
+        strategy_dict = json.loads(json.dumps(self.crossover.to_dict()))
+        loaded = Strategy.from_dict(strategy_dict=strategy_dict)
+
+        self.assertEqual(loaded.indicators, self.crossover.indicators)
+        self.assertEqual(loaded.rules, self.crossover.rules)
+
+        # Plugins are stored by their class and params.
+        plugin_strategy = Strategy(
+            name='plugin',
+            indicators=[{'indicator': 'add_plugin', 'plugin': SMAPlugin(period=5, column_name='sma_5')}],
+            rules=[]
+        )
+
+        strategy_dict = json.loads(json.dumps(plugin_strategy.to_dict()))
+        loaded = Strategy.from_dict(strategy_dict=strategy_dict)
+        plugin = loaded.indicators[0]['plugin']
+
+        self.assertIsInstance(plugin, SMAPlugin)
+        self.assertEqual(plugin.key, plugin_strategy.indicators[0]['plugin'].key)
+        self.assertEqual(plugin.outputs, ['sma_5'])
+
+    def test_robot_routes_signals(self):
+        """Test that the robot executes each strategy's signals with its own trades."""
+
+        with patch.object(PyRobot, '_create_session', return_value=None):
+            robot = PyRobot(client_id='CLIENT_ID', redirect_uri='REDIRECT_URI', paper_trading=True)
+
+        robot.stock_frame = self.stock_frame
+        robot.add_strategy(strategy=self.crossover)
+        robot.add_strategy(strategy=self.trend)
+
+        latest_bars = [
+            {
+                'symbol': symbol,
+                'datetime': 1586390400000 + 60 * 60000,
+                'open': 100.0, 'close': 100.0, 'high': 100.5, 'low': 99.5, 'volume': 100.0
+            }
+            for symbol in ['AAPL', 'MSFT', 'SQ']
+        ]
+
+        with patch.object(PyRobot, 'get_latest_bar', return_value=latest_bars), \
+                patch.object(PyRobot, 'execute_signals', return_value=[]) as execute_signals:
+            robot.process_latest_bar()
+
+        trades_used = [call.kwargs['trades_to_execute'] for call in execute_signals.call_args_list]
+
+        self.assertEqual(trades_used, [{'AAPL': 'crossover trades'}, {'AAPL': 'trend trades'}])
+        self.assertEqual(len(self.stock_frame.frame), 183)
+
+    def tearDown(self) -> None:
+        """Teardown the Strategy Registry."""
+
+        self.stock_frame = None
+        self.registry = None
+
+
+if __name__ == '__main__':
+    unittest.main()
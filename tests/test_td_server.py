@@ -0,0 +1,151 @@
+"""Unit test module for the SimulatedTDServer Object.
+
+Will perform an instance test to make sure it creates it. Additionally,
+it will test that a robot pointed at the server grabs prices, places
+orders and reads its positions over HTTP, and that the latency, the
+injected errors and the rate limit behave like they do at TD.
+"""
+
+import unittest
+
+from unittest import TestCase
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+
+from td.exceptions import ExdLmtError
+from td.exceptions import ServerError
+from td.exceptions import NotFndError
+
+from pyrobot.robot import PyRobot
+from pyrobot.retry import RetryPolicy
+from pyrobot.replay import ReplayDataSource
+from pyrobot.td_server import SimulatedTDServer
+from pyrobot.td_server import random_walk_bars
+
+
+class PyRobotSimulatedTDServerTest(TestCase):
+
+    """Will perform a unit test for the SimulatedTDServer Object."""
+
+    def setUp(self) -> None:
+        """Set up a server with an hour of bars for 3 symbols, and a robot pointed at it."""
+
+        self.source = ReplayDataSource(bars=random_walk_bars(symbols=['MSFT', 'AAPL', 'SQ'], bars=60, seed=5))
+
+        # The last 10 bars haven't happened yet.
+        self.td_server = SimulatedTDServer(source=self.source, clock=int(self.source.timestamps[-11]), seed=5)
+        self.td_server.start()
+
+        with self.td_server.patch_robot():
+            self.robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                trading_account='123456789',
+                paper_trading=False,
+                max_workers=3
+            )
+
+        self.robot.create_portfolio()
+        self.robot.portfolio.add_position(symbol='MSFT', asset_type='equity')
+        self.robot.portfolio.add_position(symbol='AAPL', asset_type='equity')
+        self.robot.portfolio.add_position(symbol='SQ', asset_type='equity')
+
+    def test_creates_instance(self):
+        """Create an instance and make sure it's a SimulatedTDServer object."""
+
+        self.assertIsInstance(self.td_server, SimulatedTDServer)
+        self.assertTrue(self.td_server.url.startswith('http://127.0.0.1:'))
+        self.assertEqual(self.robot.session.session.session.config['api_endpoint'], self.td_server.url)
+
+    def test_prices_and_orders(self):
+        """Test that the robot grabs prices, places an order and sees the position."""
+
+        clock = datetime.fromtimestamp(self.td_server.broker.clock / 1000, tz=timezone.utc)
+
+        historical_prices = self.robot.grab_historical_prices(
+            start=clock - timedelta(minutes=9),
+            end=clock
+        )
+
+        self.assertEqual(len(historical_prices['aggregated']), 30)
+        self.assertEqual(len(self.robot.get_latest_bar()), 3)
+
+        trade_obj = self.robot.create_trade(trade_id='long_msft', enter_or_exit='enter', long_or_short='long', order_type='mkt')
+        trade_obj.instrument(symbol='MSFT', quantity=10, asset_type='EQUITY')
+
+        order_response = self.robot.execute_orders(trade_obj=trade_obj)
+        self.assertEqual(order_response['order_id'], '1')
+
+        fills = self.td_server.advance(bars=2)
+
+        self.assertEqual(len(fills), 1)
+        self.assertEqual(self.robot.session.get_orders(account='123456789', order_id='1')['status'], 'FILLED')
+
+        positions = self.robot.get_positions()
+
+        self.assertEqual(positions[0]['symbol'], 'MSFT')
+        self.assertEqual(positions[0]['long_quantity'], 10)
+        self.assertAlmostEqual(positions[0]['average_price'], fills[0]['price'])
+
+        self.assertEqual(self.td_server.stats['endpoints']['place_order'], 1)
+        self.assertEqual(self.td_server.stats['endpoints']['get_price_history'], 6)
+
+    def test_errors_and_rate_limit(self):
+        """Test that injected errors are retried, and requests over the limit get a 429."""
+
+        self.td_server.fail_next(endpoint='get_quotes', status=503)
+        self.td_server.fail_next(endpoint='get_orders', status=404)
+
+        quotes = self.robot.session.get_quotes(instruments=['MSFT'])
+
+        self.assertIn('MSFT', quotes)
+        self.assertEqual(self.td_server.stats['errors'], 1)
+        self.assertEqual(self.td_server.stats['endpoints']['get_quotes'], 2)
+
+        with self.td_server.patch_robot():
+            strict_robot = PyRobot(
+                client_id='CLIENT_ID',
+                redirect_uri='REDIRECT_URI',
+                retry_policy=RetryPolicy(max_attempts=1),
+                requests_per_minute=None
+            )
+
+        with self.assertRaises(NotFndError):
+            strict_robot.session.get_orders(account='123456789', order_id='1')
+
+        self.td_server.error_rate = 1.0
+        with self.assertRaises(ServerError):
+            strict_robot.session.get_quotes(instruments=['MSFT'])
+
+        self.td_server.error_rate = 0.0
+        self.td_server.requests_per_minute = 2
+
+        strict_robot.session.get_quotes(instruments=['MSFT'])
+        strict_robot.session.get_quotes(instruments=['MSFT'])
+
+        with self.assertRaises(ExdLmtError):
+            strict_robot.session.get_quotes(instruments=['MSFT'])
+
+        self.assertEqual(self.td_server.stats['throttled'], 1)
+
+    def test_latency(self):
+        """Test that slow requests are answered at the same time."""
+
+        self.td_server.latency = 0.2
+
+        clock = datetime.fromtimestamp(self.td_server.broker.clock / 1000, tz=timezone.utc)
+        self.robot.grab_historical_prices(start=clock - timedelta(minutes=5), end=clock)
+
+        self.assertEqual(self.td_server.stats['max_in_flight'], 3)
+
+    def tearDown(self) -> None:
+        """Teardown the Server."""
+
+        self.td_server.stop()
+        self.td_server = None
+        self.robot = None
+
+
+if __name__ == '__main__':
+    unittest.main()
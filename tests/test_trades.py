@@ -6,11 +6,12 @@ it will test different properties and methods of the object.
 
 import unittest
 from unittest import TestCase
-from configparser import ConfigParser
 
 from pyrobot.robot import PyRobot
 from pyrobot.trades import Trade
 
+from simulated_td import load_config
+
 
 class PyRobotTradeTest(TestCase):
 
@@ -20,8 +21,7 @@ class PyRobotTradeTest(TestCase):
         """Set up the Trade Object."""
 
         # Grab configuration values.
-        config = ConfigParser()
-        config.read('configs/config.ini')       
+        config = load_config(test_case=self)
 
         CLIENT_ID = config.get('main', 'CLIENT_ID')
         REDIRECT_URI = config.get('main', 'REDIRECT_URI')